@@ -0,0 +1,200 @@
+"""
+Headless recompute of stored loading conditions (no PyQt6).
+
+Recomputes every condition of the chosen ships or voyages on all cores,
+prints per-stage throughput and condition latency percentiles, and exits
+non-zero when any condition fails its criteria or cannot be computed.
+Meant for nightly re-validation after editing config/limits.py:
+
+    python -m senashipping_app.cli
+    python -m senashipping_app.cli --ship "OSAMA BAY" --workers 4
+    python -m senashipping_app.cli --voyage 12 --voyage 13 --save
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from .config.settings import Settings
+from .models import Ship, Voyage
+from .models.cargo_type import CargoType
+from .repositories import database
+from .repositories.cargo_type_repository import CargoTypeRepository
+from .repositories.ship_repository import ShipRepository
+from .repositories.voyage_repository import VoyageRepository
+from .services.condition_batch import ConditionOutcome
+from .services.condition_service import ConditionService
+from .services.criteria_rules import CriterionResult
+
+# Exit codes
+EXIT_OK = 0
+EXIT_CRITERIA_FAILED = 1
+EXIT_USAGE = 2
+
+LATENCY_PERCENTILES = (50.0, 90.0, 99.0)
+STAGES = ("load", "compute", "persist")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m senashipping_app.cli",
+        description="Recompute stored loading conditions and check them against the criteria.",
+    )
+    parser.add_argument("--db", type=Path, default=None,
+                        help="SQLite database (default: senashipping_app_data/senashipping.db)")
+    parser.add_argument("--ship", action="append", default=[], metavar="ID_OR_NAME",
+                        help="Ship to recompute (repeatable; default: every ship)")
+    parser.add_argument("--voyage", action="append", type=int, default=[], metavar="ID",
+                        help="Voyage to recompute (repeatable; limits the run to these voyages)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument("--density", type=float, default=1.0,
+                        help="Cargo density for tank contents, t/m³ (default: 1.0)")
+    parser.add_argument("--cargo-type", default=None, metavar="NAME",
+                        help="Cargo type for pen weights and VCG (default: standard head weight)")
+    parser.add_argument("--free-trim", action="store_true",
+                        help="Solve draft, trim and heel for equilibrium instead of the linear estimate")
+    parser.add_argument("--save", action="store_true",
+                        help="Write the recomputed results back to the database")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Only print the summary and failing conditions")
+    return parser
+
+
+def _select_ships(ships: Sequence[Ship], wanted: Sequence[str]) -> List[Ship]:
+    """Ships matching each id or (case-insensitive) name; raises ValueError if none match."""
+    if not wanted:
+        return list(ships)
+    chosen: List[Ship] = []
+    for key in wanted:
+        matches = [
+            s for s in ships
+            if (key.isdigit() and s.id == int(key)) or s.name.strip().upper() == key.strip().upper()
+        ]
+        if not matches:
+            raise ValueError(f"No ship {key!r}")
+        chosen.extend(m for m in matches if m not in chosen)
+    return chosen
+
+
+def _find_cargo_type(repo: CargoTypeRepository, name: Optional[str]) -> Optional[CargoType]:
+    if name is None:
+        return None
+    for ct in repo.list_all():
+        if ct.name.strip().upper() == name.strip().upper():
+            return ct
+    raise ValueError(f"No cargo type {name!r}")
+
+
+def format_report(
+    outcomes: Sequence[ConditionOutcome],
+    stage_s: Dict[str, float],
+    wall_s: float,
+) -> List[str]:
+    """Throughput per stage and kernel latency percentiles as text lines."""
+    n = len(outcomes)
+    lines = [f"{'stage':<10}{'seconds':>10}{'cond/s':>12}"]
+    for stage in STAGES:
+        seconds = stage_s.get(stage, 0.0)
+        rate = n / seconds if seconds > 0 else float("inf")
+        lines.append(f"{stage:<10}{seconds:>10.3f}{rate:>12.1f}")
+    rate = n / wall_s if wall_s > 0 else float("inf")
+    lines.append(f"{'total':<10}{wall_s:>10.3f}{rate:>12.1f}")
+    if n:
+        latency_ms = 1000.0 * np.array([o.elapsed_s for o in outcomes])
+        values = np.percentile(latency_ms, LATENCY_PERCENTILES)
+        parts = [f"p{q:g} {v:.2f}" for q, v in zip(LATENCY_PERCENTILES, values)]
+        parts.append(f"max {latency_ms.max():.2f}")
+        lines.append("latency ms: " + ", ".join(parts))
+    return lines
+
+
+def run(args: argparse.Namespace, out: TextIO = sys.stdout) -> int:
+    """Recompute as selected by args; returns the process exit code."""
+    db_path = args.db or Settings.default().db_path
+    if not Path(db_path).exists():
+        print(f"Database not found: {db_path}", file=sys.stderr)
+        return EXIT_USAGE
+    session_factory = database.init_database(Path(db_path))
+    db = session_factory()
+    try:
+        try:
+            ships = _select_ships(ShipRepository(db).list(), args.ship)
+            cargo_type = _find_cargo_type(CargoTypeRepository(db), args.cargo_type)
+        except ValueError as exc:
+            print(str(exc), file=sys.stderr)
+            return EXIT_USAGE
+
+        voyage_repo = VoyageRepository(db)
+        service = ConditionService(db)
+        started = time.perf_counter()
+        outcomes: List[ConditionOutcome] = []
+        stage_s = {stage: 0.0 for stage in STAGES}
+        failing: List[str] = []
+        plan: List[Tuple[Ship, List[Voyage]]] = []
+        for ship in ships:
+            voyages = voyage_repo.list_for_ship(ship.id)
+            if args.voyage:
+                voyages = [v for v in voyages if v.id in args.voyage]
+            plan.append((ship, voyages))
+        unknown = sorted(set(args.voyage) - {v.id for _ship, voyages in plan for v in voyages})
+        if unknown:
+            print(f"No voyage {unknown[0]} for the selected ships", file=sys.stderr)
+            return EXIT_USAGE
+
+        for ship, voyages in plan:
+            if not voyages:
+                continue
+            voyage_names = {v.id: v.name for v in voyages}
+            # One batch per ship, so the pool and the pickled model are set up once
+            batch = service.compute_many(
+                ship,
+                cargo_density_t_per_m3=args.density,
+                cargo_type=cargo_type,
+                max_workers=args.workers,
+                persist=args.save,
+                voyage_ids=list(voyage_names),
+                free_trim=args.free_trim,
+            )
+            for stage in STAGES:
+                stage_s[stage] += batch.stage_s.get(stage, 0.0)
+            for outcome in batch.outcomes:
+                outcomes.append(outcome)
+                where = f"{ship.name} / {voyage_names[outcome.voyage_id]} / {outcome.name}"
+                if outcome.criteria_passed:
+                    status = "PASS"
+                elif outcome.ok:
+                    codes = [ln.code for ln in outcome.results.criteria.lines
+                             if ln.result == CriterionResult.FAIL]
+                    status = "FAIL " + ", ".join(codes)
+                    failing.append(where)
+                else:
+                    status = f"ERROR {outcome.error}"
+                    failing.append(where)
+                if not args.quiet or not outcome.criteria_passed:
+                    print(f"{where}: {status}", file=out)
+        wall_s = time.perf_counter() - started
+    finally:
+        db.close()
+
+    print(f"{len(outcomes)} conditions, {len(failing)} failing", file=out)
+    for line in format_report(outcomes, stage_s, wall_s):
+        print(line, file=out)
+    return EXIT_CRITERIA_FAILED if failing else EXIT_OK
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s - %(message)s")
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,6 +24,9 @@ MASS_PER_HEAD_T = 0.5
 # Maximum acceptable trim as fraction of LOA (e.g. 0.02 = 2%)
 MAX_TRIM_FRACTION = 0.02
 
+# Maximum static heel (deg) for a loaded condition
+MAX_HEEL_DEG = 5.0
+
 # Maximum draft as fraction of design draft (1.0 = at design)
 MAX_DRAFT_FRACTION = 1.05
 
@@ -39,6 +42,13 @@ MIN_VISIBILITY_M = 1.0
 # Phase 3: Minimum air draft (m) – clearance above waterline
 MIN_AIR_DRAFT_M = 5.0
 
+# IS Code 2008 Part A 2.2: righting lever (GZ) curve criteria
+MIN_GZ_AREA_0_30_MRAD = 0.055  # area under GZ up to 30 deg (m.rad)
+MIN_GZ_AREA_0_40_MRAD = 0.09  # area under GZ up to 40 deg (m.rad)
+MIN_GZ_AREA_30_40_MRAD = 0.03  # area under GZ between 30 and 40 deg (m.rad)
+MIN_GZ_AT_30_M = 0.20  # GZ at an angle >= 30 deg (m)
+MIN_ANGLE_MAX_GZ_DEG = 25.0  # max GZ should occur at or beyond this angle
+
 # Free surface correction factor for slack tanks (reduces effective GM)
 # I_small_square / disp for typical tank; simplified multiplier
 FREE_SURFACE_FACTOR = 0.5  # conservative reduction per slack tank
@@ -2,32 +2,53 @@
 Application entry point for the senashipping desktop app.
 
 This sets up the Qt application, main window, and high-level navigation.
+Pass --profile-startup (or set SENASHIPPING_PROFILE_STARTUP=1) to write a
+startup-time report to senashipping_app_data/startup_profile.txt.
 """
 
+import logging
 import sys
 from pathlib import Path
 
-from PyQt6.QtWidgets import QApplication
-
-from .views.main_window import MainWindow
-from .config.settings import Settings, init_logging
-from .repositories.database import init_database
+from .utils.startup_profiler import CLI_FLAG, profiling_requested, startup_profiler
 
 
 def main() -> None:
     """Bootstraps the senashipping desktop application."""
+    startup_profiler.enabled = profiling_requested(sys.argv)
+    argv = [a for a in sys.argv if a != CLI_FLAG]
+
+    with startup_profiler.stage("import PyQt6"):
+        from PyQt6.QtWidgets import QApplication
+    with startup_profiler.stage("import settings and database"):
+        from .config.settings import Settings, init_logging
+        from .repositories.database import init_database
+    with startup_profiler.stage("import MainWindow and views"):
+        from .views.main_window import MainWindow
+
     # Initialize logging & settings
     settings = Settings.default()
     init_logging(settings)
 
     # Initialize database (SQLite) and ORM mappings
-    init_database(settings.db_path)
+    with startup_profiler.stage("init_database"):
+        init_database(settings.db_path)
 
-    app = QApplication(sys.argv)
+    app = QApplication(argv)
     app.setApplicationName("Osama bay app")
 
-    main_window = MainWindow(settings=settings)
+    with startup_profiler.stage("MainWindow"):
+        main_window = MainWindow(settings=settings)
     main_window.show()
+    app.processEvents()
+    startup_profiler.mark_window_shown()
+
+    if startup_profiler.enabled:
+        report_path = settings.data_dir / "startup_profile.txt"
+        startup_profiler.write(report_path)
+        logging.getLogger(__name__).info(
+            "Startup profile written to %s\n%s", report_path, "\n".join(startup_profiler.report())
+        )
 
     exit_code = app.exec()
     # Optionally perform any graceful shutdown / cleanup here
@@ -42,4 +63,3 @@ if __name__ == "__main__":
     if project_root.exists():
         sys.path.insert(0, str(project_root))
     main()
-
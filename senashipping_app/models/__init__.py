@@ -10,6 +10,9 @@ from .cargo import Cargo
 from .voyage import Voyage, LoadingCondition
 from .livestock_pen import LivestockPen
 from .cargo_type import CargoType
+from .hydrostatic_table import HydrostaticTable, HydrostaticState
+from .cross_curves import CrossCurves
+from .tank_sounding import TankSoundingTable, TankSoundingSet, TankSoundingState
 
 __all__ = [
     "Ship",
@@ -22,5 +25,11 @@ __all__ = [
     "LoadingCondition",
     "LivestockPen",
     "CargoType",
+    "HydrostaticTable",
+    "HydrostaticState",
+    "CrossCurves",
+    "TankSoundingTable",
+    "TankSoundingSet",
+    "TankSoundingState",
 ]
 
@@ -0,0 +1,58 @@
+"""
+Cross curves of stability (KN) model.
+
+KN tabulated over a grid of displacement x heel angle for one ship. With
+the keel point K as the pole, the righting lever of a condition is
+GZ(phi) = KN(disp, phi) - KG * sin(phi).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+
+def _as_float_array(values: Iterable[float], ndim: int) -> np.ndarray:
+    arr = np.array(values, dtype=float, ndmin=ndim)
+    arr.flags.writeable = False
+    return arr
+
+
+@dataclass(slots=True)
+class CrossCurves:
+    """
+    KN (m) per displacement (rows) and heel angle (columns).
+
+    Both grids must be strictly increasing; heel angles are degrees from
+    upright. Lookups between displacements interpolate linearly and clamp
+    outside the grid.
+    """
+    displacement_t: np.ndarray
+    heel_deg: np.ndarray
+    kn_m: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.displacement_t = _as_float_array(self.displacement_t, 1)
+        self.heel_deg = _as_float_array(self.heel_deg, 1)
+        self.kn_m = _as_float_array(self.kn_m, 2)
+        n_disp, n_heel = self.displacement_t.shape[0], self.heel_deg.shape[0]
+        if n_disp < 2 or n_heel < 2:
+            raise ValueError("Cross curves need at least two displacements and two heel angles")
+        if self.kn_m.shape != (n_disp, n_heel):
+            raise ValueError(f"KN must have shape ({n_disp}, {n_heel}), got {self.kn_m.shape}")
+        if np.any(np.diff(self.displacement_t) <= 0) or np.any(np.diff(self.heel_deg) <= 0):
+            raise ValueError("Cross curve displacements and heel angles must be strictly increasing")
+        if self.heel_deg[0] < 0:
+            raise ValueError("Cross curve heel angles must be >= 0")
+
+    def kn_at(self, displacement_t: np.ndarray | float) -> np.ndarray:
+        """KN over the heel grid: (H,) for one displacement, (N, H) for N."""
+        x = np.asarray(displacement_t, dtype=float)
+        grid = self.displacement_t
+        idx = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, grid.shape[0] - 2)
+        lo = grid[idx]
+        frac = np.clip((x - lo) / (grid[idx + 1] - lo), 0.0, 1.0)
+        frac = frac[..., None]
+        return self.kn_m[idx] * (1.0 - frac) + self.kn_m[idx + 1] * frac
@@ -0,0 +1,140 @@
+"""
+Hydrostatic table model.
+
+A per-ship table of hydrostatic particulars on a draft grid (even keel),
+with interpolated lookups. Longitudinal positions (LCB, LCF) are metres from
+AP, vertical ones (KB, KM) metres above keel.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping
+
+import numpy as np
+
+# Interpolated columns, in the row order of HydrostaticTable._values
+HYDROSTATIC_COLUMNS = (
+    "displacement_t",
+    "kb_m",
+    "lcb_m",
+    "lcf_m",
+    "mtc_tm_per_m",
+    "tpc_t_per_cm",
+    "km_m",
+)
+
+
+@dataclass(slots=True)
+class HydrostaticState:
+    """Hydrostatic particulars at one draft (floats) or many drafts (arrays)."""
+    draft_m: np.ndarray | float
+    displacement_t: np.ndarray | float
+    kb_m: np.ndarray | float
+    lcb_m: np.ndarray | float
+    lcf_m: np.ndarray | float
+    mtc_tm_per_m: np.ndarray | float  # moment to change trim 1 m
+    tpc_t_per_cm: np.ndarray | float  # tonnes per cm immersion
+    km_m: np.ndarray | float
+
+
+def _as_float_array(values: Iterable[float]) -> np.ndarray:
+    arr = np.array(values, dtype=float)
+    arr.flags.writeable = False
+    return arr
+
+
+@dataclass(slots=True)
+class HydrostaticTable:
+    """
+    Hydrostatic particulars tabulated against mean draft.
+
+    Drafts must be strictly increasing and so must displacement (needed for
+    the displacement -> draft inverse). Lookups locate the bracketing rows
+    with a binary search (np.searchsorted) and interpolate every column at
+    once; values outside the grid are clamped to the first/last row.
+    """
+    draft_m: np.ndarray
+    displacement_t: np.ndarray
+    kb_m: np.ndarray
+    lcb_m: np.ndarray
+    lcf_m: np.ndarray
+    mtc_tm_per_m: np.ndarray
+    tpc_t_per_cm: np.ndarray
+    km_m: np.ndarray
+    _values: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.draft_m = _as_float_array(self.draft_m)
+        for name in HYDROSTATIC_COLUMNS:
+            setattr(self, name, _as_float_array(getattr(self, name)))
+        n = self.draft_m.shape[0]
+        if n < 2:
+            raise ValueError("Hydrostatic table needs at least two drafts")
+        for name in HYDROSTATIC_COLUMNS:
+            if getattr(self, name).shape != (n,):
+                raise ValueError(f"Column {name} must have {n} values")
+        if np.any(np.diff(self.draft_m) <= 0):
+            raise ValueError("Hydrostatic table drafts must be strictly increasing")
+        if np.any(np.diff(self.displacement_t) <= 0):
+            raise ValueError("Hydrostatic table displacement must increase with draft")
+        # (columns x rows): one gather interpolates every column
+        self._values = np.vstack([getattr(self, name) for name in HYDROSTATIC_COLUMNS])
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, float]]) -> "HydrostaticTable":
+        """Build from row dicts with draft_m and the HYDROSTATIC_COLUMNS keys."""
+        ordered = sorted(rows, key=lambda r: r["draft_m"])
+        return cls(
+            draft_m=[r["draft_m"] for r in ordered],
+            **{name: [r[name] for r in ordered] for name in HYDROSTATIC_COLUMNS},
+        )
+
+    def to_rows(self) -> List[Dict[str, float]]:
+        """Rows as dicts (inverse of from_rows)."""
+        return [
+            {"draft_m": float(self.draft_m[i]),
+             **{name: float(getattr(self, name)[i]) for name in HYDROSTATIC_COLUMNS}}
+            for i in range(self.n_rows)
+        ]
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.draft_m.shape[0])
+
+    @property
+    def min_draft_m(self) -> float:
+        return float(self.draft_m[0])
+
+    @property
+    def max_draft_m(self) -> float:
+        return float(self.draft_m[-1])
+
+    @staticmethod
+    def _locate(grid: np.ndarray, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Lower row index and interpolation fraction (clamped to [0, 1])."""
+        idx = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, grid.shape[0] - 2)
+        lo = grid[idx]
+        frac = np.clip((x - lo) / (grid[idx + 1] - lo), 0.0, 1.0)
+        return idx, frac
+
+    def at_draft(self, draft_m: np.ndarray | float) -> HydrostaticState:
+        """Interpolated particulars at one or many mean drafts."""
+        x = np.asarray(draft_m, dtype=float)
+        idx, frac = self._locate(self.draft_m, x)
+        vals = self._values[:, idx] * (1.0 - frac) + self._values[:, idx + 1] * frac
+        draft = np.clip(x, self.draft_m[0], self.draft_m[-1])
+        if x.ndim == 0:
+            return HydrostaticState(float(draft), *(float(v) for v in vals))
+        return HydrostaticState(draft, *vals)
+
+    def draft_for_displacement(self, displacement_t: np.ndarray | float) -> np.ndarray | float:
+        """Inverse lookup: mean draft for one or many displacements."""
+        x = np.asarray(displacement_t, dtype=float)
+        idx, frac = self._locate(self.displacement_t, x)
+        draft = self.draft_m[idx] * (1.0 - frac) + self.draft_m[idx + 1] * frac
+        return float(draft) if x.ndim == 0 else draft
+
+    def at_displacement(self, displacement_t: np.ndarray | float) -> HydrostaticState:
+        """Particulars at the even-keel draft for one or many displacements."""
+        return self.at_draft(self.draft_for_displacement(displacement_t))
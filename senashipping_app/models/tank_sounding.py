@@ -0,0 +1,209 @@
+"""
+Tank sounding tables.
+
+Per-tank contents particulars tabulated against sounding (liquid level
+above the tank bottom): volume, centroid of the liquid (LCG from AP, VCG
+above keel, TCG from centreline) and the transverse moment of inertia of
+the free surface about its own centreline. TankSoundingSet packs the
+tables of a ship's tanks onto one fill-fraction grid so many tanks and
+conditions are interpolated in a single gather.
+"""
+
+from __future__ import annotations
+
+from dataclasses import astuple, dataclass, field
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+# Interpolated columns (besides level_m), in TankSoundingTable row order
+SOUNDING_COLUMNS = (
+    "volume_m3",
+    "lcg_m",
+    "vcg_m",
+    "tcg_m",
+    "fs_inertia_m4",
+)
+
+
+@dataclass(slots=True)
+class TankSoundingState:
+    """Contents particulars at one or many volumes (floats or arrays)."""
+    level_m: np.ndarray | float
+    ullage_m: np.ndarray | float
+    lcg_m: np.ndarray | float
+    vcg_m: np.ndarray | float
+    tcg_m: np.ndarray | float
+    fs_inertia_m4: np.ndarray | float
+
+
+def _as_float_array(values: Iterable[float]) -> np.ndarray:
+    arr = np.array(values, dtype=float)
+    arr.flags.writeable = False
+    return arr
+
+
+@dataclass(slots=True)
+class TankSoundingTable:
+    """
+    Contents particulars of one tank tabulated against sounding.
+
+    Levels and volumes must be strictly increasing; the last row is the
+    full tank. Lookups are by volume and clamp to the table.
+    """
+    level_m: np.ndarray
+    volume_m3: np.ndarray
+    lcg_m: np.ndarray
+    vcg_m: np.ndarray
+    tcg_m: np.ndarray
+    fs_inertia_m4: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.level_m = _as_float_array(self.level_m)
+        for name in SOUNDING_COLUMNS:
+            setattr(self, name, _as_float_array(getattr(self, name)))
+        n = self.level_m.shape[0]
+        if n < 2:
+            raise ValueError("Sounding table needs at least two levels")
+        for name in SOUNDING_COLUMNS:
+            if getattr(self, name).shape != (n,):
+                raise ValueError(f"Column {name} must have {n} values")
+        if np.any(np.diff(self.level_m) <= 0):
+            raise ValueError("Sounding levels must be strictly increasing")
+        if np.any(np.diff(self.volume_m3) <= 0):
+            raise ValueError("Sounding volume must increase with level")
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, float]]) -> "TankSoundingTable":
+        """Build from row dicts with level_m and the SOUNDING_COLUMNS keys."""
+        ordered = sorted(rows, key=lambda r: r["level_m"])
+        return cls(
+            level_m=[r["level_m"] for r in ordered],
+            **{name: [r[name] for r in ordered] for name in SOUNDING_COLUMNS},
+        )
+
+    def to_rows(self) -> List[Dict[str, float]]:
+        """Rows as dicts (inverse of from_rows)."""
+        return [
+            {"level_m": float(self.level_m[i]),
+             **{name: float(getattr(self, name)[i]) for name in SOUNDING_COLUMNS}}
+            for i in range(self.level_m.shape[0])
+        ]
+
+    @property
+    def depth_m(self) -> float:
+        """Sounding of the full tank."""
+        return float(self.level_m[-1])
+
+    @property
+    def capacity_m3(self) -> float:
+        return float(self.volume_m3[-1])
+
+    def at_volume(self, volume_m3: np.ndarray | float) -> TankSoundingState:
+        """Interpolated particulars at one or many contents volumes."""
+        v = np.asarray(volume_m3, dtype=float)
+        grid = self.volume_m3
+        idx = np.clip(np.searchsorted(grid, v, side="right") - 1, 0, grid.shape[0] - 2)
+        frac = np.clip((v - grid[idx]) / (grid[idx + 1] - grid[idx]), 0.0, 1.0)
+
+        def interp(col: np.ndarray) -> np.ndarray:
+            return col[idx] * (1.0 - frac) + col[idx + 1] * frac
+
+        level = interp(self.level_m)
+        values = (level, self.depth_m - level, interp(self.lcg_m), interp(self.vcg_m),
+                  interp(self.tcg_m), interp(self.fs_inertia_m4))
+        if v.ndim == 0:
+            return TankSoundingState(*(float(x) for x in values))
+        return TankSoundingState(*values)
+
+
+@dataclass(slots=True)
+class TankSoundingSet:
+    """
+    Sounding tables of a ship's tanks resampled onto a common grid of
+    fill fractions (columns in tank order; tanks without a table keep
+    fixed centroids and no free-surface inertia).
+    """
+    has_table: np.ndarray  # (T,) bool
+    full_volume_m3: np.ndarray  # (T,) table capacity (fill fraction denominator)
+    depth_m: np.ndarray  # (T,) full sounding (NaN without a table)
+    level_m: np.ndarray  # (T, K) sounding (NaN without a table)
+    lcg_m: np.ndarray  # (T, K)
+    vcg_m: np.ndarray  # (T, K)
+    tcg_m: np.ndarray  # (T, K)
+    fs_inertia_m4: np.ndarray  # (T, K)
+    _cols: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._cols = np.arange(self.has_table.shape[0])
+
+    @classmethod
+    def compile(
+        cls,
+        tables: Sequence[TankSoundingTable | None],
+        capacity_m3: np.ndarray,
+        lcg_m: np.ndarray,
+        vcg_m: np.ndarray,
+        tcg_m: np.ndarray,
+        n_points: int = 201,
+    ) -> "TankSoundingSet":
+        """
+        Pack tables (one per tank, None for tanks without one); capacity and
+        the fixed centroids are used for the tanks without a table.
+        """
+        n = len(tables)
+        fill = np.linspace(0.0, 1.0, n_points)
+        has_table = np.array([t is not None for t in tables], dtype=bool)
+        full = np.asarray(capacity_m3, dtype=float).copy()
+        depth = np.full(n, np.nan)
+        names = ("level_m", "lcg_m", "vcg_m", "tcg_m", "fs_inertia_m4")
+        out = {name: np.empty((n, n_points)) for name in names}
+        fixed = {"lcg_m": lcg_m, "vcg_m": vcg_m, "tcg_m": tcg_m}
+        for i, table in enumerate(tables):
+            if table is None:
+                for name, values in fixed.items():
+                    out[name][i] = values[i]
+                out["level_m"][i] = np.nan
+                out["fs_inertia_m4"][i] = 0.0
+                continue
+            full[i] = table.capacity_m3
+            depth[i] = table.depth_m
+            state = table.at_volume(fill * table.capacity_m3)
+            for name in out:
+                out[name][i] = getattr(state, name)
+        for arr in out.values():
+            arr.flags.writeable = False
+        return cls(has_table=has_table, full_volume_m3=full, depth_m=depth, **out)
+
+    def at_volumes(self, volumes_m3: np.ndarray) -> TankSoundingState:
+        """
+        Particulars for (..., T) volumes in tank column order (level and
+        ullage are NaN for tanks without a table).
+        """
+        v = np.asarray(volumes_m3, dtype=float)
+        return self.at_columns(np.broadcast_to(self._cols, v.shape), v)
+
+    def at_tank(self, col: int, volume_m3: float) -> TankSoundingState:
+        """Particulars of the tank in column col at one volume (floats)."""
+        state = self.at_columns(np.array(col), np.array(float(volume_m3)))
+        return TankSoundingState(*(float(x) for x in astuple(state)))
+
+    def at_columns(self, cols: np.ndarray, volumes_m3: np.ndarray) -> TankSoundingState:
+        """Particulars for volumes of the tanks in cols (arrays of one shape)."""
+        v = np.asarray(volumes_m3, dtype=float)
+        k = self.lcg_m.shape[1]
+        pos = np.clip(v / np.maximum(self.full_volume_m3[cols], 1e-12), 0.0, 1.0) * (k - 1)
+        idx = np.minimum(pos.astype(np.int64), k - 2)
+        frac = pos - idx
+
+        def interp(table: np.ndarray) -> np.ndarray:
+            return table[cols, idx] * (1.0 - frac) + table[cols, idx + 1] * frac
+
+        fs = interp(self.fs_inertia_m4)
+        # Only strictly slack tanks carry a free surface
+        fs = np.where((pos > 0.0) & (pos < k - 1), fs, 0.0)
+        level = interp(self.level_m)
+        return TankSoundingState(
+            level, self.depth_m[cols] - level,
+            interp(self.lcg_m), interp(self.vcg_m), interp(self.tcg_m), fs,
+        )
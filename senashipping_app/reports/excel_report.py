@@ -7,8 +7,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import pandas as pd
-
 if TYPE_CHECKING:
     from ..models import Ship, Voyage, LoadingCondition
     from ..services.stability_service import ConditionResults
@@ -24,6 +22,9 @@ def export_condition_to_excel(
     """
     Generate an Excel report for a loading condition.
     """
+    # pandas is slow to import; load it on first export rather than at startup
+    import pandas as pd
+
     data = {
         "Parameter": [
             "Ship",
@@ -7,11 +7,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-
 if TYPE_CHECKING:
     from ..models import Ship, Voyage, LoadingCondition
     from ..services.stability_service import ConditionResults
@@ -27,6 +22,12 @@ def export_condition_to_pdf(
     """
     Generate a PDF report for a loading condition.
     """
+    # reportlab is loaded on first export rather than at startup
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
     doc = SimpleDocTemplate(
         str(filepath),
         pagesize=A4,
@@ -10,6 +10,7 @@ from sqlalchemy import Integer, String, Boolean, Float
 from sqlalchemy.orm import Mapped, mapped_column, Session
 
 from .database import Base
+from .read_cache import repository_cache
 from ..models.cargo_type import CargoType
 
 
@@ -37,6 +38,9 @@ class CargoTypeRepository:
 
     def list_all(self) -> List[CargoType]:
         """List all cargo types ordered by display_order, then id."""
+        return repository_cache.read(self._db, ("cargo_types",), self._query_all)
+
+    def _query_all(self) -> List[CargoType]:
         result: List[CargoType] = []
         for obj in (
             self._db.query(CargoTypeORM)
@@ -47,10 +51,8 @@ class CargoTypeRepository:
         return result
 
     def get(self, cargo_type_id: int) -> Optional[CargoType]:
-        obj = self._db.get(CargoTypeORM, cargo_type_id)
-        if not obj:
-            return None
-        return self._to_model(obj)
+        # The library is small: look it up in the cached list
+        return next((ct for ct in self.list_all() if ct.id == cargo_type_id), None)
 
     def create(self, ct: CargoType) -> CargoType:
         obj = CargoTypeORM(
@@ -71,6 +73,7 @@ class CargoTypeRepository:
         self._db.commit()
         self._db.refresh(obj)
         ct.id = obj.id
+        repository_cache.invalidate(self._db, ("cargo_types",))
         return ct
 
     def update(self, ct: CargoType) -> CargoType:
@@ -93,6 +96,7 @@ class CargoTypeRepository:
         obj.dung_weight_pct_per_day = getattr(ct, "dung_weight_pct_per_day", 1.5)
         self._db.commit()
         self._db.refresh(obj)
+        repository_cache.invalidate(self._db, ("cargo_types",))
         return ct
 
     def delete(self, cargo_type_id: int) -> None:
@@ -101,6 +105,7 @@ class CargoTypeRepository:
             return
         self._db.delete(obj)
         self._db.commit()
+        repository_cache.invalidate(self._db, ("cargo_types",))
 
     def move_up(self, cargo_type_id: int) -> bool:
         """Move item up in display order. Returns True if order changed."""
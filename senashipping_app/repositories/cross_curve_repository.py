@@ -0,0 +1,77 @@
+"""
+Repository for per-ship KN cross curves.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import Integer, Float, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, Session
+
+from .database import Base
+from .data_version import bump_ship_data_version
+from ..models.cross_curves import CrossCurves
+
+
+class CrossCurvePointORM(Base):
+    __tablename__ = "cross_curve_points"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ship_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ships.id"), nullable=False, index=True
+    )
+    displacement_t: Mapped[float] = mapped_column(Float, nullable=False)
+    heel_deg: Mapped[float] = mapped_column(Float, nullable=False)
+    kn_m: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class CrossCurveRepository:
+    """Load and replace the KN cross curves of a ship."""
+
+    def __init__(self, db: Session) -> None:
+        self._db = db
+
+    def get_for_ship(self, ship_id: int) -> Optional[CrossCurves]:
+        """The ship's cross curves, or None if none (or an incomplete grid) are stored."""
+        rows = (
+            self._db.query(CrossCurvePointORM)
+            .filter(CrossCurvePointORM.ship_id == ship_id)
+            .all()
+        )
+        if not rows:
+            return None
+        disp = np.unique([r.displacement_t for r in rows])
+        heel = np.unique([r.heel_deg for r in rows])
+        if len(rows) != disp.size * heel.size or disp.size < 2 or heel.size < 2:
+            return None
+        kn = np.empty((disp.size, heel.size))
+        for r in rows:
+            kn[np.searchsorted(disp, r.displacement_t), np.searchsorted(heel, r.heel_deg)] = r.kn_m
+        return CrossCurves(displacement_t=disp, heel_deg=heel, kn_m=kn)
+
+    def replace_for_ship(self, ship_id: int, curves: CrossCurves) -> None:
+        """Delete the ship's existing points and store curves in one transaction."""
+        self._db.query(CrossCurvePointORM).filter(
+            CrossCurvePointORM.ship_id == ship_id
+        ).delete(synchronize_session=False)
+        self._db.add_all(
+            CrossCurvePointORM(
+                ship_id=ship_id,
+                displacement_t=float(disp),
+                heel_deg=float(heel),
+                kn_m=float(curves.kn_m[i, j]),
+            )
+            for i, disp in enumerate(curves.displacement_t)
+            for j, heel in enumerate(curves.heel_deg)
+        )
+        self._db.commit()
+        bump_ship_data_version(ship_id)
+
+    def delete_for_ship(self, ship_id: int) -> None:
+        self._db.query(CrossCurvePointORM).filter(
+            CrossCurvePointORM.ship_id == ship_id
+        ).delete(synchronize_session=False)
+        self._db.commit()
+        bump_ship_data_version(ship_id)
@@ -0,0 +1,30 @@
+"""
+Per-ship data version stamps.
+
+Repositories bump a ship's version whenever its tanks, pens or particulars
+are written, so compiled models and caches keyed by (ship_id, version) know
+when they are stale. Versions are process-local and start at 0.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict
+
+_lock = threading.Lock()
+_versions: Dict[int, int] = {}
+
+
+def ship_data_version(ship_id: int) -> int:
+    """Current data version for a ship (0 if never written in this process)."""
+    return _versions.get(ship_id, 0)
+
+
+def bump_ship_data_version(ship_id: int | None) -> int:
+    """Mark a ship's data as changed. Returns the new version."""
+    if ship_id is None:
+        return 0
+    with _lock:
+        version = _versions.get(ship_id, 0) + 1
+        _versions[ship_id] = version
+        return version
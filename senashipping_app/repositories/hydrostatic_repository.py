@@ -0,0 +1,71 @@
+"""
+Repository for per-ship hydrostatic tables.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import Integer, Float, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, Session
+
+from .database import Base
+from .data_version import bump_ship_data_version
+from ..models.hydrostatic_table import HydrostaticTable, HYDROSTATIC_COLUMNS
+
+
+class HydrostaticRowORM(Base):
+    __tablename__ = "hydrostatic_rows"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ship_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ships.id"), nullable=False, index=True
+    )
+    draft_m: Mapped[float] = mapped_column(Float, nullable=False)
+    displacement_t: Mapped[float] = mapped_column(Float, nullable=False)
+    kb_m: Mapped[float] = mapped_column(Float, default=0.0)
+    lcb_m: Mapped[float] = mapped_column(Float, default=0.0)
+    lcf_m: Mapped[float] = mapped_column(Float, default=0.0)
+    mtc_tm_per_m: Mapped[float] = mapped_column(Float, default=0.0)
+    tpc_t_per_cm: Mapped[float] = mapped_column(Float, default=0.0)
+    km_m: Mapped[float] = mapped_column(Float, default=0.0)
+
+
+class HydrostaticRepository:
+    """Load and replace the hydrostatic table of a ship."""
+
+    def __init__(self, db: Session) -> None:
+        self._db = db
+
+    def get_for_ship(self, ship_id: int) -> Optional[HydrostaticTable]:
+        """The ship's table, or None if it has fewer than two rows."""
+        rows = (
+            self._db.query(HydrostaticRowORM)
+            .filter(HydrostaticRowORM.ship_id == ship_id)
+            .order_by(HydrostaticRowORM.draft_m)
+            .all()
+        )
+        if len(rows) < 2:
+            return None
+        return HydrostaticTable(
+            draft_m=[r.draft_m for r in rows],
+            **{name: [getattr(r, name) for r in rows] for name in HYDROSTATIC_COLUMNS},
+        )
+
+    def replace_for_ship(self, ship_id: int, table: HydrostaticTable) -> None:
+        """Delete the ship's existing rows and store table in one transaction."""
+        self._db.query(HydrostaticRowORM).filter(
+            HydrostaticRowORM.ship_id == ship_id
+        ).delete(synchronize_session=False)
+        self._db.add_all(
+            HydrostaticRowORM(ship_id=ship_id, **row) for row in table.to_rows()
+        )
+        self._db.commit()
+        bump_ship_data_version(ship_id)
+
+    def delete_for_ship(self, ship_id: int) -> None:
+        self._db.query(HydrostaticRowORM).filter(
+            HydrostaticRowORM.ship_id == ship_id
+        ).delete(synchronize_session=False)
+        self._db.commit()
+        bump_ship_data_version(ship_id)
@@ -10,6 +10,8 @@ from sqlalchemy import Integer, String, Float, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, Session
 
 from .database import Base
+from .data_version import bump_ship_data_version
+from .read_cache import repository_cache
 from ..models.livestock_pen import LivestockPen
 
 
@@ -43,6 +45,11 @@ class LivestockPenRepository:
         self._db = db
 
     def list_for_ship(self, ship_id: int) -> List[LivestockPen]:
+        return repository_cache.read(
+            self._db, ("pens", ship_id), lambda: self._query_for_ship(ship_id), ship_id=ship_id
+        )
+
+    def _query_for_ship(self, ship_id: int) -> List[LivestockPen]:
         pens: List[LivestockPen] = []
         for obj in (
             self._db.query(LivestockPenORM)
@@ -125,6 +132,8 @@ class LivestockPenRepository:
         self._db.commit()
         self._db.refresh(obj)
         pen.id = obj.id
+        bump_ship_data_version(obj.ship_id)
+        repository_cache.invalidate(self._db, ("pens", obj.ship_id))
         return pen
 
     def update(self, pen: LivestockPen) -> LivestockPen:
@@ -151,11 +160,16 @@ class LivestockPenRepository:
         obj.tcg_d_m = pen.tcg_d_m
         self._db.commit()
         self._db.refresh(obj)
+        bump_ship_data_version(obj.ship_id)
+        repository_cache.invalidate(self._db, ("pens", obj.ship_id))
         return pen
 
     def delete(self, pen_id: int) -> None:
         obj = self._db.get(LivestockPenORM, pen_id)
         if obj is None:
             return
+        ship_id = obj.ship_id
         self._db.delete(obj)
         self._db.commit()
+        bump_ship_data_version(ship_id)
+        repository_cache.invalidate(self._db, ("pens", ship_id))
@@ -0,0 +1,287 @@
+"""
+Versioned schema migrations for the SQLite database.
+
+The schema_version table holds one row with the number of the last
+migration applied. migrate() reads it with a single query and returns
+when it is current; otherwise the pending migrations run in order inside
+one transaction (SQLite DDL is transactional), so an upgrade either
+completes or leaves the database untouched.
+
+Migration 1 creates the tables as they stood when versioning was
+introduced; its DDL is frozen below rather than taken from the ORM
+models, so version 1 means the same schema whatever the models become.
+Databases created before versioning have no schema_version row, so they
+run every migration; tables are created only if missing and the column
+migrations only add the columns that are missing, which makes them
+no-ops on tables migration 1 just created. An upgrade holds SQLite's
+write lock, so two processes starting at once cannot both apply it.
+
+To change the schema (including any column or table added to an ORM
+model), append a Migration with the next version number; never edit or
+reorder the ones below.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    """One schema step; apply runs inside the upgrade transaction."""
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _existing_columns(conn: Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def add_missing_columns(table: str, columns: Sequence[Tuple[str, str]]) -> Callable[[Connection], None]:
+    """Migration step adding each (name, DDL type and default) column the table lacks."""
+    def apply(conn: Connection) -> None:
+        existing = _existing_columns(conn, table)
+        for name, ddl in columns:
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+    return apply
+
+
+# Schema of version 1 (frozen: never edit, add a migration instead)
+_V1_SCHEMA: Tuple[str, ...] = (
+    """CREATE TABLE IF NOT EXISTS cargo_types (
+        id INTEGER NOT NULL,
+        display_order INTEGER NOT NULL,
+        color_hex VARCHAR(32) NOT NULL,
+        pattern VARCHAR(64) NOT NULL,
+        in_use BOOLEAN NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        description VARCHAR(1024) NOT NULL,
+        method VARCHAR(64) NOT NULL,
+        cargo_subtype VARCHAR(128) NOT NULL,
+        avg_weight_per_head_kg FLOAT NOT NULL,
+        vcg_from_deck_m FLOAT NOT NULL,
+        deck_area_per_head_m2 FLOAT NOT NULL,
+        dung_weight_pct_per_day FLOAT NOT NULL,
+        PRIMARY KEY (id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS ships (
+        id INTEGER NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        imo_number VARCHAR(32) NOT NULL,
+        flag VARCHAR(64) NOT NULL,
+        length_overall_m FLOAT NOT NULL,
+        breadth_m FLOAT NOT NULL,
+        depth_m FLOAT NOT NULL,
+        design_draft_m FLOAT NOT NULL,
+        PRIMARY KEY (id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS tanks (
+        id INTEGER NOT NULL,
+        ship_id INTEGER NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        description VARCHAR(255),
+        tank_type VARCHAR(32) NOT NULL,
+        capacity_m3 FLOAT NOT NULL,
+        density_t_per_m3 FLOAT NOT NULL,
+        longitudinal_pos FLOAT NOT NULL,
+        kg_m FLOAT NOT NULL,
+        tcg_m FLOAT NOT NULL,
+        lcg_m FLOAT NOT NULL,
+        outline_json TEXT,
+        deck_name VARCHAR(32),
+        category VARCHAR(64),
+        PRIMARY KEY (id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS cross_curve_points (
+        id INTEGER NOT NULL,
+        ship_id INTEGER NOT NULL,
+        displacement_t FLOAT NOT NULL,
+        heel_deg FLOAT NOT NULL,
+        kn_m FLOAT NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(ship_id) REFERENCES ships (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_cross_curve_points_ship_id ON cross_curve_points (ship_id)",
+    """CREATE TABLE IF NOT EXISTS hydrostatic_rows (
+        id INTEGER NOT NULL,
+        ship_id INTEGER NOT NULL,
+        draft_m FLOAT NOT NULL,
+        displacement_t FLOAT NOT NULL,
+        kb_m FLOAT NOT NULL,
+        lcb_m FLOAT NOT NULL,
+        lcf_m FLOAT NOT NULL,
+        mtc_tm_per_m FLOAT NOT NULL,
+        tpc_t_per_cm FLOAT NOT NULL,
+        km_m FLOAT NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(ship_id) REFERENCES ships (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_hydrostatic_rows_ship_id ON hydrostatic_rows (ship_id)",
+    """CREATE TABLE IF NOT EXISTS livestock_pens (
+        id INTEGER NOT NULL,
+        ship_id INTEGER NOT NULL,
+        name VARCHAR(64) NOT NULL,
+        deck VARCHAR(32) NOT NULL,
+        pen_no INTEGER,
+        vcg_m FLOAT NOT NULL,
+        lcg_m FLOAT NOT NULL,
+        tcg_m FLOAT NOT NULL,
+        area_m2 FLOAT NOT NULL,
+        capacity_head INTEGER NOT NULL,
+        area_a_m2 FLOAT,
+        area_b_m2 FLOAT,
+        area_c_m2 FLOAT,
+        area_d_m2 FLOAT,
+        tcg_a_m FLOAT,
+        tcg_b_m FLOAT,
+        tcg_c_m FLOAT,
+        tcg_d_m FLOAT,
+        PRIMARY KEY (id),
+        FOREIGN KEY(ship_id) REFERENCES ships (id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS tank_sounding_rows (
+        id INTEGER NOT NULL,
+        ship_id INTEGER NOT NULL,
+        tank_id INTEGER NOT NULL,
+        level_m FLOAT NOT NULL,
+        volume_m3 FLOAT NOT NULL,
+        lcg_m FLOAT NOT NULL,
+        vcg_m FLOAT NOT NULL,
+        tcg_m FLOAT NOT NULL,
+        fs_inertia_m4 FLOAT NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(ship_id) REFERENCES ships (id),
+        FOREIGN KEY(tank_id) REFERENCES tanks (id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_tank_sounding_rows_ship_id ON tank_sounding_rows (ship_id)",
+    "CREATE INDEX IF NOT EXISTS ix_tank_sounding_rows_tank_id ON tank_sounding_rows (tank_id)",
+    """CREATE TABLE IF NOT EXISTS voyages (
+        id INTEGER NOT NULL,
+        ship_id INTEGER NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        departure_port VARCHAR(128) NOT NULL,
+        arrival_port VARCHAR(128) NOT NULL,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(ship_id) REFERENCES ships (id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS loading_conditions (
+        id INTEGER NOT NULL,
+        voyage_id INTEGER NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        tank_volumes_json TEXT NOT NULL,
+        pen_loadings_json TEXT NOT NULL,
+        displacement_t FLOAT NOT NULL,
+        draft_m FLOAT NOT NULL,
+        trim_m FLOAT NOT NULL,
+        gm_m FLOAT NOT NULL,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(voyage_id) REFERENCES voyages (id)
+    )""",
+)
+
+
+def _create_tables(conn: Connection) -> None:
+    for statement in _V1_SCHEMA:
+        conn.execute(text(statement))
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, "Create tables", _create_tables),
+    Migration(2, "Pen loadings on loading conditions", add_missing_columns(
+        "loading_conditions", [("pen_loadings_json", "TEXT DEFAULT '{}'")],
+    )),
+    Migration(3, "Deck table columns on livestock pens", add_missing_columns(
+        "livestock_pens",
+        [("pen_no", "INTEGER")] + [
+            (col, "REAL") for col in (
+                "area_a_m2", "area_b_m2", "area_c_m2", "area_d_m2",
+                "tcg_a_m", "tcg_b_m", "tcg_c_m", "tcg_d_m",
+            )
+        ],
+    )),
+    Migration(4, "Tank outline and deck for DXF-derived tanks", add_missing_columns(
+        "tanks", [("outline_json", "TEXT"), ("deck_name", "VARCHAR(32)")],
+    )),
+    Migration(5, "Tank category for loading condition tabs", add_missing_columns(
+        "tanks", [("category", "VARCHAR(64) DEFAULT 'Misc. Tanks'")],
+    )),
+    Migration(6, "Tank description and density", add_missing_columns(
+        "tanks", [("description", "VARCHAR(255) DEFAULT ''"), ("density_t_per_m3", "REAL DEFAULT 1.0")],
+    )),
+    Migration(7, "Cargo type calculation fields", add_missing_columns(
+        "cargo_types", [
+            ("method", "VARCHAR(64)"),
+            ("cargo_subtype", "VARCHAR(128)"),
+            ("avg_weight_per_head_kg", "REAL"),
+            ("vcg_from_deck_m", "REAL"),
+            ("deck_area_per_head_m2", "REAL"),
+            ("dung_weight_pct_per_day", "REAL"),
+        ],
+    )),
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(conn: Connection) -> int:
+    """Version recorded in the database (0 if never migrated)."""
+    try:
+        value = conn.execute(text(f"SELECT version FROM {SCHEMA_VERSION_TABLE}")).scalar()
+    except OperationalError:
+        return 0
+    return int(value or 0)
+
+
+def migrate(engine: Engine, migrations: Sequence[Migration] = MIGRATIONS) -> int:
+    """
+    Bring the database up to the last of migrations; returns the number
+    of migrations applied (0 on the fast path).
+    """
+    latest = migrations[-1].version if migrations else 0
+    with engine.connect() as conn:
+        current = schema_version(conn)
+    if current >= latest:
+        return 0
+
+    applied = 0
+    with engine.connect() as conn:
+        # pysqlite does not put DDL in a transaction by itself, so take the
+        # transaction (and the write lock) explicitly
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the lock in case another process upgraded meanwhile
+            current = schema_version(conn)
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (version INTEGER NOT NULL)"
+            ))
+            for migration in migrations:
+                if migration.version <= current:
+                    continue
+                logger.info("Applying schema migration %d: %s", migration.version, migration.description)
+                migration.apply(conn)
+                applied += 1
+            conn.execute(text(f"DELETE FROM {SCHEMA_VERSION_TABLE}"))
+            conn.execute(
+                text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version) VALUES (:v)"),
+                {"v": max(current, latest)},
+            )
+        except BaseException:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+        conn.exec_driver_sql("COMMIT")
+    return applied
@@ -0,0 +1,116 @@
+"""
+Read-through cache for the ship, tank, pen and cargo type repositories.
+
+Reads through ShipRepository, TankRepository, LivestockPenRepository and
+CargoTypeRepository are kept per database and key. Entries that belong
+to a ship are stamped with its data version, so any write that bumps the
+version makes them stale; the repositories' create, update and delete
+also drop the entries they touch. The cache keeps its own snapshot of
+what was loaded and callers get copies of it: each item is copied
+shallowly with new lists for its list fields (e.g. Tank.outline_xy,
+Ship.tank_ids), so editing a returned item never alters the cache and a
+hit costs far less than the query. hits and misses count the reads
+answered from the cache and from the database.
+
+The cache and the data versions are per process: writes made by another
+process to the same database file (e.g. `cli --save`) are not seen until
+this process writes to that ship, or the database is opened again.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .data_version import ship_data_version
+
+
+def _database_key(db: Session) -> str:
+    """Entries of different database files never mix."""
+    return str(db.get_bind().url)
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in dataclasses.fields(cls)) if dataclasses.is_dataclass(cls) else ()
+
+
+def _copy_item(item: Any) -> Any:
+    """Shallow copy of a model item with its list fields copied (their elements are immutable)."""
+    cls = type(item)
+    names = _field_names(cls)
+    if not names:
+        return item
+    clone = cls.__new__(cls)
+    for name in names:
+        value = getattr(item, name)
+        setattr(clone, name, list(value) if type(value) is list else value)
+    return clone
+
+
+def _copied(value: Any) -> Any:
+    """Copy of a cached value: a list of items, one item or None."""
+    if isinstance(value, list):
+        return [_copy_item(item) for item in value]
+    return _copy_item(value)
+
+
+class RepositoryCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[Hashable, ...], Tuple[int, Any]] = {}
+        self._generation = 0  # bumped by every invalidation
+        self.hits = 0
+        self.misses = 0
+
+    def read(
+        self,
+        db: Session,
+        key: Tuple[Hashable, ...],
+        loader: Callable[[], Any],
+        ship_id: Optional[int] = None,
+    ) -> Any:
+        """
+        Return a copy of the value cached under key, calling loader() on a
+        miss. With ship_id the entry is only valid for the ship's current
+        data version.
+        """
+        full_key = (_database_key(db), *key)
+        version = ship_data_version(ship_id) if ship_id is not None else 0
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return _copied(entry[1])
+            self.misses += 1
+            generation = self._generation
+        # Load outside the lock; a value read while an invalidation ran is
+        # returned but not kept, as it may predate the write
+        value = loader()
+        with self._lock:
+            if generation == self._generation:
+                # A snapshot, so edits to the items returned here leave it alone
+                self._entries[full_key] = (version, _copied(value))
+        return value
+
+    def invalidate(self, db: Session, *keys: Tuple[Hashable, ...]) -> None:
+        """Drop the entries under keys for db's database."""
+        database_key = _database_key(db)
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop((database_key, *key), None)
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. when a database is opened)."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+# Process-wide cache used by the repositories
+repository_cache = RepositoryCache()
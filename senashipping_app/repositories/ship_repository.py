@@ -6,6 +6,8 @@ from sqlalchemy import Integer, String, Float
 from sqlalchemy.orm import Mapped, mapped_column, Session
 
 from .database import Base
+from .data_version import bump_ship_data_version
+from .read_cache import repository_cache
 from ..models import Ship
 
 
@@ -42,9 +44,16 @@ class ShipRepository:
         self._db.commit()
         self._db.refresh(obj)
         ship.id = obj.id
+        bump_ship_data_version(ship.id)
+        self._invalidate(ship.id)
         return ship
 
     def get(self, ship_id: int) -> Optional[Ship]:
+        return repository_cache.read(
+            self._db, ("ship", ship_id), lambda: self._query_one(ship_id), ship_id=ship_id
+        )
+
+    def _query_one(self, ship_id: int) -> Optional[Ship]:
         obj = self._db.get(ShipORM, ship_id)
         if not obj:
             return None
@@ -60,6 +69,9 @@ class ShipRepository:
         )
 
     def list(self) -> List[Ship]:
+        return repository_cache.read(self._db, ("ships",), self._query_all)
+
+    def _query_all(self) -> List[Ship]:
         ships: List[Ship] = []
         for obj in self._db.query(ShipORM).order_by(ShipORM.name).all():
             ships.append(
@@ -93,6 +105,8 @@ class ShipRepository:
 
         self._db.commit()
         self._db.refresh(obj)
+        bump_ship_data_version(ship.id)
+        self._invalidate(ship.id)
         return ship
 
     def delete(self, ship_id: int) -> None:
@@ -101,5 +115,12 @@ class ShipRepository:
             return
         self._db.delete(obj)
         self._db.commit()
+        bump_ship_data_version(ship_id)
+        self._invalidate(ship_id)
+
+    def _invalidate(self, ship_id: int) -> None:
+        repository_cache.invalidate(
+            self._db, ("ships",), ("ship", ship_id), ("tanks", ship_id), ("pens", ship_id)
+        )
 
 
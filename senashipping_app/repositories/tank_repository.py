@@ -7,6 +7,9 @@ from sqlalchemy import Integer, String, Float, Text
 from sqlalchemy.orm import Mapped, mapped_column, Session
 
 from .database import Base
+from .data_version import bump_ship_data_version
+from .read_cache import repository_cache
+from .tank_sounding_repository import TankSoundingRowORM
 from ..models import Tank, TankType
 
 
@@ -53,6 +56,11 @@ class TankRepository:
         self._db = db
 
     def list_for_ship(self, ship_id: int) -> List[Tank]:
+        return repository_cache.read(
+            self._db, ("tanks", ship_id), lambda: self._query_for_ship(ship_id), ship_id=ship_id
+        )
+
+    def _query_for_ship(self, ship_id: int) -> List[Tank]:
         tanks: List[Tank] = []
         for obj in (
             self._db.query(TankORM)
@@ -103,6 +111,8 @@ class TankRepository:
         self._db.commit()
         self._db.refresh(obj)
         tank.id = obj.id
+        bump_ship_data_version(obj.ship_id)
+        repository_cache.invalidate(self._db, ("tanks", obj.ship_id))
         return tank
 
     def update(self, tank: Tank) -> Tank:
@@ -127,13 +137,21 @@ class TankRepository:
 
         self._db.commit()
         self._db.refresh(obj)
+        bump_ship_data_version(obj.ship_id)
+        repository_cache.invalidate(self._db, ("tanks", obj.ship_id))
         return tank
 
     def delete(self, tank_id: int) -> None:
         obj = self._db.get(TankORM, tank_id)
         if obj is None:
             return
+        ship_id = obj.ship_id
+        self._db.query(TankSoundingRowORM).filter(
+            TankSoundingRowORM.tank_id == tank_id
+        ).delete(synchronize_session=False)
         self._db.delete(obj)
         self._db.commit()
+        bump_ship_data_version(ship_id)
+        repository_cache.invalidate(self._db, ("tanks", ship_id))
 
 
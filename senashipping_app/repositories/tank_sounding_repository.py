@@ -0,0 +1,88 @@
+"""
+Repository for per-tank sounding tables.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from sqlalchemy import Integer, Float, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, Session
+
+from .database import Base
+from .data_version import bump_ship_data_version
+from ..models.tank_sounding import TankSoundingTable, SOUNDING_COLUMNS
+
+
+class TankSoundingRowORM(Base):
+    __tablename__ = "tank_sounding_rows"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ship_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ships.id"), nullable=False, index=True
+    )
+    tank_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tanks.id"), nullable=False, index=True
+    )
+    level_m: Mapped[float] = mapped_column(Float, nullable=False)
+    volume_m3: Mapped[float] = mapped_column(Float, nullable=False)
+    lcg_m: Mapped[float] = mapped_column(Float, default=0.0)
+    vcg_m: Mapped[float] = mapped_column(Float, default=0.0)
+    tcg_m: Mapped[float] = mapped_column(Float, default=0.0)
+    fs_inertia_m4: Mapped[float] = mapped_column(Float, default=0.0)
+
+
+class TankSoundingRepository:
+    """Load and replace the sounding tables of a ship's tanks."""
+
+    def __init__(self, db: Session) -> None:
+        self._db = db
+
+    @staticmethod
+    def _table(rows: List[TankSoundingRowORM]) -> Optional[TankSoundingTable]:
+        if len(rows) < 2:
+            return None
+        return TankSoundingTable(
+            level_m=[r.level_m for r in rows],
+            **{name: [getattr(r, name) for r in rows] for name in SOUNDING_COLUMNS},
+        )
+
+    def get_for_ship(self, ship_id: int) -> Dict[int, TankSoundingTable]:
+        """Sounding tables keyed by tank id (tanks without one are left out)."""
+        by_tank: Dict[int, List[TankSoundingRowORM]] = defaultdict(list)
+        for row in (
+            self._db.query(TankSoundingRowORM)
+            .filter(TankSoundingRowORM.ship_id == ship_id)
+            .order_by(TankSoundingRowORM.tank_id, TankSoundingRowORM.level_m)
+        ):
+            by_tank[row.tank_id].append(row)
+        tables = {tank_id: self._table(rows) for tank_id, rows in by_tank.items()}
+        return {tank_id: table for tank_id, table in tables.items() if table is not None}
+
+    def get_for_tank(self, tank_id: int) -> Optional[TankSoundingTable]:
+        rows = (
+            self._db.query(TankSoundingRowORM)
+            .filter(TankSoundingRowORM.tank_id == tank_id)
+            .order_by(TankSoundingRowORM.level_m)
+            .all()
+        )
+        return self._table(rows)
+
+    def replace_for_tank(self, ship_id: int, tank_id: int, table: TankSoundingTable) -> None:
+        """Delete the tank's existing rows and store table in one transaction."""
+        self._db.query(TankSoundingRowORM).filter(
+            TankSoundingRowORM.tank_id == tank_id
+        ).delete(synchronize_session=False)
+        self._db.add_all(
+            TankSoundingRowORM(ship_id=ship_id, tank_id=tank_id, **row) for row in table.to_rows()
+        )
+        self._db.commit()
+        bump_ship_data_version(ship_id)
+
+    def delete_for_tank(self, ship_id: int, tank_id: int) -> None:
+        self._db.query(TankSoundingRowORM).filter(
+            TankSoundingRowORM.tank_id == tank_id
+        ).delete(synchronize_session=False)
+        self._db.commit()
+        bump_ship_data_version(ship_id)
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import json
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
 from sqlalchemy import Integer, String, Float, Text, DateTime, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, Session
@@ -252,6 +252,25 @@ class ConditionRepository:
         self._db.refresh(obj)
         return condition
 
+    def update_results(self, conditions: Sequence[LoadingCondition]) -> None:
+        """Write the calculated properties of many conditions in one transaction."""
+        ids = [c.id for c in conditions if c.id is not None]
+        if not ids:
+            return
+        objs = {
+            obj.id: obj
+            for obj in self._db.query(LoadingConditionORM).filter(LoadingConditionORM.id.in_(ids))
+        }
+        for condition in conditions:
+            obj = objs.get(condition.id)
+            if obj is None:
+                continue
+            obj.displacement_t = condition.displacement_t
+            obj.draft_m = condition.draft_m
+            obj.trim_m = condition.trim_m
+            obj.gm_m = condition.gm_m
+        self._db.commit()
+
     def delete(self, condition_id: int) -> None:
         obj = self._db.get(LoadingConditionORM, condition_id)
         if obj is None:
@@ -9,7 +9,12 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
+
+import numpy as np
+
+from ..config.limits import MIN_GM_M
 from ..models import Ship
+from .gz_curves import GZSummary
 
 
 @dataclass(slots=True)
@@ -19,7 +24,8 @@ class AncillaryResults:
     prop_immersion_pct: float  # 0–100
     visibility_m: float  # approx distance from bridge to bow waterline
     air_draft_m: float  # clearance above waterline to highest point
-    gz_criteria_ok: bool  # simplified: based on GM and heel
+    gz_criteria_ok: bool  # IS Code GZ criteria when gz is set, else GM and heel
+    gz: GZSummary | None = None  # from the ship's cross curves, if any
 
 
 # Typical ratios when ship-specific data not available
@@ -107,6 +113,45 @@ def compute_air_draft_m(
     return max(0.0, mast_h - draft_m)
 
 
+def prop_immersion_pct_array(draft_aft_m: np.ndarray, length_m: float, depth_m: float) -> np.ndarray:
+    """compute_prop_immersion_pct with the default propeller for many aft drafts."""
+    aft = np.asarray(draft_aft_m, dtype=float)
+    if length_m <= 0 or depth_m <= 0:
+        return np.zeros_like(aft)
+    prop_center = depth_m * PROP_CENTER_ABOVE_BASELINE_RATIO
+    prop_dia = length_m * PROP_DIAMETER_RATIO
+    immersion = np.maximum(0.0, aft - prop_center)
+    return np.clip(100.0 * immersion / prop_dia, 0.0, 100.0)
+
+
+def visibility_m_array(
+    length_m: float,
+    depth_m: float,
+    draft_fwd_m: np.ndarray,
+    trim_m: np.ndarray,
+) -> np.ndarray:
+    """compute_visibility_m with the default bridge for many conditions."""
+    fwd = np.asarray(draft_fwd_m, dtype=float)
+    trim = np.asarray(trim_m, dtype=float)
+    if length_m <= 0:
+        return np.zeros(np.broadcast(fwd, trim).shape)
+    dist_to_bow = length_m - length_m * BRIDGE_POS_FROM_AP_RATIO
+    if dist_to_bow <= 0:
+        return np.full(np.broadcast(fwd, trim).shape, length_m)
+    tan_trim = np.abs(trim / length_m)  # tan(atan(trim / L))
+    height_diff = depth_m * BRIDGE_HEIGHT_RATIO - fwd
+    sighted = (height_diff > 0) & (np.arctan(tan_trim) >= 1e-9)
+    visibility = np.minimum(
+        length_m, np.maximum(0.0, height_diff / np.where(sighted, tan_trim, 1.0))
+    )
+    return np.where(sighted, visibility, dist_to_bow)
+
+
+def air_draft_m_array(depth_m: float, draft_m: np.ndarray) -> np.ndarray:
+    """compute_air_draft_m with the default mast for many drafts."""
+    return np.maximum(0.0, depth_m * MAST_HEIGHT_RATIO - np.asarray(draft_m, dtype=float))
+
+
 def compute_ancillary(
     ship: Ship,
     draft_m: float,
@@ -115,12 +160,14 @@ def compute_ancillary(
     trim_m: float,
     gm_m: float,
     heel_deg: float,
+    gz: GZSummary | None = None,
 ) -> AncillaryResults:
     """
     Compute prop immersion, visibility, air draft, and GZ criteria status.
 
-    GZ criteria: simplified pass if GM >= 0.15 and heel within limits.
-    Full GZ curve evaluation would require stability calculations.
+    GZ criteria: with a GZ summary from cross curves, the IS Code area,
+    GZ and angle criteria plus minimum GM; otherwise a simplified pass if
+    GM >= 0.15 and heel within limits.
     """
     L = max(1e-6, ship.length_overall_m)
     D = max(1e-6, ship.depth_m)
@@ -129,11 +176,15 @@ def compute_ancillary(
     visibility = compute_visibility_m(L, D, draft_fwd_m, trim_m)
     air_draft = compute_air_draft_m(D, draft_m)
 
-    gz_ok = gm_m >= 0.15 and abs(heel_deg) < 5.0
+    if gz is not None:
+        gz_ok = gz.criteria_ok and gm_m >= MIN_GM_M
+    else:
+        gz_ok = gm_m >= 0.15 and abs(heel_deg) < 5.0
 
     return AncillaryResults(
         prop_immersion_pct=prop_pct,
         visibility_m=visibility,
         air_draft_m=air_draft,
         gz_criteria_ok=gz_ok,
+        gz=gz,
     )
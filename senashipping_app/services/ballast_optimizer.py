@@ -0,0 +1,253 @@
+"""
+Ballast optimization: fill plans for ballast tanks that reach a target
+trim, heel and effective GM.
+
+Candidates keep every non-ballast tank and pen as in the base condition
+and vary the fills of up to max_tanks ballast tanks on a grid of fill
+fractions, smallest subsets first. Each subset's grid is scored in one
+compute_model_batch call (plus the free-surface correction and, when
+required, the criteria rule engine), then the closest candidates are
+refined on finer local grids. Feasible plans are ranked by the number of
+tanks touched, then by the total volume moved.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import combinations, product
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from ..config.limits import EPS, MIN_GM_M
+from ..models import TankType
+from .rule_engine import DEFAULT_RULES, fields_from_results
+from .ship_model import ShipModel
+from .stability_service import compute_model_batch
+from .free_surface import compute_free_surface_correction_array
+
+BALLAST_CATEGORY = "Water Ballast"
+DEFAULT_FILL_LEVELS = tuple(np.linspace(0.0, 1.0, 11))
+
+
+@dataclass(slots=True)
+class BallastTarget:
+    """Floating position the plan must reach, with tolerances."""
+    trim_m: float = 0.0
+    trim_tolerance_m: float = 0.1
+    heel_deg: float = 0.0
+    heel_tolerance_deg: float = 0.5
+    min_gm_m: float = MIN_GM_M  # after free-surface correction
+
+
+@dataclass(slots=True)
+class BallastPlan:
+    """One proposed fill plan and the condition it gives."""
+    volumes_m3: Dict[int, float]  # every tank of the condition
+    changes_m3: Dict[int, float]  # ballast tanks changed: new - base volume
+    tanks_touched: int
+    volume_change_m3: float
+    draft_m: float
+    trim_m: float
+    heel_deg: float
+    gm_effective_m: float
+    criteria_passed: bool
+
+
+def ballast_tank_columns(model: ShipModel) -> List[int]:
+    """Model columns of ballast tanks (by tank type or the Water Ballast category)."""
+    return [
+        i for i, t in enumerate(model.tanks)
+        if t.id is not None and (t.tank_type == TankType.BALLAST or t.category == BALLAST_CATEGORY)
+    ]
+
+
+class BallastOptimizer:
+    """
+    Searches ballast fills for one base condition on a compiled ShipModel.
+
+    Ballast water is weighed with cargo_density_t_per_m3 like every other
+    tank in compute_model_batch.
+    """
+
+    def __init__(
+        self,
+        model: ShipModel,
+        base_volumes: Mapping[int, float] | None = None,
+        pen_loadings: Mapping[int, int] | None = None,
+        cargo_density_t_per_m3: float = 1.0,
+        mass_per_head_t: float = 0.5,
+        vcg_from_deck_m: float = 0.0,
+        ballast_tank_ids: Sequence[int] | None = None,
+        fill_levels: Sequence[float] = DEFAULT_FILL_LEVELS,
+        chunk_size: int = 20_000,
+    ) -> None:
+        self.model = model
+        self.base_volumes = model.volumes_vector(base_volumes)
+        self.pen_heads = model.loadings_vector(pen_loadings)
+        self.cargo_density_t_per_m3 = cargo_density_t_per_m3
+        self.mass_per_head_t = mass_per_head_t
+        self.vcg_from_deck_m = vcg_from_deck_m
+        if ballast_tank_ids is None:
+            self.ballast_cols = ballast_tank_columns(model)
+        else:
+            self.ballast_cols = [model.tank_index[tid] for tid in ballast_tank_ids]
+        levels = np.unique(np.clip(np.asarray(fill_levels, dtype=float), 0.0, 1.0))
+        if levels.shape[0] < 2:
+            raise ValueError("fill_levels needs at least two distinct fractions")
+        self.fill_levels = levels
+        self.chunk_size = chunk_size
+        self.candidates_evaluated = 0
+
+    def evaluate(
+        self,
+        volumes_matrix: np.ndarray,
+        target: BallastTarget,
+        require_criteria: bool = True,
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Score (N x tanks) candidate volumes: (violation, feasible, fields).
+
+        violation is <= 1 where trim, heel and GM meet the target; feasible
+        additionally requires all criteria when require_criteria.
+        """
+        volumes = np.atleast_2d(volumes_matrix)
+        n = volumes.shape[0]
+        heads = np.broadcast_to(self.pen_heads, (n, self.model.n_pens))
+        batch = compute_model_batch(
+            self.model, volumes, heads,
+            cargo_density_t_per_m3=self.cargo_density_t_per_m3,
+            mass_per_head_t=self.mass_per_head_t,
+            vcg_from_deck_m=self.vcg_from_deck_m,
+        )
+        fsc = compute_free_surface_correction_array(
+            self.model, volumes, batch.displacement_t, self.cargo_density_t_per_m3
+        )
+        gm_eff = np.maximum(0.0, batch.gm_m - fsc)
+        gm_short = np.maximum(0.0, target.min_gm_m - gm_eff)
+        violation = np.maximum(
+            np.abs(batch.trim_m - target.trim_m) / max(EPS, target.trim_tolerance_m),
+            np.abs(batch.heel_deg - target.heel_deg) / max(EPS, target.heel_tolerance_deg),
+        )
+        violation = np.where(gm_short > 0, np.maximum(violation, 1.0) + gm_short, violation)
+        feasible = violation <= 1.0
+        criteria_ok = np.ones(n, dtype=bool)
+        if require_criteria:
+            criteria = DEFAULT_RULES.evaluate(
+                self.model.ship, fields_from_results(batch, fsc), self.model.gz_engine
+            )
+            criteria_ok = criteria.all_passed
+            feasible &= criteria_ok
+        self.candidates_evaluated += n
+        fields = {
+            "draft_m": batch.draft_m,
+            "trim_m": batch.trim_m,
+            "heel_deg": batch.heel_deg,
+            "gm_effective_m": gm_eff,
+            "criteria_passed": criteria_ok,
+        }
+        return violation, feasible, fields
+
+    def _grid(self, cols: Tuple[int, ...], levels: Sequence[np.ndarray]) -> Iterator[np.ndarray]:
+        """Candidate volume matrices (in chunks) for fill levels per column."""
+        capacity = self.model.tank_capacity_m3[list(cols)]
+        combos = product(*levels)
+        while True:
+            fills = np.array([c for _i, c in zip(range(self.chunk_size), combos)], dtype=float)
+            if fills.shape[0] == 0:
+                return
+            volumes = np.repeat(self.base_volumes[None, :], fills.shape[0], axis=0)
+            volumes[:, list(cols)] = fills.reshape(fills.shape[0], len(cols)) * capacity
+            yield volumes
+
+    def _search(
+        self,
+        cols: Tuple[int, ...],
+        levels: Sequence[np.ndarray],
+        target: BallastTarget,
+        require_criteria: bool,
+        keep: int,
+    ) -> Tuple[List[Tuple[np.ndarray, Dict[str, float]]], List[Tuple[float, np.ndarray]]]:
+        """
+        (best keep feasible candidates by tanks touched and volume change,
+        keep closest infeasible candidates as (violation, volumes)).
+        """
+        best: List[Tuple[Tuple[int, float], np.ndarray, Dict[str, float]]] = []
+        closest: List[Tuple[float, np.ndarray]] = []
+        for volumes in self._grid(cols, levels):
+            violation, feasible, fields = self.evaluate(volumes, target, require_criteria)
+            ok = np.flatnonzero(feasible)
+            delta = np.abs(volumes[ok] - self.base_volumes)
+            touched = (delta > 1e-9).sum(axis=1)
+            change = delta.sum(axis=1)
+            for j in np.lexsort((change, touched))[:keep]:
+                i = ok[j]
+                best.append(((int(touched[j]), float(change[j])), volumes[i],
+                             {k: v[i] for k, v in fields.items()}))
+            best = sorted(best, key=lambda c: c[0])[:keep]
+            missed = np.flatnonzero(~feasible)
+            for i in missed[np.argsort(violation[missed])[:keep]]:
+                closest.append((float(violation[i]), volumes[i]))
+            closest = sorted(closest, key=lambda c: c[0])[:keep]
+        return [(volumes, fields) for _key, volumes, fields in best], closest
+
+    def _plan(self, volumes: np.ndarray, fields: Mapping[str, float]) -> BallastPlan:
+        delta = volumes - self.base_volumes
+        changed = [i for i in self.ballast_cols if abs(delta[i]) > 1e-9]
+        ids = self.model.tank_ids
+        return BallastPlan(
+            volumes_m3={int(ids[i]): float(v) for i, v in enumerate(volumes) if ids[i] >= 0},
+            changes_m3={int(ids[i]): float(delta[i]) for i in changed},
+            tanks_touched=len(changed),
+            volume_change_m3=float(np.abs(delta).sum()),
+            draft_m=float(fields["draft_m"]),
+            trim_m=float(fields["trim_m"]),
+            heel_deg=float(fields["heel_deg"]),
+            gm_effective_m=float(fields["gm_effective_m"]),
+            criteria_passed=bool(fields["criteria_passed"]),
+        )
+
+    def optimize(
+        self,
+        target: BallastTarget | None = None,
+        max_tanks: int = 3,
+        n_plans: int = 5,
+        require_criteria: bool = True,
+        refine_rounds: int = 3,
+        refine_top: int = 8,
+    ) -> List[BallastPlan]:
+        """
+        Up to n_plans feasible plans, fewest tanks touched first, then the
+        smallest total volume change. Empty when nothing within max_tanks
+        ballast tanks reaches the target.
+        """
+        target = target or BallastTarget()
+        capacity = self.model.tank_capacity_m3
+        step0 = float(np.max(np.diff(self.fill_levels)))
+        plans: Dict[bytes, BallastPlan] = {}
+        for k in range(0, min(max_tanks, len(self.ballast_cols)) + 1):
+            for cols in combinations(self.ballast_cols, k):
+                found, closest = self._search(
+                    cols, [self.fill_levels] * k, target, require_criteria, max(n_plans, refine_top)
+                )
+                # Nothing on the coarse grid: zoom in around the closest misses
+                step = step0
+                for _round in range(refine_rounds if k and not found else 0):
+                    step /= 2.0
+                    nearest: List[Tuple[float, np.ndarray]] = []
+                    for _violation, volumes in closest:
+                        centre = volumes[list(cols)] / np.maximum(capacity[list(cols)], EPS)
+                        local = [np.unique(np.clip(c + step * np.linspace(-1.0, 1.0, 5), 0.0, 1.0))
+                                 for c in centre]
+                        more, near = self._search(cols, local, target, require_criteria, refine_top)
+                        found.extend(more)
+                        nearest.extend(near)
+                    closest = sorted(nearest, key=lambda c: c[0])[:refine_top]
+                for volumes, fields in found:
+                    plan = self._plan(volumes, fields)
+                    plans.setdefault(np.round(volumes, 6).tobytes(), plan)
+            # Plans from larger subsets always rank after these
+            if sum(1 for p in plans.values() if p.tanks_touched <= k) >= n_plans:
+                break
+        ranked = sorted(plans.values(), key=lambda p: (p.tanks_touched, p.volume_change_m3))
+        return ranked[:n_plans]
@@ -0,0 +1,228 @@
+"""
+Recompute many loading conditions of one ship.
+
+run_condition is the session-free compute kernel behind
+ConditionService.compute: it only reads the compiled ShipModel, so it can
+run in pool workers. compute_conditions fans a list of ConditionJob out
+over a ProcessPoolExecutor (the model is sent once per worker, as in the
+hydrostatic generator) and reports progress as jobs finish. Persisting
+the results is left to the caller so it can happen in one transaction.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .criteria_rules import evaluate_all_criteria
+from .equilibrium import EquilibriumResult
+from .ship_model import ShipModel
+from .stability_service import ConditionResults, compute_condition_for_model
+from .traceability import create_snapshot
+from .validation import validate_condition
+
+# progress(done, total) after each finished condition
+ProgressCallback = Callable[[int, int], None]
+# Polled between conditions (and between the stages of one); True stops the run
+CancelCallback = Callable[[], bool]
+
+
+class ComputeCancelled(Exception):
+    """Raised by run_condition when its cancel callback asks it to stop."""
+
+
+def _check_cancelled(cancelled: CancelCallback | None) -> None:
+    if cancelled is not None and cancelled():
+        raise ComputeCancelled()
+
+
+def run_condition(
+    model: ShipModel,
+    name: str,
+    tank_volumes: Dict[int, float],
+    pen_loadings: Dict[int, int] | None = None,
+    cargo_density_t_per_m3: float = 1.0,
+    mass_per_head_t: float = 0.5,
+    vcg_from_deck_m: float = 0.0,
+    free_trim: bool = False,
+    cancelled: CancelCallback | None = None,
+    warm_start: EquilibriumResult | None = None,
+) -> ConditionResults:
+    """
+    Stability, validation, criteria and snapshot for one condition.
+    warm_start seeds the free-trim solve (see compute_condition_for_model).
+    cancelled is polled before each stage; ComputeCancelled is raised
+    when it returns True.
+    """
+    _check_cancelled(cancelled)
+    results = compute_condition_for_model(
+        model, tank_volumes, pen_loadings,
+        cargo_density_t_per_m3,
+        mass_per_head_t=mass_per_head_t,
+        vcg_from_deck_m=vcg_from_deck_m,
+        free_trim=free_trim,
+        warm_start=warm_start,
+        station_strength=True,
+    )
+    ship = model.ship
+    _check_cancelled(cancelled)
+    # Run validation (negative GM, extreme trim, over-limit BM, etc.)
+    results.validation = validate_condition(
+        ship, results, model.tanks, tank_volumes, cargo_density_t_per_m3, model=model,
+    )
+    _check_cancelled(cancelled)
+    # Run IMO + livestock criteria
+    results.criteria = evaluate_all_criteria(
+        ship, results, model.tanks, tank_volumes, cargo_density_t_per_m3, model=model,
+    )
+    _check_cancelled(cancelled)
+    # Traceability snapshot
+    results.snapshot = create_snapshot(
+        name, ship.name, tank_volumes, cargo_density_t_per_m3, results, results.criteria,
+    )
+    return results
+
+
+@dataclass(slots=True)
+class ConditionJob:
+    """Inputs of one condition to recompute."""
+    condition_id: int | None
+    name: str
+    tank_volumes_m3: Dict[int, float]
+    pen_loadings: Dict[int, int] = field(default_factory=dict)
+    voyage_id: int | None = None
+
+
+@dataclass(slots=True)
+class ConditionOutcome:
+    """Results for one job, or the error that stopped it."""
+    condition_id: int | None
+    name: str
+    results: ConditionResults | None = None
+    error: str | None = None
+    elapsed_s: float = 0.0  # kernel time in the worker
+    voyage_id: int | None = None
+
+    @property
+    def criteria_passed(self) -> bool:
+        """Computed and no criterion failed."""
+        return self.results is not None and self.results.criteria.all_passed
+
+    @property
+    def ok(self) -> bool:
+        return self.results is not None
+
+
+@dataclass(slots=True)
+class BatchComputeResult:
+    """Outcomes in job order; jobs not run before cancellation are left out."""
+    outcomes: List[ConditionOutcome]
+    total: int
+    cancelled: bool = False
+    # Wall-clock seconds per stage (e.g. "load", "compute", "persist")
+    stage_s: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def n_failed(self) -> int:
+        return sum(1 for o in self.outcomes if not o.ok)
+
+
+@dataclass(slots=True)
+class _Settings:
+    """Everything a job needs besides its own inputs (sent once to each worker)."""
+    model: ShipModel
+    cargo_density_t_per_m3: float
+    mass_per_head_t: float
+    vcg_from_deck_m: float
+    free_trim: bool
+
+
+# Settings shared by pool workers (set once per process by the initializer)
+_worker_settings: _Settings | None = None
+
+
+def _init_worker(settings: _Settings) -> None:
+    global _worker_settings
+    _worker_settings = settings
+
+
+def _run_job(job: ConditionJob) -> ConditionOutcome:
+    s = _worker_settings  # type: ignore[assignment]
+    start = time.perf_counter()
+    try:
+        results = run_condition(
+            s.model, job.name, job.tank_volumes_m3, job.pen_loadings,
+            s.cargo_density_t_per_m3, s.mass_per_head_t, s.vcg_from_deck_m, s.free_trim,
+        )
+    except Exception as exc:  # bad data fails this condition, not the batch
+        return ConditionOutcome(
+            job.condition_id, job.name, error=str(exc) or type(exc).__name__,
+            elapsed_s=time.perf_counter() - start, voyage_id=job.voyage_id,
+        )
+    return ConditionOutcome(
+        job.condition_id, job.name, results=results, elapsed_s=time.perf_counter() - start,
+        voyage_id=job.voyage_id,
+    )
+
+
+def compute_conditions(
+    model: ShipModel,
+    jobs: Sequence[ConditionJob],
+    cargo_density_t_per_m3: float = 1.0,
+    mass_per_head_t: float = 0.5,
+    vcg_from_deck_m: float = 0.0,
+    free_trim: bool = False,
+    max_workers: Optional[int] = None,
+    progress: ProgressCallback | None = None,
+    cancelled: CancelCallback | None = None,
+) -> BatchComputeResult:
+    """
+    Run every job on model. max_workers=1 (or a single job) computes in
+    this process; otherwise jobs go to a process pool (None: one worker
+    per CPU). When cancelled() turns True, queued jobs are dropped and the
+    outcomes finished so far are returned.
+    """
+    started = time.perf_counter()
+    settings = _Settings(model, cargo_density_t_per_m3, mass_per_head_t, vcg_from_deck_m, free_trim)
+    total = len(jobs)
+    done: Dict[int, ConditionOutcome] = {}
+    stopped = False
+
+    def finished(i: int, outcome: ConditionOutcome) -> None:
+        done[i] = outcome
+        if progress is not None:
+            progress(len(done), total)
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or total < 2:
+        _init_worker(settings)
+        for i, job in enumerate(jobs):
+            if cancelled is not None and cancelled():
+                stopped = True
+                break
+            finished(i, _run_job(job))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, total),
+            initializer=_init_worker,
+            initargs=(settings,),
+        ) as pool:
+            pending: Dict[Future, int] = {pool.submit(_run_job, job): i for i, job in enumerate(jobs)}
+            while pending:
+                if cancelled is not None and cancelled():
+                    stopped = True
+                    for future in pending:
+                        future.cancel()
+                    break
+                ready, _rest = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in ready:
+                    finished(pending.pop(future), future.result())
+    return BatchComputeResult(
+        outcomes=[done[i] for i in sorted(done)],
+        total=total,
+        cancelled=stopped,
+        stage_s={"compute": time.perf_counter() - started},
+    )
@@ -4,20 +4,41 @@ Business logic for loading conditions and interaction with the calculation engin
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 from sqlalchemy.orm import Session
 
-from ..models import Ship, LoadingCondition, Tank
+from ..models import Ship, LoadingCondition, Tank, Voyage
 from ..models.cargo_type import CargoType
 from ..repositories.tank_repository import TankRepository
 from ..repositories.livestock_pen_repository import LivestockPenRepository
+from ..repositories.hydrostatic_repository import HydrostaticRepository
+from ..repositories.cross_curve_repository import CrossCurveRepository
+from ..repositories.tank_sounding_repository import TankSoundingRepository
+from ..repositories.voyage_repository import ConditionRepository, VoyageRepository
 from ..config.limits import MASS_PER_HEAD_T
-from .stability_service import compute_condition, ConditionResults
-from .validation import validate_condition
-from .criteria_rules import evaluate_all_criteria
-from .traceability import create_snapshot
+from .stability_service import ConditionResults
+from .equilibrium import EquilibriumResult
+from .ship_model import ShipData, ShipModel, ship_model_cache
+from .incremental_state import IncrementalConditionState
+from .live_condition import LiveCondition
+from .ballast_optimizer import BallastOptimizer, BallastPlan, BallastTarget
+from .livestock_allocation import AllocationLimits, AllocationResult, LivestockAllocator, ShipmentItem
+from .monte_carlo import MonteCarloResult, UncertaintyModel, run_monte_carlo
+from .voyage_timeline import ConsumptionRates, VoyageStep, simulate_voyage
+from .condition_batch import (
+    BatchComputeResult,
+    CancelCallback,
+    ComputeCancelled,
+    ConditionJob,
+    ConditionOutcome,
+    ProgressCallback,
+    compute_conditions,
+    run_condition,
+)
 
 
 @dataclass(slots=True)
@@ -34,8 +55,14 @@ class ConditionService:
     """
 
     def __init__(self, db: Session) -> None:
+        self._database = str(db.get_bind().url)
         self._tank_repo = TankRepository(db)
         self._pen_repo = LivestockPenRepository(db)
+        self._hydro_repo = HydrostaticRepository(db)
+        self._cross_curve_repo = CrossCurveRepository(db)
+        self._sounding_repo = TankSoundingRepository(db)
+        self._voyage_repo = VoyageRepository(db)
+        self._condition_repo = ConditionRepository(db)
 
     def get_tanks_for_ship(self, ship_id: int) -> List[Tank]:
         return self._tank_repo.list_for_ship(ship_id)
@@ -43,6 +70,197 @@ class ConditionService:
     def get_pens_for_ship(self, ship_id: int):
         return self._pen_repo.list_for_ship(ship_id)
 
+    def get_ship_model(self, ship: Ship) -> ShipModel:
+        """Compiled tank/pen arrays for ship, rebuilt only after its data changes."""
+        return ship_model_cache.get_or_build(ship, self._load_ship_data, database=self._database)
+
+    def _load_ship_data(self, ship_id: int) -> ShipData:
+        return ShipData(
+            tanks=self._tank_repo.list_for_ship(ship_id),
+            pens=self._pen_repo.list_for_ship(ship_id),
+            hydrostatics=self._hydro_repo.get_for_ship(ship_id),
+            cross_curves=self._cross_curve_repo.get_for_ship(ship_id),
+            soundings=self._sounding_repo.get_for_ship(ship_id),
+        )
+
+    @staticmethod
+    def _pen_load_parameters(cargo_type: Optional[CargoType]) -> Tuple[float, float]:
+        """(mass per head t, VCG above deck m) for pen calculations."""
+        if cargo_type:
+            mass_per_head_t = (getattr(cargo_type, "avg_weight_per_head_kg", 520.0) or 520.0) / 1000.0
+            vcg_from_deck_m = getattr(cargo_type, "vcg_from_deck_m", 0.0) or 0.0
+            return mass_per_head_t, vcg_from_deck_m
+        return MASS_PER_HEAD_T, 0.0
+
+    def incremental_state(
+        self,
+        ship: Ship,
+        tank_fill_volumes: Dict[int, float],
+        pen_loadings: Optional[Dict[int, int]] = None,
+        cargo_density_t_per_m3: float = 1.0,
+        cargo_type: Optional[CargoType] = None,
+    ) -> IncrementalConditionState:
+        """
+        Running-sum state for live edits of one condition.
+
+        Use set_tank_volume / set_pen_heads for single-cell changes and
+        compute() for the full validation and criteria pass.
+        """
+        if not ship.id:
+            raise ConditionValidationError("Ship must have an ID.")
+        mass_per_head_t, vcg_from_deck_m = self._pen_load_parameters(cargo_type)
+        return IncrementalConditionState(
+            self.get_ship_model(ship),
+            tank_fill_volumes,
+            pen_loadings,
+            cargo_density_t_per_m3=cargo_density_t_per_m3,
+            mass_per_head_t=mass_per_head_t,
+            vcg_from_deck_m=vcg_from_deck_m,
+        )
+
+    def live_condition(
+        self,
+        ship: Ship,
+        tank_fill_volumes: Dict[int, float],
+        pen_loadings: Optional[Dict[int, int]] = None,
+        cargo_density_t_per_m3: float = 1.0,
+        cargo_type: Optional[CargoType] = None,
+        free_trim: bool = False,
+    ) -> LiveCondition:
+        """
+        Live results (position, validation, criteria) for a condition being
+        edited; ids the compiled model does not know are ignored. free_trim
+        solves each update for equilibrium, as compute() does.
+        """
+        if not ship.id:
+            raise ConditionValidationError("Ship must have an ID.")
+        mass_per_head_t, vcg_from_deck_m = self._pen_load_parameters(cargo_type)
+        return LiveCondition(
+            self.get_ship_model(ship),
+            tank_fill_volumes,
+            pen_loadings,
+            cargo_density_t_per_m3=cargo_density_t_per_m3,
+            mass_per_head_t=mass_per_head_t,
+            vcg_from_deck_m=vcg_from_deck_m,
+            free_trim=free_trim,
+        )
+
+    def optimize_ballast(
+        self,
+        ship: Ship,
+        tank_fill_volumes: Dict[int, float],
+        target: Optional[BallastTarget] = None,
+        pen_loadings: Optional[Dict[int, int]] = None,
+        cargo_density_t_per_m3: float = 1.0,
+        cargo_type: Optional[CargoType] = None,
+        max_tanks: int = 3,
+        n_plans: int = 5,
+    ) -> List[BallastPlan]:
+        """
+        Ballast fill plans that bring the condition to target (even keel,
+        upright and minimum GM by default), fewest tanks touched first.
+        """
+        if not ship.id:
+            raise ConditionValidationError("Ship must have an ID.")
+        model = self.get_ship_model(ship)
+        self._validate_tank_limits(model, tank_fill_volumes)
+        mass_per_head_t, vcg_from_deck_m = self._pen_load_parameters(cargo_type)
+        optimizer = BallastOptimizer(
+            model,
+            tank_fill_volumes,
+            pen_loadings,
+            cargo_density_t_per_m3=cargo_density_t_per_m3,
+            mass_per_head_t=mass_per_head_t,
+            vcg_from_deck_m=vcg_from_deck_m,
+        )
+        return optimizer.optimize(target, max_tanks=max_tanks, n_plans=n_plans)
+
+    def allocate_livestock(
+        self,
+        ship: Ship,
+        tank_fill_volumes: Dict[int, float],
+        shipment: List[ShipmentItem],
+        cargo_density_t_per_m3: float = 1.0,
+        limits: Optional[AllocationLimits] = None,
+    ) -> AllocationResult:
+        """
+        Distribute shipment over the ship's pens, loading as many heads as
+        GM, heel, trim, draft and strength limits allow.
+        """
+        if not ship.id:
+            raise ConditionValidationError("Ship must have an ID.")
+        model = self.get_ship_model(ship)
+        self._validate_tank_limits(model, tank_fill_volumes)
+        allocator = LivestockAllocator(model, tank_fill_volumes, cargo_density_t_per_m3, limits)
+        return allocator.allocate(shipment)
+
+    def monte_carlo(
+        self,
+        ship: Ship,
+        tank_fill_volumes: Dict[int, float],
+        uncertainty: UncertaintyModel,
+        pen_loadings: Optional[Dict[int, int]] = None,
+        cargo_density_t_per_m3: float = 1.0,
+        cargo_type: Optional[CargoType] = None,
+        n_samples: int = 100_000,
+        seed: int = 0,
+        max_workers: Optional[int] = 1,
+    ) -> MonteCarloResult:
+        """Percentiles and criterion failure probabilities under uncertain inputs."""
+        if not ship.id:
+            raise ConditionValidationError("Ship must have an ID.")
+        model = self.get_ship_model(ship)
+        self._validate_tank_limits(model, tank_fill_volumes)
+        mass_per_head_t, vcg_from_deck_m = self._pen_load_parameters(cargo_type)
+        return run_monte_carlo(
+            model,
+            tank_fill_volumes,
+            pen_loadings,
+            uncertainty,
+            n_samples=n_samples,
+            seed=seed,
+            max_workers=max_workers,
+            cargo_density_t_per_m3=cargo_density_t_per_m3,
+            mass_per_head_t=mass_per_head_t,
+            vcg_from_deck_m=vcg_from_deck_m,
+        )
+
+    def voyage_timeline(
+        self,
+        ship: Ship,
+        voyage: Voyage,
+        days: float,
+        rates: Optional[ConsumptionRates] = None,
+        step_hours: float = 1.0,
+        cargo_density_t_per_m3: float = 1.0,
+        cargo_type: Optional[CargoType] = None,
+    ) -> Iterator[VoyageStep]:
+        """
+        Stream the condition at each step of the voyage, starting from its
+        first (departure) condition. Dung build-up uses the cargo type's
+        dung_weight_pct_per_day.
+        """
+        if not ship.id:
+            raise ConditionValidationError("Ship must have an ID.")
+        if not voyage.conditions:
+            raise ConditionValidationError("Voyage has no departure condition.")
+        departure = voyage.conditions[0]
+        model = self.get_ship_model(ship)
+        self._validate_tank_limits(model, departure.tank_volumes_m3)
+        mass_per_head_t, vcg_from_deck_m = self._pen_load_parameters(cargo_type)
+        return simulate_voyage(
+            model,
+            departure.tank_volumes_m3,
+            departure.pen_loadings,
+            days=days,
+            step_hours=step_hours,
+            rates=rates,
+            dung_weight_pct_per_day=cargo_type.dung_weight_pct_per_day if cargo_type else 0.0,
+            cargo_density_t_per_m3=cargo_density_t_per_m3,
+            mass_per_head_t=mass_per_head_t,
+            vcg_from_deck_m=vcg_from_deck_m,
+        )
+
     def compute(
         self,
         ship: Ship,
@@ -50,10 +268,16 @@ class ConditionService:
         tank_fill_volumes: Dict[int, float],
         cargo_density_t_per_m3: float = 1.0,
         cargo_type: Optional[CargoType] = None,
+        free_trim: bool = False,
+        cancelled: Optional[CancelCallback] = None,
+        warm_start: Optional[EquilibriumResult] = None,
     ) -> ConditionResults:
         """
         Validate the condition and run the stability calculation.
         If cargo_type is set, uses its avg_weight_per_head_kg and vcg_from_deck_m for pen calculations.
+        With free_trim, draft, trim and heel are solved for equilibrium, warm-started
+        from warm_start (the equilibrium of the caller's previous compute, if any).
+        cancelled is polled between stages; ComputeCancelled is raised if it returns True.
         """
         pen_loadings = getattr(condition, "pen_loadings", None) or {}
         if not tank_fill_volumes and not pen_loadings:
@@ -61,68 +285,132 @@ class ConditionService:
 
         if not ship.id:
             raise ConditionValidationError("Ship must have an ID.")
-        tanks = self._tank_repo.list_for_ship(ship.id)
-        pens = self._pen_repo.list_for_ship(ship.id)
-        self._validate_tank_limits(tanks, tank_fill_volumes)
+        model = self.get_ship_model(ship)
+        self._validate_tank_limits(model, tank_fill_volumes)
 
-        if cargo_type:
-            mass_per_head_t = (getattr(cargo_type, "avg_weight_per_head_kg", 520.0) or 520.0) / 1000.0
-            vcg_from_deck_m = getattr(cargo_type, "vcg_from_deck_m", 0.0) or 0.0
-        else:
-            mass_per_head_t = MASS_PER_HEAD_T
-            vcg_from_deck_m = 0.0
+        mass_per_head_t, vcg_from_deck_m = self._pen_load_parameters(cargo_type)
 
         condition.tank_volumes_m3 = tank_fill_volumes
-        results = compute_condition(
-            ship, tanks, condition, cargo_density_t_per_m3,
-            pens=pens,
-            pen_loadings=pen_loadings,
+        results = run_condition(
+            model, condition.name, tank_fill_volumes, pen_loadings,
+            cargo_density_t_per_m3,
             mass_per_head_t=mass_per_head_t,
             vcg_from_deck_m=vcg_from_deck_m,
-        )
-
-        # Run validation (negative GM, extreme trim, over-limit BM, etc.)
-        validation = validate_condition(
-            ship, results, tanks, tank_fill_volumes, cargo_density_t_per_m3
-        )
-        results.validation = validation
-
-        # Run IMO + livestock criteria
-        criteria = evaluate_all_criteria(
-            ship, results, tanks, tank_fill_volumes, cargo_density_t_per_m3
-        )
-        results.criteria = criteria
-
-        # Traceability snapshot
-        results.snapshot = create_snapshot(
-            condition.name,
-            ship.name,
-            tank_fill_volumes,
-            cargo_density_t_per_m3,
-            results,
-            criteria,
+            free_trim=free_trim,
+            cancelled=cancelled,
+            warm_start=warm_start,
         )
 
         # Fill condition with the results so it can be displayed / persisted.
+        self._fill_condition(condition, results)
+        return results
+
+    @staticmethod
+    def _fill_condition(condition: LoadingCondition, results: ConditionResults) -> None:
+        """Copy the results onto condition so it can be displayed / persisted."""
         condition.displacement_t = results.displacement_t
         condition.draft_m = results.draft_m
         condition.trim_m = results.trim_m
-        condition.gm_m = validation.gm_effective  # Use effective GM (after free surface)
+        condition.gm_m = results.validation.gm_effective  # Use effective GM (after free surface)
 
-        return results
+    def compute_many(
+        self,
+        ship: Ship,
+        voyage_id: Optional[int] = None,
+        cargo_density_t_per_m3: float = 1.0,
+        cargo_type: Optional[CargoType] = None,
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancelled: Optional[CancelCallback] = None,
+        persist: bool = True,
+        voyage_ids: Optional[Sequence[int]] = None,
+        free_trim: bool = False,
+    ) -> BatchComputeResult:
+        """
+        Recompute every condition of one voyage, of the voyages in
+        voyage_ids, or (without either) of every voyage of ship, as one
+        batch on a process pool. Conditions compute() would
+        reject are reported as outcomes with an error and not computed.
+        With persist, the computed conditions are written back in one
+        transaction (also after a cancellation, for those that finished).
+        free_trim solves each condition for equilibrium as compute() does.
+        """
+        if not ship.id:
+            raise ConditionValidationError("Ship must have an ID.")
+        started = time.perf_counter()
+        if voyage_id is not None:
+            voyage_ids = [voyage_id]
+        elif voyage_ids is None:
+            voyage_ids = [v.id for v in self._voyage_repo.list_for_ship(ship.id) if v.id is not None]
+        conditions = [c for vid in voyage_ids for c in self._condition_repo.list_for_voyage(vid)]
+        model = self.get_ship_model(ship)
+        mass_per_head_t, vcg_from_deck_m = self._pen_load_parameters(cargo_type)
+
+        jobs: List[ConditionJob] = []
+        rejected: Dict[int, ConditionOutcome] = {}
+        for i, condition in enumerate(conditions):
+            try:
+                if not condition.tank_volumes_m3 and not condition.pen_loadings:
+                    raise ConditionValidationError("No tank volumes or pen loadings provided.")
+                self._validate_tank_limits(model, condition.tank_volumes_m3)
+            except ConditionValidationError as exc:
+                rejected[i] = ConditionOutcome(
+                    condition.id, condition.name, error=str(exc), voyage_id=condition.voyage_id,
+                )
+                continue
+            jobs.append(ConditionJob(
+                condition.id, condition.name, condition.tank_volumes_m3, condition.pen_loadings,
+                voyage_id=condition.voyage_id,
+            ))
+        loaded = time.perf_counter()
+        batch = compute_conditions(
+            model, jobs, cargo_density_t_per_m3,
+            mass_per_head_t=mass_per_head_t,
+            vcg_from_deck_m=vcg_from_deck_m,
+            free_trim=free_trim,
+            max_workers=max_workers,
+            progress=progress,
+            cancelled=cancelled,
+        )
+
+        persist_start = time.perf_counter()
+        by_id = {c.id: c for c in conditions}
+        computed = []
+        for outcome in batch.outcomes:
+            condition = by_id.get(outcome.condition_id)
+            if outcome.ok and condition is not None:
+                self._fill_condition(condition, outcome.results)
+                computed.append(condition)
+        if persist and computed:
+            self._condition_repo.update_results(computed)
+
+        # Back in condition order, with the rejected ones in place
+        order = {c.id: i for i, c in enumerate(conditions)}
+        outcomes = sorted(
+            batch.outcomes + list(rejected.values()),
+            key=lambda o: order.get(o.condition_id, len(order)),
+        )
+        stage_s = {
+            "load": loaded - started,
+            "compute": batch.stage_s["compute"],
+            "persist": time.perf_counter() - persist_start,
+        }
+        return BatchComputeResult(outcomes, total=len(conditions), cancelled=batch.cancelled, stage_s=stage_s)
 
     def _validate_tank_limits(
-        self, tanks: List[Tank], tank_fill_volumes: Dict[int, float]
+        self, model: ShipModel, tank_fill_volumes: Dict[int, float]
     ) -> None:
-        for tank in tanks:
-            vol = tank_fill_volumes.get(tank.id or -1, 0.0)
-            if vol < 0:
-                raise ConditionValidationError(
-                    f"Negative volume in tank {tank.name} is not allowed."
-                )
-            if vol > tank.capacity_m3 * 1.05:
-                # Allow a small numerical tolerance
-                raise ConditionValidationError(
-                    f"Volume in tank {tank.name} exceeds capacity."
-                )
+        volumes = model.volumes_vector(tank_fill_volumes)
+        # Allow a small numerical tolerance over capacity
+        bad = np.flatnonzero((volumes < 0) | (volumes > model.tank_capacity_m3 * 1.05))
+        if bad.size == 0:
+            return
+        tank = model.tanks[int(bad[0])]
+        if volumes[bad[0]] < 0:
+            raise ConditionValidationError(
+                f"Negative volume in tank {tank.name} is not allowed."
+            )
+        raise ConditionValidationError(
+            f"Volume in tank {tank.name} exceeds capacity."
+        )
 
@@ -0,0 +1,43 @@
+"""
+Criteria result types shared by the rule engine, the criteria rule sets
+and validation.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List
+
+
+class CriterionResult(Enum):
+    PASS = "PASS"
+    FAIL = "FAIL"
+    N_A = "N/A"
+
+
+@dataclass(slots=True)
+class CriterionLine:
+    """Single criterion line with pass/fail and margin."""
+    code: str
+    name: str
+    reference: str  # e.g. "IS Code", "AMSA MO43"
+    result: CriterionResult
+    value: float | None
+    limit: float | None
+    margin: float | None  # value - limit (positive = pass margin)
+    message: str
+    parent_code: str | None = None  # for hierarchy
+
+
+@dataclass(slots=True)
+class CriteriaEvaluation:
+    """Full evaluation of IMO + livestock criteria."""
+    lines: List[CriterionLine] = field(default_factory=list)
+    passed: int = 0
+    failed: int = 0
+    n_a: int = 0
+
+    @property
+    def all_passed(self) -> bool:
+        return self.failed == 0
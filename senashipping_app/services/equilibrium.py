@@ -0,0 +1,265 @@
+"""
+Free-trim equilibrium solver.
+
+Finds the mean draft, trim and heel at which buoyancy balances a given
+weight and centre of gravity, instead of taking draft from displacement
+and trim from a linear LCB = L/2 estimate. Buoyancy comes from a source:
+the ship's hydrostatic table (with KN cross curves for heel when present)
+or the hull mesh itself. Iterations are Newton steps with a
+finite-difference Jacobian on a cold start and Broyden (secant) updates
+after that; a warm start reuses the previous solution and Jacobian, so
+small edits converge in one to three iterations.
+
+Draft is the mean draft amidships (x = L/2), trim is positive stern down
+and heel is positive towards +y (positive TCG), as in compute_condition.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Protocol, Tuple
+
+import numpy as np
+
+from ..models.cross_curves import CrossCurves
+from ..models.hydrostatic_table import HydrostaticTable
+from .hydrostatic_generator import clip_below, mesh_arrays, volume_centroid
+from .hydrostatics import RHO_SEA
+
+
+class BuoyancySource(Protocol):
+    """Displacement, LCB and heeling lever of the hull at a given attitude."""
+
+    def state(self, draft_m: float, trim_m: float, heel_rad: float) -> Tuple[float, float, float]:
+        """(displacement t, LCB m from AP, KN m) at mean draft, trim and heel."""
+        ...
+
+    def even_keel_draft(self, displacement_t: float) -> float:
+        """Upright even-keel draft for a displacement (starting guess)."""
+        ...
+
+
+class TableBuoyancy:
+    """
+    Buoyancy from an even-keel HydrostaticTable.
+
+    Trim rotates the waterplane about LCF (so displacement follows the
+    draft at LCF) and moves LCB by trim * MTC / disp. The heeling lever is
+    interpolated from KN cross curves when given, else the wall-sided
+    formula KN = sin(phi) (KM + BM tan^2(phi) / 2).
+    """
+
+    def __init__(
+        self,
+        table: HydrostaticTable,
+        length_m: float,
+        cross_curves: CrossCurves | None = None,
+    ) -> None:
+        self.table = table
+        self.length_m = max(1e-6, length_m)
+        self.cross_curves = cross_curves
+
+    def state(self, draft_m: float, trim_m: float, heel_rad: float) -> Tuple[float, float, float]:
+        L = self.length_m
+        lcf = self.table.at_draft(draft_m).lcf_m
+        s = self.table.at_draft(draft_m + trim_m * (0.5 * L - lcf) / L)
+        disp = s.displacement_t
+        lcb = s.lcb_m - (trim_m * s.mtc_tm_per_m / disp if disp > 0 else 0.0)
+        phi = abs(heel_rad)
+        if self.cross_curves is not None:
+            kn = float(np.interp(math.degrees(phi), self.cross_curves.heel_deg,
+                                 self.cross_curves.kn_at(disp)))
+        else:
+            bm = s.km_m - s.kb_m
+            kn = math.sin(phi) * (s.km_m + 0.5 * bm * math.tan(phi) ** 2)
+        return disp, lcb, math.copysign(kn, heel_rad)
+
+    def even_keel_draft(self, displacement_t: float) -> float:
+        return float(self.table.draft_for_displacement(displacement_t))
+
+
+class MeshBuoyancy:
+    """
+    Buoyancy integrated directly from the hull mesh (no table errors).
+
+    Mesh coordinates as in hydrostatic_generator: x forward from AP, y
+    transverse, z up from baseline; L is the mesh length unless given.
+    """
+
+    def __init__(self, mesh: Any, rho_t_per_m3: float = RHO_SEA, length_m: float | None = None) -> None:
+        vertices, faces = mesh_arrays(mesh)
+        self._tri = vertices[faces]
+        x_min, x_max = float(vertices[:, 0].min()), float(vertices[:, 0].max())
+        self.length_m = float(length_m) if length_m else max(1e-6, x_max - x_min)
+        self.x_ref_m = 0.5 * (x_min + x_max)
+        self.z_range = (float(vertices[:, 2].min()), float(vertices[:, 2].max()))
+        self.rho = rho_t_per_m3
+
+    def state(self, draft_m: float, trim_m: float, heel_rad: float) -> Tuple[float, float, float]:
+        tri = self._tri
+        slope = trim_m / self.length_m
+        cos_h, sin_h = math.cos(heel_rad), math.sin(heel_rad)
+        # Waterplane through (x_ref, 0, draft), tilted by trim and heel
+        d = (
+            tri[..., 2] * cos_h - tri[..., 1] * sin_h
+            + slope * (tri[..., 0] - self.x_ref_m) - draft_m * cos_h
+        )
+        sub, _p, _q = clip_below(tri, d)
+        volume, b = volume_centroid(sub, np.array([self.x_ref_m, 0.0, draft_m]))
+        return volume * self.rho, float(b[0]), float(b[1] * cos_h + b[2] * sin_h)
+
+    def even_keel_draft(self, displacement_t: float) -> float:
+        lo, hi = self.z_range
+        for _ in range(60):
+            mid = 0.5 * (lo + hi)
+            if self.state(mid, 0.0, 0.0)[0] < displacement_t:
+                lo = mid
+            else:
+                hi = mid
+        return 0.5 * (lo + hi)
+
+
+@dataclass(slots=True)
+class EquilibriumStats:
+    """What one solve cost; passed to the solver's hook."""
+    iterations: int
+    evaluations: int
+    elapsed_s: float
+    converged: bool
+    warm_start: bool
+
+
+@dataclass(slots=True)
+class EquilibriumResult:
+    """Floating position in equilibrium; pass back as warm_start for the next solve."""
+    draft_m: float
+    trim_m: float
+    heel_deg: float
+    draft_aft_m: float
+    draft_fwd_m: float
+    residual: np.ndarray
+    jacobian: np.ndarray
+    stats: EquilibriumStats
+
+    @property
+    def converged(self) -> bool:
+        return self.stats.converged
+
+
+class EquilibriumSolver:
+    """
+    Newton/Broyden solver for draft, trim and heel.
+
+    Residuals are displacement (fraction of weight), LCB - LCG (m) and the
+    righting lever KN - KG sin(phi) - TCG cos(phi) (m). hook, if set, gets
+    an EquilibriumStats after every solve.
+    """
+
+    def __init__(
+        self,
+        source: BuoyancySource,
+        hook: Callable[[EquilibriumStats], None] | None = None,
+        tol: Tuple[float, float, float] = (1e-7, 1e-5, 1e-6),
+        max_iter: int = 50,
+    ) -> None:
+        self.source = source
+        self.hook = hook
+        self.tol = np.asarray(tol, dtype=float)
+        self.max_iter = max_iter
+        self.last: EquilibriumResult | None = None
+
+    def _jacobian(self, f: Callable[[np.ndarray], np.ndarray], x: np.ndarray, r: np.ndarray) -> np.ndarray:
+        steps = np.array([1e-3 * max(1.0, abs(x[0])), 1e-3 * max(1.0, abs(x[1])), 1e-4])
+        jac = np.empty((3, 3))
+        for j in range(3):
+            xj = x.copy()
+            xj[j] += steps[j]
+            jac[:, j] = (f(xj) - r) / steps[j]
+        return jac
+
+    def solve(
+        self,
+        displacement_t: float,
+        lcg_m: float,
+        tcg_m: float,
+        kg_m: float,
+        warm_start: EquilibriumResult | None = None,
+    ) -> EquilibriumResult:
+        """Equilibrium for the given weight and centre of gravity."""
+        start = time.perf_counter()
+        evaluations = 0
+        if displacement_t <= 0:
+            stats = EquilibriumStats(0, 0, time.perf_counter() - start, True, False)
+            return EquilibriumResult(0.0, 0.0, 0.0, 0.0, 0.0, np.zeros(3), np.eye(3), stats)
+
+        def f(x: np.ndarray) -> np.ndarray:
+            nonlocal evaluations
+            evaluations += 1
+            disp, lcb, kn = self.source.state(x[0], x[1], x[2])
+            return np.array([
+                disp / displacement_t - 1.0,
+                lcb - lcg_m,
+                kn - kg_m * math.sin(x[2]) - tcg_m * math.cos(x[2]),
+            ])
+
+        if warm_start is not None and warm_start.converged:
+            x = np.array([warm_start.draft_m, warm_start.trim_m, math.radians(warm_start.heel_deg)])
+            r = f(x)
+            jac = warm_start.jacobian.copy()
+        else:
+            warm_start = None
+            x = np.array([self.source.even_keel_draft(displacement_t), 0.0, 0.0])
+            r = f(x)
+            jac = self._jacobian(f, x, r)
+
+        iterations = 0
+        converged = bool(np.all(np.abs(r) <= self.tol))
+        while not converged and iterations < self.max_iter:
+            iterations += 1
+            try:
+                dx = np.linalg.solve(jac, -r)
+            except np.linalg.LinAlgError:
+                jac = self._jacobian(f, x, r)
+                dx = np.linalg.lstsq(jac, -r, rcond=None)[0]
+            # Backtrack if the full step makes things worse
+            step = 1.0
+            x_new = x + dx
+            r_new = f(x_new)
+            while np.linalg.norm(r_new / self.tol) > np.linalg.norm(r / self.tol) and step > 1.0 / 16:
+                step *= 0.5
+                x_new = x + step * dx
+                r_new = f(x_new)
+            s = x_new - x
+            ss = float(s @ s)
+            if ss > 0.0:
+                jac += np.outer(r_new - r - jac @ s, s) / ss
+            x, r = x_new, r_new
+            converged = bool(np.all(np.abs(r) <= self.tol))
+
+        stats = EquilibriumStats(
+            iterations=iterations,
+            evaluations=evaluations,
+            elapsed_s=time.perf_counter() - start,
+            converged=converged,
+            warm_start=warm_start is not None,
+        )
+        if not converged and warm_start is not None:
+            # The previous solution was too far away; start again from even keel
+            return self.solve(displacement_t, lcg_m, tcg_m, kg_m)
+        draft, trim, heel = float(x[0]), float(x[1]), float(x[2])
+        result = EquilibriumResult(
+            draft_m=draft,
+            trim_m=trim,
+            heel_deg=math.degrees(heel),
+            draft_aft_m=draft + 0.5 * trim,
+            draft_fwd_m=draft - 0.5 * trim,
+            residual=r,
+            jacobian=jac,
+            stats=stats,
+        )
+        self.last = result
+        if self.hook is not None:
+            self.hook(stats)
+        return result
@@ -0,0 +1,91 @@
+"""
+Free surface correction of slack tanks.
+
+The approximate FREE_SURFACE_FACTOR correction per slack tank, and the
+geometric one (density * free-surface inertia) for tanks with sounding
+tables, for one condition or vectorized on a compiled ShipModel.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..config.limits import EPS, FREE_SURFACE_FACTOR
+from ..models import Tank
+from .ship_model import ShipModel
+
+
+def compute_free_surface_correction(
+    tanks: List[Tank],
+    volumes: Dict[int, float],
+    displacement_t: float,
+    cargo_density: float,
+) -> float:
+    """
+    Approximate free surface correction (m) for slack tanks.
+    Reduces effective GM.
+    """
+    if displacement_t < EPS:
+        return 0.0
+    correction = 0.0
+    for tank in tanks:
+        vol = volumes.get(tank.id or -1, 0.0)
+        cap = max(EPS, tank.capacity_m3)
+        fill_ratio = vol / cap
+        # Slack: partially filled (e.g. 5–95%)
+        if 0.05 < fill_ratio < 0.95:
+            # Simplified: i_t for rectangular tank ~ B³*L/12, mass = vol*density
+            # Reduction ≈ (rho * i_t) / disp. Use factor based on tank size.
+            mass = vol * cargo_density
+            correction += (mass / displacement_t) * FREE_SURFACE_FACTOR * (1 - fill_ratio)
+    return min(correction, 2.0)  # Cap total correction
+
+
+def free_surface_terms(
+    model: ShipModel,
+    volumes: np.ndarray,
+    cargo_density: float,
+    cols: np.ndarray | None = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-tank free-surface moments (t·m, before dividing by displacement).
+
+    Returns (approximate, geometric) arrays shaped like volumes, which are
+    (..., tanks) in model column order or the volumes of the tanks in cols.
+    Tanks with a sounding table get density * free-surface inertia; the
+    others the FREE_SURFACE_FACTOR approximation of
+    compute_free_surface_correction.
+    """
+    vols = np.asarray(volumes, dtype=float)
+    index = np.arange(model.n_tanks) if cols is None else np.asarray(cols)
+    fill = vols / np.maximum(EPS, model.tank_capacity_m3[index])
+    slack = (fill > 0.05) & (fill < 0.95)
+    approx = np.where(slack, vols * cargo_density * FREE_SURFACE_FACTOR * (1 - fill), 0.0)
+    if model.soundings is None:
+        return approx, np.zeros_like(approx)
+    has_table = model.soundings.has_table[index]
+    inertia = model.soundings.at_columns(np.broadcast_to(index, vols.shape), vols).fs_inertia_m4
+    return np.where(has_table, 0.0, approx), np.where(has_table, cargo_density * inertia, 0.0)
+
+
+def compute_free_surface_correction_array(
+    model: ShipModel,
+    volumes: np.ndarray,
+    displacement_t: np.ndarray | float,
+    cargo_density: float,
+) -> np.ndarray:
+    """
+    Vectorized compute_free_surface_correction on a ShipModel.
+
+    volumes is (tanks,) or (N x tanks) in model column order; displacement_t
+    is a scalar or (N,). The approximate part is capped as in the scalar
+    function; free surface from sounding tables is not.
+    """
+    approx, geometric = free_surface_terms(model, volumes, cargo_density)
+    disp = np.asarray(displacement_t, dtype=float)
+    loaded = disp >= EPS
+    safe_disp = np.where(loaded, disp, 1.0)
+    correction = np.minimum(approx.sum(axis=-1) / safe_disp, 2.0) + geometric.sum(axis=-1) / safe_disp
+    return np.where(loaded, correction, 0.0)
@@ -0,0 +1,141 @@
+"""
+GZ (righting lever) curves from KN cross curves.
+
+A GZEngine is compiled once per ship from its CrossCurves: KN is resampled
+onto a fixed heel grid (which always contains 30 and 40 deg) and the IS
+Code area integrals become dot products with precomputed trapezoid
+weights. Per condition this leaves one displacement interpolation and the
+KG * sin(phi) correction, so summaries are cheap enough for batch and
+optimizer loops.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..config.limits import (
+    MIN_ANGLE_MAX_GZ_DEG,
+    MIN_GZ_AREA_0_30_MRAD,
+    MIN_GZ_AREA_0_40_MRAD,
+    MIN_GZ_AREA_30_40_MRAD,
+    MIN_GZ_AT_30_M,
+)
+from ..models.cross_curves import CrossCurves
+
+
+@dataclass(slots=True)
+class GZSummary:
+    """IS Code GZ curve particulars for one condition."""
+    area_0_30_mrad: float
+    area_0_40_mrad: float
+    area_30_40_mrad: float
+    gz_30_m: float  # largest GZ at heel >= 30 deg
+    max_gz_m: float
+    angle_max_gz_deg: float
+
+    @property
+    def criteria_ok(self) -> bool:
+        """True if all IS Code 2.2 GZ curve criteria are met."""
+        return (
+            self.area_0_30_mrad >= MIN_GZ_AREA_0_30_MRAD
+            and self.area_0_40_mrad >= MIN_GZ_AREA_0_40_MRAD
+            and self.area_30_40_mrad >= MIN_GZ_AREA_30_40_MRAD
+            and self.gz_30_m >= MIN_GZ_AT_30_M
+            and self.angle_max_gz_deg >= MIN_ANGLE_MAX_GZ_DEG
+        )
+
+
+@dataclass(slots=True)
+class BatchGZSummary:
+    """GZSummary fields as arrays, one entry per condition."""
+    area_0_30_mrad: np.ndarray
+    area_0_40_mrad: np.ndarray
+    area_30_40_mrad: np.ndarray
+    gz_30_m: np.ndarray
+    max_gz_m: np.ndarray
+    angle_max_gz_deg: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.max_gz_m.shape[0])
+
+    @property
+    def criteria_ok(self) -> np.ndarray:
+        return (
+            (self.area_0_30_mrad >= MIN_GZ_AREA_0_30_MRAD)
+            & (self.area_0_40_mrad >= MIN_GZ_AREA_0_40_MRAD)
+            & (self.area_30_40_mrad >= MIN_GZ_AREA_30_40_MRAD)
+            & (self.gz_30_m >= MIN_GZ_AT_30_M)
+            & (self.angle_max_gz_deg >= MIN_ANGLE_MAX_GZ_DEG)
+        )
+
+    def row(self, i: int) -> GZSummary:
+        return GZSummary(
+            area_0_30_mrad=float(self.area_0_30_mrad[i]),
+            area_0_40_mrad=float(self.area_0_40_mrad[i]),
+            area_30_40_mrad=float(self.area_30_40_mrad[i]),
+            gz_30_m=float(self.gz_30_m[i]),
+            max_gz_m=float(self.max_gz_m[i]),
+            angle_max_gz_deg=float(self.angle_max_gz_deg[i]),
+        )
+
+
+def _trapezoid_weights(x_rad: np.ndarray, lo: int, hi: int) -> np.ndarray:
+    """Weights w with y @ w = trapezoid integral of y over x[lo..hi]."""
+    w = np.zeros_like(x_rad)
+    dx = np.diff(x_rad[lo:hi + 1])
+    w[lo:hi] += 0.5 * dx
+    w[lo + 1:hi + 1] += 0.5 * dx
+    return w
+
+
+class GZEngine:
+    """Vectorized GZ curves and IS Code summaries for one ship."""
+
+    def __init__(self, curves: CrossCurves, step_deg: float = 1.0) -> None:
+        max_heel = float(curves.heel_deg[-1])
+        if max_heel < 40.0:
+            raise ValueError("Cross curves must extend to at least 40 deg heel")
+        heel = np.union1d(np.arange(0.0, max_heel + 0.5 * step_deg, step_deg), [30.0, 40.0])
+        heel = heel[heel <= max_heel]
+        src_heel = curves.heel_deg
+        src_kn = curves.kn_m
+        if src_heel[0] > 0.0:
+            # Upright KN is zero for a symmetric hull
+            src_heel = np.concatenate(([0.0], src_heel))
+            src_kn = np.hstack([np.zeros((src_kn.shape[0], 1)), src_kn])
+        kn = np.vstack([np.interp(heel, src_heel, row) for row in src_kn])
+
+        self.curves = CrossCurves(displacement_t=curves.displacement_t, heel_deg=heel, kn_m=kn)
+        self.heel_deg = self.curves.heel_deg
+        self._sin_heel = np.sin(np.radians(self.heel_deg))
+        heel_rad = np.radians(self.heel_deg)
+        i30 = int(np.searchsorted(self.heel_deg, 30.0))
+        i40 = int(np.searchsorted(self.heel_deg, 40.0))
+        self._w_0_30 = _trapezoid_weights(heel_rad, 0, i30)
+        self._w_0_40 = _trapezoid_weights(heel_rad, 0, i40)
+        self._i30 = i30
+
+    def gz_curve(self, displacement_t: np.ndarray | float, kg_m: np.ndarray | float) -> np.ndarray:
+        """GZ over heel_deg: (H,) for one condition, (N, H) for N conditions."""
+        kg = np.asarray(kg_m, dtype=float)
+        return self.curves.kn_at(displacement_t) - kg[..., None] * self._sin_heel
+
+    def summary_batch(self, displacement_t: np.ndarray, kg_m: np.ndarray) -> BatchGZSummary:
+        gz = np.atleast_2d(self.gz_curve(np.atleast_1d(displacement_t), np.atleast_1d(kg_m)))
+        area_30 = gz @ self._w_0_30
+        area_40 = gz @ self._w_0_40
+        i_max = np.argmax(gz, axis=1)
+        rows = np.arange(gz.shape[0])
+        return BatchGZSummary(
+            area_0_30_mrad=area_30,
+            area_0_40_mrad=area_40,
+            area_30_40_mrad=area_40 - area_30,
+            gz_30_m=gz[:, self._i30:].max(axis=1),
+            max_gz_m=gz[rows, i_max],
+            angle_max_gz_deg=self.heel_deg[i_max],
+        )
+
+    def summary(self, displacement_t: float, kg_m: float) -> GZSummary:
+        return self.summary_batch(np.array([displacement_t]), np.array([kg_m])).row(0)
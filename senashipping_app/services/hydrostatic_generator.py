@@ -0,0 +1,591 @@
+"""
+Hydrostatic table generation from the hull STL.
+
+Slices the hull mesh with waterplanes on a grid of drafts and trims and
+integrates submerged volume, centre of buoyancy and waterplane properties
+directly from the clipped triangles (NumPy, no cap triangulation needed).
+Results are cached on disk as <sha256>-<grid>.npz files, named by the
+STL's SHA-256 and a digest of the grid, so each hull revision and grid
+is sliced once; slices run in a process pool.
+
+KN cross curves are generated the same way from heeled waterplanes
+(cached as <sha256>-<grid>.kn.npz).
+
+Mesh coordinates follow tanks_from_stl: x forward from AP, y transverse,
+z up from baseline. Drafts are waterline heights above z = 0 at the
+reference section (amidships of the mesh); trim is positive stern down.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from ..models.cross_curves import CrossCurves
+from ..models.hydrostatic_table import HydrostaticTable
+from .hydrostatics import RHO_SEA
+from .stl_mesh_service import load_stl
+
+# Per-slice results, in column order of the (trims x drafts x N) raw array
+_SLICE_FIELDS = (
+    "volume_m3",
+    "lcb_m",
+    "tcb_m",
+    "kb_m",
+    "waterplane_area_m2",
+    "lcf_m",
+    "i_t_m4",
+    "i_l_m4",
+)
+
+CACHE_FORMAT_VERSION = 1
+
+
+def stl_content_hash(path: str | Path) -> str:
+    """SHA-256 of the STL file contents (hex)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def grid_digest(*grid: Any) -> str:
+    """Short digest of a generation grid (arrays, scalars or None) for cache file names."""
+    digest = hashlib.sha256()
+    for part in grid:
+        if part is None:
+            digest.update(b"none;")
+            continue
+        values = np.ascontiguousarray(part, dtype=float)
+        digest.update(f"{values.shape};".encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def mesh_arrays(mesh: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Vertices and faces of a Trimesh, or of all geometry in a Scene."""
+    geometry = getattr(mesh, "geometry", None)
+    if geometry is not None:
+        import trimesh
+
+        mesh = trimesh.util.concatenate(list(geometry.values()))
+    vertices = np.asarray(mesh.vertices, dtype=float)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    if faces.size == 0:
+        raise ValueError("Hull mesh has no faces")
+    return vertices, faces
+
+
+def _rotate(tri: np.ndarray, d: np.ndarray, first: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cyclically rotate each triangle so vertex `first` comes first (keeps orientation)."""
+    idx = (first[:, None] + np.arange(3)) % 3
+    return np.take_along_axis(tri, idx[:, :, None], axis=1), np.take_along_axis(d, idx, axis=1)
+
+
+def _edge_point(a: np.ndarray, b: np.ndarray, da: np.ndarray, db: np.ndarray) -> np.ndarray:
+    t = da / (da - db)
+    return a + t[:, None] * (b - a)
+
+
+def clip_below(tri: np.ndarray, d: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Clip triangles to the side of a plane where the signed distance d < 0.
+
+    Returns the clipped triangles (orientation kept) and the cut segments
+    (p, q), oriented as the boundary of the waterplane cap that closes the
+    clipped solid (counter-clockwise seen from above).
+    """
+    below = d < 0.0
+    n_below = below.sum(axis=1)
+
+    pieces = [tri[n_below == 3]]
+    seg_p = [np.empty((0, 3))]
+    seg_q = [np.empty((0, 3))]
+
+    m1 = n_below == 1
+    if np.any(m1):
+        t, dd = _rotate(tri[m1], d[m1], np.argmax(below[m1], axis=1))
+        p01 = _edge_point(t[:, 0], t[:, 1], dd[:, 0], dd[:, 1])
+        p02 = _edge_point(t[:, 0], t[:, 2], dd[:, 0], dd[:, 2])
+        pieces.append(np.stack([t[:, 0], p01, p02], axis=1))
+        seg_p.append(p02)
+        seg_q.append(p01)
+
+    m2 = n_below == 2
+    if np.any(m2):
+        t, dd = _rotate(tri[m2], d[m2], np.argmin(below[m2], axis=1))
+        p01 = _edge_point(t[:, 0], t[:, 1], dd[:, 0], dd[:, 1])
+        p02 = _edge_point(t[:, 0], t[:, 2], dd[:, 0], dd[:, 2])
+        pieces.append(np.stack([p01, t[:, 1], t[:, 2]], axis=1))
+        pieces.append(np.stack([p01, t[:, 2], p02], axis=1))
+        seg_p.append(p01)
+        seg_q.append(p02)
+
+    return (
+        np.concatenate(pieces, axis=0),
+        np.concatenate(seg_p, axis=0),
+        np.concatenate(seg_q, axis=0),
+    )
+
+
+def volume_centroid(sub: np.ndarray, apex: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Volume and centroid of the solid bounded by sub and a planar cap.
+
+    sub is split into tetrahedra with an apex on the cap plane, so the
+    (unbuilt) cap adds no volume.
+    """
+    if sub.shape[0] == 0:
+        return 0.0, apex
+    a = sub[:, 0] - apex
+    b = sub[:, 1] - apex
+    c = sub[:, 2] - apex
+    vol = np.einsum("ij,ij->i", a, np.cross(b, c)) / 6.0
+    volume = float(vol.sum())
+    if volume <= 0.0:
+        return 0.0, apex
+    return volume, apex + (vol @ (a + b + c)) / (4.0 * volume)
+
+
+def submerged_properties(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    draft_m: float,
+    trim_m: float,
+    x_ref_m: float,
+    length_m: float,
+) -> np.ndarray:
+    """
+    Submerged volume, centre of buoyancy and waterplane properties for one
+    waterplane, as a vector in _SLICE_FIELDS order.
+
+    The waterplane is integrated with Green's theorem over the cut
+    segments; its moments use the x-y projection (exact for even keel).
+    """
+    tri = vertices[faces]
+    z_w = draft_m + trim_m * (x_ref_m - tri[..., 0]) / length_m
+    sub, p, q = clip_below(tri, tri[..., 2] - z_w)
+    out = np.zeros(len(_SLICE_FIELDS))
+    volume, centroid = volume_centroid(sub, np.array([x_ref_m, 0.0, draft_m]))
+    if volume <= 0.0:
+        return out
+
+    area = lcf = i_t = i_l = 0.0
+    if p.shape[0]:
+        xp, yp, xq, yq = p[:, 0], p[:, 1], q[:, 0], q[:, 1]
+        cross = xp * yq - xq * yp
+        area = cross.sum() / 2.0
+        if area > 0.0:
+            lcf = ((xp + xq) * cross).sum() / (6.0 * area)
+            ycf = ((yp + yq) * cross).sum() / (6.0 * area)
+            ixx = ((xp * xp + xp * xq + xq * xq) * cross).sum() / 12.0
+            iyy = ((yp * yp + yp * yq + yq * yq) * cross).sum() / 12.0
+            i_l = ixx - area * lcf ** 2
+            i_t = iyy - area * ycf ** 2
+
+    out[:] = (volume, centroid[0], centroid[1], centroid[2], area, lcf, i_t, i_l)
+    return out
+
+
+def heeled_kn(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    heel_deg: float,
+    volumes_m3: np.ndarray,
+    tol: float = 1e-9,
+    max_iter: int = 60,
+) -> np.ndarray:
+    """
+    KN (m) at one heel angle for each target displacement volume.
+
+    The ship is heeled towards +y; for each volume the waterplane height is
+    found by Illinois regula falsi on V(h), bracketed from a coarse scan.
+    KN is the lever of the centre of buoyancy about the keel point K at the
+    origin: KN = y_B cos(phi) + z_B sin(phi), so GZ = KN - KG sin(phi).
+    """
+    phi = np.radians(heel_deg)
+    up = np.array([0.0, -np.sin(phi), np.cos(phi)])
+    lever = np.array([0.0, np.cos(phi), np.sin(phi)])
+    tri = vertices[faces]
+    heights = tri @ up
+
+    def solve(h: float) -> Tuple[float, np.ndarray]:
+        sub, _p, _q = clip_below(tri, heights - h)
+        return volume_centroid(sub, h * up)
+
+    h_grid = np.linspace(heights.min(), heights.max(), 25)
+    v_grid = np.array([solve(h)[0] for h in h_grid])
+    kn = np.zeros(len(volumes_m3))
+    for i, target in enumerate(np.asarray(volumes_m3, dtype=float)):
+        if target <= 0.0:
+            continue
+        j = int(np.clip(np.searchsorted(v_grid, target), 1, len(h_grid) - 1))
+        lo, hi = h_grid[j - 1], h_grid[j]
+        f_lo, f_hi = v_grid[j - 1] - target, v_grid[j] - target
+        volume, centroid = solve(hi)
+        side = 0
+        for _ in range(max_iter):
+            if f_hi == f_lo:
+                break
+            h = hi - f_hi * (hi - lo) / (f_hi - f_lo)
+            volume, centroid = solve(h)
+            f = volume - target
+            if abs(f) <= tol * target:
+                break
+            if (f < 0) == (f_lo < 0):
+                lo, f_lo = h, f
+                if side == -1:
+                    f_hi /= 2.0
+                side = -1
+            else:
+                hi, f_hi = h, f
+                if side == 1:
+                    f_lo /= 2.0
+                side = 1
+        kn[i] = float(centroid @ lever)
+    return kn
+
+
+# Mesh arrays shared by pool workers (set once per process by the initializer)
+_worker_mesh: Tuple[np.ndarray, np.ndarray, float, float] | None = None
+
+
+def _init_worker(vertices: np.ndarray, faces: np.ndarray, x_ref_m: float, length_m: float) -> None:
+    global _worker_mesh
+    _worker_mesh = (vertices, faces, x_ref_m, length_m)
+
+
+def _kn_chunk(jobs: Sequence[Tuple[float, np.ndarray]]) -> np.ndarray:
+    vertices, faces, _x_ref_m, _length_m = _worker_mesh  # type: ignore[misc]
+    return np.array([heeled_kn(vertices, faces, heel, volumes) for heel, volumes in jobs])
+
+
+def _slice_chunk(jobs: np.ndarray) -> np.ndarray:
+    vertices, faces, x_ref_m, length_m = _worker_mesh  # type: ignore[misc]
+    return np.array([
+        submerged_properties(vertices, faces, draft, trim, x_ref_m, length_m)
+        for draft, trim in jobs
+    ]).reshape(len(jobs), len(_SLICE_FIELDS))
+
+
+@dataclass(slots=True)
+class GeneratedHydrostatics:
+    """
+    Hydrostatics sliced from a hull mesh on a (trims x drafts) grid.
+
+    Each per-slice array has shape (len(trims_m), len(drafts_m)).
+    """
+    content_hash: str
+    drafts_m: np.ndarray
+    trims_m: np.ndarray
+    rho_t_per_m3: float
+    length_m: float
+    volume_m3: np.ndarray
+    lcb_m: np.ndarray
+    tcb_m: np.ndarray
+    kb_m: np.ndarray
+    waterplane_area_m2: np.ndarray
+    lcf_m: np.ndarray
+    i_t_m4: np.ndarray
+    i_l_m4: np.ndarray
+
+    @classmethod
+    def from_raw(
+        cls,
+        content_hash: str,
+        drafts_m: Sequence[float],
+        trims_m: Sequence[float],
+        rho_t_per_m3: float,
+        length_m: float,
+        raw: np.ndarray,
+    ) -> "GeneratedHydrostatics":
+        """Build from the (trims x drafts x fields) slice array."""
+        return cls(
+            content_hash,
+            np.asarray(drafts_m, dtype=float),
+            np.asarray(trims_m, dtype=float),
+            float(rho_t_per_m3),
+            float(length_m),
+            *(raw[..., i] for i in range(len(_SLICE_FIELDS))),
+        )
+
+    @property
+    def displacement_t(self) -> np.ndarray:
+        return self.volume_m3 * self.rho_t_per_m3
+
+    def _per_volume(self, values: np.ndarray) -> np.ndarray:
+        ok = self.volume_m3 > 0.0
+        return np.where(ok, values / np.where(ok, self.volume_m3, 1.0), 0.0)
+
+    @property
+    def bm_t_m(self) -> np.ndarray:
+        return self._per_volume(self.i_t_m4)
+
+    @property
+    def km_m(self) -> np.ndarray:
+        return self.kb_m + self.bm_t_m
+
+    @property
+    def mtc_tm_per_m(self) -> np.ndarray:
+        """Moment to change trim 1 m: disp * BM_L / L."""
+        return self.displacement_t * self._per_volume(self.i_l_m4) / self.length_m
+
+    @property
+    def tpc_t_per_cm(self) -> np.ndarray:
+        return self.waterplane_area_m2 * self.rho_t_per_m3 / 100.0
+
+    def matches(
+        self,
+        drafts_m: Sequence[float],
+        trims_m: Sequence[float],
+        rho_t_per_m3: float,
+        length_m: float | None,
+    ) -> bool:
+        """True if this result was generated on the given grid."""
+        return (
+            np.array_equal(self.drafts_m, np.asarray(drafts_m, dtype=float))
+            and np.array_equal(self.trims_m, np.asarray(trims_m, dtype=float))
+            and self.rho_t_per_m3 == float(rho_t_per_m3)
+            and (length_m is None or self.length_m == float(length_m))
+        )
+
+    def table(self, trim_m: float = 0.0) -> HydrostaticTable:
+        """
+        HydrostaticTable for the grid trim nearest trim_m.
+
+        Drafts at or below the keel (no displacement increase) are dropped.
+        """
+        i = int(np.argmin(np.abs(self.trims_m - trim_m)))
+        disp = self.displacement_t[i]
+        keep = (disp > 0.0) & (disp > np.maximum.accumulate(np.concatenate(([0.0], disp[:-1]))))
+        return HydrostaticTable(
+            draft_m=self.drafts_m[keep],
+            displacement_t=disp[keep],
+            kb_m=self.kb_m[i][keep],
+            lcb_m=self.lcb_m[i][keep],
+            lcf_m=self.lcf_m[i][keep],
+            mtc_tm_per_m=self.mtc_tm_per_m[i][keep],
+            tpc_t_per_cm=self.tpc_t_per_cm[i][keep],
+            km_m=self.km_m[i][keep],
+        )
+
+    def save(self, path: str | Path) -> None:
+        """Write to an .npz file (atomically replaces an existing file)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                format_version=CACHE_FORMAT_VERSION,
+                content_hash=self.content_hash,
+                drafts_m=self.drafts_m,
+                trims_m=self.trims_m,
+                rho_t_per_m3=self.rho_t_per_m3,
+                length_m=self.length_m,
+                **{name: getattr(self, name) for name in _SLICE_FIELDS},
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "GeneratedHydrostatics":
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != CACHE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported hydrostatics cache format in {path}")
+            return cls(
+                str(data["content_hash"]),
+                data["drafts_m"],
+                data["trims_m"],
+                float(data["rho_t_per_m3"]),
+                float(data["length_m"]),
+                *(data[name] for name in _SLICE_FIELDS),
+            )
+
+
+def hydrostatics_from_mesh(
+    mesh: Any,
+    drafts_m: Iterable[float],
+    trims_m: Iterable[float] = (0.0,),
+    rho_t_per_m3: float = RHO_SEA,
+    length_m: float | None = None,
+    max_workers: int | None = None,
+    content_hash: str = "",
+) -> GeneratedHydrostatics:
+    """
+    Slice a mesh at every (trim, draft) pair.
+
+    length_m defaults to the mesh's x extent (used for MTC and trim slope).
+    max_workers=1 slices in this process; otherwise slices are chunked over
+    a ProcessPoolExecutor whose workers receive the mesh once.
+    """
+    vertices, faces = mesh_arrays(mesh)
+    drafts = np.asarray(list(drafts_m), dtype=float)
+    trims = np.asarray(list(trims_m), dtype=float)
+    x_min, x_max = float(vertices[:, 0].min()), float(vertices[:, 0].max())
+    length = float(length_m) if length_m else max(1e-6, x_max - x_min)
+    x_ref = 0.5 * (x_min + x_max)
+
+    jobs = np.array([(d, t) for t in trims for d in drafts]).reshape(-1, 2)
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) < 2:
+        _init_worker(vertices, faces, x_ref, length)
+        raw = _slice_chunk(jobs)
+    else:
+        chunks = np.array_split(jobs, min(len(jobs), workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(vertices, faces, x_ref, length),
+        ) as pool:
+            raw = np.concatenate(list(pool.map(_slice_chunk, chunks)), axis=0)
+
+    raw = raw.reshape(len(trims), len(drafts), len(_SLICE_FIELDS))
+    return GeneratedHydrostatics.from_raw(content_hash, drafts, trims, rho_t_per_m3, length, raw)
+
+
+def default_cache_dir() -> Path:
+    from ..config.settings import Settings
+
+    return Settings.default().data_dir / "hydrostatics_cache"
+
+
+def generate_hydrostatics(
+    stl_path: str | Path,
+    drafts_m: Iterable[float],
+    trims_m: Iterable[float] = (0.0,),
+    rho_t_per_m3: float = RHO_SEA,
+    length_m: float | None = None,
+    cache_dir: str | Path | None = None,
+    max_workers: int | None = None,
+) -> GeneratedHydrostatics:
+    """
+    Hydrostatics for the hull in stl_path, from the .npz cache when the
+    same STL contents were already sliced on the same grid (one file per
+    grid, so switching grids does not evict the others).
+    """
+    drafts = [float(d) for d in drafts_m]
+    trims = [float(t) for t in trims_m]
+    content_hash = stl_content_hash(stl_path)
+    grid = grid_digest(drafts, trims, rho_t_per_m3, length_m)
+    cache_file = Path(cache_dir or default_cache_dir()) / f"{content_hash}-{grid}.npz"
+    if cache_file.exists():
+        try:
+            cached = GeneratedHydrostatics.load(cache_file)
+        except (OSError, ValueError, KeyError):
+            cached = None
+        if cached is not None and cached.matches(drafts, trims, rho_t_per_m3, length_m):
+            return cached
+
+    result = hydrostatics_from_mesh(
+        load_stl(stl_path), drafts, trims, rho_t_per_m3, length_m, max_workers, content_hash
+    )
+    result.save(cache_file)
+    return result
+
+
+def create_hydrostatic_table_from_stl(
+    stl_path: str | Path,
+    ship_id: int,
+    hydro_repo: Any,
+    drafts_m: Iterable[float],
+    trims_m: Iterable[float] = (0.0,),
+    **kwargs: Any,
+) -> HydrostaticTable:
+    """Generate (or load cached) hydrostatics, store the even-keel table for the ship and return it."""
+    table = generate_hydrostatics(stl_path, drafts_m, trims_m, **kwargs).table(0.0)
+    hydro_repo.replace_for_ship(ship_id, table)
+    return table
+
+
+def cross_curves_from_mesh(
+    mesh: Any,
+    heels_deg: Iterable[float],
+    displacements_t: Iterable[float],
+    rho_t_per_m3: float = RHO_SEA,
+    max_workers: int | None = None,
+) -> CrossCurves:
+    """KN for every (displacement, heel) pair; one pool task per heel angle."""
+    vertices, faces = mesh_arrays(mesh)
+    heels = np.asarray(list(heels_deg), dtype=float)
+    disp = np.asarray(list(displacements_t), dtype=float)
+    volumes = disp / rho_t_per_m3
+    jobs = [(float(h), volumes) for h in heels]
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) < 2:
+        _init_worker(vertices, faces, 0.0, 1.0)
+        kn = _kn_chunk(jobs)
+    else:
+        chunks = [jobs[i::workers] for i in range(min(workers, len(jobs)))]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(vertices, faces, 0.0, 1.0),
+        ) as pool:
+            parts = list(pool.map(_kn_chunk, chunks))
+        kn = np.empty((len(jobs), len(disp)))
+        for i, part in enumerate(parts):
+            kn[i::workers] = part
+    return CrossCurves(displacement_t=disp, heel_deg=heels, kn_m=kn.T)
+
+
+def generate_cross_curves(
+    stl_path: str | Path,
+    heels_deg: Iterable[float],
+    displacements_t: Iterable[float],
+    rho_t_per_m3: float = RHO_SEA,
+    cache_dir: str | Path | None = None,
+    max_workers: int | None = None,
+) -> CrossCurves:
+    """Cross curves for the hull in stl_path, from the .kn.npz cache when the grid matches."""
+    heels = np.asarray([float(h) for h in heels_deg])
+    disp = np.asarray([float(d) for d in displacements_t])
+    grid = grid_digest(heels, disp, rho_t_per_m3)
+    cache_file = Path(cache_dir or default_cache_dir()) / f"{stl_content_hash(stl_path)}-{grid}.kn.npz"
+    if cache_file.exists():
+        try:
+            with np.load(cache_file, allow_pickle=False) as data:
+                if (
+                    int(data["format_version"]) == CACHE_FORMAT_VERSION
+                    and float(data["rho_t_per_m3"]) == float(rho_t_per_m3)
+                    and np.array_equal(data["heel_deg"], heels)
+                    and np.array_equal(data["displacement_t"], disp)
+                ):
+                    return CrossCurves(displacement_t=disp, heel_deg=heels, kn_m=data["kn_m"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    curves = cross_curves_from_mesh(load_stl(stl_path), heels, disp, rho_t_per_m3, max_workers)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_name(cache_file.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            format_version=CACHE_FORMAT_VERSION,
+            rho_t_per_m3=float(rho_t_per_m3),
+            heel_deg=curves.heel_deg,
+            displacement_t=curves.displacement_t,
+            kn_m=curves.kn_m,
+        )
+    os.replace(tmp, cache_file)
+    return curves
+
+
+def create_cross_curves_from_stl(
+    stl_path: str | Path,
+    ship_id: int,
+    cross_curve_repo: Any,
+    heels_deg: Iterable[float],
+    displacements_t: Iterable[float],
+    **kwargs: Any,
+) -> CrossCurves:
+    """Generate (or load cached) KN cross curves, store them for the ship and return them."""
+    curves = generate_cross_curves(stl_path, heels_deg, displacements_t, **kwargs)
+    cross_curve_repo.replace_for_ship(ship_id, curves)
+    return curves
@@ -1,9 +1,9 @@
 """
 Hydrostatic calculations.
 
-Uses ship principal dimensions and simplified formulas when full
-hydrostatic tables are not available. Includes numerical safeguards
-against division-by-zero and floating-point issues.
+Uses the ship's HydrostaticTable when one is stored, and falls back to
+principal dimensions and simplified box formulas when it is not. Includes
+numerical safeguards against division-by-zero and floating-point issues.
 """
 
 from __future__ import annotations
@@ -12,7 +12,10 @@ import math
 from dataclasses import dataclass
 from typing import List
 
+import numpy as np
+
 from ..models import Ship, Tank
+from ..models.hydrostatic_table import HydrostaticTable
 
 # Seawater density t/m³
 RHO_SEA = 1.025
@@ -98,9 +101,9 @@ def compute_trim(
     """
     Approximate trim (m, positive = stern down) from LCG vs LCB.
 
-    trim ≈ (LCG - LCB) * disp / MTC
+    trim ≈ (LCB - LCG) * disp / MTC  (positions from AP: G aft of B trims by the stern)
     MTC ≈ (disp * BM_L) / (100 * L) for 1cm; for 1m divide by 100.
-    Simplified: trim = (lcg - lcb) * L * factor
+    Simplified: trim = (lcb - lcg) * L * factor
     """
     if displacement_t <= 0 or length_m <= 0:
         return 0.0
@@ -111,7 +114,7 @@ def compute_trim(
         return 0.0
     lcg_m = lcg_norm * length_m
     lcb_m = lcb_norm * length_m
-    trim_m = (lcg_m - lcb_m) * displacement_t / mtc
+    trim_m = (lcb_m - lcg_m) * displacement_t / mtc
     return trim_m
 
 
@@ -167,3 +170,136 @@ def compute_kg_from_tanks(
 def compute_gm(km_m: float, kg_m: float) -> float:
     """GM = KM - KG."""
     return max(0.0, km_m - kg_m)
+
+
+# --- Array versions (one value per loading condition) ---
+# Same formulas as the scalar functions above, including their guards; these
+# are what compute_condition and the batch engine both run.
+
+
+def displacement_to_draft_array(
+    displacement_t: np.ndarray,
+    length_m: float,
+    breadth_m: float,
+    cb: float = DEFAULT_CB,
+    rho: float = RHO_SEA,
+) -> np.ndarray:
+    """Vectorized displacement_to_draft."""
+    disp = np.asarray(displacement_t, dtype=float)
+    if length_m <= 0 or breadth_m <= 0 or cb <= 0 or rho <= 0:
+        return np.zeros_like(disp)
+    denom = length_m * breadth_m * cb * rho
+    if abs(denom) < EPS:
+        return np.zeros_like(disp)
+    return np.where(disp < 0, 0.0, disp / denom)
+
+
+def compute_trim_array(
+    displacement_t: np.ndarray,
+    lcg_norm: np.ndarray,
+    length_m: float,
+    breadth_m: float,
+    lcb_norm: float = 0.5,
+) -> np.ndarray:
+    """Vectorized compute_trim (draft is not used by the simplified formula)."""
+    disp = np.asarray(displacement_t, dtype=float)
+    if length_m <= 0:
+        return np.zeros_like(disp)
+    loaded = disp > 0
+    safe_disp = np.where(loaded, disp, 1.0)
+    bm_l = (breadth_m ** 3) * length_m / (12 * (safe_disp / RHO_SEA))
+    mtc = safe_disp * bm_l / (length_m * 100)
+    ok = loaded & (mtc > 0)
+    safe_mtc = np.where(ok, mtc, 1.0)
+    lcg_m = np.asarray(lcg_norm, dtype=float) * length_m
+    lcb_m = lcb_norm * length_m
+    trim_m = (lcb_m - lcg_m) * safe_disp / safe_mtc
+    return np.where(ok, trim_m, 0.0)
+
+
+def compute_bm_t_array(
+    displacement_t: np.ndarray,
+    length_m: float,
+    breadth_m: float,
+    rho: float = RHO_SEA,
+) -> np.ndarray:
+    """Vectorized compute_bm_t."""
+    disp = np.asarray(displacement_t, dtype=float)
+    loaded = disp > 0
+    v = np.where(loaded, disp, 1.0) / rho
+    i_t = length_m * (breadth_m ** 3) / 12
+    return np.where(loaded, i_t / v, 0.0)
+
+
+# --- Hydrostatic table lookups ---
+
+
+@dataclass(slots=True)
+class TableFloatation:
+    """Draft, trim and KM of a condition from a hydrostatic table."""
+    draft_m: np.ndarray | float
+    trim_m: np.ndarray | float  # same sign convention as compute_trim
+    km_m: np.ndarray | float
+    draft_aft_m: np.ndarray | float
+    draft_fwd_m: np.ndarray | float
+
+
+def floatation_from_table(
+    table: HydrostaticTable,
+    displacement_t: np.ndarray | float,
+    lcg_m: np.ndarray | float,
+    length_m: float,
+) -> TableFloatation:
+    """
+    Draft, trim, KM and end drafts for one or many conditions.
+
+    Draft comes from the inverse displacement lookup, trim from
+    (LCB - LCG) * disp / MTC (positive = stern down, as compute_trim), and
+    end drafts pivot about LCF.
+    Zero (or negative) displacement gives all zeros, as the box formulas do.
+    """
+    disp = np.asarray(displacement_t, dtype=float)
+    loaded = disp > 0
+    state = table.at_draft(table.draft_for_displacement(disp))
+    mtc = np.asarray(state.mtc_tm_per_m)
+    ok = loaded & (mtc > EPS)
+    trim = np.where(ok, (state.lcb_m - np.asarray(lcg_m)) * disp / np.where(ok, mtc, 1.0), 0.0)
+    draft = np.where(loaded, state.draft_m, 0.0)
+    km = np.where(loaded, state.km_m, 0.0)
+    L = max(EPS, length_m)
+    draft_aft = draft + trim * np.asarray(state.lcf_m) / L
+    draft_fwd = draft_aft - trim
+    if disp.ndim == 0:
+        return TableFloatation(float(draft), float(trim), float(km), float(draft_aft), float(draft_fwd))
+    return TableFloatation(draft, trim, km, draft_aft, draft_fwd)
+
+
+def box_hydrostatic_table(
+    length_m: float,
+    breadth_m: float,
+    drafts_m: np.ndarray,
+    cb: float = DEFAULT_CB,
+    rho: float = RHO_SEA,
+) -> HydrostaticTable:
+    """
+    HydrostaticTable for a box-shaped hull with block coefficient cb.
+
+    Useful as a placeholder before real hydrostatics are imported; KB and
+    KM follow compute_kb / compute_bm_t, LCB and LCF are amidships.
+    """
+    drafts = np.asarray(drafts_m, dtype=float)
+    disp = length_m * breadth_m * drafts * cb * rho
+    volume = np.where(disp > 0, disp / rho, 1.0)
+    bm_t = np.where(disp > 0, length_m * breadth_m ** 3 / 12 / volume, 0.0)
+    bm_l = np.where(disp > 0, breadth_m * length_m ** 3 / 12 / volume, 0.0)
+    kb = 0.53 * drafts
+    return HydrostaticTable(
+        draft_m=drafts,
+        displacement_t=disp,
+        kb_m=kb,
+        lcb_m=np.full_like(drafts, 0.5 * length_m),
+        lcf_m=np.full_like(drafts, 0.5 * length_m),
+        mtc_tm_per_m=disp * bm_l / length_m,
+        tpc_t_per_cm=np.full_like(drafts, length_m * breadth_m * cb * rho / 100.0),
+        km_m=kb + bm_t,
+    )
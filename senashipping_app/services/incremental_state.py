@@ -0,0 +1,207 @@
+"""
+Incremental condition state for single-cell edits.
+
+Keeps running sums of mass, LCG/VCG/TCG moments and free-surface terms
+for one loading condition on a compiled ShipModel. Changing one tank
+volume or one pen head count subtracts that item's old contribution and
+adds the new one, so draft, trim, GM and heel are available without
+re-summing every tank and pen. Sums are rebuilt from the per-item
+vectors every resum_every edits so floating-point drift cannot build up.
+The moment about amidships behind the simplified SF/BM is kept the same
+way, so strength() is O(1) too.
+
+Results use the same formulas as compute_model_batch (and so
+compute_condition_for_model) for the same inputs.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Mapping, Tuple
+
+import numpy as np
+
+from ..config.limits import EPS
+from .longitudinal_strength import StrengthResult, strength_from_moments
+from .ship_model import ShipModel
+from .stability_service import model_floatation
+from .free_surface import free_surface_terms
+
+
+@dataclass(slots=True)
+class IncrementalResults:
+    """Floating position and stability from an IncrementalConditionState."""
+    displacement_t: float
+    draft_m: float
+    draft_aft_m: float
+    draft_fwd_m: float
+    trim_m: float
+    kg_m: float
+    km_m: float
+    gm_m: float
+    heel_deg: float
+    free_surface_correction_m: float
+    gm_effective_m: float
+    lcg_m: float  # from AP
+    tcg_m: float
+
+
+class IncrementalConditionState:
+    """
+    Running totals for one condition; O(1) updates per tank or pen edit.
+
+    Tank volumes (m³) and pen head counts are held in model column order.
+    The LCG moment is normalized (0-1 from AP) as in compute_model_batch.
+    """
+
+    def __init__(
+        self,
+        model: ShipModel,
+        tank_volumes: Mapping[int, float] | None = None,
+        pen_loadings: Mapping[int, int] | None = None,
+        cargo_density_t_per_m3: float = 1.0,
+        mass_per_head_t: float = 0.5,
+        vcg_from_deck_m: float = 0.0,
+        resum_every: int = 1000,
+    ) -> None:
+        if resum_every < 1:
+            raise ValueError("resum_every must be at least 1")
+        self.model = model
+        self.cargo_density_t_per_m3 = cargo_density_t_per_m3
+        self.mass_per_head_t = mass_per_head_t
+        self.vcg_from_deck_m = vcg_from_deck_m
+        self.resum_every = resum_every
+        self._length_m = max(1e-6, model.ship.length_overall_m)
+        self._pen_vcg_m = model.pen_vcg_m + vcg_from_deck_m
+        self._pen_lcg_norm = model.pen_lcg_m / self._length_m
+        # Lever arms about amidships for the simplified strength (as compute_strength_batch)
+        self._tank_arm_m = (model.tank_longitudinal_pos - 0.5) * self._length_m
+        self._pen_arm_m = model.pen_lcg_m - self._length_m * 0.5
+
+        self.tank_volumes = model.volumes_vector(tank_volumes)
+        self.pen_heads = model.loadings_vector(pen_loadings)
+        self.edits_since_resum = 0
+        self.resum()
+
+    def resum(self) -> None:
+        """Rebuild all running sums from the per-item vectors."""
+        m = self.model
+        density = self.cargo_density_t_per_m3
+        tank_mass = self.tank_volumes * density
+        pen_mass = np.where(self.pen_heads > 0, self.pen_heads, 0.0) * self.mass_per_head_t
+        tank_lcg, tank_kg, tank_tcg = m.tank_centroids(self.tank_volumes)
+        self._mass = float(tank_mass.sum() + pen_mass.sum())
+        self._lcg_moment = float(tank_mass @ tank_lcg + pen_mass @ self._pen_lcg_norm)
+        self._vcg_moment = float(tank_mass @ tank_kg + pen_mass @ self._pen_vcg_m)
+        self._tcg_moment = float(tank_mass @ tank_tcg + pen_mass @ m.pen_tcg_m)
+        self._midship_moment = float(tank_mass @ self._tank_arm_m + pen_mass @ self._pen_arm_m)
+        approx, geometric = free_surface_terms(m, self.tank_volumes, density)
+        self._free_surface = float(approx.sum())
+        self._free_surface_geometric = float(geometric.sum())
+        self.edits_since_resum = 0
+
+    def _tank_terms(self, col: int, volume: float) -> Tuple[float, float, float, float, float, float]:
+        """One tank's (mass, LCG/VCG/TCG moments, free-surface moments) at volume."""
+        cols = np.array(col)
+        vol = np.array(volume)
+        mass = volume * self.cargo_density_t_per_m3
+        lcg, kg, tcg = self.model.tank_centroids(vol, cols)
+        approx, geometric = free_surface_terms(self.model, vol, self.cargo_density_t_per_m3, cols)
+        return mass, mass * float(lcg), mass * float(kg), mass * float(tcg), float(approx), float(geometric)
+
+    def _edited(self) -> None:
+        self.edits_since_resum += 1
+        if self.edits_since_resum >= self.resum_every:
+            self.resum()
+
+    def set_tank_volume(self, tank_id: int, volume_m3: float) -> None:
+        """Change one tank's volume (m³); raises KeyError for unknown tank ids."""
+        col = self.model.tank_index[tank_id]
+        old = float(self.tank_volumes[col])
+        new = float(volume_m3)
+        if new == old:
+            return
+        # Contents centroids may move with the level, so take whole-tank differences
+        delta = [b - a for a, b in zip(self._tank_terms(col, old), self._tank_terms(col, new))]
+        self._mass += delta[0]
+        self._lcg_moment += delta[1]
+        self._vcg_moment += delta[2]
+        self._tcg_moment += delta[3]
+        self._free_surface += delta[4]
+        self._free_surface_geometric += delta[5]
+        self._midship_moment += delta[0] * float(self._tank_arm_m[col])
+        self.tank_volumes[col] = new
+        self._edited()
+
+    def set_tank_fill_pct(self, tank_id: int, fill_pct: float) -> None:
+        """Change one tank's fill as a percentage of its capacity."""
+        col = self.model.tank_index[tank_id]
+        self.set_tank_volume(tank_id, float(self.model.tank_capacity_m3[col]) * fill_pct / 100.0)
+
+    def set_pen_heads(self, pen_id: int, heads: int) -> None:
+        """Change one pen's head count; raises KeyError for unknown pen ids."""
+        col = self.model.pen_index[pen_id]
+        old = float(self.pen_heads[col])
+        new = float(heads)
+        if new == old:
+            return
+        # Unloaded (or negative) pens contribute nothing, as in compute_model_batch
+        dm = (max(new, 0.0) - max(old, 0.0)) * self.mass_per_head_t
+        self._mass += dm
+        self._lcg_moment += dm * float(self._pen_lcg_norm[col])
+        self._vcg_moment += dm * float(self._pen_vcg_m[col])
+        self._tcg_moment += dm * float(self.model.pen_tcg_m[col])
+        self._midship_moment += dm * float(self._pen_arm_m[col])
+        self.pen_heads[col] = new
+        self._edited()
+
+    @property
+    def displacement_t(self) -> float:
+        return self._mass
+
+    def tank_volume_map(self) -> Dict[int, float]:
+        """Current tank volumes keyed by tank id (for a full compute)."""
+        return {int(tid): float(v) for tid, v in zip(self.model.tank_ids, self.tank_volumes) if tid >= 0}
+
+    def pen_loading_map(self) -> Dict[int, int]:
+        """Current pen head counts keyed by pen id (for a full compute)."""
+        return {int(pid): int(h) for pid, h in zip(self.model.pen_ids, self.pen_heads) if pid >= 0}
+
+    def strength(self) -> StrengthResult:
+        """Simplified SF/BM (as compute_strength_batch) from the running sums."""
+        mass = np.array([self._mass])
+        return strength_from_moments(
+            mass, self._length_m, mass, np.array([self._midship_moment])
+        ).row(0)
+
+    def results(self) -> IncrementalResults:
+        """Draft, trim, GM and heel from the running sums (no per-item work)."""
+        mass = self._mass
+        lcg_norm = self._lcg_moment / mass if mass > 0 else 0.5
+        draft, trim, km, draft_aft, draft_fwd = (
+            float(v) for v in model_floatation(self.model, mass, lcg_norm)
+        )
+        significant = mass > 1e-9
+        kg = self._vcg_moment / mass if significant else 0.0
+        tcg = self._tcg_moment / mass if significant else 0.0
+        gm = max(0.0, km - kg)
+        heel = math.degrees(math.atan(tcg / gm)) if gm > 1e-9 else 0.0
+        fsc = 0.0
+        if mass >= EPS:
+            fsc = min(self._free_surface / mass, 2.0) + self._free_surface_geometric / mass
+        return IncrementalResults(
+            displacement_t=mass,
+            draft_m=draft,
+            draft_aft_m=draft_aft,
+            draft_fwd_m=draft_fwd,
+            trim_m=trim,
+            kg_m=kg,
+            km_m=km,
+            gm_m=gm,
+            heel_deg=heel,
+            free_surface_correction_m=fsc,
+            gm_effective_m=max(0.0, gm - fsc),
+            lcg_m=lcg_norm * self._length_m,
+            tcg_m=tcg,
+        )
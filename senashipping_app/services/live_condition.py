@@ -0,0 +1,146 @@
+"""
+Live results for a condition being edited cell by cell.
+
+LiveCondition pairs an IncrementalConditionState with an
+IncrementalRuleEvaluator: apply() takes the tank volumes and pen head
+counts edited since the last update, applies only those deltas to the
+running sums, re-runs only the criteria whose inputs moved, and returns
+a ConditionResults with floating position, simplified strength,
+validation, criteria and ancillary values in one piece. With free_trim
+the position comes from the LiveCondition's own equilibrium solver,
+warm-started from its previous update. Station SF/BM
+curves and the traceability snapshot need every item, so they are left
+to the full compute.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Mapping, Tuple
+
+from .ancillary_calculations import compute_ancillary
+from .incremental_state import IncrementalConditionState
+from .rule_engine import IncrementalRuleEvaluator, fields_from_results
+from .ship_model import ShipModel
+from .stability_service import ConditionResults
+from .validation import validate_condition
+
+# One frame at 60 Hz; updates slower than this are counted in over_budget
+FRAME_BUDGET_S = 1.0 / 60.0
+
+
+@dataclass(slots=True)
+class LiveUpdate:
+    """Results of one apply() and what it cost."""
+    results: ConditionResults
+    tanks_changed: int
+    pens_changed: int
+    criteria_evaluated: Tuple[str, ...]
+    latency_s: float
+    ignored_ids: Tuple[int, ...] = field(default_factory=tuple)  # ids not on the model
+
+    @property
+    def within_budget(self) -> bool:
+        return self.latency_s <= FRAME_BUDGET_S
+
+
+class LiveCondition:
+    """Delta-driven recompute of one condition on a compiled ShipModel."""
+
+    def __init__(
+        self,
+        model: ShipModel,
+        tank_volumes: Mapping[int, float] | None = None,
+        pen_loadings: Mapping[int, int] | None = None,
+        cargo_density_t_per_m3: float = 1.0,
+        mass_per_head_t: float = 0.5,
+        vcg_from_deck_m: float = 0.0,
+        free_trim: bool = False,
+    ) -> None:
+        self.model = model
+        self.free_trim = free_trim
+        self.state = IncrementalConditionState(
+            model,
+            {tid: v for tid, v in (tank_volumes or {}).items() if tid in model.tank_index},
+            {pid: h for pid, h in (pen_loadings or {}).items() if pid in model.pen_index},
+            cargo_density_t_per_m3=cargo_density_t_per_m3,
+            mass_per_head_t=mass_per_head_t,
+            vcg_from_deck_m=vcg_from_deck_m,
+        )
+        self._rules = IncrementalRuleEvaluator(model.ship, model.gz_engine)
+        self._solver = model.equilibrium_solver() if free_trim else None
+        self.updates = 0
+        self.over_budget = 0
+
+    def apply(
+        self,
+        tank_volumes: Mapping[int, float] | None = None,
+        pen_heads: Mapping[int, int] | None = None,
+    ) -> LiveUpdate:
+        """Apply edited volumes (m³) and head counts, then rebuild the results."""
+        started = time.perf_counter()
+        ignored = []
+        n_tanks = n_pens = 0
+        for tank_id, volume in (tank_volumes or {}).items():
+            if tank_id in self.model.tank_index:
+                self.state.set_tank_volume(tank_id, volume)
+                n_tanks += 1
+            else:
+                ignored.append(tank_id)
+        for pen_id, heads in (pen_heads or {}).items():
+            if pen_id in self.model.pen_index:
+                self.state.set_pen_heads(pen_id, heads)
+                n_pens += 1
+            else:
+                ignored.append(pen_id)
+
+        inc = self.state.results()
+        ship = self.model.ship
+        results = ConditionResults(
+            displacement_t=inc.displacement_t,
+            draft_m=inc.draft_m,
+            trim_m=inc.trim_m,
+            gm_m=inc.gm_m,
+            kg_m=inc.kg_m,
+            km_m=inc.km_m,
+            draft_aft_m=inc.draft_aft_m,
+            draft_fwd_m=inc.draft_fwd_m,
+            heel_deg=inc.heel_deg,
+            strength=self.state.strength(),
+        )
+        if self._solver is not None and inc.displacement_t > 0:
+            eq = self._solver.solve(
+                inc.displacement_t, inc.lcg_m, inc.tcg_m, inc.kg_m, warm_start=self._solver.last,
+            )
+            results.draft_m = eq.draft_m
+            results.trim_m = eq.trim_m
+            results.heel_deg = eq.heel_deg
+            results.draft_aft_m = eq.draft_aft_m
+            results.draft_fwd_m = eq.draft_fwd_m
+            results.equilibrium = eq
+        results.ancillary = compute_ancillary(
+            ship, results.draft_m, results.draft_aft_m, results.draft_fwd_m, results.trim_m,
+            results.gm_m, results.heel_deg,
+        )
+        results.validation = validate_condition(
+            ship, results, (), {},
+            self.state.cargo_density_t_per_m3,
+            model=self.model,
+            free_surface_correction_m=inc.free_surface_correction_m,
+        )
+        criteria = self._rules.evaluate(fields_from_results(results, inc.free_surface_correction_m))
+        results.criteria = criteria.evaluation(0)
+
+        latency_s = time.perf_counter() - started
+        self.updates += 1
+        if latency_s > FRAME_BUDGET_S:
+            self.over_budget += 1
+        return LiveUpdate(
+            results,
+            tanks_changed=n_tanks,
+            pens_changed=n_pens,
+            criteria_evaluated=self._rules.last_evaluated,
+            latency_s=latency_s,
+            ignored_ids=tuple(ignored),
+        )
@@ -0,0 +1,292 @@
+"""
+Ship-wide livestock allocation: distribute a shipment (head counts per
+cargo type) over a ship's pens to load as many heads as possible while
+GM, heel, trim, draft and longitudinal strength stay within limits.
+
+The solver keeps running sums of mass and moments for the condition, as
+IncrementalConditionState does, and adds one pen load per step. Each step
+scores every candidate (free pen x cargo type with heads left, or topping
+up a partly loaded pen) in one vectorized pass: the candidate's mass and
+moment increments are added to the sums as arrays, floatation comes from
+model_floatation and SF/BM from the station strength engine with the pen's
+weight distribution row added to the base weight. The feasible candidate
+that adds the most heads (then leaves the largest normalized margin) is
+loaded in full; when no pen can be filled, the largest feasible partial
+load is found by a vectorized bisection on the head count.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from ..config.limits import (
+    EPS,
+    MAX_DRAFT_FRACTION,
+    MAX_HEEL_DEG,
+    MAX_TRIM_FRACTION,
+    MIN_GM_LIVESTOCK_M,
+)
+from ..models.cargo_type import CargoType
+from .ship_model import ShipModel
+from .stability_service import model_floatation
+from .free_surface import free_surface_terms
+
+# Constraint names, in the order of the margin rows
+CONSTRAINTS = ("gm", "heel", "trim", "draft", "bending_moment", "shear_force")
+
+
+@dataclass(slots=True)
+class ShipmentItem:
+    """Head count of one cargo type to be loaded."""
+    cargo_type: CargoType
+    heads: int
+
+
+@dataclass(slots=True)
+class AllocationLimits:
+    """Limits every intermediate and the final condition must respect."""
+    min_gm_m: float = MIN_GM_LIVESTOCK_M  # after free-surface correction
+    max_heel_deg: float = MAX_HEEL_DEG
+    max_trim_m: float | None = None  # None: MAX_TRIM_FRACTION of LOA
+    max_draft_m: float | None = None  # None: MAX_DRAFT_FRACTION of design draft
+    max_bm_pct: float = 100.0
+    max_sf_pct: float = 100.0
+
+
+@dataclass(slots=True)
+class AllocationResult:
+    """Pen loads proposed for a shipment and the resulting condition."""
+    pen_heads: Dict[int, int]  # pen id -> heads (loaded pens only)
+    pen_cargo: Dict[int, CargoType]  # pen id -> cargo type in that pen
+    loaded_heads: List[int]  # per shipment item
+    requested_heads: List[int]
+    displacement_t: float
+    draft_m: float
+    trim_m: float
+    heel_deg: float
+    gm_effective_m: float
+    max_bm_pct: float
+    max_sf_pct: float
+    limiting: str | None = None  # constraint (or "pen area") that stopped loading
+    steps: int = 0
+    candidates_evaluated: int = 0
+
+    @property
+    def total_heads(self) -> int:
+        return sum(self.loaded_heads)
+
+    @property
+    def unloaded_heads(self) -> int:
+        return sum(self.requested_heads) - self.total_heads
+
+
+def pen_head_capacity(model: ShipModel, cargo_types: Sequence[CargoType]) -> np.ndarray:
+    """
+    (types x pens) maximum heads: pen area over deck area per head, floored,
+    and capped by the pen's capacity_head when that is set.
+    """
+    area_per_head = np.array([c.deck_area_per_head_m2 or 0.0 for c in cargo_types], dtype=float)
+    ok = area_per_head > 0
+    cap = np.where(
+        ok[:, None],
+        np.floor(model.pen_area_m2[None, :] / np.where(ok, area_per_head, 1.0)[:, None] + 1e-9),
+        0.0,
+    )
+    limit = model.pen_capacity_head
+    cap = np.where(limit[None, :] > 0, np.minimum(cap, limit[None, :]), cap)
+    cap[:, model.pen_ids < 0] = 0.0
+    return cap.astype(np.int64)
+
+
+class LivestockAllocator:
+    """Greedy, vectorized pen allocation for one base (tank) condition."""
+
+    def __init__(
+        self,
+        model: ShipModel,
+        tank_volumes: Mapping[int, float] | None = None,
+        cargo_density_t_per_m3: float = 1.0,
+        limits: AllocationLimits | None = None,
+    ) -> None:
+        self.model = model
+        self.limits = limits or AllocationLimits()
+        ship = model.ship
+        self._length_m = L = max(1e-6, ship.length_overall_m)
+        self._max_trim_m = (
+            self.limits.max_trim_m if self.limits.max_trim_m is not None else L * MAX_TRIM_FRACTION
+        )
+        if self.limits.max_draft_m is not None:
+            self._max_draft_m = self.limits.max_draft_m
+        elif ship.design_draft_m > 0:
+            self._max_draft_m = ship.design_draft_m * MAX_DRAFT_FRACTION
+        else:
+            self._max_draft_m = math.inf
+
+        volumes = model.volumes_vector(tank_volumes)
+        tank_mass = volumes * cargo_density_t_per_m3
+        lcg, kg, tcg = model.tank_centroids(volumes)
+        self._base_mass = float(tank_mass.sum())
+        self._base_lcg_moment = float(tank_mass @ lcg)
+        self._base_vcg_moment = float(tank_mass @ kg)
+        self._base_tcg_moment = float(tank_mass @ tcg)
+        approx, geometric = free_surface_terms(model, volumes, cargo_density_t_per_m3)
+        self._free_surface = float(approx.sum())
+        self._free_surface_geometric = float(geometric.sum())
+
+        self._strength = model.strength_engine()
+        self._base_weight = tank_mass @ self._strength.tank_distribution
+        self._pen_lcg_norm = model.pen_lcg_m / L
+        self.candidates_evaluated = 0
+
+    def _evaluate(
+        self,
+        sums: np.ndarray,
+        weight: np.ndarray,
+        pens: np.ndarray | None,
+        dm: np.ndarray,
+        dvcg: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Condition after adding mass dm (t) to each candidate pen, VCG
+        dvcg; sums are the current (mass, LCG, VCG, TCG moments). With
+        pens None, the current condition itself (dm must be zero).
+        """
+        m = self.model
+        if pens is None:
+            pen_lcg, pen_tcg = np.zeros_like(dm), np.zeros_like(dm)
+            candidate_weight = np.broadcast_to(weight, (dm.shape[0], weight.shape[0]))
+        else:
+            pen_lcg, pen_tcg = self._pen_lcg_norm[pens], m.pen_tcg_m[pens]
+            candidate_weight = weight[None, :] + dm[:, None] * self._strength.pen_distribution[pens]
+        mass = sums[0] + dm
+        safe = np.where(mass > 1e-9, mass, 1.0)
+        lcg_norm = np.where(mass > 0, (sums[1] + dm * pen_lcg) / safe, 0.5)
+        kg = np.where(mass > 1e-9, (sums[2] + dm * dvcg) / safe, 0.0)
+        tcg = np.where(mass > 1e-9, (sums[3] + dm * pen_tcg) / safe, 0.0)
+        draft, trim, km, aft, fwd = model_floatation(m, mass, lcg_norm)
+        gm = np.maximum(0.0, km - kg)
+        stable = gm > 1e-9
+        heel = np.where(stable, np.degrees(np.arctan(tcg / np.where(stable, gm, 1.0))), 0.0)
+        loaded = mass >= EPS
+        safe_disp = np.where(loaded, mass, 1.0)
+        fsc = np.where(
+            loaded,
+            np.minimum(self._free_surface / safe_disp, 2.0) + self._free_surface_geometric / safe_disp,
+            0.0,
+        )
+        gm_eff = np.maximum(0.0, gm - fsc)
+        curves = self._strength.curves_from_weight(candidate_weight, aft, fwd)
+        self.candidates_evaluated += int(dm.shape[0])
+        lim = self.limits
+        margins = np.vstack([
+            (gm_eff - lim.min_gm_m) / max(EPS, lim.min_gm_m),
+            1.0 - np.abs(heel) / max(EPS, lim.max_heel_deg),
+            1.0 - np.abs(trim) / max(EPS, self._max_trim_m),
+            1.0 - draft / max(EPS, self._max_draft_m),
+            1.0 - curves.max_bm_pct / max(EPS, lim.max_bm_pct),
+            1.0 - curves.max_sf_pct / max(EPS, lim.max_sf_pct),
+        ])
+        return {
+            "mass": mass,
+            "draft": draft,
+            "trim": trim,
+            "heel": heel,
+            "gm_eff": gm_eff,
+            "bm_pct": curves.max_bm_pct,
+            "sf_pct": curves.max_sf_pct,
+            "margins": margins,
+            "feasible": np.all(margins >= 0.0, axis=0),
+            "score": margins.min(axis=0),
+        }
+
+    def allocate(self, shipment: Sequence[ShipmentItem]) -> AllocationResult:
+        """Pen loads for shipment, loading as many heads as the limits allow."""
+        m = self.model
+        types = [item.cargo_type for item in shipment]
+        n_types, n_pens = len(types), m.n_pens
+        mass_per_head = np.array(
+            [(c.avg_weight_per_head_kg or 520.0) / 1000.0 for c in types], dtype=float
+        )
+        vcg_from_deck = np.array([c.vcg_from_deck_m or 0.0 for c in types], dtype=float)
+        capacity = pen_head_capacity(m, types)
+        remaining = np.array([max(0, int(item.heads)) for item in shipment], dtype=np.int64)
+        requested = remaining.copy()
+        pen_type = np.full(n_pens, -1, dtype=np.int64)
+        heads = np.zeros(n_pens, dtype=np.int64)
+
+        sums = np.array([
+            self._base_mass, self._base_lcg_moment, self._base_vcg_moment, self._base_tcg_moment
+        ])
+        weight = self._base_weight.copy()
+        limiting: str | None = None
+        steps = 0
+        self.candidates_evaluated = 0
+
+        while remaining.sum() > 0:
+            # Candidates: free pens x types with heads left, or top-ups of the pen's own type
+            tt, pp = np.nonzero((capacity > 0) & (remaining[:, None] > 0))
+            own = (pen_type[pp] == -1) | (pen_type[pp] == tt)
+            tt, pp = tt[own], pp[own]
+            room = capacity[tt, pp] - heads[pp]
+            keep = room > 0
+            tt, pp = tt[keep], pp[keep]
+            if tt.size == 0:
+                limiting = "pen area"
+                break
+            full = np.minimum(room[keep], remaining[tt])
+            dvcg = m.pen_vcg_m[pp] + vcg_from_deck[tt]
+
+            state = self._evaluate(sums, weight, pp, full * mass_per_head[tt], dvcg)
+            if state["feasible"].any():
+                # Most heads first, then the largest remaining margin
+                ok = np.flatnonzero(state["feasible"])
+                pick = int(ok[np.lexsort((state["score"][ok], full[ok]))[-1]])
+                add = int(full[pick])
+            else:
+                # Largest feasible partial load per candidate (bisection on heads)
+                lo = np.zeros_like(full)
+                hi = full.copy()
+                while np.any(hi - lo > 1):
+                    mid = (lo + hi + 1) // 2
+                    trial = self._evaluate(sums, weight, pp, mid * mass_per_head[tt], dvcg)
+                    ok = trial["feasible"]
+                    lo = np.where(ok, mid, lo)
+                    hi = np.where(ok, hi, mid)
+                if lo.max() <= 0:
+                    failing = np.sum(state["margins"] < 0.0, axis=1)
+                    limiting = CONSTRAINTS[int(np.argmax(failing))]
+                    break
+                pick = int(np.argmax(lo))
+                add = int(lo[pick])
+
+            p, t = int(pp[pick]), int(tt[pick])
+            dm = add * mass_per_head[t]
+            sums += dm * np.array([1.0, self._pen_lcg_norm[p], dvcg[pick], m.pen_tcg_m[p]])
+            weight += dm * self._strength.pen_distribution[p]
+            pen_type[p] = t
+            heads[p] += add
+            remaining[t] -= add
+            steps += 1
+
+        final = self._evaluate(sums, weight, None, np.zeros(1), np.zeros(1))
+        loaded = np.flatnonzero(heads > 0)
+        return AllocationResult(
+            pen_heads={int(m.pen_ids[p]): int(heads[p]) for p in loaded},
+            pen_cargo={int(m.pen_ids[p]): types[pen_type[p]] for p in loaded},
+            loaded_heads=[int(r - left) for r, left in zip(requested, remaining)],
+            requested_heads=[int(r) for r in requested],
+            displacement_t=float(final["mass"][0]),
+            draft_m=float(final["draft"][0]),
+            trim_m=float(final["trim"][0]),
+            heel_deg=float(final["heel"][0]),
+            gm_effective_m=float(final["gm_eff"][0]),
+            max_bm_pct=float(final["bm_pct"][0]),
+            max_sf_pct=float(final["sf_pct"][0]),
+            limiting=limiting,
+            steps=steps,
+            candidates_evaluated=self.candidates_evaluated,
+        )
@@ -7,6 +7,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List
 
+import numpy as np
+
 from ..models import Tank, LivestockPen
 
 # Seawater density t/m³
@@ -25,6 +27,30 @@ class StrengthResult:
     sf_pct_allow: float = 0.0  # (sf_max / design_sf) * 100
 
 
+@dataclass(slots=True)
+class BatchStrengthResult:
+    """StrengthResult fields as arrays, one entry per loading condition."""
+    hogging_bm_tm: np.ndarray
+    shear_force_max_t: np.ndarray
+    still_water_bm_approx_tm: np.ndarray
+    design_bm_tm: np.ndarray
+    design_sf_t: np.ndarray
+    bm_pct_allow: np.ndarray
+    sf_pct_allow: np.ndarray
+
+    def row(self, i: int) -> StrengthResult:
+        """StrengthResult for condition i."""
+        return StrengthResult(
+            hogging_bm_tm=float(self.hogging_bm_tm[i]),
+            shear_force_max_t=float(self.shear_force_max_t[i]),
+            still_water_bm_approx_tm=float(self.still_water_bm_approx_tm[i]),
+            design_bm_tm=float(self.design_bm_tm[i]),
+            design_sf_t=float(self.design_sf_t[i]),
+            bm_pct_allow=float(self.bm_pct_allow[i]),
+            sf_pct_allow=float(self.sf_pct_allow[i]),
+        )
+
+
 def compute_strength(
     displacement_t: float,
     length_m: float,
@@ -103,3 +129,76 @@ def compute_strength(
         bm_pct_allow=bm_pct,
         sf_pct_allow=sf_pct,
     )
+
+
+def compute_strength_batch(
+    displacement_t: np.ndarray,
+    length_m: float,
+    tank_masses_t: np.ndarray,
+    tank_longitudinal_pos: np.ndarray,
+    pen_masses_t: np.ndarray,
+    pen_lcg_m: np.ndarray,
+) -> BatchStrengthResult:
+    """
+    Vectorized compute_strength over N conditions.
+
+    tank_masses_t is (N x tanks) and pen_masses_t is (N x pens), already
+    multiplied out by density / mass per head (unloaded pens = 0).
+    """
+    disp = np.asarray(displacement_t, dtype=float)
+    if length_m <= 0:
+        zeros = np.zeros(disp.shape[0])
+        return BatchStrengthResult(zeros, zeros, zeros, zeros, zeros, zeros, zeros)
+
+    total_mass = tank_masses_t.sum(axis=1) + pen_masses_t.sum(axis=1)
+    moment_sum = (
+        tank_masses_t @ ((tank_longitudinal_pos - 0.5) * length_m)
+        + pen_masses_t @ (pen_lcg_m - length_m * 0.5)
+    )
+    return strength_from_moments(disp, length_m, total_mass, moment_sum)
+
+
+def strength_from_moments(
+    displacement_t: np.ndarray,
+    length_m: float,
+    total_mass_t: np.ndarray,
+    moment_sum_tm: np.ndarray,
+) -> BatchStrengthResult:
+    """
+    compute_strength_batch from summed item masses and their moments about amidships.
+
+    Lets callers that keep running sums (e.g. IncrementalConditionState)
+    skip the per-item products.
+    """
+    disp = np.asarray(displacement_t, dtype=float)
+    total_mass = np.asarray(total_mass_t, dtype=float)
+    moment_sum = np.asarray(moment_sum_tm, dtype=float)
+    if length_m <= 0:
+        zeros = np.zeros(disp.shape[0])
+        return BatchStrengthResult(zeros, zeros, zeros, zeros, zeros, zeros, zeros)
+
+    loaded = (disp > 0) & (total_mass > 0)
+    safe_mass = np.where(loaded, total_mass, 1.0)
+
+    lcg_norm = np.clip(0.5 + (moment_sum / safe_mass) / length_m, 0.0, 1.0)
+    eccent = np.abs(lcg_norm - 0.5)
+    swbm = disp * length_m * eccent * 0.25
+    sf_max = disp * 0.1 * eccent * 2
+
+    design_bm = disp * length_m * 0.12
+    design_sf = disp * 0.15
+    bm_pct = np.where(design_bm > 0, np.abs(swbm) / np.where(design_bm > 0, design_bm, 1.0) * 100.0, 0.0)
+    sf_pct = np.where(design_sf > 0, np.abs(sf_max) / np.where(design_sf > 0, design_sf, 1.0) * 100.0, 0.0)
+
+    def _masked(a: np.ndarray) -> np.ndarray:
+        return np.where(loaded, a, 0.0)
+
+    return BatchStrengthResult(
+        hogging_bm_tm=_masked(np.where(lcg_norm < 0.5, swbm, -swbm)),
+        shear_force_max_t=_masked(np.abs(sf_max)),
+        still_water_bm_approx_tm=_masked(swbm),
+        design_bm_tm=_masked(design_bm),
+        design_sf_t=_masked(design_sf),
+        bm_pct_allow=_masked(bm_pct),
+        sf_pct_allow=_masked(sf_pct),
+    )
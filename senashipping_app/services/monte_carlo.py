@@ -0,0 +1,203 @@
+"""
+Monte Carlo uncertainty analysis for one loading condition.
+
+Head weights, tank fill readings and the livestock VCG are drawn from the
+distributions of an UncertaintyModel and every sample is pushed through
+compute_model_batch and the criteria rule engine. Samples are processed
+in chunks of chunk_size rows so the (samples x tanks) and (rules x
+samples) work arrays stay bounded; only a few scalars per sample are kept
+for the percentiles. Each chunk draws from its own child of
+SeedSequence(seed), so results depend on seed and chunk_size but not on
+the number of worker processes.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .rule_engine import DEFAULT_RULES, fields_from_results
+from .ship_model import ShipModel
+from .stability_service import compute_model_batch
+from .free_surface import compute_free_surface_correction_array
+
+# Per-sample values kept for percentiles
+METRICS = ("displacement_t", "draft_m", "trim_m", "heel_deg", "kg_m", "gm_m", "gm_effective_m")
+
+DEFAULT_PERCENTILES = (1.0, 5.0, 50.0, 95.0, 99.0)
+
+
+@dataclass(slots=True)
+class Distribution:
+    """
+    A sampled input: "fixed" (always loc), "normal" (mean loc, standard
+    deviation scale), "uniform" or "triangular" (centred on loc, half-width
+    scale).
+    """
+    kind: str = "fixed"
+    loc: float = 0.0
+    scale: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.kind not in ("fixed", "normal", "uniform", "triangular"):
+            raise ValueError(f"Unknown distribution {self.kind!r}")
+        if self.scale < 0:
+            raise ValueError("Distribution scale must be non-negative")
+
+    def sample(self, rng: np.random.Generator, size: int | Tuple[int, ...]) -> np.ndarray:
+        if self.kind == "fixed" or self.scale == 0:
+            return np.full(size, self.loc, dtype=float)
+        if self.kind == "normal":
+            return rng.normal(self.loc, self.scale, size)
+        if self.kind == "uniform":
+            return rng.uniform(self.loc - self.scale, self.loc + self.scale, size)
+        return rng.triangular(self.loc - self.scale, self.loc, self.loc + self.scale, size)
+
+
+@dataclass(slots=True)
+class UncertaintyModel:
+    """Distributions of the uncertain condition inputs."""
+    # Factor on the mass per head, one draw per sample (shipment-wide average weight)
+    head_weight_factor: Distribution = field(default_factory=lambda: Distribution("fixed", 1.0))
+    # Reading error as a fraction of capacity, one draw per loaded tank per sample
+    fill_error_fraction: Distribution = field(default_factory=Distribution)
+    # Added to the livestock VCG above deck (m), one draw per sample
+    vcg_offset_m: Distribution = field(default_factory=Distribution)
+
+
+@dataclass(slots=True)
+class MonteCarloResult:
+    """Percentiles of the condition particulars and criterion failure rates."""
+    n_samples: int
+    seed: int
+    percentiles: Tuple[float, ...]
+    values: Dict[str, np.ndarray]  # metric -> value at each of percentiles
+    mean: Dict[str, float]
+    failure_probability: Dict[str, float]  # criterion code -> P(FAIL)
+    any_failure_probability: float
+
+    def percentile(self, metric: str, q: float) -> float:
+        """Value of metric at percentile q (one of self.percentiles)."""
+        return float(self.values[metric][self.percentiles.index(q)])
+
+
+@dataclass(slots=True)
+class _Problem:
+    """Everything a chunk needs (sent once to each worker)."""
+    model: ShipModel
+    volumes: np.ndarray  # (tanks,)
+    heads: np.ndarray  # (pens,)
+    cargo_density_t_per_m3: float
+    mass_per_head_t: float
+    vcg_from_deck_m: float
+    uncertainty: UncertaintyModel
+
+
+# Problem shared by pool workers (set once per process by the initializer)
+_worker_problem: _Problem | None = None
+
+
+def _init_worker(problem: _Problem) -> None:
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _chunk(job: Tuple[np.random.SeedSequence, int]) -> Tuple[Dict[str, np.ndarray], np.ndarray, int]:
+    """(metric samples, failures per rule, samples failing any rule) for one chunk."""
+    seed_seq, n = job
+    prob = _worker_problem  # type: ignore[assignment]
+    m, unc = prob.model, prob.uncertainty
+    rng = np.random.default_rng(seed_seq)
+
+    factor = np.maximum(0.0, unc.head_weight_factor.sample(rng, n))
+    vcg = prob.vcg_from_deck_m + unc.vcg_offset_m.sample(rng, n)
+    error = unc.fill_error_fraction.sample(rng, (n, m.n_tanks)) * m.tank_capacity_m3
+    loaded = prob.volumes > 0
+    volumes = np.where(
+        loaded, np.clip(prob.volumes + error, 0.0, m.tank_capacity_m3), prob.volumes
+    )
+    heads = prob.heads[None, :] * factor[:, None]  # mass per head scaled through the head count
+
+    batch = compute_model_batch(
+        m, volumes, heads,
+        cargo_density_t_per_m3=prob.cargo_density_t_per_m3,
+        mass_per_head_t=prob.mass_per_head_t,
+        vcg_from_deck_m=vcg,
+    )
+    fsc = compute_free_surface_correction_array(
+        m, volumes, batch.displacement_t, prob.cargo_density_t_per_m3
+    )
+    criteria = DEFAULT_RULES.evaluate(m.ship, fields_from_results(batch, fsc), m.gz_engine)
+    failed = criteria.applicable & ~criteria.ok
+    metrics = {name: getattr(batch, name) for name in METRICS if name != "gm_effective_m"}
+    metrics["gm_effective_m"] = np.maximum(0.0, batch.gm_m - fsc)
+    return metrics, failed.sum(axis=1), int(failed.any(axis=0).sum())
+
+
+def run_monte_carlo(
+    model: ShipModel,
+    tank_volumes: Mapping[int, float] | None,
+    pen_loadings: Mapping[int, int] | None = None,
+    uncertainty: UncertaintyModel | None = None,
+    n_samples: int = 100_000,
+    seed: int = 0,
+    chunk_size: int = 10_000,
+    max_workers: int | None = 1,
+    cargo_density_t_per_m3: float = 1.0,
+    mass_per_head_t: float = 0.5,
+    vcg_from_deck_m: float = 0.0,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> MonteCarloResult:
+    """
+    Sample the condition n_samples times. max_workers=1 runs the chunks in
+    this process; otherwise they are spread over a ProcessPoolExecutor
+    whose workers receive the model once.
+    """
+    if n_samples < 1:
+        raise ValueError("n_samples must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    problem = _Problem(
+        model=model,
+        volumes=model.volumes_vector(tank_volumes),
+        heads=model.loadings_vector(pen_loadings),
+        cargo_density_t_per_m3=cargo_density_t_per_m3,
+        mass_per_head_t=mass_per_head_t,
+        vcg_from_deck_m=vcg_from_deck_m,
+        uncertainty=uncertainty or UncertaintyModel(),
+    )
+    sizes = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        sizes.append(n_samples % chunk_size)
+    jobs = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) < 2:
+        _init_worker(problem)
+        outputs = [_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)),
+            initializer=_init_worker,
+            initargs=(problem,),
+        ) as pool:
+            outputs = list(pool.map(_chunk, jobs))
+
+    samples = {name: np.concatenate([out[0][name] for out in outputs]) for name in METRICS}
+    failures = np.sum([out[1] for out in outputs], axis=0)
+    any_failed = sum(out[2] for out in outputs)
+    codes: List[str] = [r.code for r in DEFAULT_RULES.rules_for(model.gz_engine is not None)]
+    q = tuple(float(p) for p in percentiles)
+    return MonteCarloResult(
+        n_samples=n_samples,
+        seed=seed,
+        percentiles=q,
+        values={name: np.percentile(v, q) for name, v in samples.items()},
+        mean={name: float(v.mean()) for name, v in samples.items()},
+        failure_probability={code: float(f) / n_samples for code, f in zip(codes, failures)},
+        any_failure_probability=any_failed / n_samples,
+    )
@@ -0,0 +1,601 @@
+"""
+Declarative criteria rules with batch and incremental evaluation.
+
+Each Rule declares the condition fields it reads and computes its value
+for a whole array of conditions at once. Intermediate quantities shared
+by several rules (effective GM, freeboard, roll period, the corrected GZ
+curve, ...) are registered as derived fields with their own inputs and
+are computed at most once per pass. Because every rule and derived field
+names its inputs, an IncrementalRuleEvaluator can re-evaluate only the
+rules downstream of the fields that changed since the last pass.
+
+DEFAULT_RULES holds the IMO, livestock (AMSA MO43) and ancillary criteria
+lines; criteria_rules.evaluate_all_criteria reports them for one
+condition. VALIDATION_RULES holds the limit checks validation.validate_condition
+turns into issues (a failing rule is an issue of the rule's severity).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+from ..config.limits import (
+    EPS,
+    MAX_DRAFT_FRACTION,
+    MAX_ROLL_PERIOD_S,
+    MAX_SWBM_FRACTION,
+    MAX_TRIM_FRACTION,
+    MIN_AIR_DRAFT_M,
+    MIN_ANGLE_MAX_GZ_DEG,
+    MIN_FREEBORD_M,
+    MIN_GM_LIVESTOCK_M,
+    MIN_GM_M,
+    MIN_GZ_AREA_0_30_MRAD,
+    MIN_GZ_AREA_0_40_MRAD,
+    MIN_GZ_AREA_30_40_MRAD,
+    MIN_GZ_AT_30_M,
+    MIN_PROP_IMMERSION_PCT,
+    MIN_VISIBILITY_M,
+)
+from ..models import Ship
+from .ancillary_calculations import air_draft_m_array, prop_immersion_pct_array, visibility_m_array
+from .criteria_types import CriteriaEvaluation, CriterionLine, CriterionResult
+from .free_surface import compute_free_surface_correction_array
+from .gz_curves import GZEngine
+from .ship_model import ShipModel
+from .stability_service import BatchConditionResults
+
+# Condition fields a rule pass starts from (scalars or (N,) arrays)
+BASE_FIELDS = (
+    "displacement_t",
+    "draft_m",
+    "draft_aft_m",
+    "draft_fwd_m",
+    "trim_m",
+    "kg_m",
+    "gm_m",
+    "heel_deg",
+    "free_surface_correction_m",
+)
+# Fields a pass may be given; NaN (rules reading them are N/A) when absent
+OPTIONAL_FIELDS = ("still_water_bm_tm",)
+
+
+@dataclass(frozen=True, slots=True)
+class DerivedField:
+    """Intermediate quantity computed once per pass from its inputs."""
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[["RuleContext"], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """
+    One criterion line. value returns an (N,) array (NaN where the rule
+    does not apply); the margin is value - limit, or limit - value for
+    upper limits, and the rule passes where the margin is >= 0.
+    """
+    code: str
+    name: str
+    reference: str
+    group: str  # parent_code of the line: IMO, LIVESTOCK or ANCILLARY
+    inputs: Tuple[str, ...]
+    value: Callable[["RuleContext"], np.ndarray]
+    limit: Callable[[Ship], float]
+    message: Callable[[float, float, float], str]
+    upper: bool = False
+    na_message: str = "N/A"
+    gz: bool | None = None  # True: only with cross curves, False: only without
+    severity: str = "error"  # ValidationSeverity value of a failing validation check
+
+
+class RuleContext:
+    """Field values of one pass; derived fields are computed on first use."""
+
+    def __init__(
+        self,
+        registry: "RuleRegistry",
+        ship: Ship,
+        fields: Mapping[str, Any],
+        gz_engine: GZEngine | None = None,
+    ) -> None:
+        self.registry = registry
+        self.ship = ship
+        self.gz_engine = gz_engine
+        self._values: Dict[str, Any] = {}
+        self._base: Dict[str, np.ndarray] = {}
+        for name in BASE_FIELDS:
+            if name not in fields:
+                raise KeyError(f"Missing condition field {name!r}")
+        n = max(np.size(fields[name]) for name in BASE_FIELDS)
+        for name, value in fields.items():
+            self._base[name] = np.broadcast_to(np.asarray(value, dtype=float), (n,)).copy()
+        for name in OPTIONAL_FIELDS:
+            self._base.setdefault(name, np.full(n, np.nan))
+        self.n = n
+        self._values.update(self._base)
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        derived = self.registry.fields.get(name)
+        if derived is None:
+            raise KeyError(f"Unknown field {name!r}")
+        value = derived.compute(self)
+        self._values[name] = value
+        return value
+
+    def update(self, fields: Mapping[str, Any]) -> FrozenSet[str]:
+        """
+        Replace base field values; returns the names that actually changed
+        and drops the derived fields computed from them.
+        """
+        changed = set()
+        for name, value in fields.items():
+            new = np.broadcast_to(np.asarray(value, dtype=float), (self.n,))
+            old = self._base.get(name)
+            if old is not None and np.array_equal(old, new, equal_nan=True):
+                continue
+            self._base[name] = new.copy()
+            self._values[name] = self._base[name]
+            changed.add(name)
+        for name in self.registry.dependents(changed):
+            self._values.pop(name, None)
+        return frozenset(changed)
+
+
+@dataclass(slots=True)
+class BatchCriteria:
+    """
+    Rule results for N conditions: (rules x N) arrays in rule order.
+    value is NaN where a rule does not apply (N/A).
+    """
+    ship: Ship
+    rules: Tuple[Rule, ...]
+    value: np.ndarray
+    limit: np.ndarray  # (rules,)
+    margin: np.ndarray
+    ok: np.ndarray  # bool, False where N/A
+
+    def __len__(self) -> int:
+        return int(self.value.shape[1])
+
+    @property
+    def codes(self) -> List[str]:
+        return [r.code for r in self.rules]
+
+    @property
+    def applicable(self) -> np.ndarray:
+        return ~np.isnan(self.value)
+
+    @property
+    def n_passed(self) -> np.ndarray:
+        return self.ok.sum(axis=0)
+
+    @property
+    def n_failed(self) -> np.ndarray:
+        return (self.applicable & ~self.ok).sum(axis=0)
+
+    @property
+    def n_na(self) -> np.ndarray:
+        return (~self.applicable).sum(axis=0)
+
+    @property
+    def all_passed(self) -> np.ndarray:
+        """(N,) True where no applicable rule fails."""
+        return self.n_failed == 0
+
+    def index(self, code: str) -> int:
+        """Row of the rule with this code."""
+        return self.codes.index(code)
+
+    def evaluation(self, i: int) -> CriteriaEvaluation:
+        """CriteriaEvaluation (as evaluate_all_criteria) for condition i."""
+        lines: List[CriterionLine] = []
+        for r, rule in enumerate(self.rules):
+            limit = float(self.limit[r])
+            value = float(self.value[r, i])
+            if math.isnan(value):
+                lines.append(CriterionLine(
+                    code=rule.code, name=rule.name, reference=rule.reference,
+                    result=CriterionResult.N_A, value=None, limit=limit, margin=None,
+                    message=rule.na_message, parent_code=rule.group,
+                ))
+                continue
+            margin = float(self.margin[r, i])
+            lines.append(CriterionLine(
+                code=rule.code, name=rule.name, reference=rule.reference,
+                result=CriterionResult.PASS if self.ok[r, i] else CriterionResult.FAIL,
+                value=value, limit=limit, margin=margin,
+                message=rule.message(value, limit, margin), parent_code=rule.group,
+            ))
+        return CriteriaEvaluation(
+            lines=lines,
+            passed=int(self.n_passed[i]),
+            failed=int(self.n_failed[i]),
+            n_a=int(self.n_na[i]),
+        )
+
+
+class RuleRegistry:
+    """Derived fields and rules, in registration (line) order."""
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, DerivedField] = {}
+        self.rules: List[Rule] = []
+        self._base_inputs: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+
+    def field(self, name: str, inputs: Iterable[str], compute: Callable[[RuleContext], Any]) -> None:
+        """Register a derived field computed from inputs."""
+        if name in self.fields or name in BASE_FIELDS:
+            raise ValueError(f"Field {name!r} already defined")
+        self.fields[name] = DerivedField(name, tuple(inputs), compute)
+        self._base_inputs.clear()
+
+    def register(self, rule: Rule) -> None:
+        if any(r.code == rule.code and r.gz == rule.gz for r in self.rules):
+            raise ValueError(f"Rule {rule.code!r} already registered")
+        for name in rule.inputs:
+            if name not in self.fields and name not in BASE_FIELDS and name not in OPTIONAL_FIELDS:
+                raise ValueError(f"Rule {rule.code!r} reads unknown field {name!r}")
+        self.rules.append(rule)
+
+    def rules_for(self, has_gz: bool, groups: Iterable[str] | None = None) -> Tuple[Rule, ...]:
+        """Rules that apply with (or without) a GZ engine, optionally only those of groups."""
+        wanted = None if groups is None else frozenset(groups)
+        return tuple(
+            r for r in self.rules
+            if (r.gz is None or r.gz == has_gz) and (wanted is None or r.group in wanted)
+        )
+
+    def base_inputs(self, names: Iterable[str]) -> FrozenSet[str]:
+        """Base fields that names (base or derived) are computed from."""
+        key = tuple(names)
+        cached = self._base_inputs.get(key)
+        if cached is not None:
+            return cached
+        out = set()
+        stack = list(key)
+        while stack:
+            name = stack.pop()
+            derived = self.fields.get(name)
+            if derived is None:
+                out.add(name)
+            else:
+                stack.extend(derived.inputs)
+        self._base_inputs[key] = frozenset(out)
+        return self._base_inputs[key]
+
+    def dependents(self, changed: Iterable[str]) -> FrozenSet[str]:
+        """Derived fields computed (directly or not) from any changed field."""
+        changed = set(changed)
+        return frozenset(
+            name for name, derived in self.fields.items()
+            if self.base_inputs(derived.inputs) & changed
+        )
+
+    def evaluate(
+        self,
+        ship: Ship,
+        fields: Mapping[str, Any],
+        gz_engine: GZEngine | None = None,
+        groups: Iterable[str] | None = None,
+    ) -> BatchCriteria:
+        """
+        All applicable rules (or those of groups) for the conditions in
+        fields, in one pass; only the derived fields they read are computed.
+        """
+        return self.evaluate_context(RuleContext(self, ship, fields, gz_engine), groups)
+
+    def evaluate_context(self, ctx: RuleContext, groups: Iterable[str] | None = None) -> BatchCriteria:
+        """All applicable rules (or those of groups) on an existing context."""
+        rules = self.rules_for(ctx.gz_engine is not None, groups)
+        value = np.empty((len(rules), ctx.n))
+        limit = np.empty(len(rules))
+        margin = np.empty((len(rules), ctx.n))
+        ok = np.empty((len(rules), ctx.n), dtype=bool)
+        for r, rule in enumerate(rules):
+            value[r], limit[r], margin[r], ok[r] = _evaluate_rule(rule, ctx)
+        return BatchCriteria(ctx.ship, rules, value, limit, margin, ok)
+
+
+def _evaluate_rule(rule: Rule, ctx: RuleContext) -> Tuple[np.ndarray, float, np.ndarray, np.ndarray]:
+    value = np.broadcast_to(np.asarray(rule.value(ctx), dtype=float), (ctx.n,))
+    limit = float(rule.limit(ctx.ship))
+    margin = limit - value if rule.upper else value - limit
+    with np.errstate(invalid="ignore"):
+        ok = margin >= 0
+    return value, limit, margin, ok
+
+
+class IncrementalRuleEvaluator:
+    """
+    Re-evaluates only the rules whose inputs changed since the previous
+    call. last_evaluated holds the codes run by the latest evaluate().
+    """
+
+    def __init__(
+        self,
+        ship: Ship,
+        gz_engine: GZEngine | None = None,
+        registry: RuleRegistry | None = None,
+    ) -> None:
+        self.ship = ship
+        self.gz_engine = gz_engine
+        self.registry = registry or DEFAULT_RULES
+        self.last_evaluated: Tuple[str, ...] = ()
+        self._ctx: RuleContext | None = None
+        self._result: BatchCriteria | None = None
+
+    def evaluate(self, fields: Mapping[str, Any]) -> BatchCriteria:
+        """
+        Rule results for fields. The first call (or one with a different
+        number of conditions) evaluates every rule; later calls only the
+        rules reading fields whose values changed.
+        """
+        ctx, prev = self._ctx, self._result
+        n = max((np.size(v) for v in fields.values()), default=1)
+        if ctx is None or prev is None or n not in (1, ctx.n):
+            ctx = RuleContext(self.registry, self.ship, fields, self.gz_engine)
+            self._ctx = ctx
+            self._result = self.registry.evaluate_context(ctx)
+            self.last_evaluated = tuple(self._result.codes)
+            return self._result
+
+        changed = ctx.update(fields)
+        value, margin, ok = prev.value.copy(), prev.margin.copy(), prev.ok.copy()
+        evaluated = []
+        for r, rule in enumerate(prev.rules):
+            if self.registry.base_inputs(rule.inputs) & changed:
+                value[r], _limit, margin[r], ok[r] = _evaluate_rule(rule, ctx)
+                evaluated.append(rule.code)
+        self.last_evaluated = tuple(evaluated)
+        self._result = BatchCriteria(self.ship, prev.rules, value, prev.limit, margin, ok)
+        return self._result
+
+
+def fields_from_results(results: Any, free_surface_correction_m: Any = None) -> Dict[str, Any]:
+    """
+    Base fields from ConditionResults, BatchConditionResults or
+    IncrementalResults (which carries its own free-surface correction).
+    """
+    if free_surface_correction_m is None:
+        free_surface_correction_m = getattr(results, "free_surface_correction_m", 0.0)
+    fields = {name: getattr(results, name) for name in BASE_FIELDS if name != "free_surface_correction_m"}
+    fields["free_surface_correction_m"] = free_surface_correction_m
+    strength = getattr(results, "strength", None)
+    if strength is not None:
+        fields["still_water_bm_tm"] = strength.still_water_bm_approx_tm
+    return fields
+
+
+def evaluate_batch(
+    model: ShipModel,
+    batch: BatchConditionResults,
+    volumes: np.ndarray,
+    cargo_density: float = 1.0,
+    registry: RuleRegistry | None = None,
+) -> BatchCriteria:
+    """
+    Criteria for every condition of a compute_model_batch result;
+    volumes is the (N x tanks) matrix the batch was computed from.
+    """
+    fsc = compute_free_surface_correction_array(model, volumes, batch.displacement_t, cargo_density)
+    return (registry or DEFAULT_RULES).evaluate(
+        model.ship, fields_from_results(batch, fsc), model.gz_engine
+    )
+
+
+# --- Default IMO / livestock / ancillary rule set ---------------------------
+
+
+def _gm_effective(ctx: RuleContext) -> np.ndarray:
+    return np.maximum(0.0, ctx["gm_m"] - ctx["free_surface_correction_m"])
+
+
+def _roll_period(ctx: RuleContext) -> np.ndarray:
+    gm_eff = ctx["gm_effective_m"]
+    breadth = max(EPS, ctx.ship.breadth_m)
+    stable = gm_eff > EPS
+    period = 2 * math.pi * 0.45 * breadth / np.sqrt(9.81 * np.where(stable, gm_eff, 1.0))
+    return np.where(stable, period, np.nan)
+
+
+def _freeboard(ctx: RuleContext) -> np.ndarray:
+    return max(EPS, ctx.ship.depth_m) - ctx["draft_m"] - 0.5 * np.abs(ctx["trim_m"])
+
+
+def _corrected_gz(ctx: RuleContext) -> Any:
+    fsc = np.maximum(0.0, ctx["gm_m"] - ctx["gm_effective_m"])
+    return ctx.gz_engine.summary_batch(ctx["displacement_t"], ctx["kg_m"] + fsc)
+
+
+def _length(ship: Ship) -> float:
+    return max(1e-6, ship.length_overall_m)
+
+
+def _depth(ship: Ship) -> float:
+    return max(1e-6, ship.depth_m)
+
+
+def _swbm_pct_of_design(ctx: RuleContext) -> np.ndarray:
+    """Still-water BM as % of the simplified design BM (disp * L * 0.1); NaN without strength."""
+    design = ctx["displacement_t"] * _length(ctx.ship) * 0.1
+    loaded = design > EPS
+    pct = 100.0 * np.abs(ctx["still_water_bm_tm"]) / np.where(loaded, design, 1.0)
+    return np.where(loaded, pct, np.nan)
+
+
+def default_registry() -> RuleRegistry:
+    """Registry with the criteria lines reported by evaluate_all_criteria."""
+    reg = RuleRegistry()
+    reg.field("gm_effective_m", ("gm_m", "free_surface_correction_m"), _gm_effective)
+    reg.field("roll_period_s", ("gm_effective_m",), _roll_period)
+    reg.field("freeboard_m", ("draft_m", "trim_m"), _freeboard)
+    reg.field("gz", ("displacement_t", "kg_m", "gm_m", "gm_effective_m"), _corrected_gz)
+    reg.field(
+        "prop_immersion_pct", ("draft_aft_m",),
+        lambda ctx: prop_immersion_pct_array(ctx["draft_aft_m"], _length(ctx.ship), _depth(ctx.ship)),
+    )
+    reg.field(
+        "visibility_m", ("draft_fwd_m", "trim_m"),
+        lambda ctx: visibility_m_array(_length(ctx.ship), _depth(ctx.ship), ctx["draft_fwd_m"], ctx["trim_m"]),
+    )
+    reg.field(
+        "air_draft_m", ("draft_m",),
+        lambda ctx: air_draft_m_array(_depth(ctx.ship), ctx["draft_m"]),
+    )
+
+    # IMO intact stability
+    reg.register(Rule(
+        "IMO_GM", "Minimum GM", "IS Code Ch.2", "IMO", ("gm_effective_m",),
+        lambda ctx: ctx["gm_effective_m"], lambda ship: MIN_GM_M,
+        lambda v, lim, m: f"GM {v:.3f} m, min {lim} m, margin {m:+.3f} m",
+    ))
+    reg.register(Rule(
+        "IMO_TRIM", "Trim limit", "IS Code", "IMO", ("trim_m",),
+        lambda ctx: np.abs(ctx["trim_m"]),
+        lambda ship: max(EPS, ship.length_overall_m) * MAX_TRIM_FRACTION,
+        lambda v, lim, m: f"Trim {v:.2f} m, max {lim:.2f} m, margin {m:+.2f} m",
+        upper=True,
+    ))
+    reg.register(Rule(
+        "IMO_DRAFT", "Draft limit", "Load Line", "IMO", ("draft_m",),
+        lambda ctx: ctx["draft_m"],
+        lambda ship: max(EPS, ship.design_draft_m) * MAX_DRAFT_FRACTION,
+        lambda v, lim, m: f"Draft {v:.2f} m, max {lim:.2f} m, margin {m:+.2f} m",
+        upper=True,
+    ))
+
+    # Livestock (AMSA MO43 / IMO livestock)
+    reg.register(Rule(
+        "LIV_GM", "Livestock minimum GM", "AMSA MO43 / IMO Livestock", "LIVESTOCK", ("gm_effective_m",),
+        lambda ctx: ctx["gm_effective_m"], lambda ship: MIN_GM_LIVESTOCK_M,
+        lambda v, lim, m: f"GM {v:.3f} m, min {lim} m, margin {m:+.3f} m",
+    ))
+    reg.register(Rule(
+        "LIV_ROLL", "Roll period (animal welfare)", "AMSA MO43", "LIVESTOCK", ("roll_period_s",),
+        lambda ctx: ctx["roll_period_s"], lambda ship: MAX_ROLL_PERIOD_S,
+        lambda v, lim, m: f"Roll period {v:.1f} s, max {lim} s, margin {m:+.1f} s",
+        upper=True, na_message="N/A (GM too low)",
+    ))
+    reg.register(Rule(
+        "LIV_FREEBORD", "Minimum freeboard (no deck immersion)", "AMSA MO43", "LIVESTOCK", ("freeboard_m",),
+        lambda ctx: ctx["freeboard_m"], lambda ship: MIN_FREEBORD_M,
+        lambda v, lim, m: f"Freeboard {v:.2f} m, min {lim} m, margin {m:+.2f} m",
+    ))
+
+    # Ancillary: GZ status (from the GZ curve, or GM and heel without cross curves)
+    reg.register(Rule(
+        "GZ_STATUS", "GZ Criteria Status", "IS Code Ch.2", "ANCILLARY", ("gz", "gm_effective_m"),
+        lambda ctx: ((ctx["gm_effective_m"] >= MIN_GM_M) & ctx["gz"].criteria_ok).astype(float),
+        lambda ship: 1.0,
+        lambda v, lim, m: "PASS" if m >= 0 else "FAIL (GZ curve)",
+        gz=True,
+    ))
+    reg.register(Rule(
+        "GZ_STATUS", "GZ Criteria Status", "IS Code Ch.2", "ANCILLARY", ("gm_m", "heel_deg"),
+        lambda ctx: ((ctx["gm_m"] >= 0.15) & (np.abs(ctx["heel_deg"]) < 5.0)).astype(float),
+        lambda ship: 1.0,
+        lambda v, lim, m: "PASS" if m >= 0 else "FAIL (GM or heel)",
+        gz=False,
+    ))
+    gz_checks = (
+        ("GZ_AREA_0_30", "Area under GZ 0-30 deg", "area_0_30_mrad", MIN_GZ_AREA_0_30_MRAD, "m.rad", 4),
+        ("GZ_AREA_0_40", "Area under GZ 0-40 deg", "area_0_40_mrad", MIN_GZ_AREA_0_40_MRAD, "m.rad", 4),
+        ("GZ_AREA_30_40", "Area under GZ 30-40 deg", "area_30_40_mrad", MIN_GZ_AREA_30_40_MRAD, "m.rad", 4),
+        ("GZ_30", "GZ at 30 deg or more", "gz_30_m", MIN_GZ_AT_30_M, "m", 3),
+        ("GZ_MAX_ANGLE", "Angle of maximum GZ", "angle_max_gz_deg", MIN_ANGLE_MAX_GZ_DEG, "deg", 1),
+    )
+    for code, name, attr, limit, unit, prec in gz_checks:
+        reg.register(Rule(
+            code, name, "IS Code 2.2", "ANCILLARY", ("gz",),
+            lambda ctx, attr=attr: getattr(ctx["gz"], attr),
+            lambda ship, limit=limit: limit,
+            lambda v, lim, m, name=name, unit=unit, prec=prec: (
+                f"{name} {v:.{prec}f} {unit}, min {lim} {unit}, margin {m:+.{prec}f} {unit}"
+            ),
+            gz=True,
+        ))
+
+    reg.register(Rule(
+        "PROP_IMM", "Propeller immersion", "Operational", "ANCILLARY", ("prop_immersion_pct",),
+        lambda ctx: ctx["prop_immersion_pct"], lambda ship: MIN_PROP_IMMERSION_PCT,
+        lambda v, lim, m: f"Prop immersion {v:.1f}%, min {lim}%",
+    ))
+    reg.register(Rule(
+        "VISIBILITY", "Visibility", "SOLAS", "ANCILLARY", ("visibility_m",),
+        lambda ctx: ctx["visibility_m"], lambda ship: MIN_VISIBILITY_M,
+        lambda v, lim, m: f"Visibility {v:.1f} m, min {lim} m",
+    ))
+    reg.register(Rule(
+        "AIR_DRAFT", "Air draft", "Operational", "ANCILLARY", ("air_draft_m",),
+        lambda ctx: ctx["air_draft_m"], lambda ship: MIN_AIR_DRAFT_M,
+        lambda v, lim, m: f"Air draft {v:.1f} m, min {lim} m",
+    ))
+    return reg
+
+
+def validation_registry() -> RuleRegistry:
+    """Registry with the limit checks of validate_condition, in issue order."""
+    reg = RuleRegistry()
+    reg.field("gm_effective_m", ("gm_m", "free_surface_correction_m"), _gm_effective)
+    reg.register(Rule(
+        "GM_LOW", "Negative / low GM", "IS Code Ch.2", "VALIDATION", ("gm_effective_m",),
+        lambda ctx: ctx["gm_effective_m"], lambda ship: MIN_GM_M,
+        lambda v, lim, m: f"GM {v:.3f} m below minimum {lim} m. Condition unsafe.",
+    ))
+    reg.register(Rule(
+        # Only checked where GM_LOW passes
+        "GM_MARGINAL", "Marginal GM", "IS Code Ch.2", "VALIDATION", ("gm_effective_m",),
+        lambda ctx: np.where(ctx["gm_effective_m"] < MIN_GM_M, np.nan, ctx["gm_effective_m"]),
+        lambda ship: MIN_GM_M * 1.5,
+        lambda v, lim, m: f"GM {v:.3f} m is marginal. Minimum recommended: {MIN_GM_M} m.",
+        severity="warning",
+    ))
+    reg.register(Rule(
+        "TRIM_EXCESSIVE", "Extreme trim", "IS Code", "VALIDATION", ("trim_m",),
+        lambda ctx: np.abs(ctx["trim_m"]),
+        lambda ship: max(EPS, ship.length_overall_m) * MAX_TRIM_FRACTION,
+        lambda v, lim, m: (
+            f"Trim {v:.2f} m exceeds limit {lim:.2f} m ({MAX_TRIM_FRACTION*100:.1f}% LOA)."
+        ),
+        upper=True,
+    ))
+    reg.register(Rule(
+        "DRAFT_OVER", "Draft over limit", "Load Line", "VALIDATION", ("draft_m",),
+        lambda ctx: ctx["draft_m"],
+        lambda ship: max(EPS, ship.design_draft_m) * MAX_DRAFT_FRACTION,
+        lambda v, lim, m: (
+            f"Draft {v:.2f} m exceeds {MAX_DRAFT_FRACTION*100:.0f}% of design draft "
+            f"{lim / MAX_DRAFT_FRACTION:.2f} m."
+        ),
+        upper=True,
+    ))
+    reg.register(Rule(
+        "BM_OVER", "Over-limit bending moment", "Strength", "VALIDATION",
+        ("still_water_bm_tm", "displacement_t"),
+        _swbm_pct_of_design, lambda ship: 100.0 * MAX_SWBM_FRACTION,
+        lambda v, lim, m: (
+            f"Still-water BM at {v:.0f}% of the design estimate may exceed design limits. Verify strength."
+        ),
+        upper=True, severity="warning",
+    ))
+    reg.register(Rule(
+        "ZERO_WEIGHT", "Zero displacement", "Informational", "VALIDATION", ("displacement_t",),
+        lambda ctx: ctx["displacement_t"], lambda ship: EPS,
+        lambda v, lim, m: "Zero displacement. No cargo/ballast loaded.",
+        severity="warning",
+    ))
+    return reg
+
+
+DEFAULT_RULES = default_registry()
+VALIDATION_RULES = validation_registry()
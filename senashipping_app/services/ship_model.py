@@ -0,0 +1,301 @@
+"""
+Compiled structure-of-arrays ship model.
+
+Packs the calculation fields of a ship's tanks and pens into contiguous
+NumPy arrays with id -> column maps, so stability, strength, validation and
+criteria code can work on vectors instead of per-tank dataclasses. Models
+are cached per ship and stamped with the ship's data version; any
+repository write to the ship's tanks, pens or particulars makes them stale.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models import Ship, Tank, LivestockPen
+from ..models.cross_curves import CrossCurves
+from ..models.hydrostatic_table import HydrostaticTable
+from ..models.tank_sounding import TankSoundingSet, TankSoundingTable
+from ..repositories.data_version import ship_data_version
+from .equilibrium import EquilibriumSolver, TableBuoyancy
+from .gz_curves import GZEngine
+from .hydrostatics import box_hydrostatic_table
+from .station_strength import StationStrengthEngine
+
+
+def _frozen(values: Iterable[float], dtype=float) -> np.ndarray:
+    arr = np.fromiter(values, dtype=dtype)
+    arr.flags.writeable = False
+    return arr
+
+
+@dataclass(slots=True)
+class ShipModel:
+    """Immutable, array-backed view of one ship's tanks and pens."""
+
+    ship: Ship
+    version: int
+    tanks: Tuple[Tank, ...]
+    pens: Tuple[LivestockPen, ...]
+
+    # Tanks: one column per tank, in self.tanks order
+    tank_ids: np.ndarray
+    tank_index: Dict[int, int]
+    tank_capacity_m3: np.ndarray
+    tank_density_t_per_m3: np.ndarray
+    tank_longitudinal_pos: np.ndarray
+    tank_kg_m: np.ndarray
+    tank_lcg_m: np.ndarray
+    tank_tcg_m: np.ndarray
+
+    # Pens: one column per pen, in self.pens order
+    pen_ids: np.ndarray
+    pen_index: Dict[int, int]
+    pen_vcg_m: np.ndarray
+    pen_lcg_m: np.ndarray
+    pen_tcg_m: np.ndarray
+    pen_area_m2: np.ndarray
+    pen_capacity_head: np.ndarray
+
+    # Ship hydrostatics; None falls back to box formulas
+    hydrostatics: HydrostaticTable | None = None
+    # GZ curves from KN cross curves; None falls back to the GM/heel check
+    gz_engine: GZEngine | None = None
+    # Tank sounding tables; None keeps fixed tank centroids and approximate free surface
+    soundings: TankSoundingSet | None = None
+    # Buoyancy source for free-trim solvers, created on first use (stateless)
+    _buoyancy: TableBuoyancy | None = field(default=None, init=False, repr=False, compare=False)
+    # Station SF/BM engine, created on first use
+    _strength: StationStrengthEngine | None = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def compile(
+        cls,
+        ship: Ship,
+        tanks: Sequence[Tank],
+        pens: Sequence[LivestockPen] | None = None,
+        version: int = 0,
+        hydrostatics: HydrostaticTable | None = None,
+        cross_curves: CrossCurves | None = None,
+        soundings: Mapping[int, TankSoundingTable] | None = None,
+    ) -> "ShipModel":
+        """
+        Build a model from domain objects (one pass over each list).
+
+        soundings maps tank id -> sounding table; tanks without one keep
+        their fixed centroids.
+        """
+        tanks_t = tuple(tanks)
+        pens_t = tuple(pens or ())
+        sounding_set = None
+        if soundings and any(t.id in soundings for t in tanks_t):
+            L = max(1e-6, ship.length_overall_m)
+            sounding_set = TankSoundingSet.compile(
+                [soundings.get(t.id) for t in tanks_t],
+                capacity_m3=np.array([t.capacity_m3 for t in tanks_t]),
+                lcg_m=np.array([t.longitudinal_pos * L for t in tanks_t]),
+                vcg_m=np.array([t.kg_m for t in tanks_t]),
+                tcg_m=np.array([t.tcg_m for t in tanks_t]),
+            )
+        return cls(
+            ship=ship,
+            version=version,
+            tanks=tanks_t,
+            pens=pens_t,
+            tank_ids=_frozen((t.id if t.id is not None else -1 for t in tanks_t), dtype=np.int64),
+            tank_index={t.id: i for i, t in enumerate(tanks_t) if t.id is not None},
+            tank_capacity_m3=_frozen(t.capacity_m3 for t in tanks_t),
+            tank_density_t_per_m3=_frozen(t.density_t_per_m3 for t in tanks_t),
+            tank_longitudinal_pos=_frozen(t.longitudinal_pos for t in tanks_t),
+            tank_kg_m=_frozen(t.kg_m for t in tanks_t),
+            tank_lcg_m=_frozen(t.lcg_m for t in tanks_t),
+            tank_tcg_m=_frozen(t.tcg_m for t in tanks_t),
+            pen_ids=_frozen((p.id if p.id is not None else -1 for p in pens_t), dtype=np.int64),
+            pen_index={p.id: i for i, p in enumerate(pens_t) if p.id is not None},
+            pen_vcg_m=_frozen(p.vcg_m for p in pens_t),
+            pen_lcg_m=_frozen(p.lcg_m for p in pens_t),
+            pen_tcg_m=_frozen(p.tcg_m for p in pens_t),
+            pen_area_m2=_frozen(p.area_m2 for p in pens_t),
+            pen_capacity_head=_frozen(p.capacity_head for p in pens_t),
+            hydrostatics=hydrostatics,
+            gz_engine=GZEngine(cross_curves) if cross_curves is not None else None,
+            soundings=sounding_set,
+        )
+
+    @property
+    def n_tanks(self) -> int:
+        return len(self.tanks)
+
+    @property
+    def n_pens(self) -> int:
+        return len(self.pens)
+
+    def with_ship(self, ship: Ship) -> "ShipModel":
+        """Same tanks/pens with different ship particulars (arrays are shared)."""
+        if ship == self.ship:
+            return self
+        return replace(self, ship=ship)
+
+    def buoyancy(self) -> TableBuoyancy:
+        """Buoyancy from the ship's hydrostatics (a box table if it has none)."""
+        if self._buoyancy is None:
+            ship = self.ship
+            L = max(1e-6, ship.length_overall_m)
+            table = self.hydrostatics
+            if table is None:
+                depth = max(ship.depth_m, ship.design_draft_m, 1.0)
+                table = box_hydrostatic_table(L, max(1e-6, ship.breadth_m), np.linspace(0.0, 1.5 * depth, 151))
+            curves = self.gz_engine.curves if self.gz_engine is not None else None
+            self._buoyancy = TableBuoyancy(table, L, curves)
+        return self._buoyancy
+
+    def equilibrium_solver(self) -> EquilibriumSolver:
+        """
+        A new equilibrium solver on the model's buoyancy.
+
+        Solvers keep their last solution for warm starts, so the model
+        (shared between threads) never holds one; each caller owns its own.
+        """
+        return EquilibriumSolver(self.buoyancy())
+
+    def strength_engine(self) -> StationStrengthEngine:
+        """Station SF/BM engine for the model's tanks and pens."""
+        if self._strength is None:
+            ship = self.ship
+            self._strength = StationStrengthEngine.for_items(
+                ship.length_overall_m, ship.breadth_m, self.tanks, self.pens,
+                design_draft_m=ship.design_draft_m,
+            )
+        return self._strength
+
+    def tank_centroids(
+        self,
+        volumes: np.ndarray,
+        cols: np.ndarray | None = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (normalized LCG, KG, TCG) of the tank contents for (..., tanks)
+        volumes, or for volumes of the tanks in cols. Without sounding
+        tables these are the fixed tank centroids (1-D, for broadcasting).
+        """
+        index = slice(None) if cols is None else cols
+        if self.soundings is None:
+            return (
+                self.tank_longitudinal_pos[index], self.tank_kg_m[index], self.tank_tcg_m[index],
+            )
+        vols = np.asarray(volumes, dtype=float)
+        if cols is None:
+            state = self.soundings.at_volumes(vols)
+        else:
+            state = self.soundings.at_columns(np.broadcast_to(cols, vols.shape), vols)
+        L = max(1e-6, self.ship.length_overall_m)
+        return state.lcg_m / L, state.vcg_m, state.tcg_m
+
+    def volumes_vector(self, volumes: Mapping[int, float] | None) -> np.ndarray:
+        """Tank volumes (m³) as a vector in column order; unknown ids are ignored."""
+        vec = np.zeros(self.n_tanks)
+        index = self.tank_index
+        for tank_id, vol in (volumes or {}).items():
+            col = index.get(tank_id)
+            if col is not None:
+                vec[col] = vol
+        return vec
+
+    def loadings_vector(self, loadings: Mapping[int, int] | None) -> np.ndarray:
+        """Pen head counts as a vector in column order; unknown ids are ignored."""
+        vec = np.zeros(self.n_pens)
+        index = self.pen_index
+        for pen_id, heads in (loadings or {}).items():
+            col = index.get(pen_id)
+            if col is not None:
+                vec[col] = heads
+        return vec
+
+    def volumes_matrix(self, volumes_list: Sequence[Mapping[int, float]]) -> np.ndarray:
+        """(N x tanks) matrix from N volume mappings."""
+        out = np.zeros((len(volumes_list), self.n_tanks))
+        for i, vols in enumerate(volumes_list):
+            out[i] = self.volumes_vector(vols)
+        return out
+
+    def loadings_matrix(self, loadings_list: Sequence[Mapping[int, int]]) -> np.ndarray:
+        """(N x pens) matrix from N head-count mappings."""
+        out = np.zeros((len(loadings_list), self.n_pens))
+        for i, heads in enumerate(loadings_list):
+            out[i] = self.loadings_vector(heads)
+        return out
+
+    def unknown_tank_ids(self, volumes: Mapping[int, float]) -> List[int]:
+        """Ids in volumes that are not tanks of this ship."""
+        return [tid for tid in volumes if tid not in self.tank_index]
+
+
+class ShipData(NamedTuple):
+    """What a ShipModelCache loader returns for a ship id."""
+    tanks: Sequence[Tank]
+    pens: Sequence[LivestockPen]
+    hydrostatics: Optional[HydrostaticTable] = None
+    cross_curves: Optional[CrossCurves] = None
+    soundings: Optional[Mapping[int, TankSoundingTable]] = None
+
+
+class ShipModelCache:
+    """Thread-safe cache of compiled models, one per database and ship id."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple[Hashable, int], ShipModel] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(
+        self,
+        ship: Ship,
+        loader: Callable[[int], Tuple],
+        database: Hashable = None,
+    ) -> ShipModel:
+        """
+        Return the cached model for ship, compiling it with loader(ship_id)
+        if there is none or the ship's data version has moved on. loader
+        returns a ShipData or a plain (tanks, pens, ...) tuple in its order.
+        database identifies where the ship was loaded from (e.g. the engine
+        URL), so equal ship ids of different database files never share a model.
+        """
+        if ship.id is None:
+            raise ValueError("Ship must have an ID to build a cached model")
+        key = (database, ship.id)
+        version = ship_data_version(ship.id)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None and model.version == version:
+                self.hits += 1
+                return model.with_ship(ship)
+            self.misses += 1
+        # Load outside the lock; the version read above stamps the model, so a
+        # write that races with the load simply makes it stale again.
+        data = ShipData(*loader(ship.id))
+        model = ShipModel.compile(
+            ship, data.tanks, data.pens, version=version,
+            hydrostatics=data.hydrostatics, cross_curves=data.cross_curves,
+            soundings=data.soundings,
+        )
+        with self._lock:
+            self._models[key] = model
+        return model
+
+    def invalidate(self, ship_id: int | None = None) -> None:
+        """Drop one ship's models (of every database), or all of them."""
+        with self._lock:
+            if ship_id is None:
+                self._models.clear()
+            else:
+                for key in [k for k in self._models if k[1] == ship_id]:
+                    del self._models[key]
+
+
+# Process-wide cache used by ConditionService
+ship_model_cache = ShipModelCache()
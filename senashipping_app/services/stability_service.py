@@ -6,22 +6,33 @@ Uses hydrostatic and longitudinal strength modules for improved results.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
 
 from ..models import Ship, Tank, LoadingCondition, LivestockPen
+from ..models.hydrostatic_table import HydrostaticTable
+from ..models.tank_sounding import TankSoundingTable
 
 from .hydrostatics import (
     RHO_SEA,
-    displacement_to_draft,
-    compute_trim,
-    compute_kb,
-    compute_bm_t,
     compute_kg_from_tanks,
-    compute_gm,
+    displacement_to_draft_array,
+    compute_trim_array,
+    compute_bm_t_array,
+    floatation_from_table,
+)
+from .longitudinal_strength import (
+    compute_strength_batch,
+    StrengthResult,
+    BatchStrengthResult,
 )
-from .longitudinal_strength import compute_strength, StrengthResult
 from .ancillary_calculations import compute_ancillary, AncillaryResults
+from .gz_curves import GZEngine, BatchGZSummary
+from .station_strength import StationStrengthCurves
+from .equilibrium import EquilibriumResult
+from .ship_model import ShipModel
 
 
 @dataclass(slots=True)
@@ -40,32 +51,8 @@ class ConditionResults:
     validation: object = None  # ValidationResult from validation.validate_condition
     criteria: object = None  # CriteriaEvaluation from criteria_rules.evaluate_all_criteria
     snapshot: object = None  # CalculationSnapshot from traceability.create_snapshot
-
-
-def _pen_mass_and_moments(
-    pens: List[LivestockPen],
-    pen_loadings: Dict[int, int],
-    mass_per_head_t: float,
-    vcg_from_deck_m: float = 0.0,
-) -> tuple[float, float, float, float]:
-    """Return (total_mass, vcg_moment, lcg_moment_norm, tcg_moment).
-    Cargo VCG = pen.vcg_m (deck) + vcg_from_deck_m (CoG above deck from cargo type).
-    """
-    total = 0.0
-    vcg_mom = 0.0
-    lcg_mom = 0.0
-    tcg_mom = 0.0
-    cargo_vcg_offset = vcg_from_deck_m
-    for pen in pens:
-        heads = pen_loadings.get(pen.id or -1, 0)
-        if heads <= 0:
-            continue
-        mass = heads * mass_per_head_t
-        total += mass
-        vcg_mom += mass * (pen.vcg_m + cargo_vcg_offset)
-        lcg_mom += mass * pen.lcg_m  # will divide by L for norm
-        tcg_mom += mass * pen.tcg_m
-    return total, vcg_mom, lcg_mom, tcg_mom
+    equilibrium: EquilibriumResult | None = None  # free-trim solution, when requested
+    strength_curves: StationStrengthCurves | None = None  # station SF/BM, when requested
 
 
 def compute_condition(
@@ -77,93 +64,317 @@ def compute_condition(
     pen_loadings: Dict[int, int] | None = None,
     mass_per_head_t: float = 0.5,
     vcg_from_deck_m: float = 0.0,
+    hydrostatics: HydrostaticTable | None = None,
+    gz_engine: GZEngine | None = None,
+    soundings: Mapping[int, TankSoundingTable] | None = None,
 ) -> ConditionResults:
     """
     Compute displacement, draft, trim, GM, and basic strength for a condition.
 
-    Uses ship dimensions for hydrostatic estimates when available.
-    Optionally includes livestock pen weights (Phase 2).
+    Draft, trim and KM are interpolated from the hydrostatics table when one
+    is given; otherwise ship dimensions are used for box estimates. With a
+    gz_engine the ancillary GZ check uses the IS Code GZ curve criteria.
+    soundings (tank id -> table) move each tank's contents centroid with
+    its volume. Optionally includes livestock pen weights (Phase 2).
+
+    Compiles a ShipModel for the call and runs compute_condition_for_model;
+    callers computing many conditions should keep the model.
     """
-    volumes: Dict[int, float] = condition.tank_volumes_m3
-    loadings: Dict[int, int] = pen_loadings or getattr(condition, "pen_loadings", None) or {}
-    pens_list = pens or []
-
-    total_mass_t = 0.0
-    total_lcg_moment = 0.0
-    total_vcg_moment = 0.0
-    total_tcg_moment = 0.0
-
-    for tank in tanks:
-        vol = volumes.get(tank.id or -1, 0.0)
-        mass = vol * cargo_density_t_per_m3
-        total_mass_t += mass
-        total_lcg_moment += mass * tank.longitudinal_pos
-        total_vcg_moment += mass * tank.kg_m  # VCG = KG for tanks
-        total_tcg_moment += mass * tank.tcg_m
-
-    pen_mass, pen_vcg, pen_lcg, pen_tcg = _pen_mass_and_moments(
-        pens_list, loadings, mass_per_head_t, vcg_from_deck_m
+    model = ShipModel.compile(ship, tanks, pens, hydrostatics=hydrostatics, soundings=soundings)
+    if gz_engine is not None:
+        model = replace(model, gz_engine=gz_engine)
+    return compute_condition_for_model(
+        model,
+        condition.tank_volumes_m3,
+        pen_loadings or getattr(condition, "pen_loadings", None) or {},
+        cargo_density_t_per_m3,
+        mass_per_head_t=mass_per_head_t,
+        vcg_from_deck_m=vcg_from_deck_m,
     )
-    total_mass_t += pen_mass
-    L = max(1e-6, ship.length_overall_m)
-    total_lcg_moment += pen_lcg / L  # pen_lcg in m, convert to 0-1 norm
-    total_vcg_moment += pen_vcg
-    total_tcg_moment += pen_tcg
 
-    displacement_t = total_mass_t
 
-    B = max(1e-6, ship.breadth_m)
+@dataclass(slots=True)
+class BatchConditionResults:
+    """
+    Results of compute_conditions_batch: one array entry per loading condition.
 
-    # Draft from displacement
-    draft_m = displacement_to_draft(displacement_t, L, B)
+    Values are the same as compute_condition would return for each row;
+    use row(i) to get a ConditionResults (with ancillary) for one condition.
+    """
+    ship: Ship
+    displacement_t: np.ndarray
+    draft_m: np.ndarray
+    draft_aft_m: np.ndarray
+    draft_fwd_m: np.ndarray
+    trim_m: np.ndarray
+    kg_m: np.ndarray
+    km_m: np.ndarray
+    gm_m: np.ndarray
+    heel_deg: np.ndarray
+    strength: BatchStrengthResult
+    gz: BatchGZSummary | None = None
+    lcg_m: np.ndarray | None = None  # metres from AP
+    tcg_m: np.ndarray | None = None
+    strength_curves: StationStrengthCurves | None = None
 
-    # Trim from LCG (normalized 0-1)
-    if total_mass_t > 0:
-        lcg_norm = total_lcg_moment / total_mass_t
-    else:
-        lcg_norm = 0.5
-    trim_m = compute_trim(displacement_t, lcg_norm, L, B, draft_m)
-
-    # KG = total VCG moment / total mass (tanks + pens)
-    kg_m = total_vcg_moment / total_mass_t if total_mass_t > 1e-9 else 0.0
-
-    # KB, BM, KM, GM
-    kb_m = compute_kb(draft_m)
-    bm_t = compute_bm_t(displacement_t, L, B)
-    km_m = kb_m + bm_t
-    gm_m = compute_gm(km_m, kg_m)
-
-    # Longitudinal strength (tanks + pens)
-    strength = compute_strength(
-        displacement_t, L, tanks, volumes, cargo_density_t_per_m3,
-        pens=pens_list,
-        pen_loadings=loadings,
-        mass_per_head=mass_per_head_t,
+    def __len__(self) -> int:
+        return int(self.displacement_t.shape[0])
+
+    def row(self, i: int) -> ConditionResults:
+        """Scalar ConditionResults for condition i (ancillary computed here)."""
+        draft_m = float(self.draft_m[i])
+        draft_aft_m = float(self.draft_aft_m[i])
+        draft_fwd_m = float(self.draft_fwd_m[i])
+        trim_m = float(self.trim_m[i])
+        gm_m = float(self.gm_m[i])
+        heel_deg = float(self.heel_deg[i])
+        return ConditionResults(
+            displacement_t=float(self.displacement_t[i]),
+            draft_m=draft_m,
+            draft_aft_m=draft_aft_m,
+            draft_fwd_m=draft_fwd_m,
+            trim_m=trim_m,
+            gm_m=gm_m,
+            kg_m=float(self.kg_m[i]),
+            km_m=float(self.km_m[i]),
+            heel_deg=heel_deg,
+            strength=self.strength.row(i),
+            ancillary=compute_ancillary(
+                self.ship, draft_m, draft_aft_m, draft_fwd_m, trim_m, gm_m, heel_deg,
+                self.gz.row(i) if self.gz is not None else None,
+            ),
+            strength_curves=self.strength_curves.row(i) if self.strength_curves is not None else None,
+        )
+
+
+def build_loading_matrices(
+    tanks: Sequence[Tank],
+    pens: Sequence[LivestockPen],
+    conditions: Sequence[LoadingCondition],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack conditions into (N x tanks) volume and (N x pens) head-count matrices.
+
+    Column order follows the tanks / pens sequences; ids missing from a
+    condition are 0.
+    """
+    volumes = np.zeros((len(conditions), len(tanks)))
+    loadings = np.zeros((len(conditions), len(pens)))
+    for i, cond in enumerate(conditions):
+        vols = cond.tank_volumes_m3 or {}
+        heads = getattr(cond, "pen_loadings", None) or {}
+        for j, tank in enumerate(tanks):
+            volumes[i, j] = vols.get(tank.id or -1, 0.0)
+        for j, pen in enumerate(pens):
+            loadings[i, j] = heads.get(pen.id or -1, 0)
+    return volumes, loadings
+
+
+def compute_conditions_batch(
+    ship: Ship,
+    tanks: Sequence[Tank],
+    pens: Sequence[LivestockPen] | None,
+    volumes_matrix: np.ndarray,
+    loadings_matrix: np.ndarray | None = None,
+    cargo_density_t_per_m3: float = 1.0,
+    mass_per_head_t: float = 0.5,
+    vcg_from_deck_m: float = 0.0,
+    soundings: Mapping[int, TankSoundingTable] | None = None,
+) -> BatchConditionResults:
+    """
+    Compute many loading conditions in one vectorized pass.
+
+    volumes_matrix is (N conditions x M tanks) in m³, columns in the order of
+    tanks; loadings_matrix is (N x P pens) head counts in the order of pens.
+    compute_condition runs the same kernel one condition at a time.
+    """
+    model = ShipModel.compile(ship, tanks, pens, soundings=soundings)
+    return compute_model_batch(
+        model, volumes_matrix, loadings_matrix,
+        cargo_density_t_per_m3=cargo_density_t_per_m3,
+        mass_per_head_t=mass_per_head_t,
+        vcg_from_deck_m=vcg_from_deck_m,
     )
 
-    # Draft at marks (trim +ve = stern down)
-    draft_aft_m = draft_m + trim_m / 2.0
-    draft_fwd_m = draft_m - trim_m / 2.0
 
-    # Heel from TCG (tanks + pens already in total_tcg_moment)
-    tcg_m = total_tcg_moment / total_mass_t if total_mass_t > 1e-9 else 0.0
-    import math
-    heel_deg = math.degrees(math.atan(tcg_m / gm_m)) if gm_m > 1e-9 else 0.0
+def _moment(masses: np.ndarray, arms: np.ndarray) -> np.ndarray:
+    """Row sums of masses * arms; arms are per tank (1-D) or per condition and tank."""
+    if arms.ndim == 1:
+        return masses @ arms
+    return np.einsum("ij,ij->i", masses, arms)
+
+
+def compute_model_batch(
+    model: ShipModel,
+    volumes_matrix: np.ndarray,
+    loadings_matrix: np.ndarray | None = None,
+    cargo_density_t_per_m3: float = 1.0,
+    mass_per_head_t: float = 0.5,
+    vcg_from_deck_m: float | np.ndarray = 0.0,
+    station_strength: bool = False,
+) -> BatchConditionResults:
+    """
+    compute_conditions_batch on a compiled ShipModel (columns in model order).
+
+    vcg_from_deck_m may be an (N,) array of per-condition values.
+
+    With station_strength, SF/BM curves on the model's station grid are
+    added as strength_curves.
+    """
+    ship = model.ship
+    volumes = np.atleast_2d(np.asarray(volumes_matrix, dtype=float))
+    n = volumes.shape[0]
+    if volumes.shape[1] != model.n_tanks:
+        raise ValueError(
+            f"volumes_matrix has {volumes.shape[1]} columns for {model.n_tanks} tanks"
+        )
+    if loadings_matrix is None:
+        heads = np.zeros((n, model.n_pens))
+    else:
+        heads = np.atleast_2d(np.asarray(loadings_matrix, dtype=float))
+    if heads.shape != (n, model.n_pens):
+        raise ValueError(
+            f"loadings_matrix shape {heads.shape} does not match ({n}, {model.n_pens})"
+        )
+
+    tank_pos = model.tank_longitudinal_pos
+    pen_lcg = model.pen_lcg_m
+
+    tank_mass = volumes * cargo_density_t_per_m3
+    # Unloaded (or negative) pens contribute nothing
+    pen_mass = np.where(heads > 0, heads, 0.0) * mass_per_head_t
+
+    L = max(1e-6, ship.length_overall_m)
+
+    # Contents centroids follow the sounding tables when the model has them
+    tank_lcg, tank_kg, tank_tcg = model.tank_centroids(volumes)
+
+    total_mass = tank_mass.sum(axis=1) + pen_mass.sum(axis=1)
+    lcg_moment = _moment(tank_mass, tank_lcg) + (pen_mass @ pen_lcg) / L
+    if np.ndim(vcg_from_deck_m) == 0:
+        pen_vcg_moment = pen_mass @ (model.pen_vcg_m + vcg_from_deck_m)
+    else:
+        # One VCG above deck per condition
+        pen_vcg_moment = pen_mass @ model.pen_vcg_m + pen_mass.sum(axis=1) * np.asarray(vcg_from_deck_m, dtype=float)
+    vcg_moment = _moment(tank_mass, tank_kg) + pen_vcg_moment
+    tcg_moment = _moment(tank_mass, tank_tcg) + pen_mass @ model.pen_tcg_m
 
-    ancillary = compute_ancillary(
-        ship, draft_m, draft_aft_m, draft_fwd_m, trim_m, gm_m, heel_deg
+    displacement = total_mass
+    has_mass = total_mass > 0
+    lcg_norm = np.where(has_mass, lcg_moment / np.where(has_mass, total_mass, 1.0), 0.5)
+
+    draft, trim, km, draft_aft, draft_fwd = model_floatation(model, displacement, lcg_norm)
+
+    significant = total_mass > 1e-9
+    safe_mass = np.where(significant, total_mass, 1.0)
+    kg = np.where(significant, vcg_moment / safe_mass, 0.0)
+
+    gm = np.maximum(0.0, km - kg)
+
+    tcg = np.where(significant, tcg_moment / safe_mass, 0.0)
+    stable = gm > 1e-9
+    heel = np.where(stable, np.degrees(np.arctan(tcg / np.where(stable, gm, 1.0))), 0.0)
+
+    strength = compute_strength_batch(
+        displacement, L, tank_mass, tank_pos, pen_mass, pen_lcg
     )
 
-    return ConditionResults(
-        displacement_t=displacement_t,
-        draft_m=draft_m,
-        draft_aft_m=draft_aft_m,
-        draft_fwd_m=draft_fwd_m,
-        trim_m=trim_m,
-        gm_m=gm_m,
-        kg_m=kg_m,
-        km_m=km_m,
-        heel_deg=heel_deg,
+    return BatchConditionResults(
+        ship=ship,
+        displacement_t=displacement,
+        draft_m=draft,
+        draft_aft_m=draft_aft,
+        draft_fwd_m=draft_fwd,
+        trim_m=trim,
+        kg_m=kg,
+        km_m=km,
+        gm_m=gm,
+        heel_deg=heel,
         strength=strength,
-        ancillary=ancillary,
+        gz=model.gz_engine.summary_batch(displacement, kg) if model.gz_engine is not None else None,
+        lcg_m=lcg_norm * L,
+        tcg_m=tcg,
+        strength_curves=(
+            model.strength_engine().curves(tank_mass, pen_mass, draft_aft, draft_fwd)
+            if station_strength else None
+        ),
+    )
+
+
+def model_floatation(
+    model: ShipModel,
+    displacement_t: np.ndarray | float,
+    lcg_norm: np.ndarray | float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (draft, trim, KM, draft aft, draft fwd) for displacement and normalized LCG.
+
+    Uses the model's hydrostatic table when present, else box formulas;
+    inputs may be scalars or arrays.
+    """
+    ship = model.ship
+    L = max(1e-6, ship.length_overall_m)
+    B = max(1e-6, ship.breadth_m)
+    displacement = np.asarray(displacement_t, dtype=float)
+    lcg = np.asarray(lcg_norm, dtype=float)
+    if model.hydrostatics is not None:
+        floatation = floatation_from_table(model.hydrostatics, displacement, lcg * L, L)
+        return (
+            floatation.draft_m, floatation.trim_m, floatation.km_m,
+            floatation.draft_aft_m, floatation.draft_fwd_m,
+        )
+    draft = displacement_to_draft_array(displacement, L, B)
+    trim = compute_trim_array(displacement, lcg, L, B)
+    km = 0.53 * draft + compute_bm_t_array(displacement, L, B)
+    return draft, trim, km, draft + trim / 2.0, draft - trim / 2.0
+
+
+def compute_condition_for_model(
+    model: ShipModel,
+    tank_volumes: Dict[int, float],
+    pen_loadings: Dict[int, int] | None = None,
+    cargo_density_t_per_m3: float = 1.0,
+    mass_per_head_t: float = 0.5,
+    vcg_from_deck_m: float = 0.0,
+    free_trim: bool = False,
+    warm_start: EquilibriumResult | None = None,
+    station_strength: bool = False,
+) -> ConditionResults:
+    """
+    compute_condition for one condition on a compiled ShipModel.
+
+    With free_trim, draft, trim and heel come from an equilibrium solve,
+    warm-started from warm_start (callers keep results.equilibrium for the
+    next compute of the same condition). station_strength adds SF/BM curves (see compute_model_batch).
+    """
+    batch = compute_model_batch(
+        model,
+        model.volumes_vector(tank_volumes)[np.newaxis, :],
+        model.loadings_vector(pen_loadings)[np.newaxis, :],
+        cargo_density_t_per_m3=cargo_density_t_per_m3,
+        mass_per_head_t=mass_per_head_t,
+        vcg_from_deck_m=vcg_from_deck_m,
+        station_strength=station_strength,
+    )
+    results = batch.row(0)
+    if not free_trim or results.displacement_t <= 0:
+        return results
+
+    eq = model.equilibrium_solver().solve(
+        results.displacement_t,
+        float(batch.lcg_m[0]),
+        float(batch.tcg_m[0]),
+        results.kg_m,
+        warm_start=warm_start,
+    )
+    results.draft_m = eq.draft_m
+    results.trim_m = eq.trim_m
+    results.heel_deg = eq.heel_deg
+    results.draft_aft_m = eq.draft_aft_m
+    results.draft_fwd_m = eq.draft_fwd_m
+    results.equilibrium = eq
+    results.ancillary = compute_ancillary(
+        model.ship, eq.draft_m, eq.draft_aft_m, eq.draft_fwd_m, eq.trim_m,
+        results.gm_m, eq.heel_deg, results.ancillary.gz if results.ancillary else None,
     )
+    return results
@@ -0,0 +1,299 @@
+"""
+Station-based still-water shear force and bending moment.
+
+The hull is divided into segments between stations (x from AP). Each
+tank and pen weight is spread uniformly over its longitudinal extent,
+which becomes a fixed (items x segments) distribution matrix when the
+engine is built; buoyancy per segment follows the sectional areas at the
+local draft (Bonjean curves, or a box section). Buoyancy is then scaled
+and given a small linear correction so that it balances the weight in
+force and moment, and SF and BM follow from cumulative sums over the
+segments. Everything per condition is a matrix product or a cumsum, so a
+200-station grid over thousands of items and many conditions runs in
+milliseconds.
+
+Sign convention: net load is weight minus buoyancy and shear is its
+running sum from AP; bending moment is positive hogging, negative
+sagging (as StrengthResult.hogging_bm_tm).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from ..models import LivestockPen, Tank
+from .hydrostatics import RHO_SEA
+
+# Longitudinal extent of a tank as a fraction of L when none is given
+DEFAULT_TANK_EXTENT_FRACTION = 0.05
+
+# Simplified design limits (as compute_strength), at design displacement
+DESIGN_BM_FACTOR = 0.12  # x displacement x L
+DESIGN_SF_FACTOR = 0.15  # x displacement
+
+
+@dataclass(slots=True)
+class SectionalAreaCurves:
+    """
+    Bonjean curves: immersed sectional area (m²) at stations x_m (from AP)
+    for drafts draft_m (above keel). area_m2 is (stations x drafts).
+    """
+    x_m: np.ndarray
+    draft_m: np.ndarray
+    area_m2: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.x_m = np.asarray(self.x_m, dtype=float)
+        self.draft_m = np.asarray(self.draft_m, dtype=float)
+        self.area_m2 = np.asarray(self.area_m2, dtype=float)
+        if self.area_m2.shape != (self.x_m.shape[0], self.draft_m.shape[0]):
+            raise ValueError(
+                f"area_m2 shape {self.area_m2.shape} does not match "
+                f"({self.x_m.shape[0]}, {self.draft_m.shape[0]})"
+            )
+        if self.x_m.shape[0] < 2 or np.any(np.diff(self.x_m) <= 0):
+            raise ValueError("Sectional area stations must be strictly increasing")
+        if self.draft_m.shape[0] < 2 or np.any(np.diff(self.draft_m) <= 0):
+            raise ValueError("Sectional area drafts must be strictly increasing")
+
+    def resampled(self, x_m: np.ndarray) -> "SectionalAreaCurves":
+        """Same curves on other stations (linear in x, zero outside the hull)."""
+        area = np.column_stack([
+            np.interp(x_m, self.x_m, col, left=0.0, right=0.0) for col in self.area_m2.T
+        ])
+        return SectionalAreaCurves(x_m=x_m, draft_m=self.draft_m, area_m2=area)
+
+
+@dataclass(slots=True)
+class StationStrengthCurves:
+    """
+    SF and BM curves on the station grid.
+
+    Per-condition arrays are (N x ...) for a batch or 1-D for one
+    condition (see row); reductions work along the last axis either way.
+    """
+    x_m: np.ndarray  # (S,) stations from AP
+    weight_t: np.ndarray  # (..., S-1) weight per segment
+    buoyancy_t: np.ndarray  # (..., S-1) buoyancy per segment
+    shear_force_t: np.ndarray  # (..., S)
+    bending_moment_tm: np.ndarray  # (..., S)
+    permissible_sf_t: np.ndarray  # (S,)
+    permissible_bm_tm: np.ndarray  # (S,)
+
+    @property
+    def sf_pct(self) -> np.ndarray:
+        """|SF| as a percentage of the permissible value at each station."""
+        return np.abs(self.shear_force_t) / self.permissible_sf_t * 100.0
+
+    @property
+    def bm_pct(self) -> np.ndarray:
+        """|BM| as a percentage of the permissible value at each station."""
+        return np.abs(self.bending_moment_tm) / self.permissible_bm_tm * 100.0
+
+    @property
+    def max_sf_pct(self) -> np.ndarray:
+        return self.sf_pct.max(axis=-1)
+
+    @property
+    def max_bm_pct(self) -> np.ndarray:
+        return self.bm_pct.max(axis=-1)
+
+    @property
+    def within_limits(self) -> np.ndarray:
+        """True where SF and BM are within permissible values at every station."""
+        return (self.max_sf_pct <= 100.0) & (self.max_bm_pct <= 100.0)
+
+    def row(self, i: int) -> "StationStrengthCurves":
+        """Curves of condition i from a batch."""
+        return StationStrengthCurves(
+            x_m=self.x_m,
+            weight_t=self.weight_t[i],
+            buoyancy_t=self.buoyancy_t[i],
+            shear_force_t=self.shear_force_t[i],
+            bending_moment_tm=self.bending_moment_tm[i],
+            permissible_sf_t=self.permissible_sf_t,
+            permissible_bm_tm=self.permissible_bm_tm,
+        )
+
+
+def distribution_matrix(
+    x_m: np.ndarray,
+    center_m: np.ndarray,
+    half_length_m: np.ndarray,
+) -> np.ndarray:
+    """
+    (items x segments) fractions of each item's weight per segment.
+
+    Items are spread uniformly over center +- half_length, clipped to the
+    grid; zero-length items go to the segment containing their centre.
+    Rows sum to 1.
+    """
+    lo_edge, hi_edge = x_m[:-1], x_m[1:]
+    center = np.clip(np.asarray(center_m, dtype=float), x_m[0], x_m[-1])
+    half = np.maximum(0.0, np.asarray(half_length_m, dtype=float))
+    a = np.clip(center - half, x_m[0], x_m[-1])[:, None]
+    b = np.clip(center + half, x_m[0], x_m[-1])[:, None]
+    overlap = np.clip(np.minimum(b, hi_edge) - np.maximum(a, lo_edge), 0.0, None)
+    length = (b - a)[:, 0]
+    out = np.zeros((center.shape[0], lo_edge.shape[0]))
+    spread = length > 1e-12
+    out[spread] = overlap[spread] / length[spread, None]
+    point = np.flatnonzero(~spread)
+    seg = np.clip(np.searchsorted(x_m, center[point], side="right") - 1, 0, lo_edge.shape[0] - 1)
+    out[point, seg] = 1.0
+    return out
+
+
+class StationStrengthEngine:
+    """
+    Vectorized SF/BM on a fixed station grid for one ship's tanks and pens.
+
+    Item positions and extents are compiled into distribution matrices
+    once; curves() then takes per-condition masses and drafts. Without
+    sectional areas the buoyancy is that of a box of the ship's breadth.
+    Permissible SF/BM default to the simplified design limits at the
+    design displacement, uniform along the hull.
+    """
+
+    def __init__(
+        self,
+        length_m: float,
+        breadth_m: float,
+        tank_center_m: np.ndarray,
+        tank_half_length_m: np.ndarray,
+        pen_center_m: np.ndarray,
+        pen_half_length_m: np.ndarray,
+        n_stations: int = 201,
+        sectional_areas: SectionalAreaCurves | None = None,
+        permissible_sf_t: np.ndarray | float | None = None,
+        permissible_bm_tm: np.ndarray | float | None = None,
+        design_draft_m: float = 0.0,
+        rho_t_per_m3: float = RHO_SEA,
+    ) -> None:
+        if n_stations < 3:
+            raise ValueError("Station grid needs at least three stations")
+        self.length_m = L = max(1e-6, length_m)
+        self.breadth_m = max(1e-6, breadth_m)
+        self.rho = rho_t_per_m3
+        self.x_m = np.linspace(0.0, L, n_stations)
+        self.dx_m = np.diff(self.x_m)
+        self.segment_center_m = 0.5 * (self.x_m[:-1] + self.x_m[1:])
+        self.tank_distribution = distribution_matrix(self.x_m, tank_center_m, tank_half_length_m)
+        self.pen_distribution = distribution_matrix(self.x_m, pen_center_m, pen_half_length_m)
+        self.sectional_areas = sectional_areas.resampled(self.x_m) if sectional_areas is not None else None
+
+        # Linear correction shape: zero net force, unit moment
+        offset = self.segment_center_m - (self.segment_center_m @ self.dx_m) / L
+        self._moment_shape = offset * self.dx_m / float((offset ** 2) @ self.dx_m)
+
+        design_disp = L * self.breadth_m * max(0.0, design_draft_m) * rho_t_per_m3
+        if permissible_sf_t is None:
+            permissible_sf_t = design_disp * DESIGN_SF_FACTOR
+        if permissible_bm_tm is None:
+            permissible_bm_tm = design_disp * L * DESIGN_BM_FACTOR
+        # Guard against a zero limit (no design draft): report 0% rather than inf
+        self.permissible_sf_t = np.maximum(1e-6, np.broadcast_to(np.asarray(permissible_sf_t, dtype=float), self.x_m.shape))
+        self.permissible_bm_tm = np.maximum(1e-6, np.broadcast_to(np.asarray(permissible_bm_tm, dtype=float), self.x_m.shape))
+
+    @classmethod
+    def for_items(
+        cls,
+        length_m: float,
+        breadth_m: float,
+        tanks: Sequence[Tank],
+        pens: Sequence[LivestockPen],
+        **kwargs,
+    ) -> "StationStrengthEngine":
+        """
+        Engine for tanks (centred at longitudinal_pos * L, extent
+        DEFAULT_TANK_EXTENT_FRACTION * L) and pens (centred at lcg_m, a
+        square pen of area_m2).
+        """
+        L = max(1e-6, length_m)
+        return cls(
+            L,
+            breadth_m,
+            tank_center_m=np.array([t.longitudinal_pos * L for t in tanks], dtype=float),
+            tank_half_length_m=np.full(len(tanks), 0.5 * DEFAULT_TANK_EXTENT_FRACTION * L),
+            pen_center_m=np.array([p.lcg_m for p in pens], dtype=float),
+            pen_half_length_m=np.array([0.5 * np.sqrt(max(0.0, p.area_m2)) for p in pens], dtype=float),
+            **kwargs,
+        )
+
+    def _segment_buoyancy(self, draft_aft_m: np.ndarray, draft_fwd_m: np.ndarray) -> np.ndarray:
+        """Unscaled buoyancy per segment (N x S-1) at the given draft marks."""
+        frac = self.x_m / self.length_m
+        local = draft_aft_m[:, None] + (draft_fwd_m - draft_aft_m)[:, None] * frac
+        local = np.maximum(0.0, local)
+        if self.sectional_areas is None:
+            area = self.breadth_m * local
+        else:
+            drafts = self.sectional_areas.draft_m
+            table = self.sectional_areas.area_m2
+            idx = np.clip(np.searchsorted(drafts, local) - 1, 0, drafts.shape[0] - 2)
+            t = np.clip((local - drafts[idx]) / (drafts[idx + 1] - drafts[idx]), 0.0, 1.0)
+            cols = np.arange(self.x_m.shape[0])
+            area = (1.0 - t) * table[cols, idx] + t * table[cols, idx + 1]
+        return self.rho * 0.5 * (area[:, :-1] + area[:, 1:]) * self.dx_m
+
+    def curves(
+        self,
+        tank_masses_t: np.ndarray,
+        pen_masses_t: np.ndarray,
+        draft_aft_m: np.ndarray,
+        draft_fwd_m: np.ndarray,
+    ) -> StationStrengthCurves:
+        """
+        SF/BM for N conditions: tank_masses_t is (N x tanks), pen_masses_t
+        (N x pens) and the drafts (N,).
+        """
+        tank_m = np.atleast_2d(np.asarray(tank_masses_t, dtype=float))
+        pen_m = np.atleast_2d(np.asarray(pen_masses_t, dtype=float))
+        weight = tank_m @ self.tank_distribution
+        if pen_m.shape[1]:
+            weight = weight + pen_m @ self.pen_distribution
+        return self.curves_from_weight(weight, draft_aft_m, draft_fwd_m)
+
+    def curves_from_weight(
+        self,
+        weight_t: np.ndarray,
+        draft_aft_m: np.ndarray,
+        draft_fwd_m: np.ndarray,
+    ) -> StationStrengthCurves:
+        """
+        SF/BM for N conditions from their (N x segments) weight per segment,
+        e.g. a base condition's weight plus one item's distribution row.
+        """
+        weight = np.atleast_2d(np.asarray(weight_t, dtype=float))
+        n = weight.shape[0]
+        total = weight.sum(axis=1)
+        moment = weight @ self.segment_center_m
+
+        aft = np.broadcast_to(np.asarray(draft_aft_m, dtype=float), (n,))
+        fwd = np.broadcast_to(np.asarray(draft_fwd_m, dtype=float), (n,))
+        raw = self._segment_buoyancy(aft, fwd)
+        raw_total = raw.sum(axis=1)
+        # No immersed section (e.g. zero draft): fall back to uniform buoyancy
+        uniform = self.dx_m / self.length_m
+        scale = np.where(raw_total > 0, total / np.where(raw_total > 0, raw_total, 1.0), 0.0)
+        buoyancy = np.where((raw_total > 0)[:, None], raw * scale[:, None], total[:, None] * uniform)
+        # Close the moment so SF and BM vanish at both ends
+        buoyancy += (moment - buoyancy @ self.segment_center_m)[:, None] * self._moment_shape
+
+        load = weight - buoyancy
+        sf = np.zeros((n, self.x_m.shape[0]))
+        np.cumsum(load, axis=1, out=sf[:, 1:])
+        bm = np.zeros_like(sf)
+        np.cumsum(0.5 * (sf[:, :-1] + sf[:, 1:]) * self.dx_m, axis=1, out=bm[:, 1:])
+        return StationStrengthCurves(
+            x_m=self.x_m,
+            weight_t=weight,
+            buoyancy_t=buoyancy,
+            shear_force_t=sf,
+            bending_moment_tm=bm,
+            permissible_sf_t=self.permissible_sf_t,
+            permissible_bm_tm=self.permissible_bm_tm,
+        )
@@ -7,18 +7,21 @@ Tank volume and LCG, VCG, TCG are calculated from STL (replacing DXF).
 
 from __future__ import annotations
 
+import importlib.util
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, List, Tuple
 
 if TYPE_CHECKING:
     from ..models import Tank
 
-try:
+# trimesh is slow to import, so it is only loaded by the first STL operation
+TRIMESH_AVAILABLE = importlib.util.find_spec("trimesh") is not None
+
+
+def _trimesh() -> Any:
     import trimesh
-    TRIMESH_AVAILABLE = True
-except ImportError:
-    TRIMESH_AVAILABLE = False
-    trimesh = None
+
+    return trimesh
 
 
 def load_stl(path: str | Path) -> Any:
@@ -36,7 +39,7 @@ def load_stl(path: str | Path) -> Any:
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"STL file not found: {path}")
-    result = trimesh.load_mesh(str(path))
+    result = _trimesh().load_mesh(str(path))
     return result
 
 
@@ -44,7 +47,7 @@ def mesh_volume(mesh: Any) -> float:
     """Volume in m³ (or same units as STL). Returns 0 if not a single solid mesh."""
     if not TRIMESH_AVAILABLE:
         return 0.0
-    if isinstance(mesh, trimesh.Scene):
+    if isinstance(mesh, _trimesh().Scene):
         return sum(mesh_volume(g) for g in mesh.geometry.values())
     if hasattr(mesh, "volume"):
         return float(mesh.volume)
@@ -55,7 +58,7 @@ def mesh_centroid(mesh: Any) -> Tuple[float, float, float]:
     """Center of mass (x, y, z). Returns (0,0,0) if not available."""
     if not TRIMESH_AVAILABLE:
         return 0.0, 0.0, 0.0
-    if isinstance(mesh, trimesh.Scene):
+    if isinstance(mesh, _trimesh().Scene):
         # Use first geometry or weighted average; simple case use first
         geos = list(mesh.geometry.values())
         if not geos:
@@ -71,7 +74,7 @@ def mesh_bounds(mesh: Any) -> Tuple[Tuple[float, float, float], Tuple[float, flo
     """Axis-aligned bounds: ((xmin, ymin, zmin), (xmax, ymax, zmax))."""
     if not TRIMESH_AVAILABLE:
         return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
-    if isinstance(mesh, trimesh.Scene):
+    if isinstance(mesh, _trimesh().Scene):
         geos = list(mesh.geometry.values())
         if not geos:
             return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
@@ -95,7 +98,7 @@ def is_watertight(mesh: Any) -> bool:
     """True if the mesh is closed (no holes); required for meaningful volume."""
     if not TRIMESH_AVAILABLE:
         return False
-    if isinstance(mesh, trimesh.Scene):
+    if isinstance(mesh, _trimesh().Scene):
         return all(is_watertight(g) for g in mesh.geometry.values())
     return bool(getattr(mesh, "is_watertight", False))
 
@@ -147,9 +150,10 @@ def tanks_from_stl(
     path = Path(stl_path)
     if not path.exists():
         raise FileNotFoundError(f"STL file not found: {path}")
-    result = trimesh.load_mesh(str(path))  # type: ignore[union-attr]
+    trimesh = _trimesh()
+    result = trimesh.load_mesh(str(path))
     tanks: List[Tank] = []
-    if isinstance(result, trimesh.Scene):  # type: ignore[union-attr]
+    if isinstance(result, trimesh.Scene):
         for i, (geom_name, geom) in enumerate(result.geometry.items()):
             name = geom_name or path.stem or f"Tank_{i + 1}"
             tanks.append(_tank_from_mesh(geom, name, ship_id, deck_name, density_t_per_m3))
@@ -165,10 +169,18 @@ def create_tanks_from_stl(
     deck_name: str,
     tank_repo: Any,
     density_t_per_m3: float = 1.025,
+    sounding_repo: Any = None,
 ) -> List[Tank]:
-    """Load STL, create Tank instances with volume and LCG/VCG/TCG from mesh, persist and return them."""
+    """
+    Load STL, create Tank instances with volume and LCG/VCG/TCG from mesh, persist and return them.
+    With sounding_repo, sounding tables sliced from each tank body are stored too.
+    """
     tank_models = tanks_from_stl(stl_path, ship_id, deck_name, density_t_per_m3)
     created: List[Tank] = []
     for t in tank_models:
         created.append(tank_repo.create(t))
+    if sounding_repo is not None:
+        from .tank_sounding_generator import store_sounding_tables
+
+        store_sounding_tables(stl_path, created, sounding_repo)
     return created
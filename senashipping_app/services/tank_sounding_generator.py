@@ -0,0 +1,150 @@
+"""
+Tank sounding tables from tank meshes.
+
+Each tank body of a tanks STL (as loaded by tanks_from_stl) is sliced
+with horizontal planes from its bottom to its top, using the same
+clipping and volume integration as the hull hydrostatics. Every level
+gives the contents volume, its centroid and the transverse moment of
+inertia of the free surface. Results are cached next to the hull
+hydrostatics as <sha256>-<grid>.soundings.npz, keyed by the STL contents
+and the number of levels.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+
+from ..models import Tank
+from ..models.tank_sounding import TankSoundingTable
+from .hydrostatic_generator import (
+    CACHE_FORMAT_VERSION,
+    default_cache_dir,
+    grid_digest,
+    hydrostatics_from_mesh,
+    mesh_arrays,
+    stl_content_hash,
+)
+
+# Raw per-level columns stored in the cache, (tanks x levels) each
+_RAW_FIELDS = ("level_m", "volume_m3", "lcg_m", "vcg_m", "tcg_m", "fs_inertia_m4")
+
+DEFAULT_SOUNDING_LEVELS = 101
+
+
+def _tank_bodies(mesh: Any) -> List[Tuple[str, Any]]:
+    """(name, mesh) per tank body, in tanks_from_stl order."""
+    geometry = getattr(mesh, "geometry", None)
+    if geometry is not None:
+        return list(geometry.items())
+    return [("", mesh)]
+
+
+def _sounding_raw(mesh: Any, n_levels: int, max_workers: int | None) -> np.ndarray:
+    """(fields x levels) raw sounding columns for one closed tank mesh."""
+    vertices, _faces = mesh_arrays(mesh)
+    z_min, z_max = float(vertices[:, 2].min()), float(vertices[:, 2].max())
+    heights = np.linspace(z_min, z_max, n_levels)
+    sliced = hydrostatics_from_mesh(
+        mesh, heights, (0.0,), rho_t_per_m3=1.0, max_workers=max_workers
+    )
+    raw = np.vstack([
+        heights - z_min,
+        sliced.volume_m3[0],
+        sliced.lcb_m[0],
+        sliced.kb_m[0],
+        sliced.tcb_m[0],
+        sliced.i_t_m4[0],
+    ])
+    # The empty row has no centroid and the top slice no cut: use the
+    # limits from the neighbouring levels.
+    raw[2:5, 0] = raw[2:5, 1]
+    raw[5, 0] = raw[5, 1]
+    raw[5, -1] = raw[5, -2]
+    return raw
+
+
+def _table_from_raw(raw: np.ndarray) -> TankSoundingTable:
+    """Table from raw columns, dropping levels that add no volume."""
+    volume = raw[1]
+    keep = np.concatenate(([True], volume[1:] > np.maximum.accumulate(volume)[:-1]))
+    return TankSoundingTable(*(raw[i][keep] for i in range(len(_RAW_FIELDS))))
+
+
+def sounding_table_from_mesh(
+    mesh: Any,
+    n_levels: int = DEFAULT_SOUNDING_LEVELS,
+    max_workers: int | None = 1,
+) -> TankSoundingTable:
+    """Sounding table of one closed tank mesh on n_levels equally spaced levels."""
+    return _table_from_raw(_sounding_raw(mesh, n_levels, max_workers))
+
+
+def generate_sounding_tables(
+    stl_path: str | Path,
+    n_levels: int = DEFAULT_SOUNDING_LEVELS,
+    cache_dir: str | Path | None = None,
+    max_workers: int | None = 1,
+) -> List[Tuple[str, TankSoundingTable]]:
+    """
+    (body name, table) for every tank body in stl_path, from the
+    .soundings.npz cache when the same STL was sliced on the same levels.
+    """
+    from .stl_mesh_service import load_stl
+
+    grid = grid_digest(n_levels)
+    cache_file = Path(cache_dir or default_cache_dir()) / f"{stl_content_hash(stl_path)}-{grid}.soundings.npz"
+    if cache_file.exists():
+        try:
+            with np.load(cache_file, allow_pickle=False) as data:
+                if (
+                    int(data["format_version"]) == CACHE_FORMAT_VERSION
+                    and int(data["n_levels"]) == n_levels
+                ):
+                    names = [str(n) for n in data["names"]]
+                    raw = np.stack([data[name] for name in _RAW_FIELDS], axis=1)
+                    return [(name, _table_from_raw(r)) for name, r in zip(names, raw)]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    bodies = _tank_bodies(load_stl(stl_path))
+    raw = np.stack([_sounding_raw(body, n_levels, max_workers) for _name, body in bodies])
+    names = [name for name, _body in bodies]
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_name(cache_file.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            format_version=CACHE_FORMAT_VERSION,
+            n_levels=n_levels,
+            names=np.array(names, dtype=str),
+            **{name: raw[:, i] for i, name in enumerate(_RAW_FIELDS)},
+        )
+    os.replace(tmp, cache_file)
+    return [(name, _table_from_raw(r)) for name, r in zip(names, raw)]
+
+
+def store_sounding_tables(
+    stl_path: str | Path,
+    tanks: Sequence[Tank],
+    sounding_repo: Any,
+    n_levels: int = DEFAULT_SOUNDING_LEVELS,
+    **kwargs: Any,
+) -> List[TankSoundingTable]:
+    """
+    Generate (or load cached) sounding tables for the tank bodies of
+    stl_path and store them for tanks, which must be the persisted tanks
+    created from the same STL (same order).
+    """
+    tables = [table for _name, table in generate_sounding_tables(stl_path, n_levels, **kwargs)]
+    if len(tables) != len(tanks):
+        raise ValueError(f"STL has {len(tables)} tank bodies for {len(tanks)} tanks")
+    for tank, table in zip(tanks, tables):
+        if tank.id is None or tank.ship_id is None:
+            raise ValueError("Tanks must be persisted before storing sounding tables")
+        sounding_repo.replace_for_tank(tank.ship_id, tank.id, table)
+    return tables
+
@@ -2,24 +2,25 @@
 Validation and limit checks for loading conditions.
 
 Detects negative GM, over-limit BM, invalid tank combos, extreme trim,
-zero-weight divisions, and applies free surface correction.
+zero-weight divisions, and applies free surface correction (computed in
+free_surface, whose functions are re-exported here).
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List
-
-from ..config.limits import (
-    EPS,
-    FREE_SURFACE_FACTOR,
-    MAX_DRAFT_FRACTION,
-    MAX_SWBM_FRACTION,
-    MAX_TRIM_FRACTION,
-    MIN_GM_M,
-)
+from typing import Dict, List, Sequence
+
+from ..config.limits import EPS
 from ..models import Ship, Tank
+from .free_surface import (  # noqa: F401 - free_surface_terms is re-exported
+    compute_free_surface_correction,
+    compute_free_surface_correction_array,
+    free_surface_terms,
+)
+from .rule_engine import VALIDATION_RULES, fields_from_results
+from .ship_model import ShipModel
 from .stability_service import ConditionResults
 
 
@@ -60,130 +61,62 @@ def safe_divide(a: float, b: float, default: float = 0.0) -> float:
     return a / b
 
 
-def compute_free_surface_correction(
-    tanks: List[Tank],
-    volumes: Dict[int, float],
-    displacement_t: float,
-    cargo_density: float,
-) -> float:
-    """
-    Approximate free surface correction (m) for slack tanks.
-    Reduces effective GM.
-    """
-    if displacement_t < EPS:
-        return 0.0
-    correction = 0.0
-    for tank in tanks:
-        vol = volumes.get(tank.id or -1, 0.0)
-        cap = max(EPS, tank.capacity_m3)
-        fill_ratio = vol / cap
-        # Slack: partially filled (e.g. 5–95%)
-        if 0.05 < fill_ratio < 0.95:
-            # Simplified: i_t for rectangular tank ~ B³*L/12, mass = vol*density
-            # Reduction ≈ (rho * i_t) / disp. Use factor based on tank size.
-            mass = vol * cargo_density
-            correction += (mass / displacement_t) * FREE_SURFACE_FACTOR * (1 - fill_ratio)
-    return min(correction, 2.0)  # Cap total correction
-
-
 def validate_condition(
     ship: Ship,
     results: ConditionResults,
-    tanks: List[Tank],
+    tanks: Sequence[Tank],
     volumes: Dict[int, float],
     cargo_density: float = 1.0,
+    model: ShipModel | None = None,
+    free_surface_correction_m: float | None = None,
 ) -> ValidationResult:
     """
     Run all validation checks and compute effective GM after free surface.
+
+    With a compiled ShipModel the free-surface and tank-id checks run on its
+    arrays instead of iterating tanks. A free_surface_correction_m already
+    known (e.g. from an IncrementalConditionState) is used as is.
     """
     issues: List[ValidationIssue] = []
     gm_raw = results.gm_m
 
     # Free surface correction
-    fsc = compute_free_surface_correction(tanks, volumes, results.displacement_t, cargo_density)
+    if free_surface_correction_m is not None:
+        fsc = free_surface_correction_m
+    elif model is not None:
+        fsc = float(compute_free_surface_correction_array(
+            model, model.volumes_vector(volumes), results.displacement_t, cargo_density
+        ))
+    else:
+        fsc = compute_free_surface_correction(tanks, volumes, results.displacement_t, cargo_density)
     gm_effective = max(0.0, gm_raw - fsc)
 
-    # 1. Negative / low GM
-    if gm_effective < MIN_GM_M:
-        issues.append(
-            ValidationIssue(
-                code="GM_LOW",
-                severity=ValidationSeverity.ERROR,
-                message=f"GM {gm_effective:.3f} m below minimum {MIN_GM_M} m. Condition unsafe.",
-                value=gm_effective,
-                limit=MIN_GM_M,
-            )
-        )
-    elif gm_effective < MIN_GM_M * 1.5:
-        issues.append(
-            ValidationIssue(
-                code="GM_MARGINAL",
-                severity=ValidationSeverity.WARNING,
-                message=f"GM {gm_effective:.3f} m is marginal. Minimum recommended: {MIN_GM_M} m.",
-                value=gm_effective,
-                limit=MIN_GM_M,
-            )
-        )
-
-    # 2. Extreme trim
-    L = max(EPS, ship.length_overall_m)
-    max_trim = L * MAX_TRIM_FRACTION
-    if abs(results.trim_m) > max_trim:
-        issues.append(
-            ValidationIssue(
-                code="TRIM_EXCESSIVE",
-                severity=ValidationSeverity.ERROR,
-                message=f"Trim {results.trim_m:.2f} m exceeds limit {max_trim:.2f} m ({MAX_TRIM_FRACTION*100:.1f}% LOA).",
-                value=abs(results.trim_m),
-                limit=max_trim,
-            )
-        )
-
-    # 3. Draft over limit
-    design_draft = max(EPS, ship.design_draft_m)
-    if results.draft_m > design_draft * MAX_DRAFT_FRACTION:
-        issues.append(
-            ValidationIssue(
-                code="DRAFT_OVER",
-                severity=ValidationSeverity.ERROR,
-                message=f"Draft {results.draft_m:.2f} m exceeds {MAX_DRAFT_FRACTION*100:.0f}% of design draft {design_draft:.2f} m.",
-                value=results.draft_m,
-                limit=design_draft * MAX_DRAFT_FRACTION,
-            )
-        )
-
-    # 4. Over-limit bending moment
-    if hasattr(results, "strength") and results.strength:
-        swbm = abs(results.strength.still_water_bm_approx_tm)
-        # Placeholder: assume design limit ~ disp * L * 0.1 (simplified)
-        design_bm = results.displacement_t * L * 0.1
-        if design_bm > EPS and swbm > design_bm * MAX_SWBM_FRACTION:
-            issues.append(
-                ValidationIssue(
-                    code="BM_OVER",
-                    severity=ValidationSeverity.WARNING,
-                    message=f"Still-water BM {swbm:.0f} tm may exceed design limits. Verify strength.",
-                    value=swbm,
-                    limit=design_bm,
-                )
-            )
-
-    # 5. Zero displacement (informational)
-    if results.displacement_t < EPS:
+    # Limit checks (negative / low GM, extreme trim, draft over limit,
+    # over-limit bending moment, zero displacement) are the rules of
+    # rule_engine.VALIDATION_RULES; each failing one is an issue
+    checks = VALIDATION_RULES.evaluate(ship, fields_from_results(results, fsc))
+    for r, rule in enumerate(checks.rules):
+        if checks.ok[r, 0] or not checks.applicable[r, 0]:
+            continue
+        value, limit = float(checks.value[r, 0]), float(checks.limit[r])
         issues.append(
             ValidationIssue(
-                code="ZERO_WEIGHT",
-                severity=ValidationSeverity.WARNING,
-                message="Zero displacement. No cargo/ballast loaded.",
-                value=0.0,
-                limit=None,
+                code=rule.code,
+                severity=ValidationSeverity(rule.severity),
+                message=rule.message(value, limit, float(checks.margin[r, 0])),
+                value=value,
+                limit=limit,
             )
         )
 
-    # 6. Invalid tank IDs (checked earlier in condition_service; here we flag unknown refs)
-    tank_ids = {t.id for t in tanks if t.id is not None}
-    for tid in volumes:
-        if tid not in tank_ids and volumes[tid] > EPS:
+    # Invalid tank IDs (checked earlier in condition_service; here we flag unknown refs)
+    if model is not None:
+        unknown = model.unknown_tank_ids(volumes)
+    else:
+        tank_ids = {t.id for t in tanks if t.id is not None}
+        unknown = [tid for tid in volumes if tid not in tank_ids]
+    for tid in unknown:
+        if volumes[tid] > EPS:
             issues.append(
                 ValidationIssue(
                     code="TANK_UNKNOWN",
@@ -0,0 +1,172 @@
+"""
+Voyage timeline: the loading condition at every time step of a voyage.
+
+Starting from the departure condition, each step burns bunkers, draws
+fresh water and fodder for the ship and the livestock carried, and moves
+the dung produced (dung_weight_pct_per_day of the livestock weight) into
+the Dung tanks. Only the tanks whose contents change are updated on an
+IncrementalConditionState, and the criteria are re-run through an
+IncrementalRuleEvaluator, so each step costs a handful of single-tank
+updates rather than a full condition compute.
+
+Consumables are drawn from every tank of their group in proportion to
+what each tank holds, and dung fills the Dung tanks in proportion to
+their free space, so a group's tanks empty (or fill) together. Like the
+rest of the calculation, tank contents are weighed at one
+cargo_density_t_per_m3; consumption in tonnes is converted to m³ with it.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Mapping, Tuple
+
+import numpy as np
+
+from ..models import TankType
+from .incremental_state import IncrementalConditionState, IncrementalResults
+from .rule_engine import IncrementalRuleEvaluator, fields_from_results
+from .ship_model import ShipModel
+
+# Consumable groups: tank types and categories (as in the condition table tabs)
+TANK_GROUPS: Dict[str, Tuple[Tuple[TankType, ...], Tuple[str, ...]]] = {
+    "fuel": ((TankType.FUEL,), ("Heavy Fuel Oil", "Diesel Oil")),
+    "fresh_water": ((TankType.FRESH_WATER,), ("Fresh Water",)),
+    "fodder": ((), ("Fodder Hold",)),
+    "dung": ((), ("Dung",)),
+}
+
+
+@dataclass(slots=True)
+class ConsumptionRates:
+    """Daily consumption; per-head rates apply to the heads loaded at departure."""
+    fuel_t_per_day: float = 0.0
+    fresh_water_t_per_day: float = 0.0  # crew and ship services
+    water_kg_per_head_day: float = 0.0
+    fodder_kg_per_head_day: float = 0.0
+
+
+@dataclass(slots=True)
+class VoyageStep:
+    """Condition after hours at sea; failed lists the criteria codes not met."""
+    step: int
+    hours: float
+    results: IncrementalResults
+    group_volumes_m3: Dict[str, float]  # contents left (dung: held) per group
+    failed: Tuple[str, ...] = ()
+    # Groups that could not supply (dung: could not stow) this step's demand
+    shortages: Tuple[str, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.shortages
+
+
+def tank_group_columns(model: ShipModel) -> Dict[str, List[int]]:
+    """Model columns of the tanks in each consumable group."""
+    groups: Dict[str, List[int]] = {name: [] for name in TANK_GROUPS}
+    for i, tank in enumerate(model.tanks):
+        if tank.id is None:
+            continue
+        for name, (types, categories) in TANK_GROUPS.items():
+            if tank.tank_type in types or tank.category in categories:
+                groups[name].append(i)
+                break
+    return groups
+
+
+def _draw(contents: np.ndarray, amount: float) -> Tuple[np.ndarray, bool]:
+    """New contents after taking amount pro rata; (contents, short)."""
+    total = float(contents.sum())
+    if amount <= 0.0:
+        return contents, False
+    if amount >= total:
+        return np.zeros_like(contents), amount > total
+    return contents * (1.0 - amount / total), False
+
+
+def simulate_voyage(
+    model: ShipModel,
+    tank_volumes: Mapping[int, float] | None,
+    pen_loadings: Mapping[int, int] | None = None,
+    days: float = 1.0,
+    step_hours: float = 1.0,
+    rates: ConsumptionRates | None = None,
+    dung_weight_pct_per_day: float = 0.0,
+    cargo_density_t_per_m3: float = 1.0,
+    mass_per_head_t: float = 0.5,
+    vcg_from_deck_m: float = 0.0,
+) -> Iterator[VoyageStep]:
+    """
+    Yield the condition at departure (step 0) and after every step_hours
+    until days have passed; the last step may be shorter.
+    """
+    if days < 0:
+        raise ValueError("days must be non-negative")
+    if step_hours <= 0:
+        raise ValueError("step_hours must be positive")
+    rates = rates or ConsumptionRates()
+    density = max(1e-9, cargo_density_t_per_m3)
+    state = IncrementalConditionState(
+        model, tank_volumes, pen_loadings,
+        cargo_density_t_per_m3=cargo_density_t_per_m3,
+        mass_per_head_t=mass_per_head_t,
+        vcg_from_deck_m=vcg_from_deck_m,
+    )
+    evaluator = IncrementalRuleEvaluator(model.ship, model.gz_engine)
+    groups = {name: np.array(cols, dtype=np.intp) for name, cols in tank_group_columns(model).items()}
+    tank_ids = model.tank_ids
+    heads = float(np.maximum(state.pen_heads, 0.0).sum())
+    livestock_t = heads * mass_per_head_t
+
+    # Demand per hour in m³ of tank contents
+    per_hour = {
+        "fuel": rates.fuel_t_per_day / 24.0 / density,
+        "fresh_water": (rates.fresh_water_t_per_day + heads * rates.water_kg_per_head_day / 1000.0)
+        / 24.0 / density,
+        "fodder": heads * rates.fodder_kg_per_head_day / 1000.0 / 24.0 / density,
+        "dung": livestock_t * dung_weight_pct_per_day / 100.0 / 24.0 / density,
+    }
+
+    def set_group(cols: np.ndarray, volumes: np.ndarray) -> None:
+        for col, vol in zip(cols, volumes):
+            state.set_tank_volume(int(tank_ids[col]), float(vol))
+
+    def step_result(step: int, hours: float, shortages: Tuple[str, ...]) -> VoyageStep:
+        results = state.results()
+        criteria = evaluator.evaluate(fields_from_results(results))
+        failed = criteria.applicable[:, 0] & ~criteria.ok[:, 0]
+        return VoyageStep(
+            step=step,
+            hours=hours,
+            results=results,
+            group_volumes_m3={name: float(state.tank_volumes[cols].sum()) for name, cols in groups.items()},
+            failed=tuple(code for code, f in zip(criteria.codes, failed) if f),
+            shortages=shortages,
+        )
+
+    yield step_result(0, 0.0, ())
+    total_hours = days * 24.0
+    n_steps = int(math.ceil(total_hours / step_hours - 1e-9))
+    for step in range(1, n_steps + 1):
+        hours = min(step * step_hours, total_hours)
+        dt = hours - (step - 1) * step_hours
+        shortages: List[str] = []
+        for name in ("fuel", "fresh_water", "fodder"):
+            cols = groups[name]
+            amount = per_hour[name] * dt
+            if amount <= 0.0:
+                continue
+            new, short = _draw(state.tank_volumes[cols], amount)
+            set_group(cols, new)
+            if short:
+                shortages.append(name)
+        cols = groups["dung"]
+        amount = per_hour["dung"] * dt
+        if amount > 0.0:
+            free, short = _draw(model.tank_capacity_m3[cols] - state.tank_volumes[cols], amount)
+            set_group(cols, model.tank_capacity_m3[cols] - free)
+            if short:
+                shortages.append("dung")
+        yield step_result(step, hours, tuple(shortages))
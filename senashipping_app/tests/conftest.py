@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import sys
 import tempfile
+from dataclasses import replace
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 # Ensure project root is on path when running tests
@@ -15,6 +17,8 @@ if str(_project_root) not in sys.path:
 
 from senashipping_app.repositories.database import init_database
 from senashipping_app.models import Ship, Tank, TankType, Voyage, LoadingCondition
+from senashipping_app.services.hydrostatics import box_hydrostatic_table
+from senashipping_app.services.ship_model import ShipModel
 
 
 @pytest.fixture
@@ -65,6 +69,21 @@ def sample_ship():
     )
 
 
+@pytest.fixture
+def box_model(sample_ship):
+    """
+    Factory compiling a ShipModel of the sample ship (id 1) with a box
+    hydrostatic table, for the given tanks and pens.
+    """
+    ship = replace(sample_ship, id=1)
+    table = box_hydrostatic_table(ship.length_overall_m, ship.breadth_m, np.linspace(0.0, 14.0, 141))
+
+    def compile_model(tanks, pens=None) -> ShipModel:
+        return ShipModel.compile(ship, tanks, pens, hydrostatics=table)
+
+    return compile_model
+
+
 @pytest.fixture
 def sample_tanks():
     """Create sample Tank domain objects."""
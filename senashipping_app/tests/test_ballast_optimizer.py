@@ -0,0 +1,83 @@
+"""Tests for the ballast optimizer."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import Tank, TankType
+from senashipping_app.repositories.hydrostatic_repository import HydrostaticRepository
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.services.ballast_optimizer import (
+    BallastOptimizer,
+    BallastTarget,
+    ballast_tank_columns,
+)
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.hydrostatics import box_hydrostatic_table
+from senashipping_app.services.stability_service import compute_condition_for_model
+
+
+def _tanks(ship_id=1, with_ids=True):
+    specs = [
+        dict(name="Cargo", capacity_m3=20000.0, longitudinal_pos=0.47, kg_m=6.0, tcg_m=0.1),
+        dict(name="FPT", capacity_m3=1500.0, longitudinal_pos=0.95, kg_m=4.0, tank_type=TankType.BALLAST),
+        dict(name="APT", capacity_m3=1500.0, longitudinal_pos=0.05, kg_m=4.0, tank_type=TankType.BALLAST),
+        dict(name="DB P", capacity_m3=1000.0, longitudinal_pos=0.5, kg_m=1.0, tcg_m=-8.0, category="Water Ballast"),
+        dict(name="DB S", capacity_m3=1000.0, longitudinal_pos=0.5, kg_m=1.0, tcg_m=8.0, category="Water Ballast"),
+    ]
+    return [Tank(id=i + 1 if with_ids else None, ship_id=ship_id, **spec) for i, spec in enumerate(specs)]
+
+
+def test_ballast_tanks_by_type_or_category(box_model):
+    assert ballast_tank_columns(box_model(_tanks())) == [1, 2, 3, 4]
+
+
+def test_plans_reach_target_and_are_ranked(box_model):
+    model = box_model(_tanks())
+    target = BallastTarget(trim_m=0.0, trim_tolerance_m=0.1, heel_deg=0.0, heel_tolerance_deg=0.5)
+    optimizer = BallastOptimizer(model, {1: 15000.0})
+    plans = optimizer.optimize(target, require_criteria=False)
+    assert plans
+    assert optimizer.candidates_evaluated > 1000
+    keys = [(p.tanks_touched, p.volume_change_m3) for p in plans]
+    assert keys == sorted(keys)
+    for plan in plans:
+        assert plan.volumes_m3[1] == 15000.0  # cargo untouched
+        assert set(plan.changes_m3) <= {2, 3, 4, 5}
+        for tid, vol in plan.volumes_m3.items():
+            assert 0.0 <= vol <= model.tank_capacity_m3[model.tank_index[tid]] + 1e-9
+        res = compute_condition_for_model(model, plan.volumes_m3)
+        assert res.trim_m == pytest.approx(plan.trim_m)
+        assert abs(res.trim_m) <= target.trim_tolerance_m
+        assert abs(res.heel_deg) <= target.heel_tolerance_deg
+
+
+def test_base_condition_on_target_needs_no_ballast(box_model):
+    model = box_model(_tanks())
+    res = compute_condition_for_model(model, {1: 15000.0})
+    target = BallastTarget(trim_m=res.trim_m, heel_deg=res.heel_deg)
+    plans = BallastOptimizer(model, {1: 15000.0}).optimize(target, n_plans=1)
+    assert len(plans) == 1
+    assert plans[0].tanks_touched == 0 and plans[0].changes_m3 == {}
+
+
+def test_unreachable_target_gives_no_plans(box_model):
+    plans = BallastOptimizer(box_model(_tanks()), {1: 15000.0}).optimize(
+        BallastTarget(trim_m=-20.0), max_tanks=2, refine_rounds=1
+    )
+    assert plans == []
+
+
+def test_service_optimize_ballast(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tanks = [TankRepository(db_session).create(t) for t in _tanks(ship.id, with_ids=False)]
+    table = box_hydrostatic_table(ship.length_overall_m, ship.breadth_m, np.linspace(0.0, 14.0, 141))
+    HydrostaticRepository(db_session).replace_for_ship(ship.id, table)
+    plans = ConditionService(db_session).optimize_ballast(
+        ship, {tanks[0].id: 15000.0}, BallastTarget(trim_m=0.5), n_plans=3
+    )
+    assert plans and all(p.criteria_passed for p in plans)
+    assert plans[0].tanks_touched == 2
+    assert abs(plans[0].trim_m - 0.5) <= 0.1
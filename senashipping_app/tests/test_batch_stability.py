@@ -0,0 +1,112 @@
+"""Tests for the vectorized batch condition engine."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import Ship, Tank, LivestockPen, LoadingCondition, TankSoundingTable
+from senashipping_app.services.stability_service import (
+    compute_condition,
+    compute_conditions_batch,
+    build_loading_matrices,
+)
+
+
+@pytest.fixture
+def ship():
+    return Ship(
+        id=1, name="Batch", length_overall_m=150.0, breadth_m=25.0,
+        depth_m=15.0, design_draft_m=10.0,
+    )
+
+
+@pytest.fixture
+def tanks():
+    return [
+        Tank(id=i + 1, ship_id=1, name=f"T{i + 1}", capacity_m3=400.0,
+             longitudinal_pos=0.1 + 0.08 * i, kg_m=2.0 + 0.5 * i, tcg_m=(-1) ** i * 3.0)
+        for i in range(10)
+    ]
+
+
+@pytest.fixture
+def pens():
+    return [
+        LivestockPen(id=i + 1, ship_id=1, name=f"PEN {i + 1}", deck="A",
+                     vcg_m=12.0 + i, lcg_m=20.0 + 10.0 * i, tcg_m=(-1) ** i * 4.0,
+                     area_m2=60.0)
+        for i in range(6)
+    ]
+
+
+def _soundings(tanks):
+    """Tables for every other tank: contents rise and shift aft/outboard as they fill."""
+    level = np.linspace(0.0, 4.0, 9)
+    return {
+        t.id: TankSoundingTable(
+            level, t.capacity_m3 * level / 4.0, 10.0 + 12.0 * i + level,
+            1.0 + level / 2.0, (-1) ** i * (1.0 + level / 4.0), np.full(9, 50.0),
+        )
+        for i, t in enumerate(tanks) if i % 2 == 0
+    }
+
+
+def _random_conditions(tanks, pens, n, seed=0):
+    rng = np.random.default_rng(seed)
+    conds = []
+    for _ in range(n):
+        vols = {t.id: float(rng.uniform(0, t.capacity_m3)) for t in tanks if rng.random() < 0.8}
+        heads = {p.id: int(rng.integers(-5, 120)) for p in pens if rng.random() < 0.7}
+        conds.append(LoadingCondition(tank_volumes_m3=vols, pen_loadings=heads))
+    return conds
+
+
+FIELDS = ("displacement_t", "draft_m", "draft_aft_m", "draft_fwd_m", "trim_m",
+          "kg_m", "km_m", "gm_m", "heel_deg")
+STRENGTH_FIELDS = ("hogging_bm_tm", "shear_force_max_t", "still_water_bm_approx_tm",
+                   "design_bm_tm", "design_sf_t", "bm_pct_allow", "sf_pct_allow")
+
+
+@pytest.mark.parametrize("with_soundings", [False, True])
+def test_batch_matches_scalar(ship, tanks, pens, with_soundings):
+    soundings = _soundings(tanks) if with_soundings else None
+    conds = _random_conditions(tanks, pens, 50)
+    conds.append(LoadingCondition())  # empty condition
+    volumes, loadings = build_loading_matrices(tanks, pens, conds)
+    batch = compute_conditions_batch(
+        ship, tanks, pens, volumes, loadings,
+        cargo_density_t_per_m3=1.025, mass_per_head_t=0.52, vcg_from_deck_m=1.5,
+        soundings=soundings,
+    )
+    assert len(batch) == len(conds)
+    if with_soundings:  # the tables do move the centroids
+        fixed = compute_conditions_batch(ship, tanks, pens, volumes, loadings, 1.025, 0.52, 1.5)
+        assert not np.allclose(batch.kg_m, fixed.kg_m)
+    for i, cond in enumerate(conds):
+        ref = compute_condition(
+            ship, tanks, cond, 1.025,
+            pens=pens, pen_loadings=cond.pen_loadings,
+            mass_per_head_t=0.52, vcg_from_deck_m=1.5,
+            soundings=soundings,
+        )
+        row = batch.row(i)
+        for name in FIELDS:
+            assert getattr(row, name) == pytest.approx(getattr(ref, name), rel=1e-12, abs=1e-9), name
+        for name in STRENGTH_FIELDS:
+            assert getattr(row.strength, name) == pytest.approx(
+                getattr(ref.strength, name), rel=1e-12, abs=1e-9
+            ), name
+        assert row.ancillary.gz_criteria_ok == ref.ancillary.gz_criteria_ok
+
+
+def test_batch_without_pens(ship, tanks):
+    volumes = np.full((3, len(tanks)), 100.0)
+    batch = compute_conditions_batch(ship, tanks, None, volumes)
+    assert batch.displacement_t.tolist() == [1000.0] * 3
+    assert np.all(batch.draft_m > 0)
+
+
+def test_batch_shape_mismatch(ship, tanks, pens):
+    with pytest.raises(ValueError):
+        compute_conditions_batch(ship, tanks, pens, np.zeros((2, 3)))
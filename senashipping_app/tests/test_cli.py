@@ -0,0 +1,118 @@
+"""Tests for the headless recompute command line."""
+
+from __future__ import annotations
+
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from senashipping_app import cli
+from senashipping_app.models import LoadingCondition, Tank, Voyage
+from senashipping_app.repositories.database import init_database
+from senashipping_app.repositories.hydrostatic_repository import HydrostaticRepository
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.repositories.voyage_repository import ConditionRepository, VoyageRepository
+from senashipping_app.services.hydrostatics import box_hydrostatic_table
+
+
+def _populate(db_path, sample_ship, volumes):
+    db = init_database(db_path)()
+    ship = ShipRepository(db).create(sample_ship)
+    tank = TankRepository(db).create(
+        Tank(ship_id=ship.id, name="DB", capacity_m3=20000.0, longitudinal_pos=0.5, kg_m=1.0)
+    )
+    table = box_hydrostatic_table(ship.length_overall_m, ship.breadth_m, np.linspace(0.0, 14.0, 141))
+    HydrostaticRepository(db).replace_for_ship(ship.id, table)
+    voyage = VoyageRepository(db).create(Voyage(ship_id=ship.id, name="V1"))
+    for i, vol in enumerate(volumes):
+        ConditionRepository(db).create(
+            LoadingCondition(voyage_id=voyage.id, name=f"C{i + 1}", tank_volumes_m3={tank.id: vol})
+        )
+    db.close()
+    return ship, voyage
+
+
+def _run(argv):
+    out = io.StringIO()
+    code = cli.run(cli.build_parser().parse_args(argv), out=out)
+    return code, out.getvalue()
+
+
+def test_all_pass_exits_zero_with_report(temp_db, sample_ship):
+    ship, _voyage = _populate(temp_db, sample_ship, [15000.0, 16000.0, 17000.0])
+    code, text = _run(["--db", str(temp_db), "--ship", ship.name, "--workers", "1"])
+    assert code == cli.EXIT_OK
+    assert "Test Vessel / V1 / C1: PASS" in text
+    assert "3 conditions, 0 failing" in text
+    for stage in cli.STAGES:
+        assert f"\n{stage}" in text
+    assert "latency ms: p50" in text
+
+
+def test_each_ship_is_one_batch(temp_db, sample_ship, monkeypatch):
+    ship, voyage = _populate(temp_db, sample_ship, [15000.0, 16000.0])
+    db = init_database(temp_db)()
+    tank_id = TankRepository(db).list_for_ship(ship.id)[0].id
+    second = VoyageRepository(db).create(Voyage(ship_id=ship.id, name="V2"))
+    ConditionRepository(db).create(
+        LoadingCondition(voyage_id=second.id, name="D1", tank_volumes_m3={tank_id: 17000.0})
+    )
+    db.close()
+    calls = []
+    compute_many = cli.ConditionService.compute_many
+
+    def spy(self, *args, **kwargs):
+        calls.append(kwargs.get("voyage_ids"))
+        return compute_many(self, *args, **kwargs)
+
+    monkeypatch.setattr(cli.ConditionService, "compute_many", spy)
+    code, text = _run(["--db", str(temp_db), "--workers", "1"])
+    assert code == cli.EXIT_OK and len(calls) == 1 and sorted(calls[0]) == [voyage.id, second.id]
+    assert "Test Vessel / V1 / C2: PASS" in text and "Test Vessel / V2 / D1: PASS" in text
+    assert "3 conditions, 0 failing" in text
+
+
+def test_free_trim_flag_solves_equilibrium(temp_db, sample_ship, monkeypatch):
+    _populate(temp_db, sample_ship, [15000.0])
+    batches = []
+    compute_many = cli.ConditionService.compute_many
+
+    def spy(self, *args, **kwargs):
+        batches.append(compute_many(self, *args, **kwargs))
+        return batches[-1]
+
+    monkeypatch.setattr(cli.ConditionService, "compute_many", spy)
+    assert _run(["--db", str(temp_db), "--workers", "1"])[0] == cli.EXIT_OK
+    assert _run(["--db", str(temp_db), "--workers", "1", "--free-trim"])[0] == cli.EXIT_OK
+    fixed, solved = (b.outcomes[0].results for b in batches)
+    assert fixed.equilibrium is None
+    assert solved.equilibrium is not None and solved.equilibrium.converged
+    assert solved.draft_m == solved.equilibrium.draft_m
+
+
+def test_cli_does_not_import_qt():
+    probe = "import sys, senashipping_app.cli; print(any(m.startswith('PyQt6') for m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True,
+                         cwd=Path(cli.__file__).resolve().parents[1])
+    assert out.stdout.strip() == "False"
+
+
+def test_failing_condition_exits_non_zero(temp_db, sample_ship):
+    _ship, voyage = _populate(temp_db, sample_ship, [15000.0, 30000.0])
+    code, text = _run(["--db", str(temp_db), "--voyage", str(voyage.id), "--workers", "2", "-q"])
+    assert code == cli.EXIT_CRITERIA_FAILED
+    assert "C1: PASS" not in text  # quiet: only failing conditions
+    assert "C2: ERROR Volume in tank DB exceeds capacity." in text
+    assert "2 conditions, 1 failing" in text
+
+
+def test_unknown_ship_or_missing_db_is_usage_error(temp_db, sample_ship, tmp_path):
+    _populate(temp_db, sample_ship, [15000.0])
+    assert _run(["--db", str(temp_db), "--ship", "NOPE"])[0] == cli.EXIT_USAGE
+    code, text = _run(["--db", str(temp_db), "--voyage", "999"])
+    assert code == cli.EXIT_USAGE and "conditions" not in text
+    assert _run(["--db", str(tmp_path / "missing.db")])[0] == cli.EXIT_USAGE
@@ -0,0 +1,154 @@
+"""Tests for the background compute worker (latest request wins, cancellation)."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from senashipping_app.models import LoadingCondition
+from senashipping_app.repositories import database
+from senashipping_app.repositories.database import init_database
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.services.condition_batch import ComputeCancelled
+from senashipping_app.views.compute_worker import ComputeOutcome, ComputeRequest, ComputeWorker
+
+
+@pytest.fixture
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def ship_with_tanks(temp_db, sample_ship, sample_tanks):
+    init_database(temp_db)
+    with database.SessionLocal() as db:
+        ship = ShipRepository(db).create(sample_ship)
+        tanks = []
+        for t in sample_tanks:
+            t.id, t.ship_id = None, ship.id
+            tanks.append(TankRepository(db).create(t))
+    return ship, tanks
+
+
+class _Recorder:
+    def __init__(self, worker: ComputeWorker) -> None:
+        self.computed = []
+        self.failed = []
+        self.cancelled = []
+        worker.computed.connect(self.computed.append)
+        worker.failed.connect(lambda rid, msg: self.failed.append((rid, msg)))
+        worker.cancelled.connect(self.cancelled.append)
+
+    def wait(self, predicate, timeout_s: float = 10.0) -> None:
+        deadline = time.monotonic() + timeout_s
+        while not predicate():
+            assert time.monotonic() < deadline, "worker did not answer in time"
+            QtCore.QCoreApplication.processEvents()
+            time.sleep(0.005)
+
+
+class _GatedWorker(ComputeWorker):
+    """Blocks each request until released, then polls cancelled like the kernel does."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def execute(self, request, cancelled):
+        self.started.set()
+        self.release.wait(5.0)
+        if cancelled():
+            raise ComputeCancelled()
+        return ComputeOutcome(request, results=request.condition.name)
+
+
+def _request(ship, volumes, name="Dep"):
+    return ComputeRequest(ship, LoadingCondition(name=name), volumes)
+
+
+def test_worker_computes_in_its_own_session(app, ship_with_tanks):
+    ship, tanks = ship_with_tanks
+    worker = ComputeWorker()
+    rec = _Recorder(worker)
+    try:
+        rid = worker.submit(_request(ship, {tanks[0].id: 200.0, tanks[1].id: 450.0}))
+        rec.wait(lambda: rec.computed)
+    finally:
+        worker.stop()
+    outcome = rec.computed[0]
+    assert outcome.request.request_id == rid
+    assert outcome.results.displacement_t > 0
+    assert outcome.request.condition.gm_m == pytest.approx(outcome.results.validation.gm_effective)
+    assert sorted(t.id for t in outcome.tanks) == sorted(t.id for t in tanks)
+    assert worker.isFinished()
+
+
+def test_free_trim_requests_warm_start_from_the_previous_one(app, ship_with_tanks):
+    ship, tanks = ship_with_tanks
+    worker = ComputeWorker()
+    rec = _Recorder(worker)
+    try:
+        for volume in (200.0, 210.0):
+            request = _request(ship, {tanks[0].id: volume, tanks[1].id: 450.0})
+            request.free_trim = True
+            worker.submit(request)
+            rec.wait(lambda: len(rec.computed) == (1 if volume == 200.0 else 2))
+    finally:
+        worker.stop()
+    first, second = (o.results.equilibrium for o in rec.computed)
+    assert first.converged and not first.stats.warm_start
+    assert second.converged and second.stats.warm_start
+    assert rec.computed[1].results.draft_m == second.draft_m
+
+
+def test_validation_errors_are_reported(app, ship_with_tanks):
+    ship, tanks = ship_with_tanks
+    worker = ComputeWorker()
+    rec = _Recorder(worker)
+    try:
+        rid = worker.submit(_request(ship, {tanks[0].id: 10_000.0}))
+        rec.wait(lambda: rec.failed)
+    finally:
+        worker.stop()
+    assert rec.failed[0][0] == rid and rec.computed == []
+
+
+def test_newer_requests_replace_stale_ones(app):
+    worker = _GatedWorker()
+    rec = _Recorder(worker)
+    try:
+        first = worker.submit(_request(None, {}, "A"))
+        assert worker.started.wait(5.0)
+        second = worker.submit(_request(None, {}, "B"))
+        third = worker.submit(_request(None, {}, "C"))
+        worker.release.set()
+        rec.wait(lambda: rec.computed)
+    finally:
+        worker.stop()
+    # B never ran; A was running when C arrived, so its result is dropped
+    assert sorted(rec.cancelled) == [first, second]
+    assert [o.request.request_id for o in rec.computed] == [third]
+    assert rec.computed[0].results == "C"
+    assert not worker.is_busy()
+
+
+def test_cancel_stops_the_running_compute(app):
+    worker = _GatedWorker()
+    rec = _Recorder(worker)
+    try:
+        rid = worker.submit(_request(None, {}))
+        assert worker.started.wait(5.0)
+        worker.cancel()
+        worker.release.set()
+        rec.wait(lambda: rec.cancelled)
+    finally:
+        worker.stop()
+    assert rec.cancelled == [rid] and rec.computed == []
@@ -0,0 +1,121 @@
+"""Tests for recomputing many conditions (compute kernel and process pool)."""
+
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from senashipping_app.models import LoadingCondition, Tank, Voyage
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.repositories.voyage_repository import ConditionRepository, VoyageRepository
+from senashipping_app.services.condition_batch import (
+    ComputeCancelled,
+    ConditionJob,
+    compute_conditions,
+    run_condition,
+)
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.ship_model import ShipModel
+
+JOBS = [
+    ConditionJob(i + 1, f"C{i + 1}", {1: 50.0 * i, 2: 500.0 - 40.0 * i})
+    for i in range(6)
+]
+
+
+def test_kernel_matches_service_compute(db_session, sample_ship, sample_tanks):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tanks = []
+    for t in sample_tanks:
+        t.id, t.ship_id = None, ship.id
+        tanks.append(TankRepository(db_session).create(t))
+    volumes = {tanks[0].id: 200.0, tanks[1].id: 450.0}
+    condition = LoadingCondition(name="Dep")
+    ref = ConditionService(db_session).compute(ship, condition, volumes)
+    model = ConditionService(db_session).get_ship_model(ship)
+    res = run_condition(model, "Dep", volumes)
+    assert res.displacement_t == pytest.approx(ref.displacement_t)
+    assert res.trim_m == pytest.approx(ref.trim_m)
+    assert res.validation.gm_effective == pytest.approx(condition.gm_m)
+    assert res.criteria.passed == ref.criteria.passed
+    assert res.snapshot.condition_name == "Dep"
+    pickle.loads(pickle.dumps(res))  # results cross process boundaries
+
+
+def test_pool_matches_serial_and_reports_progress(sample_ship, sample_tanks):
+    sample_ship.id = 1
+    model = ShipModel.compile(sample_ship, sample_tanks)
+    calls = []
+    serial = compute_conditions(model, JOBS, max_workers=1)
+    pooled = compute_conditions(model, JOBS, max_workers=2, progress=lambda d, t: calls.append((d, t)))
+    assert not pooled.cancelled and pooled.n_failed == 0
+    assert calls == [(i, 6) for i in range(1, 7)]
+    assert [o.condition_id for o in pooled.outcomes] == [1, 2, 3, 4, 5, 6]
+    for a, b in zip(serial.outcomes, pooled.outcomes):
+        assert a.results.displacement_t == pytest.approx(b.results.displacement_t)
+        assert a.results.gm_m == pytest.approx(b.results.gm_m)
+
+
+def test_bad_condition_fails_alone(sample_ship, sample_tanks):
+    sample_ship.id = 1
+    model = ShipModel.compile(sample_ship, sample_tanks)
+    jobs = [*JOBS[:2], ConditionJob(99, "Bad", {1: object()}), *JOBS[2:4]]  # TypeError in the kernel
+    for workers in (1, 2):
+        result = compute_conditions(model, jobs, max_workers=workers)
+        assert [o.condition_id for o in result.outcomes] == [1, 2, 99, 3, 4]
+        assert result.n_failed == 1 and result.outcomes[2].error
+        assert result.outcomes[3].results.displacement_t > 0
+
+
+def test_cancel_stops_between_conditions(sample_ship, sample_tanks):
+    sample_ship.id = 1
+    model = ShipModel.compile(sample_ship, sample_tanks)
+    done = []
+    result = compute_conditions(
+        model, JOBS, max_workers=1, progress=lambda d, t: done.append(d), cancelled=lambda: len(done) >= 2,
+    )
+    assert result.cancelled and result.total == 6
+    assert [o.name for o in result.outcomes] == ["C1", "C2"]
+
+
+def test_service_compute_many_persists_in_one_pass(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tank = TankRepository(db_session).create(
+        Tank(ship_id=ship.id, name="T1", capacity_m3=500.0, longitudinal_pos=0.4, kg_m=5.0)
+    )
+    voyages = [VoyageRepository(db_session).create(Voyage(ship_id=ship.id, name=f"V{i}")) for i in (1, 2)]
+    cond_repo = ConditionRepository(db_session)
+    cond_repo.create(LoadingCondition(voyage_id=voyages[0].id, name="A", tank_volumes_m3={tank.id: 100.0}))
+    cond_repo.create(LoadingCondition(voyage_id=voyages[0].id, name="B", tank_volumes_m3={tank.id: 900.0}))
+    cond_repo.create(LoadingCondition(voyage_id=voyages[1].id, name="C", tank_volumes_m3={tank.id: 300.0}))
+
+    service = ConditionService(db_session)
+    result = service.compute_many(ship, max_workers=2)
+    assert [o.name for o in result.outcomes] == ["A", "B", "C"]
+    assert [o.ok for o in result.outcomes] == [True, False, True]
+    assert "exceeds capacity" in result.outcomes[1].error
+
+    stored = {c.name: c for v in voyages for c in cond_repo.list_for_voyage(v.id)}
+    assert stored["A"].displacement_t == pytest.approx(100.0)
+    assert stored["C"].displacement_t == pytest.approx(300.0)
+    assert stored["C"].gm_m == pytest.approx(result.outcomes[2].results.validation.gm_effective)
+    assert stored["B"].displacement_t == 0.0
+
+    only = service.compute_many(ship, voyage_id=voyages[1].id, max_workers=1)
+    assert [o.name for o in only.outcomes] == ["C"]
+
+
+def test_kernel_stops_when_cancelled(sample_ship, sample_tanks):
+    sample_ship.id = 1
+    model = ShipModel.compile(sample_ship, sample_tanks)
+    polls = []
+
+    def cancelled():
+        polls.append(1)
+        return len(polls) > 2  # after stability and validation
+
+    with pytest.raises(ComputeCancelled):
+        run_condition(model, "Dep", {1: 200.0}, cancelled=cancelled)
+    assert len(polls) == 3
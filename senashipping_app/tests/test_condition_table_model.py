@@ -0,0 +1,235 @@
+"""Tests for the array-backed condition table models."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+from PyQt6.QtCore import Qt
+
+from senashipping_app.models import CargoType, LivestockPen, Tank
+from senashipping_app.views.condition_table_model import (
+    AllTableModel,
+    ConditionTableData,
+    LivestockTableModel,
+    TankTableModel,
+)
+
+CATTLE = CargoType(name="Cattle", avg_weight_per_head_kg=500.0, deck_area_per_head_m2=2.0, vcg_from_deck_m=1.5)
+SHEEP = CargoType(name="Sheep", avg_weight_per_head_kg=60.0, deck_area_per_head_m2=0.5, vcg_from_deck_m=0.8)
+
+
+def _pens(n: int):
+    return [
+        LivestockPen(id=i + 1, name=f"{i + 1}-A", deck="ABCDEFGH"[i % 8], vcg_m=10.0,
+                     lcg_m=float(i), tcg_m=0.0, area_m2=20.0, capacity_head=8)
+        for i in range(n)
+    ]
+
+
+def _load(data: ConditionTableData, pens, tanks=(), **kw):
+    data.load(pens, list(tanks), [p.deck for p in pens], {}, kw.pop("volumes", {}),
+              cargo_types=[CATTLE, SHEEP], cargo_choice=True, default_cargo="Cattle",
+              mass_per_head_t=0.5, area_per_head=2.0, **kw)
+
+
+def test_bulk_cargo_change_is_one_range_per_model():
+    data = ConditionTableData()
+    pens = _pens(5600)
+    _load(data, pens)
+    model = LivestockTableModel(data, "DK1 Totals")
+    rows = [i for i, p in enumerate(pens) if p.deck == "A"]
+    model.set_rows(rows)
+    changes = []
+    model.dataChanged.connect(lambda tl, br: changes.append((tl.row(), br.row())))
+
+    # Defaults: capacity (8) is the tighter limit than area (20 / 2.0 = 10)
+    assert model.index(0, 2).data() == "8" and model.index(0, 9).data() == "4.00"
+    assert data.set_pen_cargo(model.pen_indices(), "Sheep") == len(rows)
+    # One range for the rows plus one for the totals row
+    assert changes == [(0, len(rows) - 1), (len(rows), len(rows))]
+    assert model.index(0, 1).data() == "Sheep" and model.index(0, 4).data() == "40"
+    assert model.index(0, 9).data() == "0.48" and model.index(0, 10).data() == "10.800"
+    assert model.index(len(rows), 9).data() == f"{0.48 * len(rows):.2f}"
+
+
+def test_head_edits_are_capped_and_shared_with_all_tab():
+    data = ConditionTableData()
+    pens = _pens(16)
+    _load(data, pens, preserved_heads={2: 3})
+    deck = LivestockTableModel(data, "DK2 Totals")
+    deck.set_rows([1, 9])
+    everything = AllTableModel(data)
+    everything.set_rows(range(16))
+    assert deck.index(0, 2).data() == "3"  # preserved value wins over the default
+    assert deck.index(0, 0).data(Qt.ItemDataRole.UserRole) == 2
+
+    assert deck.setData(deck.index(0, 2), "50")
+    assert deck.index(0, 2).data() == "8" and everything.index(1, 3).data() == "8"
+    assert not deck.setData(deck.index(0, 2), "lots")
+    assert deck.rows_for_pens({10, 2, 99}) == [0, 1]
+    # Deck H pens belong to the free-entry DK8 table and stay blank here
+    assert everything.index(7, 2).data() == "-- Blank --"
+    assert not everything.flags(everything.index(7, 3)) & Qt.ItemFlag.ItemIsEditable
+
+
+def test_tank_weight_sets_volume_capped_at_capacity():
+    data = ConditionTableData()
+    tanks = [Tank(id=1, name="WB1", capacity_m3=100.0, density_t_per_m3=1.025),
+             Tank(id=2, name="WB2", capacity_m3=50.0, density_t_per_m3=1.0)]
+    _load(data, [], tanks, volumes={2: 80.0})
+    model = TankTableModel(data, "Water Ballast Totals")
+    model.set_rows(tank_rows=[0, 1])
+    assert model.index(1, 6).data() == "50.00"  # loaded volume capped
+
+    assert model.setData(model.index(0, 8), "51.25")
+    assert model.index(0, 6).data() == "50.00" and model.index(0, 5).data() == "50.0"
+    assert model.setData(model.index(0, 8), "500")
+    assert model.index(0, 8).data() == "102.50"
+    assert model.index(2, 6).data() == "150.00"
+    assert data.tank_volume_map() == {1: 100.0, 2: 50.0}
+
+
+def test_running_totals_follow_edits_by_row_deltas():
+    data = ConditionTableData()
+    pens = _pens(400)
+    tanks = [Tank(id=i + 1, name=f"T{i}", capacity_m3=100.0, kg_m=2.0 + i, lcg_m=10.0 * i, tcg_m=i % 3 - 1.0)
+             for i in range(6)]
+    _load(data, pens, tanks, volumes={1: 30.0, 4: 60.0})
+    deck_a = LivestockTableModel(data, "DK1 Totals")
+    rows = [i for i, p in enumerate(pens) if p.deck == "A"]
+    deck_a.set_rows(rows, totals=data.deck_totals["A"])
+    tank_model = TankTableModel(data, "Tank Totals")
+    tank_model.set_rows(tank_rows=[0, 2, 3, 5])
+
+    sizes = []
+    pen_sums = data._pen_sums
+    data._pen_sums = lambda idx: sizes.append(idx.size) or pen_sums(idx)
+    data.set_pen_heads(rows[3], 2)
+    data.set_pen_cargo([rows[5]], "Sheep")
+    data.set_pen_heads(rows[0], 0)
+    assert sizes and set(sizes) == {1}  # single-cell edits never rescan the table
+    data.set_tank_weight(3, 20.0)
+    data.set_tank_weight(5, 400.0)
+
+    tot = len(rows)
+    weight = data.pen_weight[rows].sum()
+    assert deck_a.index(tot, 9).data() == f"{weight:.2f}"
+    assert deck_a.index(tot, 5).data() == f"{data.pen_area_used[rows].sum():.2f}"
+    assert deck_a.index(tot, 13).data() == f"{data.pen_moment[rows].sum():.2f}"
+    lcg = (data.pen_weight[rows] * data.pen_lcg[rows]).sum() / weight
+    assert deck_a.index(tot, 11).data() == f"{lcg:.3f}"
+    assert data.deck_totals["B"].weight == pytest.approx(data.pen_weight[1::8].sum())
+
+    shown = [0, 2, 3, 5]
+    w = data.tank_weight[shown]
+    assert tank_model.index(4, 8).data() == f"{w.sum():.2f}"
+    assert tank_model.index(4, 6).data() == f"{data.tank_volume[shown].sum():.2f}"
+    assert tank_model.index(4, 9).data() == f"{(w * data.tank_vcg[shown]).sum() / w.sum():.3f}"
+
+
+def test_widget_edits_emit_loadings():
+    app = QtWidgets.QApplication.instance()
+    if app is not None and not isinstance(app, QtWidgets.QApplication):
+        pytest.skip("a non-GUI QCoreApplication is already running")
+    app = app or QtWidgets.QApplication([])
+    from senashipping_app.views.condition_table_widget import ConditionTableWidget
+
+    widget = ConditionTableWidget()
+    pens = _pens(16)
+    tanks = [Tank(id=7, name="WB1", capacity_m3=100.0, category="Water Ballast")]
+    widget.update_data(pens, tanks, {}, {7: 40.0}, cargo_type=CATTLE,
+                       cargo_type_names=["Cattle", "Sheep"], cargo_types=[CATTLE, SHEEP])
+    edits = []
+    widget.pen_heads_changed.connect(lambda pid, h: edits.append(("pen", pid, h)))
+    widget.tank_volume_changed.connect(lambda tid, v: edits.append(("tank", tid, v)))
+
+    dk1 = widget._models["Livestock-DK1"]
+    assert dk1.setData(dk1.index(0, 2), "4")
+    widget._tabs.setCurrentIndex(widget._tab_names.index("Water Ballast"))
+    tanks_model = widget._models["Water Ballast"]
+    assert tanks_model.setData(tanks_model.index(0, 8), "20.5")
+    assert edits == [("pen", 1, 4), ("tank", 7, pytest.approx(20.0))]
+
+    pen_heads, volumes = widget.current_loadings()
+    assert pen_heads[1] == 4 and pen_heads[2] == 8 and volumes == {7: pytest.approx(20.0)}
+    widget._on_header_cargo_changed("Livestock-DK1", "Sheep")
+    widget._tabs.setCurrentIndex(widget._tab_names.index("All"))
+    assert widget._models["All"].index(0, 2).data() == "Sheep"
+
+    # Deck 8: two deck H pens at 8 head x 500 kg; the totals row follows a quantity edit
+    dk8 = widget._table_widgets["Livestock-DK8"]
+    assert dk8.item(2, 3).text() == "8000.00"
+    dk8.item(0, 1).setText("10")
+    assert dk8.item(2, 3).text() == "9000.00" and dk8.item(0, 3).text() == "5000.00"
+    widget.deleteLater()
+
+
+def test_hidden_tabs_are_built_when_first_shown():
+    app = QtWidgets.QApplication.instance()
+    if app is not None and not isinstance(app, QtWidgets.QApplication):
+        pytest.skip("a non-GUI QCoreApplication is already running")
+    app = app or QtWidgets.QApplication([])
+    from senashipping_app.views.condition_table_widget import ConditionTableWidget
+
+    widget = ConditionTableWidget()
+    resets = {name: [] for name in widget._models}
+    for name, model in widget._models.items():
+        model.modelReset.connect(lambda name=name: resets[name].append(True))
+    pens = _pens(64)
+    tanks = [Tank(id=7, name="WB1", capacity_m3=100.0, category="Water Ballast")]
+    widget.update_data(pens, tanks, {}, {7: 40.0}, cargo_type=CATTLE, cargo_types=[CATTLE])
+
+    built = [name for name, model in widget._models.items() if model.rowCount()]
+    assert built == ["Livestock-DK1"] and sum(map(len, resets.values())) == 1
+    # Loadings cover every tab, built or not
+    pen_heads, volumes = widget.current_loadings()
+    assert len(pen_heads) == 64 and volumes == {7: pytest.approx(40.0)}
+
+    widget._on_header_cargo_changed("Livestock-DK2", "Cattle")  # hidden tab: its deck's pens still change
+    widget._tabs.setCurrentIndex(widget._tab_names.index("Livestock-DK2"))
+    dk2 = widget._models["Livestock-DK2"]
+    assert dk2.rowCount() == 9 and dk2.index(8, 0).data() == "Livestock-DK2 Totals"
+    widget._tabs.setCurrentIndex(0)
+    widget._tabs.setCurrentIndex(widget._tab_names.index("Livestock-DK2"))
+    assert len(resets["Livestock-DK2"]) == 1  # reused until the data changes
+
+    widget.update_data(pens[:16], tanks, {}, {}, cargo_type=CATTLE, cargo_types=[CATTLE])
+    assert dk2.rowCount() == 3 and widget._models["Livestock-DK1"].rowCount() == 0
+    widget._tabs.setCurrentIndex(widget._tab_names.index("All"))
+    assert widget._models["All"].rowCount() == 16  # no tank held liquid at load
+    widget.deleteLater()
+
+
+def test_registry_upserts_extend_the_table_data():
+    app = QtWidgets.QApplication.instance()
+    if app is not None and not isinstance(app, QtWidgets.QApplication):
+        pytest.skip("a non-GUI QCoreApplication is already running")
+    app = app or QtWidgets.QApplication([])
+    from senashipping_app.views.condition_table_widget import ConditionTableWidget
+
+    widget = ConditionTableWidget()
+    pens = _pens(2)
+    widget.update_data(pens, [], {}, {}, cargo_type=CATTLE, cargo_types=[CATTLE])
+    dk1 = widget._models["Livestock-DK1"]
+    assert dk1.rowCount() == 2 and dk1.index(1, 9).data() == "4.00"
+
+    # A deck 8 pen saved from the DK8 table, then a new deck A pen and a renamed one
+    registry = widget._registry
+    registry.upsert_pens([LivestockPen(id=50, name="Extra", deck="H", lcg_m=5.0, capacity_head=3)])
+    registry.upsert_pens([
+        LivestockPen(id=51, name="0-A", deck="A", vcg_m=10.0, lcg_m=2.0, area_m2=20.0, capacity_head=8),
+        LivestockPen(id=1, name="1-A renamed", deck="A", vcg_m=10.0, lcg_m=0.0, area_m2=20.0, capacity_head=8),
+    ])
+    assert [dk1.index(r, 0).data() for r in range(3)] == ["0-A", "1-A renamed", "Livestock-DK1 Totals"]
+    assert dk1.index(0, 2).data() == "8" and dk1.index(2, 9).data() == "8.00"
+
+    widget._tabs.setCurrentIndex(widget._tab_names.index("All"))
+    everything = widget._models["All"]
+    assert everything.rowCount() == 4
+    assert {everything.index(r, 0).data(Qt.ItemDataRole.UserRole) for r in range(4)} == {1, 2, 50, 51}
+    assert widget.current_loadings()[0] == {1: 8, 2: 8, 51: 8}
+    widget.deleteLater()
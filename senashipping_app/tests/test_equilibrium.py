@@ -0,0 +1,105 @@
+"""Tests for the free-trim equilibrium solver."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import LoadingCondition, Tank
+from senashipping_app.repositories.hydrostatic_repository import HydrostaticRepository
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.equilibrium import EquilibriumSolver, MeshBuoyancy, TableBuoyancy
+from senashipping_app.services.hydrostatics import box_hydrostatic_table
+
+L, B = 100.0, 20.0
+
+
+def _solver(**kwargs) -> EquilibriumSolver:
+    table = box_hydrostatic_table(L, B, np.linspace(0.0, 10.0, 201), cb=1.0)
+    return EquilibriumSolver(TableBuoyancy(table, L), **kwargs)
+
+
+def test_upright_when_g_over_b():
+    disp = L * B * 4.0 * 1.025
+    eq = _solver().solve(disp, lcg_m=50.0, tcg_m=0.0, kg_m=6.0)
+    assert eq.converged
+    assert eq.draft_m == pytest.approx(4.0)
+    assert eq.trim_m == pytest.approx(0.0, abs=1e-6)
+    assert eq.heel_deg == pytest.approx(0.0, abs=1e-6)
+
+
+def test_balances_longitudinal_and_transverse_moments():
+    disp = L * B * 4.0 * 1.025
+    solver = _solver()
+    eq = solver.solve(disp, lcg_m=48.0, tcg_m=0.3, kg_m=6.0)
+    assert eq.converged
+    assert np.all(np.abs(eq.residual) <= solver.tol)
+    # Small offsets: close to the linear trim and heel estimates
+    mtc = disp * (B * L ** 3 / 12.0 / (disp / 1.025)) / L
+    assert eq.trim_m == pytest.approx((50.0 - 48.0) * disp / mtc, rel=0.02)
+    gm = 2.0 + B ** 2 / (12.0 * 4.0) - 6.0
+    assert eq.heel_deg == pytest.approx(math.degrees(math.atan(0.3 / gm)), rel=0.05)
+    assert eq.draft_aft_m - eq.draft_fwd_m == pytest.approx(eq.trim_m)
+
+
+def test_warm_start_converges_quickly_and_reports_to_hook():
+    stats = []
+    solver = _solver(hook=stats.append)
+    disp = L * B * 5.0 * 1.025
+    first = solver.solve(disp, 47.0, 0.2, 6.5)
+    second = solver.solve(disp * 1.005, 47.1, 0.22, 6.5, warm_start=first)
+    assert second.converged and second.stats.warm_start
+    assert 1 <= second.stats.iterations <= 3
+    assert second.stats.evaluations < first.stats.evaluations
+    assert [s.warm_start for s in stats] == [False, True]
+    assert all(s.elapsed_s >= 0.0 for s in stats)
+
+
+def test_far_warm_start_falls_back_to_cold_start():
+    solver = _solver(max_iter=2)
+    light = solver.solve(L * B * 1.0 * 1.025, 50.0, 0.0, 5.0)
+    deep = solver.solve(L * B * 8.0 * 1.025, 40.0, 0.5, 5.0, warm_start=light)
+    assert deep.draft_m == pytest.approx(8.0, rel=0.05)
+
+
+def test_mesh_source_matches_table_source():
+    trimesh = pytest.importorskip("trimesh")
+    mesh = trimesh.creation.box(extents=[L, B, 10.0])
+    mesh.apply_translation([L / 2, 0.0, 5.0])
+    disp = L * B * 4.0 * 1.025
+    by_mesh = EquilibriumSolver(MeshBuoyancy(mesh)).solve(disp, 48.0, 0.0, 6.0)
+    by_table = _solver().solve(disp, 48.0, 0.0, 6.0)
+    assert by_mesh.converged
+    assert by_mesh.draft_m == pytest.approx(4.0, abs=1e-6)
+    assert by_mesh.trim_m == pytest.approx(by_table.trim_m, rel=0.01)
+
+
+def test_service_free_trim(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tank = TankRepository(db_session).create(
+        Tank(ship_id=ship.id, name="T", capacity_m3=30000.0, kg_m=5.0,
+             longitudinal_pos=0.45, tcg_m=0.5)
+    )
+    table = box_hydrostatic_table(ship.length_overall_m, ship.breadth_m, np.linspace(0.0, 14.0, 141))
+    HydrostaticRepository(db_session).replace_for_ship(ship.id, table)
+    service = ConditionService(db_session)
+    res = service.compute(ship, LoadingCondition(name="C"), {tank.id: 20000.0}, free_trim=True)
+    assert res.equilibrium is not None and res.equilibrium.converged
+    assert res.trim_m == res.equilibrium.trim_m
+    assert res.trim_m > 0.0  # G aft of B: trimmed by the stern
+    assert res.heel_deg > 0.0
+
+    again = service.compute(
+        ship, LoadingCondition(name="C"), {tank.id: 20100.0}, free_trim=True, warm_start=res.equilibrium,
+    )
+    assert again.equilibrium.stats.warm_start
+    # The shared model holds no solver state: a compute without warm_start starts cold
+    cold = service.compute(ship, LoadingCondition(name="C"), {tank.id: 20100.0}, free_trim=True)
+    assert not cold.equilibrium.stats.warm_start
+    model = service.get_ship_model(ship)
+    assert model.equilibrium_solver() is not model.equilibrium_solver()
+    assert model.equilibrium_solver().source is model.buoyancy()
@@ -0,0 +1,145 @@
+"""Tests for KN cross curves and the vectorized GZ engine."""
+
+from __future__ import annotations
+
+from dataclasses import astuple
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import CrossCurves, LoadingCondition, Tank
+from senashipping_app.repositories.cross_curve_repository import CrossCurveRepository
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.services.ancillary_calculations import compute_ancillary
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.gz_curves import GZEngine
+from senashipping_app.services.ship_model import ShipModel
+from senashipping_app.services.stability_service import compute_condition, compute_model_batch
+
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+HEELS = np.arange(0.0, 61.0, 5.0)
+DISPS = np.array([5000.0, 10000.0, 20000.0])
+
+
+def _curves() -> CrossCurves:
+    # Smooth, realistic-looking KN: rises then flattens past ~45 deg
+    phi = np.radians(HEELS)
+    kn = np.vstack([
+        (10.0 - 1e-4 * d) * np.sin(phi) * (1.0 + 0.4 * np.sin(phi) ** 2)
+        - 2.5 * (d / 1e4) * np.sin(phi) ** 3
+        for d in DISPS
+    ])
+    return CrossCurves(displacement_t=DISPS, heel_deg=HEELS, kn_m=kn)
+
+
+def test_gz_curve_is_kn_minus_kg_sin():
+    engine = GZEngine(_curves())
+    gz = engine.gz_curve(10000.0, 8.0)
+    kn = engine.curves.kn_at(10000.0)
+    assert gz.shape == engine.heel_deg.shape
+    assert np.allclose(gz, kn - 8.0 * np.sin(np.radians(engine.heel_deg)))
+    assert gz[0] == pytest.approx(0.0)
+
+
+def test_summary_areas_match_fine_integration():
+    curves = _curves()
+    engine = GZEngine(curves, step_deg=0.5)
+    summary = engine.summary(7500.0, 7.0)
+    fine = np.linspace(0.0, 40.0, 4001)
+    kn = np.interp(fine, HEELS, curves.kn_at(7500.0))
+    gz = kn - 7.0 * np.sin(np.radians(fine))
+    area_40 = _trapezoid(gz, np.radians(fine))
+    area_30 = _trapezoid(gz[fine <= 30.0], np.radians(fine[fine <= 30.0]))
+    assert summary.area_0_40_mrad == pytest.approx(area_40, rel=1e-3)
+    assert summary.area_0_30_mrad == pytest.approx(area_30, rel=1e-3)
+    assert summary.area_30_40_mrad == pytest.approx(area_40 - area_30, rel=1e-3)
+    full = engine.gz_curve(7500.0, 7.0)
+    assert summary.max_gz_m == pytest.approx(full.max())
+    assert summary.angle_max_gz_deg == engine.heel_deg[np.argmax(full)]
+
+
+def test_batch_summary_matches_scalar():
+    engine = GZEngine(_curves())
+    disp = np.array([4000.0, 9000.0, 15000.0, 25000.0])
+    kg = np.array([6.0, 7.5, 9.0, 11.0])
+    batch = engine.summary_batch(disp, kg)
+    for i in range(len(disp)):
+        one = engine.summary(disp[i], kg[i])
+        assert astuple(batch.row(i)) == pytest.approx(astuple(one), rel=1e-12)
+        assert bool(batch.criteria_ok[i]) == one.criteria_ok
+
+
+def test_high_kg_fails_gz_criteria():
+    engine = GZEngine(_curves())
+    assert engine.summary(10000.0, 5.0).criteria_ok
+    assert not engine.summary(10000.0, 9.5).criteria_ok
+
+
+def test_ancillary_uses_gz_summary(sample_ship):
+    engine = GZEngine(_curves())
+    good = engine.summary(10000.0, 5.0)
+    bad = engine.summary(10000.0, 9.5)
+    assert compute_ancillary(sample_ship, 8.0, 8.5, 7.5, 1.0, 2.0, 0.0, good).gz_criteria_ok
+    anc = compute_ancillary(sample_ship, 8.0, 8.5, 7.5, 1.0, 2.0, 0.0, bad)
+    assert anc.gz_criteria_ok is False and anc.gz is bad
+
+
+def test_rejects_short_heel_range():
+    curves = CrossCurves(displacement_t=DISPS, heel_deg=[0.0, 10.0, 30.0],
+                         kn_m=np.ones((3, 3)))
+    with pytest.raises(ValueError, match="40 deg"):
+        GZEngine(curves)
+
+
+def test_repository_round_trip(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    repo = CrossCurveRepository(db_session)
+    assert repo.get_for_ship(ship.id) is None
+    repo.replace_for_ship(ship.id, _curves())
+    loaded = repo.get_for_ship(ship.id)
+    assert loaded is not None
+    assert np.allclose(loaded.kn_m, _curves().kn_m)
+    assert np.array_equal(loaded.heel_deg, HEELS)
+
+
+def test_batch_and_scalar_engines_carry_gz(sample_ship, sample_tanks):
+    engine = GZEngine(_curves())
+    model = ShipModel.compile(sample_ship, sample_tanks, cross_curves=_curves())
+    volumes = np.array([[4000.0, 3000.0], [6000.0, 6000.0]])
+    batch = compute_model_batch(model, volumes)
+    assert batch.gz is not None and len(batch.gz) == 2
+    for i in range(2):
+        cond = LoadingCondition(tank_volumes_m3={1: volumes[i, 0], 2: volumes[i, 1]})
+        ref = compute_condition(sample_ship, sample_tanks, cond, gz_engine=engine)
+        assert astuple(batch.row(i).ancillary.gz) == pytest.approx(astuple(ref.ancillary.gz), rel=1e-12)
+
+
+def test_service_reports_is_code_gz_lines(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tank = TankRepository(db_session).create(
+        Tank(ship_id=ship.id, name="T", capacity_m3=20000.0, kg_m=6.0)
+    )
+    CrossCurveRepository(db_session).replace_for_ship(ship.id, _curves())
+    res = ConditionService(db_session).compute(ship, LoadingCondition(name="C"), {tank.id: 10000.0})
+    codes = {line.code for line in res.criteria.lines}
+    assert {"GZ_STATUS", "GZ_AREA_0_30", "GZ_AREA_30_40", "GZ_MAX_ANGLE"} <= codes
+    assert res.ancillary.gz is not None
+
+
+def test_kn_from_box_hull_matches_wall_sided_formula():
+    trimesh = pytest.importorskip("trimesh")
+    from senashipping_app.services.hydrostatic_generator import cross_curves_from_mesh
+
+    mesh = trimesh.creation.box(extents=[100.0, 20.0, 10.0])
+    mesh.apply_translation([50.0, 0.0, 5.0])
+    draft = 4.0
+    disp = np.array([100.0 * 20.0 * d * 1.025 for d in (3.0, draft, 5.0)])
+    curves = cross_curves_from_mesh(mesh, [0.0, 10.0, 20.0], disp, max_workers=1)
+    # Wall-sided until the deck edge or bilge reaches the water (~21.8 deg)
+    bm = 20.0 ** 2 / (12.0 * draft)
+    phi = np.radians([10.0, 20.0])
+    expected = np.sin(phi) * (draft / 2.0 + bm + 0.5 * bm * np.tan(phi) ** 2)
+    assert np.allclose(curves.kn_m[1, 1:], expected, rtol=1e-6)
+    assert curves.kn_m[1, 0] == pytest.approx(0.0, abs=1e-9)
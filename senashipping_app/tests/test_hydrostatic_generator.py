@@ -0,0 +1,109 @@
+"""Tests for slicing hydrostatic tables from a hull mesh."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+
+from senashipping_app.repositories.hydrostatic_repository import HydrostaticRepository
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.services import hydrostatic_generator
+from senashipping_app.services.hydrostatic_generator import (
+    create_hydrostatic_table_from_stl,
+    generate_cross_curves,
+    generate_hydrostatics,
+    hydrostatics_from_mesh,
+)
+
+
+def _box_hull(length=100.0, breadth=20.0, depth=10.0):
+    mesh = trimesh.creation.box(extents=[length, breadth, depth])
+    mesh.apply_translation([length / 2, 0.0, depth / 2])
+    return mesh.subdivide()
+
+
+@pytest.fixture
+def hull_stl(tmp_path):
+    path = tmp_path / "hull.stl"
+    _box_hull().export(path)
+    return path
+
+
+def test_box_hull_matches_closed_form():
+    gen = hydrostatics_from_mesh(_box_hull(), [2.0, 4.0, 6.0], max_workers=1)
+    assert np.allclose(gen.volume_m3[0], [4000.0, 8000.0, 12000.0])
+    assert np.allclose(gen.kb_m[0], [1.0, 2.0, 3.0])
+    assert np.allclose(gen.lcb_m[0], 50.0) and np.allclose(gen.lcf_m[0], 50.0)
+    assert np.allclose(gen.waterplane_area_m2[0], 2000.0)
+    # BM_T = L B^3 / 12 / V
+    assert np.allclose(gen.bm_t_m[0], 100.0 * 20.0 ** 3 / 12.0 / gen.volume_m3[0])
+    assert np.allclose(gen.tpc_t_per_cm[0], 2000.0 * 1.025 / 100.0)
+
+
+def test_trim_moves_buoyancy_aft():
+    gen = hydrostatics_from_mesh(_box_hull(), [4.0], trims_m=[0.0, 1.0], max_workers=1)
+    # Trim about amidships keeps volume for a box; stern down moves LCB aft
+    assert gen.volume_m3[1, 0] == pytest.approx(gen.volume_m3[0, 0])
+    assert gen.lcb_m[1, 0] < gen.lcb_m[0, 0]
+
+
+def test_process_pool_matches_serial():
+    drafts = np.linspace(1.0, 8.0, 8)
+    serial = hydrostatics_from_mesh(_box_hull(), drafts, [0.0, 0.5], max_workers=1)
+    pooled = hydrostatics_from_mesh(_box_hull(), drafts, [0.0, 0.5], max_workers=2)
+    assert np.allclose(serial.volume_m3, pooled.volume_m3)
+    assert np.allclose(serial.i_l_m4, pooled.i_l_m4)
+
+
+def test_cache_is_keyed_by_content_hash(hull_stl, tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    first = generate_hydrostatics(hull_stl, [0.0, 2.0, 4.0], cache_dir=cache, max_workers=1)
+    assert [p.name.split("-")[0] for p in cache.glob("*.npz")] == [first.content_hash]
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("mesh should not be sliced again")
+
+    monkeypatch.setattr(hydrostatic_generator, "load_stl", fail)
+    again = generate_hydrostatics(hull_stl, [0.0, 2.0, 4.0], cache_dir=cache, max_workers=1)
+    assert np.array_equal(again.volume_m3, first.volume_m3)
+
+    # A different grid for the same hull is regenerated
+    with pytest.raises(AssertionError):
+        generate_hydrostatics(hull_stl, [1.0, 3.0], cache_dir=cache, max_workers=1)
+
+
+def test_each_grid_keeps_its_own_cache_file(hull_stl, tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    grids = ([0.0, 2.0, 4.0], [1.0, 3.0])
+    for drafts in grids:
+        generate_hydrostatics(hull_stl, drafts, cache_dir=cache, max_workers=1)
+    generate_cross_curves(hull_stl, [0.0, 10.0], [4000.0, 8000.0], cache_dir=cache, max_workers=1)
+    generate_cross_curves(hull_stl, [0.0, 20.0], [4000.0, 8000.0], cache_dir=cache, max_workers=1)
+    assert len(list(cache.glob("*.kn.npz"))) == 2 and len(list(cache.glob("*.npz"))) == 4
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("mesh should not be sliced again")
+
+    monkeypatch.setattr(hydrostatic_generator, "load_stl", fail)
+    for drafts in grids + grids:
+        assert np.allclose(
+            generate_hydrostatics(hull_stl, drafts, cache_dir=cache, max_workers=1).drafts_m, drafts
+        )
+    for heels in ([0.0, 10.0], [0.0, 20.0]):
+        curves = generate_cross_curves(hull_stl, heels, [4000.0, 8000.0], cache_dir=cache, max_workers=1)
+        assert np.array_equal(curves.heel_deg, heels)
+
+
+def test_table_stored_for_ship(hull_stl, tmp_path, db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    repo = HydrostaticRepository(db_session)
+    table = create_hydrostatic_table_from_stl(
+        hull_stl, ship.id, repo, [0.0, 2.0, 4.0, 6.0], cache_dir=tmp_path, max_workers=1
+    )
+    # The zero-volume row at the keel is dropped
+    assert table.n_rows == 3
+    stored = repo.get_for_ship(ship.id)
+    assert stored is not None
+    assert stored.at_draft(3.0).displacement_t == pytest.approx(6000.0 * 1.025)
@@ -0,0 +1,115 @@
+"""Tests for interpolated hydrostatic tables and their use in condition calculations."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import HydrostaticTable, LivestockPen, LoadingCondition, Tank
+from senashipping_app.repositories.hydrostatic_repository import HydrostaticRepository
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.hydrostatics import box_hydrostatic_table
+from senashipping_app.services.ship_model import ShipModel
+from senashipping_app.services.stability_service import compute_condition, compute_model_batch
+
+
+def _table() -> HydrostaticTable:
+    return HydrostaticTable(
+        draft_m=[2.0, 4.0, 6.0],
+        displacement_t=[1000.0, 2200.0, 3600.0],
+        kb_m=[1.1, 2.1, 3.2],
+        lcb_m=[50.0, 49.0, 48.0],
+        lcf_m=[48.0, 47.0, 46.0],
+        mtc_tm_per_m=[9000.0, 11000.0, 13000.0],
+        tpc_t_per_cm=[6.0, 7.0, 8.0],
+        km_m=[12.0, 10.0, 9.5],
+    )
+
+
+def test_interpolation_and_inverse():
+    table = _table()
+    state = table.at_draft(3.0)
+    assert state.displacement_t == pytest.approx(1600.0)
+    assert state.km_m == pytest.approx(11.0)
+    assert table.draft_for_displacement(2900.0) == pytest.approx(5.0)
+
+    drafts = np.array([2.0, 2.5, 5.0, 6.0])
+    states = table.at_draft(drafts)
+    assert states.displacement_t.shape == (4,)
+    back = table.draft_for_displacement(states.displacement_t)
+    assert np.allclose(back, drafts)
+
+
+def test_lookups_clamp_outside_grid():
+    table = _table()
+    assert table.at_draft(0.5).km_m == pytest.approx(12.0)
+    assert table.at_draft(9.0).draft_m == pytest.approx(6.0)
+    assert table.draft_for_displacement(10_000.0) == pytest.approx(6.0)
+
+
+def test_rejects_bad_tables():
+    with pytest.raises(ValueError, match="strictly increasing"):
+        HydrostaticTable.from_rows([
+            {**_table().to_rows()[0]}, {**_table().to_rows()[0]},
+        ])
+    rows = _table().to_rows()
+    rows[1]["displacement_t"] = 500.0
+    with pytest.raises(ValueError, match="displacement"):
+        HydrostaticTable.from_rows(rows)
+
+
+def test_repository_round_trip(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    repo = HydrostaticRepository(db_session)
+    assert repo.get_for_ship(ship.id) is None
+    repo.replace_for_ship(ship.id, _table())
+    loaded = repo.get_for_ship(ship.id)
+    assert loaded is not None
+    assert loaded.to_rows() == _table().to_rows()
+
+
+def test_box_table_matches_box_formulas(sample_ship, sample_tanks):
+    table = box_hydrostatic_table(
+        sample_ship.length_overall_m, sample_ship.breadth_m, np.linspace(0.0, 14.0, 141)
+    )
+    cond = LoadingCondition(tank_volumes_m3={1: 18000.0, 2: 14000.0})
+    box = compute_condition(sample_ship, sample_tanks, cond)
+    tabled = compute_condition(sample_ship, sample_tanks, cond, hydrostatics=table)
+    assert tabled.draft_m == pytest.approx(box.draft_m, rel=1e-9)
+    assert tabled.km_m == pytest.approx(box.km_m, rel=1e-3)
+    # G aft of amidships: both trim by the stern (positive)
+    assert tabled.trim_m > 0.0 and box.trim_m > 0.0
+
+
+def test_batch_matches_scalar_with_table(sample_ship, sample_tanks):
+    pens = [LivestockPen(id=5, ship_id=1, name="P", vcg_m=10.0, lcg_m=30.0, tcg_m=0.5, area_m2=40.0)]
+    table = _table()
+    model = ShipModel.compile(sample_ship, sample_tanks, pens, hydrostatics=table)
+    rng = np.random.default_rng(3)
+    volumes = rng.uniform(0.0, 1000.0, size=(20, 2))
+    heads = rng.integers(0, 100, size=(20, 1))
+    batch = compute_model_batch(model, volumes, heads)
+    for i in range(20):
+        cond = LoadingCondition(tank_volumes_m3={1: volumes[i, 0], 2: volumes[i, 1]})
+        ref = compute_condition(
+            sample_ship, sample_tanks, cond, pens=pens,
+            pen_loadings={5: int(heads[i, 0])}, hydrostatics=table,
+        )
+        row = batch.row(i)
+        assert row.draft_m == pytest.approx(ref.draft_m, rel=1e-12)
+        assert row.trim_m == pytest.approx(ref.trim_m, rel=1e-12, abs=1e-12)
+        assert row.draft_aft_m - row.draft_fwd_m == pytest.approx(row.trim_m)
+        assert row.gm_m == pytest.approx(ref.gm_m, rel=1e-12)
+
+
+def test_service_uses_stored_table(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tank = TankRepository(db_session).create(
+        Tank(ship_id=ship.id, name="T", capacity_m3=5000.0, kg_m=4.0)
+    )
+    HydrostaticRepository(db_session).replace_for_ship(ship.id, _table())
+    res = ConditionService(db_session).compute(ship, LoadingCondition(name="C"), {tank.id: 2200.0})
+    assert res.draft_m == pytest.approx(4.0)
+    assert res.km_m == pytest.approx(10.0)
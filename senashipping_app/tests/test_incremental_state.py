@@ -0,0 +1,98 @@
+"""Tests for the incremental (running-sum) condition state."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import LivestockPen, Tank
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.hydrostatics import box_hydrostatic_table
+from senashipping_app.services.incremental_state import IncrementalConditionState
+from senashipping_app.services.ship_model import ShipModel
+from senashipping_app.services.stability_service import compute_condition_for_model
+from senashipping_app.services.validation import compute_free_surface_correction
+
+
+def _model(sample_ship, hydrostatics=None) -> ShipModel:
+    tanks = [
+        Tank(id=i + 1, name=f"T{i}", capacity_m3=800.0 + 100 * i, kg_m=2.0 + 0.5 * i,
+             longitudinal_pos=0.1 + 0.08 * i, tcg_m=(-1.0) ** i * 2.0)
+        for i in range(10)
+    ]
+    pens = [
+        LivestockPen(id=i + 1, name=f"P{i}", deck="A", vcg_m=14.0, lcg_m=30.0 + 20 * i,
+                     tcg_m=1.5 - i, area_m2=40.0, capacity_head=50)
+        for i in range(4)
+    ]
+    return ShipModel.compile(sample_ship, tanks, pens, hydrostatics=hydrostatics)
+
+
+@pytest.mark.parametrize("with_table", [False, True])
+def test_matches_full_compute_after_random_edits(sample_ship, with_table):
+    table = None
+    if with_table:
+        table = box_hydrostatic_table(sample_ship.length_overall_m, sample_ship.breadth_m,
+                                      np.linspace(0.0, 15.0, 151))
+    model = _model(sample_ship, table)
+    state = IncrementalConditionState(model, {1: 400.0}, {1: 10}, cargo_density_t_per_m3=1.025,
+                                      mass_per_head_t=0.52, vcg_from_deck_m=1.2)
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        if rng.random() < 0.7:
+            tid = int(rng.integers(1, 11))
+            state.set_tank_fill_pct(tid, float(rng.uniform(0.0, 100.0)))
+        else:
+            state.set_pen_heads(int(rng.integers(1, 5)), int(rng.integers(-2, 51)))
+
+    volumes = state.tank_volume_map()
+    ref = compute_condition_for_model(model, volumes, state.pen_loading_map(), 1.025,
+                                      mass_per_head_t=0.52, vcg_from_deck_m=1.2)
+    res = state.results()
+    for name in ("displacement_t", "draft_m", "trim_m", "kg_m", "km_m", "gm_m", "heel_deg",
+                 "draft_aft_m", "draft_fwd_m"):
+        assert getattr(res, name) == pytest.approx(getattr(ref, name), rel=1e-9, abs=1e-9), name
+    fsc = compute_free_surface_correction(list(model.tanks), volumes, ref.displacement_t, 1.025)
+    assert res.free_surface_correction_m == pytest.approx(fsc, rel=1e-9)
+    assert res.gm_effective_m == pytest.approx(max(0.0, ref.gm_m - fsc))
+
+
+def test_periodic_resum_bounds_drift(sample_ship):
+    model = _model(sample_ship)
+    state = IncrementalConditionState(model, resum_every=5)
+    for k in range(12):
+        state.set_tank_volume(1, 100.0 + k)
+    assert state.edits_since_resum == 2
+    # Repeated large/small edits return to the exact resummed totals
+    state.set_tank_volume(2, 1e9)
+    state.set_tank_volume(2, 0.1)
+    drifted = state.displacement_t
+    state.resum()
+    assert state.edits_since_resum == 0
+    assert drifted == pytest.approx(state.displacement_t, abs=1e-6)
+    assert state.displacement_t == pytest.approx(111.1)
+
+
+def test_noop_and_unknown_edits(sample_ship):
+    state = IncrementalConditionState(_model(sample_ship), {1: 50.0})
+    state.set_tank_volume(1, 50.0)
+    assert state.edits_since_resum == 0
+    with pytest.raises(KeyError):
+        state.set_tank_volume(999, 1.0)
+    with pytest.raises(KeyError):
+        state.set_pen_heads(999, 1)
+    assert IncrementalConditionState(_model(sample_ship)).results().draft_m == 0.0
+
+
+def test_service_builds_state_from_cached_model(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tank = TankRepository(db_session).create(
+        Tank(ship_id=ship.id, name="T", capacity_m3=5000.0, kg_m=4.0, longitudinal_pos=0.4)
+    )
+    service = ConditionService(db_session)
+    state = service.incremental_state(ship, {tank.id: 2000.0})
+    assert state.model is service.get_ship_model(ship)
+    state.set_tank_volume(tank.id, 3000.0)
+    assert state.results().displacement_t == pytest.approx(3000.0)
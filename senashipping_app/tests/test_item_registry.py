@@ -0,0 +1,152 @@
+"""Tests for the indexed pen/tank registry shared by the condition views."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PyQt6.QtCore")
+
+from senashipping_app.models import LivestockPen, Tank
+from senashipping_app.models.tank import TankType
+from senashipping_app.utils.sorting import get_pen_sort_key, get_tank_sort_key
+from senashipping_app.views.item_registry import ItemRegistry, deck_letter, tank_in_category
+
+
+def _pens(n: int):
+    decks = ["A", "DK2", "3", "h", "", "X"]
+    return [
+        LivestockPen(id=i + 1, name=f"{(n - i) % 7 + 1}-{'ABCD'[i % 4]}", deck=decks[i % len(decks)],
+                     area_m2=10.0, capacity_head=5)
+        for i in range(n)
+    ]
+
+
+def _tanks():
+    return [
+        Tank(id=1, name="WB 2 P", capacity_m3=100.0, category="Water Ballast"),
+        Tank(id=2, name="WB 1 S", capacity_m3=100.0, category="Water Ballast"),
+        # Old data without a category falls back to the tank type
+        Tank(id=3, name="FW 1", capacity_m3=50.0, tank_type=TankType.FRESH_WATER, category=""),
+        Tank(id=4, name="Store", capacity_m3=20.0, category="spaces"),
+    ]
+
+
+def test_load_indexes_match_list_scans():
+    pens, tanks = _pens(60), _tanks()
+    registry = ItemRegistry()
+    resets = []
+    registry.reset.connect(lambda: resets.append(registry.version))
+    registry.load(7, pens, tanks)
+
+    assert resets == [1] and registry.ship_id == 7
+    for letter in "ABCDEFGH":
+        expected = sorted((p for p in pens if deck_letter(p.deck) == letter), key=get_pen_sort_key)
+        assert registry.pens_on_deck(letter) == expected
+    assert registry.sorted_pens() == sorted(pens, key=get_pen_sort_key)
+    assert registry.sorted_tanks() == sorted(tanks, key=get_tank_sort_key)
+    assert [t.id for t in registry.tanks_in_category("Water Ballast")] == [2, 1]
+    assert [t.id for t in registry.tanks_in_category("Spaces")] == [4]
+    assert registry.pen(12) is pens[11] and registry.tank(3) is tanks[2] and registry.pen(999) is None
+    # All tab: deck A..H first, pens without a known deck last
+    decks = [registry.pen_decks[i] for i in registry.all_pen_rows()]
+    assert decks == sorted(decks, key=lambda d: d or "~")
+    assert registry.holds(registry.pens, registry.tanks) and not registry.holds(pens, tanks)
+
+
+def test_upserts_keep_indexes_sorted_and_signal_ids():
+    registry = ItemRegistry()
+    registry.load(1, _pens(12), _tanks())
+    changed = []
+    registry.pens_changed.connect(changed.append)
+    registry.tanks_changed.connect(changed.append)
+
+    registry.upsert_pens([LivestockPen(id=50, name="0-A", deck="DK8")])
+    moved = LivestockPen(id=1, name="1-A", deck="B")
+    registry.upsert_pens([moved])
+    registry.upsert_tanks([Tank(id=2, name="WB 2 S", capacity_m3=10.0, category="Fresh Water")])
+
+    assert changed == [(50,), (1,), (2,)] and registry.version == 4
+    assert registry.pens_on_deck("H")[0].id == 50
+    assert moved in registry.pens_on_deck("B") and registry.pen(1) is moved
+    assert all(p.id != 1 for p in registry.pens_on_deck("A"))
+    assert registry.pens_on_deck("B") == sorted(registry.pens_on_deck("B"), key=get_pen_sort_key)
+    assert [t.id for t in registry.tanks_in_category("Water Ballast")] == [1]
+    assert [t.id for t in registry.tanks_in_category("Fresh Water")] == [3, 2]
+    assert len(registry.all_pen_rows()) == len(registry.pens) == 13
+    assert tank_in_category(registry.tank(4), "Spaces")
+
+
+def test_condition_table_uses_shared_registry():
+    QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+    app = QtWidgets.QApplication.instance()
+    if app is not None and not isinstance(app, QtWidgets.QApplication):
+        pytest.skip("a non-GUI QCoreApplication is already running")
+    app = app or QtWidgets.QApplication([])
+    from senashipping_app.views.condition_table_widget import ConditionTableWidget
+
+    registry = ItemRegistry()
+    registry.load(1, _pens(30), _tanks())
+    widget = ConditionTableWidget()
+    widget.set_registry(registry)
+    resets = []
+    registry.reset.connect(lambda: resets.append(True))
+
+    widget.update_data(registry.pens, registry.tanks, {1: 3}, {1: 50.0}, ship_id=1)
+    assert resets == []  # the registry's own lists are not reloaded
+    deck_a = widget._models["Livestock-DK1"]
+    assert deck_a.pen_indices().tolist() == registry.deck_rows("A")
+    for name in ("Water Ballast", "All"):
+        widget._tabs.setCurrentIndex(widget._tab_names.index(name))
+    assert widget._models["Water Ballast"].tank_indices().tolist() == registry.category_rows("Water Ballast")
+    assert widget._models["All"].tank_indices().tolist() == [0]
+
+    widget.update_data(_pens(5), [], {}, {}, ship_id=2)
+    assert resets == [True] and registry.ship_id == 2 and len(registry.pens) == 5
+
+
+def test_editor_and_tables_follow_upserts(temp_db):
+    QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+    app = QtWidgets.QApplication.instance()
+    if app is not None and not isinstance(app, QtWidgets.QApplication):
+        pytest.skip("a non-GUI QCoreApplication is already running")
+    app = app or QtWidgets.QApplication([])
+    from PyQt6.QtCore import Qt
+    from senashipping_app.repositories.database import init_database
+    from senashipping_app.views.condition_editor_view import ConditionEditorView
+
+    init_database(temp_db)
+    view = ConditionEditorView()
+    registry = view._registry
+    registry.load(1, _pens(6), _tanks())
+    view._populate_tanks_table({})
+    view._populate_pens_table({})
+    table = view._condition_table
+    table.update_data(registry.pens, registry.tanks, {}, {1: 50.0}, ship_id=1)
+    table._tabs.setCurrentIndex(table._tab_names.index("Water Ballast"))
+    tank_rows = view._tank_table
+    next(tank_rows.item(r, 2) for r in range(tank_rows.rowCount())
+         if tank_rows.item(r, 0).data(Qt.ItemDataRole.UserRole) == 2).setText("40.0")
+
+    registry.upsert_tanks([
+        Tank(id=1, name="WB 2 P", capacity_m3=20.0, category="Water Ballast"),  # smaller than its 50 m³
+        Tank(id=2, name="WB 0 S", capacity_m3=100.0, category="Water Ballast"),
+        Tank(id=9, name="WB 9", capacity_m3=30.0, category="Water Ballast"),
+    ])
+    rows = {tank_rows.item(r, 0).text(): tank_rows.item(r, 2).text() for r in range(tank_rows.rowCount())}
+    assert list(rows) == [t.name for t in registry.sorted_tanks()]
+    assert rows["WB 0 S"] == "40.0" and rows["WB 9"] == "0.0"
+    ballast = table._models["Water Ballast"]
+    assert ballast.tank_indices().tolist() == registry.category_rows("Water Ballast")
+    volumes = table.current_loadings()[1]
+    assert (volumes[1], volumes[2], volumes[9]) == (pytest.approx(20.0), 0.0, 0.0)
+
+    registry.upsert_pens([LivestockPen(id=40, name="1-A", deck="A", area_m2=10.0, capacity_head=5)])
+    pen_rows = view._pen_table
+    assert [pen_rows.item(r, 0).data(Qt.ItemDataRole.UserRole) for r in range(pen_rows.rowCount())] == [
+        p.id for p in registry.sorted_pens()
+    ]
+    assert 40 in table.current_loadings()[0]
+    view.deleteLater()
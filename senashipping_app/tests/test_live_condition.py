@@ -0,0 +1,124 @@
+"""Tests for live (delta-driven) condition results and their debouncing."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from senashipping_app.models import LivestockPen, Tank
+from senashipping_app.services.alarms import AlarmStatus, build_alarm_rows
+from senashipping_app.services.condition_batch import run_condition
+from senashipping_app.services.live_condition import LiveCondition
+from senashipping_app.services.ship_model import ShipModel
+
+
+def _model(sample_ship) -> ShipModel:
+    sample_ship.id = 1
+    tanks = [
+        Tank(id=i + 1, name=f"T{i}", capacity_m3=800.0, kg_m=2.0 + 0.5 * i,
+             longitudinal_pos=0.1 + 0.15 * i, tcg_m=(-1.0) ** i * 2.0)
+        for i in range(6)
+    ]
+    pens = [
+        LivestockPen(id=i + 1, name=f"P{i}", deck="A", vcg_m=14.0, lcg_m=30.0 + 25 * i,
+                     tcg_m=1.0 - i, area_m2=40.0, capacity_head=50)
+        for i in range(4)
+    ]
+    return ShipModel.compile(sample_ship, tanks, pens)
+
+
+def test_live_results_match_full_compute(sample_ship):
+    model = _model(sample_ship)
+    live = LiveCondition(model, {1: 300.0, 2: 500.0}, {1: 20}, mass_per_head_t=0.52)
+    live.apply({3: 650.0, 1: 100.0}, {2: 45, 1: 0})
+    update = live.apply({6: 200.0}, {})
+
+    ref = run_condition(model, "Ref", live.state.tank_volume_map(), live.state.pen_loading_map(),
+                        mass_per_head_t=0.52)
+    res = update.results
+    for name in ("displacement_t", "draft_m", "trim_m", "gm_m", "kg_m", "heel_deg"):
+        assert getattr(res, name) == pytest.approx(getattr(ref, name), rel=1e-9, abs=1e-9), name
+    assert res.validation.gm_effective == pytest.approx(ref.validation.gm_effective)
+    assert res.validation.has_errors == ref.validation.has_errors
+    assert [(l.code, l.result) for l in res.criteria.lines] == [(l.code, l.result) for l in ref.criteria.lines]
+    assert res.ancillary.prop_immersion_pct == pytest.approx(ref.ancillary.prop_immersion_pct)
+    for name in ("still_water_bm_approx_tm", "bm_pct_allow", "sf_pct_allow", "hogging_bm_tm"):
+        assert getattr(res.strength, name) == pytest.approx(getattr(ref.strength, name), rel=1e-9, abs=1e-9), name
+    assert (update.tanks_changed, update.pens_changed) == (1, 0)
+
+
+def test_free_trim_matches_full_compute_and_warm_starts(sample_ship):
+    model = _model(sample_ship)
+    live = LiveCondition(model, {1: 300.0, 2: 500.0}, {1: 20}, free_trim=True)
+    first = live.apply().results
+    update = live.apply({3: 650.0}, {2: 10})
+    res = update.results
+
+    ref = run_condition(model, "Ref", live.state.tank_volume_map(), live.state.pen_loading_map(),
+                        free_trim=True)
+    for name in ("draft_m", "trim_m", "heel_deg", "draft_aft_m", "draft_fwd_m"):
+        assert getattr(res, name) == pytest.approx(getattr(ref, name), rel=1e-6, abs=1e-6), name
+    assert not first.equilibrium.stats.warm_start
+    assert res.equilibrium.converged and res.equilibrium.stats.warm_start
+    assert res.ancillary.prop_immersion_pct == pytest.approx(ref.ancillary.prop_immersion_pct)
+
+
+def test_failing_bm_alarm_survives_a_live_edit(sample_ship):
+    sample_ship.id = 1
+    tanks = [
+        Tank(id=1, name="Aft", capacity_m3=5000.0, kg_m=3.0, longitudinal_pos=0.0),
+        Tank(id=2, name="Mid", capacity_m3=100.0, kg_m=3.0, longitudinal_pos=0.5),
+    ]
+    live = LiveCondition(ShipModel.compile(sample_ship, tanks, []), {1: 4000.0})
+
+    def bm_row(results):
+        rows = build_alarm_rows(results, results.validation, results.criteria)
+        return next(r for r in rows if r.description == "Max BMom %Allow")
+
+    assert bm_row(live.apply().results).status == AlarmStatus.FAIL
+    edited = live.apply({2: 10.0}).results
+    assert bm_row(edited).status == AlarmStatus.FAIL
+    assert any(r.description == "Max Shear %Allow" for r in build_alarm_rows(edited, None, None))
+    assert "BM_OVER" in [i.code for i in edited.validation.issues]
+
+
+def test_only_changed_inputs_are_reevaluated(sample_ship):
+    live = LiveCondition(_model(sample_ship), {1: 300.0})
+    first = live.apply()
+    assert len(first.criteria_evaluated) == len(first.results.criteria.lines)
+    assert live.apply().criteria_evaluated == ()
+    changed = live.apply({2: 400.0}, {99: 5})
+    assert 0 < len(changed.criteria_evaluated) and changed.ignored_ids == (99,)
+    assert live.updates == 3 and changed.latency_s > 0
+
+
+def test_debounce_coalesces_edits_into_one_update(sample_ship):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtCore = pytest.importorskip("PyQt6.QtCore")
+    from senashipping_app.views.live_recompute import LiveRecompute
+
+    _app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    live = LiveCondition(_model(sample_ship), {1: 300.0})
+    controller = LiveRecompute(debounce_ms=20)
+    updates, latencies = [], []
+    controller.updated.connect(updates.append)
+    controller.latency_measured.connect(latencies.append)
+
+    controller.start(live)
+    assert len(updates) == 1  # initial results are published at once
+    for heads in range(1, 30):
+        controller.pen_heads_edited(2, heads)
+    controller.tank_volume_edited(1, 100.0)
+    controller.tank_volume_edited(3, 200.0)
+    assert len(updates) == 1
+    loop = QtCore.QEventLoop()
+    QtCore.QTimer.singleShot(200, loop.quit)
+    loop.exec()
+
+    assert len(updates) == 2 and len(latencies) == 2
+    assert (updates[1].tanks_changed, updates[1].pens_changed) == (2, 1)
+    assert live.state.pen_loading_map()[2] == 29
+    controller.stop()
+    controller.pen_heads_edited(2, 3)
+    assert not controller.active and live.state.pen_loading_map()[2] == 29
@@ -0,0 +1,116 @@
+"""Tests for the ship-wide livestock pen allocation solver."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import LivestockPen, Tank
+from senashipping_app.models.cargo_type import CargoType
+from senashipping_app.repositories.hydrostatic_repository import HydrostaticRepository
+from senashipping_app.repositories.livestock_pen_repository import LivestockPenRepository
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.hydrostatics import box_hydrostatic_table
+from senashipping_app.services.livestock_allocation import (
+    AllocationLimits,
+    LivestockAllocator,
+    ShipmentItem,
+    pen_head_capacity,
+)
+from senashipping_app.services.stability_service import compute_condition_for_model
+
+CATTLE = CargoType(id=1, name="Cattle", avg_weight_per_head_kg=500.0, vcg_from_deck_m=1.5,
+                   deck_area_per_head_m2=1.85)
+SHEEP = CargoType(id=2, name="Sheep", avg_weight_per_head_kg=60.0, vcg_from_deck_m=0.8,
+                  deck_area_per_head_m2=0.35)
+
+
+def _tanks():
+    return [Tank(id=1, ship_id=1, name="DB", capacity_m3=8000.0, longitudinal_pos=0.5, kg_m=1.0)]
+
+
+def _pens(sides=(-1.0, 1.0), with_ids=True, ship_id=1):
+    pens = []
+    for deck in range(3):
+        for i in range(20):
+            for side in sides:
+                n = len(pens) + 1
+                pens.append(LivestockPen(
+                    id=n if with_ids else None, ship_id=ship_id, name=f"PEN {n}", deck=f"DK{deck + 1}",
+                    vcg_m=12.0 + 2.5 * deck, lcg_m=25.0 + 5.0 * i, tcg_m=side * (3.0 + 2.5 * (i % 3)),
+                    area_m2=20.0,
+                ))
+    return pens
+
+
+def test_pen_capacity_from_area_and_head_limit(box_model):
+    pens = _pens()[:2]
+    pens[1].capacity_head = 5
+    cap = pen_head_capacity(box_model(_tanks(), pens), [CATTLE, SHEEP])
+    assert cap.tolist() == [[10, 5], [57, 5]]
+
+
+def test_allocation_matches_full_compute(box_model):
+    model = box_model(_tanks(), _pens())
+    result = LivestockAllocator(model, {1: 8000.0}).allocate([ShipmentItem(CATTLE, 500)])
+    assert result.loaded_heads == [500] and result.limiting is None
+    assert all(h <= 10 for h in result.pen_heads.values())
+    ref = compute_condition_for_model(
+        model, {1: 8000.0}, result.pen_heads, mass_per_head_t=0.5, vcg_from_deck_m=1.5,
+        station_strength=True,
+    )
+    assert result.displacement_t == pytest.approx(ref.displacement_t)
+    assert result.trim_m == pytest.approx(ref.trim_m)
+    assert result.heel_deg == pytest.approx(ref.heel_deg)
+    assert result.max_bm_pct == pytest.approx(float(ref.strength_curves.max_bm_pct))
+
+
+def test_mixed_shipment_fits_one_type_per_pen(box_model):
+    model = box_model(_tanks(), _pens())
+    result = LivestockAllocator(model, {1: 8000.0}).allocate(
+        [ShipmentItem(CATTLE, 400), ShipmentItem(SHEEP, 1000)]
+    )
+    assert result.loaded_heads == [400, 1000] and result.unloaded_heads == 0
+    for cargo, total in ((CATTLE, 400), (SHEEP, 1000)):
+        pens = [p for p, c in result.pen_cargo.items() if c is cargo]
+        assert sum(result.pen_heads[p] for p in pens) == total
+
+
+def test_pen_area_limits_loading(box_model):
+    model = box_model(_tanks(), _pens())
+    result = LivestockAllocator(model, {1: 8000.0}).allocate([ShipmentItem(SHEEP, 100000)])
+    assert result.limiting == "pen area"
+    assert result.total_heads == 57 * model.n_pens
+    assert len(result.pen_heads) == model.n_pens
+
+
+def test_heel_limit_stops_one_sided_loading(box_model):
+    model = box_model(_tanks(), _pens(sides=(1.0,)))
+    limits = AllocationLimits(max_heel_deg=0.2)
+    result = LivestockAllocator(model, {1: 8000.0}, limits=limits).allocate([ShipmentItem(CATTLE, 10000)])
+    assert result.limiting == "heel"
+    assert 0 < result.total_heads < 600
+    assert abs(result.heel_deg) <= 0.2 + 1e-9
+    # A looser limit lets more heads on
+    looser = LivestockAllocator(model, {1: 8000.0}, limits=AllocationLimits(max_heel_deg=0.3))
+    assert looser.allocate([ShipmentItem(CATTLE, 10000)]).total_heads > result.total_heads
+
+
+def test_service_allocate_livestock(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    TankRepository(db_session).create(
+        Tank(ship_id=ship.id, name="DB", capacity_m3=8000.0, longitudinal_pos=0.5, kg_m=1.0)
+    )
+    pen_repo = LivestockPenRepository(db_session)
+    for pen in _pens(with_ids=False, ship_id=ship.id)[:20]:
+        pen_repo.create(pen)
+    table = box_hydrostatic_table(ship.length_overall_m, ship.breadth_m, np.linspace(0.0, 14.0, 141))
+    HydrostaticRepository(db_session).replace_for_ship(ship.id, table)
+    tank_id = TankRepository(db_session).list_for_ship(ship.id)[0].id
+    result = ConditionService(db_session).allocate_livestock(
+        ship, {tank_id: 8000.0}, [ShipmentItem(CATTLE, 150)]
+    )
+    assert result.total_heads == 150
+    assert result.gm_effective_m >= AllocationLimits().min_gm_m
@@ -0,0 +1,88 @@
+"""Tests for the versioned schema migrations."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from senashipping_app.repositories.database import Base, init_database, register_models
+from senashipping_app.repositories.migrations import (
+    LATEST_VERSION,
+    MIGRATIONS,
+    Migration,
+    add_missing_columns,
+    migrate,
+    schema_version,
+)
+
+
+def _columns(engine, table):
+    with engine.connect() as conn:
+        return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_new_database_is_created_at_latest_version(temp_db):
+    init_database(temp_db)
+    engine = create_engine(f"sqlite:///{temp_db}", future=True)
+    with engine.connect() as conn:
+        assert schema_version(conn) == LATEST_VERSION
+    assert {"category", "density_t_per_m3", "deck_name"} <= _columns(engine, "tanks")
+    assert "pen_loadings_json" in _columns(engine, "loading_conditions")
+
+
+def test_migrations_cover_the_orm_models(temp_db):
+    # Migration 1 is frozen DDL, so model changes need a migration of their own
+    engine = create_engine(f"sqlite:///{temp_db}", future=True)
+    migrate(engine)
+    register_models()
+    for table in Base.metadata.sorted_tables:
+        assert {c.name for c in table.columns} <= _columns(engine, table.name), table.name
+
+
+def test_current_database_takes_one_query(temp_db):
+    init_database(temp_db)
+    engine = create_engine(f"sqlite:///{temp_db}", future=True)
+    statements = _count_statements(engine)
+    assert migrate(engine) == 0
+    assert len(statements) == 1 and "schema_version" in statements[0]
+
+
+def test_legacy_database_is_upgraded_once(temp_db):
+    engine = create_engine(f"sqlite:///{temp_db}", future=True)
+    with engine.begin() as conn:
+        # Tables as created before the added columns, with no version table
+        conn.execute(text("CREATE TABLE tanks (id INTEGER PRIMARY KEY, ship_id INTEGER, name VARCHAR(255))"))
+        conn.execute(text("INSERT INTO tanks (id, ship_id, name) VALUES (1, 1, 'DB1')"))
+        conn.execute(text("CREATE TABLE cargo_types (id INTEGER PRIMARY KEY, name VARCHAR(128))"))
+    assert migrate(engine) == len(MIGRATIONS)
+    assert {"outline_json", "category", "description", "density_t_per_m3"} <= _columns(engine, "tanks")
+    assert "dung_weight_pct_per_day" in _columns(engine, "cargo_types")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT category, density_t_per_m3 FROM tanks")).one() == ("Misc. Tanks", 1.0)
+    assert migrate(engine) == 0
+
+
+def test_failed_upgrade_leaves_database_untouched(temp_db):
+    engine = create_engine(f"sqlite:///{temp_db}", future=True)
+    migrate(engine)
+
+    def broken(conn):
+        raise RuntimeError("boom")
+
+    pending = MIGRATIONS + (
+        Migration(LATEST_VERSION + 1, "Add column", add_missing_columns("tanks", [("extra_m", "REAL")])),
+        Migration(LATEST_VERSION + 2, "Broken", broken),
+    )
+    with pytest.raises(RuntimeError):
+        migrate(engine, pending)
+    assert "extra_m" not in _columns(engine, "tanks")
+    with engine.connect() as conn:
+        assert schema_version(conn) == LATEST_VERSION
+    assert migrate(engine, pending[:-1]) == 1
+    assert "extra_m" in _columns(engine, "tanks")
@@ -0,0 +1,87 @@
+"""Tests for Monte Carlo uncertainty analysis."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import LivestockPen, Tank
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.monte_carlo import Distribution, UncertaintyModel, run_monte_carlo
+from senashipping_app.services.ship_model import ShipModel
+from senashipping_app.services.stability_service import compute_condition_for_model
+from senashipping_app.services.validation import compute_free_surface_correction_array
+
+TANKS = {1: 300.0, 2: 450.0}
+PENS = {10: 400, 11: 400}
+
+
+def _model(sample_ship, sample_tanks) -> ShipModel:
+    pens = [
+        LivestockPen(id=10, ship_id=1, name="P1", vcg_m=14.0, lcg_m=60.0, tcg_m=2.0, area_m2=800.0),
+        LivestockPen(id=11, ship_id=1, name="P2", vcg_m=14.0, lcg_m=90.0, tcg_m=-2.0, area_m2=800.0),
+    ]
+    return ShipModel.compile(sample_ship, sample_tanks, pens)
+
+
+UNCERTAIN = UncertaintyModel(
+    head_weight_factor=Distribution("normal", 1.0, 0.05),
+    fill_error_fraction=Distribution("uniform", 0.0, 0.02),
+    vcg_offset_m=Distribution("triangular", 1.5, 0.5),
+)
+
+
+def test_fixed_inputs_reproduce_deterministic_condition(sample_ship, sample_tanks):
+    model = _model(sample_ship, sample_tanks)
+    ref = compute_condition_for_model(model, TANKS, PENS)
+    result = run_monte_carlo(model, TANKS, PENS, n_samples=50, chunk_size=20)
+    assert result.n_samples == 50
+    for q in result.percentiles:
+        assert result.percentile("gm_m", q) == pytest.approx(ref.gm_m)
+        assert result.percentile("trim_m", q) == pytest.approx(ref.trim_m)
+    assert set(result.failure_probability.values()) <= {0.0, 1.0}
+
+
+def test_seeded_runs_are_reproducible_across_workers(sample_ship, sample_tanks):
+    model = _model(sample_ship, sample_tanks)
+    kwargs = dict(uncertainty=UNCERTAIN, n_samples=4000, seed=7, chunk_size=1000)
+    one = run_monte_carlo(model, TANKS, PENS, max_workers=1, **kwargs)
+    pooled = run_monte_carlo(model, TANKS, PENS, max_workers=2, **kwargs)
+    other = run_monte_carlo(model, TANKS, PENS, **{**kwargs, "seed": 8})
+    for name in one.values:
+        assert np.array_equal(one.values[name], pooled.values[name])
+    assert one.failure_probability == pooled.failure_probability
+    assert not np.array_equal(one.values["kg_m"], other.values["kg_m"])
+    lo, hi = one.percentile("kg_m", 5.0), one.percentile("kg_m", 95.0)
+    assert lo < one.mean["kg_m"] < hi
+
+
+def test_failure_probability_matches_distribution(sample_ship, sample_tanks):
+    model = _model(sample_ship, sample_tanks)
+    ref = compute_condition_for_model(model, TANKS, PENS)
+    fsc = float(compute_free_surface_correction_array(
+        model, model.volumes_vector(TANKS), ref.displacement_t, 1.0
+    ))
+    pen_mass = sum(PENS.values()) * 0.5
+    # VCG offset that puts effective GM exactly on the livestock minimum
+    offset = (ref.gm_m - fsc - 0.20) * ref.displacement_t / pen_mass
+    unc = UncertaintyModel(vcg_offset_m=Distribution("normal", offset, 0.05))
+    result = run_monte_carlo(model, TANKS, PENS, unc, n_samples=20_000, seed=1)
+    assert result.failure_probability["LIV_GM"] == pytest.approx(0.5, abs=0.02)
+    assert result.failure_probability["IMO_GM"] < 0.01
+    assert result.any_failure_probability >= result.failure_probability["LIV_GM"]
+    assert result.percentile("gm_effective_m", 50.0) == pytest.approx(0.20, abs=0.01)
+
+
+def test_service_monte_carlo(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tank = TankRepository(db_session).create(
+        Tank(ship_id=ship.id, name="T", capacity_m3=5000.0, kg_m=3.0, longitudinal_pos=0.5)
+    )
+    unc = UncertaintyModel(fill_error_fraction=Distribution("normal", 0.0, 0.01))
+    result = ConditionService(db_session).monte_carlo(
+        ship, {tank.id: 2500.0}, unc, n_samples=2000, seed=3
+    )
+    assert result.percentile("displacement_t", 5.0) < 2500.0 < result.percentile("displacement_t", 95.0)
@@ -0,0 +1,122 @@
+"""Tests for the read-through repository cache."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from sqlalchemy import event
+
+from senashipping_app.models import LivestockPen, LoadingCondition
+from senashipping_app.models.cargo_type import CargoType
+from senashipping_app.repositories import database
+from senashipping_app.repositories.cargo_type_repository import CargoTypeRepository
+from senashipping_app.repositories.database import init_database
+from senashipping_app.repositories.livestock_pen_repository import LivestockPenORM, LivestockPenRepository
+from senashipping_app.repositories.read_cache import repository_cache
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+
+
+@pytest.fixture
+def ship_with_items(temp_db, sample_ship, sample_tanks):
+    init_database(temp_db)
+    with database.SessionLocal() as db:
+        ship = ShipRepository(db).create(sample_ship)
+        sample_tanks[0].outline_xy = [(0.0, 0.0), (4.0, 0.0), (4.0, 2.0)]
+        for t in sample_tanks:
+            t.id, t.ship_id = None, ship.id
+            TankRepository(db).create(t)
+        LivestockPenRepository(db).create(
+            LivestockPen(ship_id=ship.id, name="1-A", deck="A", area_m2=20.0, capacity_head=10)
+        )
+    return ship
+
+
+def _count_statements(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_reads_are_cached_until_a_write(ship_with_items):
+    ship = ship_with_items
+    with database.SessionLocal() as db:
+        tanks_repo, pens_repo = TankRepository(db), LivestockPenRepository(db)
+        cargo_repo = CargoTypeRepository(db)
+        first = tanks_repo.list_for_ship(ship.id)
+        pens_repo.list_for_ship(ship.id)
+        cargo_repo.list_all()
+        ShipRepository(db).get(ship.id)
+        statements = _count_statements(db)
+        hits = repository_cache.hits
+
+        again = tanks_repo.list_for_ship(ship.id)
+        assert [t.id for t in again] == [t.id for t in first]
+        assert pens_repo.list_for_ship(ship.id)[0].name == "1-A"
+        assert ShipRepository(db).get(ship.id).name == ship.name
+        assert cargo_repo.get(-1) is None
+        assert statements == [] and repository_cache.hits == hits + 4
+
+        # Callers get copies: editing one leaves the cache alone
+        outlined = next(i for i, t in enumerate(again) if t.outline_xy)
+        again[outlined].name = "changed"
+        again[outlined].outline_xy.append((0.0, 2.0))
+        fresh = tanks_repo.list_for_ship(ship.id)[outlined]
+        assert fresh.name == first[outlined].name and len(fresh.outline_xy) == 3
+
+        # Writes drop the entries they touch
+        first[0].name = "renamed"
+        tanks_repo.update(first[0])
+        assert "renamed" in [t.name for t in tanks_repo.list_for_ship(ship.id)]
+        pen = pens_repo.list_for_ship(ship.id)[0]
+        pens_repo.delete(pen.id)
+        assert pens_repo.list_for_ship(ship.id) == []
+        created = cargo_repo.create(CargoType(name="Test cattle"))
+        assert cargo_repo.get(created.id).name == "Test cattle"
+        ship.name = "Renamed Vessel"
+        ShipRepository(db).update(ship)
+        assert ShipRepository(db).get(ship.id).name == "Renamed Vessel"
+        assert [s.name for s in ShipRepository(db).list()] == ["Renamed Vessel"]
+
+
+def test_hits_cost_far_less_than_misses(ship_with_items):
+    ship = ship_with_items
+    with database.SessionLocal() as db:
+        repo = LivestockPenRepository(db)
+        db.add_all(LivestockPenORM(ship_id=ship.id, name=f"P{i}", deck="B", area_m2=5.0) for i in range(3000))
+        db.commit()
+
+        def timed() -> float:
+            started = time.perf_counter()
+            pens = repo.list_for_ship(ship.id)
+            assert len(pens) == 3001
+            return time.perf_counter() - started
+
+        misses = []
+        for _ in range(3):
+            repository_cache.invalidate(db, ("pens", ship.id))
+            misses.append(timed())
+        hit = min(timed() for _ in range(3))
+        assert hit < min(misses) / 3
+
+
+def test_warm_compute_makes_no_database_round_trips(ship_with_items):
+    pytest.importorskip("PyQt6.QtCore")
+    from senashipping_app.views.compute_worker import ComputeRequest, ComputeWorker
+
+    ship = ship_with_items
+    with database.SessionLocal() as db:
+        tank_ids = [t.id for t in TankRepository(db).list_for_ship(ship.id)]
+    volumes = {tank_ids[0]: 100.0}
+    request = ComputeRequest(ship, LoadingCondition(name="Dep"), volumes)
+    worker = ComputeWorker()
+    worker.execute(request, lambda: False)  # warms the caches
+
+    with database.SessionLocal() as db:
+        statements = _count_statements(db)
+    misses = repository_cache.misses
+    outcome = worker.execute(request, lambda: False)
+    assert outcome.results.displacement_t > 0 and len(outcome.tanks) == len(tank_ids)
+    assert statements == [] and repository_cache.misses == misses
@@ -0,0 +1,165 @@
+"""Tests for the declarative criteria rule engine."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import CrossCurves
+from senashipping_app.services.criteria_rules import (
+    CriterionResult,
+    evaluate_all_criteria,
+    evaluate_imo_criteria,
+    evaluate_livestock_criteria,
+)
+from senashipping_app.services.rule_engine import (
+    DEFAULT_RULES,
+    DerivedField,
+    IncrementalRuleEvaluator,
+    Rule,
+    RuleRegistry,
+    evaluate_batch,
+    fields_from_results,
+)
+from senashipping_app.services.ship_model import ShipModel
+from senashipping_app.services.stability_service import compute_model_batch
+
+VOLUMES = np.array([
+    [0.0, 0.0],
+    [100.0, 400.0],
+    [250.0, 250.0],
+    [500.0, 20.0],
+])
+
+
+def _curves() -> CrossCurves:
+    heels = np.arange(0.0, 61.0, 5.0)
+    disps = np.array([100.0, 1000.0, 5000.0])
+    phi = np.radians(heels)
+    kn = np.vstack([(12.0 - 1e-3 * d) * np.sin(phi) * (1.0 + 0.4 * np.sin(phi) ** 2) for d in disps])
+    return CrossCurves(displacement_t=disps, heel_deg=heels, kn_m=kn)
+
+
+def _assert_same_lines(batch_eval, scalar_eval):
+    assert [l.code for l in batch_eval.lines] == [l.code for l in scalar_eval.lines]
+    for got, ref in zip(batch_eval.lines, scalar_eval.lines):
+        assert got.result == ref.result, got.code
+        assert got.parent_code == ref.parent_code
+        assert got.limit == pytest.approx(ref.limit)
+        if ref.value is None:
+            assert got.value is None and got.margin is None
+        else:
+            assert got.value == pytest.approx(ref.value, abs=1e-9)
+            assert got.margin == pytest.approx(ref.margin, abs=1e-9)
+        assert got.message == ref.message
+    assert (batch_eval.passed, batch_eval.failed, batch_eval.n_a) == (
+        scalar_eval.passed, scalar_eval.failed, scalar_eval.n_a
+    )
+
+
+@pytest.mark.parametrize("with_gz", [False, True])
+def test_batch_matches_scalar_criteria(sample_ship, sample_tanks, with_gz):
+    model = ShipModel.compile(sample_ship, sample_tanks, cross_curves=_curves() if with_gz else None)
+    batch = compute_model_batch(model, VOLUMES)
+    criteria = evaluate_batch(model, batch, VOLUMES)
+    assert criteria.value.shape == (len(criteria.rules), len(VOLUMES))
+    assert ("GZ_AREA_0_30" in criteria.codes) == with_gz
+    for i in range(len(VOLUMES)):
+        volumes = {1: VOLUMES[i, 0], 2: VOLUMES[i, 1]}
+        ref = evaluate_all_criteria(sample_ship, batch.row(i), sample_tanks, volumes, model=model)
+        _assert_same_lines(criteria.evaluation(i), ref)
+        assert bool(criteria.all_passed[i]) == ref.all_passed
+
+
+def test_roll_period_not_applicable_without_gm(sample_ship):
+    fields = dict(
+        displacement_t=[1000.0, 1000.0], draft_m=5.0, draft_aft_m=5.0, draft_fwd_m=5.0,
+        trim_m=0.0, kg_m=8.0, gm_m=[0.0, 1.0], heel_deg=0.0, free_surface_correction_m=0.0,
+    )
+    criteria = DEFAULT_RULES.evaluate(sample_ship, fields)
+    r = criteria.index("LIV_ROLL")
+    assert np.isnan(criteria.value[r, 0]) and not np.isnan(criteria.value[r, 1])
+    assert list(criteria.n_na) == [1, 0]
+    line = criteria.evaluation(0).lines[r]
+    assert line.result == CriterionResult.N_A and line.message == "N/A (GM too low)"
+
+
+def test_incremental_reevaluates_only_affected_rules(sample_ship, sample_tanks):
+    model = ShipModel.compile(sample_ship, sample_tanks)
+    batch = compute_model_batch(model, VOLUMES[1:2])
+    fields = fields_from_results(batch, 0.05)
+    evaluator = IncrementalRuleEvaluator(sample_ship)
+    first = evaluator.evaluate(fields)
+    assert set(evaluator.last_evaluated) == set(first.codes)
+
+    evaluator.evaluate(fields)
+    assert evaluator.last_evaluated == ()
+
+    fields["trim_m"] = fields["trim_m"] + 0.4
+    after_trim = evaluator.evaluate(fields)
+    assert set(evaluator.last_evaluated) == {"IMO_TRIM", "LIV_FREEBORD", "VISIBILITY"}
+    full = DEFAULT_RULES.evaluate(sample_ship, fields)
+    assert np.array_equal(after_trim.value, full.value, equal_nan=True)
+    assert np.array_equal(after_trim.ok, full.ok)
+
+    fields["free_surface_correction_m"] = 0.3
+    evaluator.evaluate(fields)
+    assert set(evaluator.last_evaluated) == {"IMO_GM", "LIV_GM", "LIV_ROLL"}
+
+
+def test_shared_field_computed_once_per_pass(sample_ship):
+    calls = []
+    registry = RuleRegistry()
+    registry.field("double_gm", ("gm_m",), lambda ctx: calls.append(1) or 2.0 * ctx["gm_m"])
+    for code in ("A", "B"):
+        registry.register(Rule(
+            code, code, "test", "TEST", ("double_gm",),
+            lambda ctx: ctx["double_gm"], lambda ship: 1.0, lambda v, lim, m: "",
+        ))
+    fields = {name: np.full(10_000, 0.4) for name in (
+        "displacement_t", "draft_m", "draft_aft_m", "draft_fwd_m", "trim_m",
+        "kg_m", "gm_m", "heel_deg", "free_surface_correction_m",
+    )}
+    criteria = registry.evaluate(sample_ship, fields)
+    assert len(calls) == 1
+    assert not criteria.ok.any() and criteria.margin[0, 0] == pytest.approx(-0.2)
+
+
+def test_registry_rejects_unknown_inputs():
+    registry = RuleRegistry()
+    with pytest.raises(ValueError, match="unknown field"):
+        registry.register(Rule(
+            "X", "X", "test", "TEST", ("nope",),
+            lambda ctx: ctx["nope"], lambda ship: 0.0, lambda v, lim, m: "",
+        ))
+
+
+def test_group_functions_evaluate_only_their_group(sample_ship, sample_tanks, monkeypatch):
+    model = ShipModel.compile(sample_ship, sample_tanks)
+    row = compute_model_batch(model, VOLUMES[1:2]).row(0)
+    volumes = {1: VOLUMES[1, 0], 2: VOLUMES[1, 1]}
+    full = evaluate_all_criteria(sample_ship, row, sample_tanks, volumes, model=model)
+
+    def livestock_only(ctx):
+        raise AssertionError("livestock field computed for the IMO lines")
+
+    roll = DEFAULT_RULES.fields["roll_period_s"]
+    monkeypatch.setitem(
+        DEFAULT_RULES.fields, "roll_period_s", DerivedField(roll.name, roll.inputs, livestock_only)
+    )
+    imo = evaluate_imo_criteria(sample_ship, row, sample_tanks, volumes, 1.0, model=model)
+    assert [l.code for l in imo] == [l.code for l in full.lines if l.parent_code == "IMO"]
+    monkeypatch.undo()
+    livestock = evaluate_livestock_criteria(sample_ship, row, sample_tanks, volumes, 1.0, model=model)
+    assert {l.parent_code for l in livestock} == {"LIVESTOCK"}
+
+
+@pytest.mark.parametrize("module", ["criteria_rules", "rule_engine", "validation"])
+def test_modules_import_on_their_own(module):
+    probe = f"import senashipping_app.services.{module}"
+    subprocess.run([sys.executable, "-c", probe], check=True,
+                   cwd=Path(__file__).resolve().parents[2])
@@ -0,0 +1,97 @@
+"""Tests for the compiled ShipModel and its per-ship cache."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import Ship, Tank, LivestockPen, LoadingCondition
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.repositories.livestock_pen_repository import LivestockPenRepository
+from senashipping_app.services.condition_service import ConditionService, ConditionValidationError
+from senashipping_app.services.ship_model import ShipModel, ShipModelCache
+from senashipping_app.services.stability_service import compute_condition
+
+
+def test_compile_packs_arrays(sample_ship, sample_tanks):
+    pens = [LivestockPen(id=7, ship_id=1, name="P", vcg_m=9.0, lcg_m=40.0, tcg_m=1.0, area_m2=30.0)]
+    model = ShipModel.compile(sample_ship, sample_tanks, pens)
+    assert model.n_tanks == 2 and model.n_pens == 1
+    assert model.tank_index == {1: 0, 2: 1}
+    assert model.tank_longitudinal_pos.tolist() == [0.3, 0.7]
+    assert model.pen_index == {7: 0}
+    assert not model.tank_kg_m.flags.writeable
+    vec = model.volumes_vector({2: 100.0, 99: 5.0})
+    assert vec.tolist() == [0.0, 100.0]
+    assert model.unknown_tank_ids({2: 1.0, 99: 5.0}) == [99]
+
+
+def test_cache_rebuilds_after_repository_write(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tank_repo = TankRepository(db_session)
+    tank_repo.create(Tank(ship_id=ship.id, name="T1", capacity_m3=100.0))
+    loads = []
+
+    def loader(ship_id):
+        loads.append(ship_id)
+        return tank_repo.list_for_ship(ship_id), []
+
+    cache = ShipModelCache()
+    first = cache.get_or_build(ship, loader)
+    assert cache.get_or_build(ship, loader) is first
+    assert len(loads) == 1
+
+    tank_repo.create(Tank(ship_id=ship.id, name="T2", capacity_m3=50.0))
+    rebuilt = cache.get_or_build(ship, loader)
+    assert rebuilt.n_tanks == 2
+    assert rebuilt.version > first.version
+    assert len(loads) == 2
+
+
+def test_cache_keeps_databases_apart(sample_ship):
+    ship = sample_ship
+    ship.id = 1
+    cache = ShipModelCache()
+    a = cache.get_or_build(ship, lambda _id: ([Tank(id=1, name="A", capacity_m3=1.0)], []), database="a.db")
+    b = cache.get_or_build(ship, lambda _id: ([], []), database="b.db")
+    assert a.n_tanks == 1 and b.n_tanks == 0
+    assert cache.get_or_build(ship, lambda _id: ([], []), database="a.db") is a
+    cache.invalidate(1)
+    assert cache.get_or_build(ship, lambda _id: ([], []), database="a.db").n_tanks == 0
+
+
+def test_service_compute_matches_scalar(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tank_repo = TankRepository(db_session)
+    pen_repo = LivestockPenRepository(db_session)
+    tanks = [
+        tank_repo.create(Tank(ship_id=ship.id, name=f"T{i}", capacity_m3=300.0,
+                              longitudinal_pos=0.2 + 0.15 * i, kg_m=3.0 + i, tcg_m=0.5 * i))
+        for i in range(4)
+    ]
+    pens = [
+        pen_repo.create(LivestockPen(ship_id=ship.id, name=f"P{i}", deck="A",
+                                     vcg_m=11.0, lcg_m=30.0 + 20 * i, tcg_m=-1.0, area_m2=50.0))
+        for i in range(3)
+    ]
+    volumes = {tanks[0].id: 150.0, tanks[2].id: 280.0}
+    heads = {pens[1].id: 40, pens[2].id: 10}
+    cond = LoadingCondition(name="C", pen_loadings=heads)
+
+    res = ConditionService(db_session).compute(ship, cond, volumes)
+    ref = compute_condition(
+        ship, tank_repo.list_for_ship(ship.id), LoadingCondition(tank_volumes_m3=volumes),
+        pens=pen_repo.list_for_ship(ship.id), pen_loadings=heads,
+    )
+    assert res.displacement_t == pytest.approx(ref.displacement_t)
+    assert res.gm_m == pytest.approx(ref.gm_m)
+    assert res.trim_m == pytest.approx(ref.trim_m)
+    assert res.validation is not None and res.criteria is not None
+
+
+def test_service_rejects_over_capacity(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tank = TankRepository(db_session).create(Tank(ship_id=ship.id, name="Small", capacity_m3=10.0))
+    with pytest.raises(ConditionValidationError, match="Small"):
+        ConditionService(db_session).compute(ship, LoadingCondition(name="C"), {tank.id: 20.0})
@@ -0,0 +1,61 @@
+"""Tests for the startup profiler and deferred heavy imports."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+from senashipping_app.utils.startup_profiler import (
+    CLI_FLAG,
+    ENV_VAR,
+    StartupProfiler,
+    profiling_requested,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StartupProfiler()
+    with profiler.stage("import"):
+        pass
+    profiler.mark_window_shown()
+    assert profiler.stages == [] and profiler.window_shown_s is None
+
+
+def test_nested_stages_and_report(tmp_path):
+    profiler = StartupProfiler(enabled=True)
+    with profiler.stage("MainWindow"):
+        with profiler.stage("page A"):
+            pass
+    with profiler.stage("init_database"):
+        pass
+    profiler.mark_window_shown()
+    assert [(d, n) for d, n, _s in profiler.stages] == [(0, "MainWindow"), (1, "page A"), (0, "init_database")]
+    assert profiler.stages[0][2] >= profiler.stages[1][2]
+    path = tmp_path / "startup_profile.txt"
+    profiler.write(path)
+    text = path.read_text(encoding="utf-8")
+    assert "\n  page A" in text and "time to window" in text
+    assert "heavy modules loaded at startup:" in text
+
+
+def test_profiling_requested(monkeypatch):
+    monkeypatch.delenv(ENV_VAR, raising=False)
+    assert not profiling_requested(["main"])
+    assert profiling_requested(["main", CLI_FLAG])
+    monkeypatch.setenv(ENV_VAR, "1")
+    assert profiling_requested(["main"])
+
+
+def test_report_and_stl_modules_defer_heavy_imports():
+    probe = (
+        "import sys\n"
+        "import senashipping_app.reports, senashipping_app.services.stl_mesh_service\n"
+        "import senashipping_app.services.hydrostatic_generator\n"
+        "print(sorted(m for m in ('pandas', 'reportlab', 'trimesh', 'pyvista') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True,
+                         cwd=PROJECT_ROOT)
+    assert out.stdout.strip() == "[]"
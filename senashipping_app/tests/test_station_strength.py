@@ -0,0 +1,104 @@
+"""Tests for the station-based SF/BM engine."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import LoadingCondition, Tank
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.ship_model import ShipModel
+from senashipping_app.services.stability_service import compute_model_batch
+from senashipping_app.services.station_strength import (
+    SectionalAreaCurves,
+    StationStrengthEngine,
+    distribution_matrix,
+)
+
+L, B = 100.0, 20.0
+
+
+def _engine(centers, halves, **kwargs) -> StationStrengthEngine:
+    return StationStrengthEngine(
+        L, B, np.asarray(centers, dtype=float), np.asarray(halves, dtype=float),
+        np.zeros(0), np.zeros(0), **kwargs,
+    )
+
+
+def test_distribution_rows_sum_to_one():
+    x = np.linspace(0.0, L, 11)
+    dist = distribution_matrix(x, np.array([5.0, 50.0, 99.0, 120.0]), np.array([5.0, 15.0, 3.0, 0.0]))
+    assert np.allclose(dist.sum(axis=1), 1.0)
+    assert dist[0, 0] == pytest.approx(1.0)
+    assert np.allclose(dist[1, 3:7], np.array([1, 2, 2, 1]) / 6.0)  # 35..65 m over 10 m segments
+    assert dist[3, -1] == 1.0  # beyond FP: clamped to the last segment
+
+
+def test_uniform_weight_on_box_gives_no_bending():
+    engine = _engine([L / 2], [L / 2])
+    curves = engine.curves(np.array([[8000.0]]), np.zeros((1, 0)), np.array([4.0]), np.array([4.0]))
+    assert np.allclose(curves.shear_force_t, 0.0, atol=1e-6)
+    assert np.allclose(curves.bending_moment_tm, 0.0, atol=1e-4)
+
+
+def test_midship_point_load_sags_by_wl_over_8():
+    engine = _engine([L / 2], [0.0], n_stations=401)
+    w = 1000.0
+    curves = engine.curves(np.array([[w]]), np.zeros((1, 0)), np.array([0.5]), np.array([0.5]))
+    bm = curves.bending_moment_tm[0]
+    # The point load is smeared over one 0.25 m segment
+    assert bm.min() == pytest.approx(-w * L / 8.0, rel=1e-2)
+    assert abs(curves.shear_force_t[0]).max() == pytest.approx(w / 2.0, rel=1e-2)
+    # Closed at both ends
+    assert curves.shear_force_t[0, -1] == pytest.approx(0.0, abs=1e-6)
+    assert bm[-1] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_ends_heavy_hogs_and_trimmed_buoyancy_balances():
+    engine = _engine([5.0, 95.0, 30.0], [5.0, 5.0, 5.0])
+    masses = np.array([[500.0, 500.0, 0.0], [0.0, 0.0, 1000.0]])
+    curves = engine.curves(masses, np.zeros((2, 0)), np.array([1.0, 1.2]), np.array([1.0, 0.3]))
+    assert curves.bending_moment_tm[0].max() > 0.0  # hogging
+    for i in range(2):
+        assert curves.buoyancy_t[i].sum() == pytest.approx(1000.0)
+        assert curves.shear_force_t[i, -1] == pytest.approx(0.0, abs=1e-6)
+        assert curves.bending_moment_tm[i, -1] == pytest.approx(0.0, abs=1e-5)
+    # Stern-down condition has more buoyancy aft
+    assert curves.buoyancy_t[1, 0] > curves.buoyancy_t[1, -1]
+
+
+def test_sectional_areas_and_permissible_values():
+    x = np.linspace(0.0, L, 5)
+    drafts = np.array([0.0, 10.0])
+    box = SectionalAreaCurves(x, drafts, np.outer(np.ones(5), drafts * B))
+    masses = np.array([[300.0, 300.0]])
+    plain = _engine([20.0, 80.0], [10.0, 10.0], permissible_bm_tm=1000.0, permissible_sf_t=100.0)
+    bonjean = _engine([20.0, 80.0], [10.0, 10.0], sectional_areas=box,
+                      permissible_bm_tm=1000.0, permissible_sf_t=100.0)
+    a = plain.curves(masses, np.zeros((1, 0)), np.array([2.0]), np.array([2.0]))
+    b = bonjean.curves(masses, np.zeros((1, 0)), np.array([2.0]), np.array([2.0]))
+    assert np.allclose(a.bending_moment_tm, b.bending_moment_tm)
+    one = a.row(0)
+    assert one.bm_pct.shape == one.x_m.shape
+    assert one.max_bm_pct == pytest.approx(np.abs(one.bending_moment_tm).max() / 10.0)
+    assert bool(one.within_limits) == (one.max_bm_pct <= 100.0 and one.max_sf_pct <= 100.0)
+
+
+def test_batch_and_service_attach_curves(db_session, sample_ship, sample_tanks):
+    model = ShipModel.compile(sample_ship, sample_tanks)
+    batch = compute_model_batch(model, np.array([[400.0, 100.0], [0.0, 500.0]]), station_strength=True)
+    curves = batch.strength_curves
+    assert curves is not None and curves.shear_force_t.shape == (2, 201)
+    row = batch.row(1).strength_curves
+    assert np.array_equal(row.bending_moment_tm, curves.bending_moment_tm[1])
+    assert compute_model_batch(model, np.array([[1.0, 1.0]])).strength_curves is None
+
+    ship = ShipRepository(db_session).create(sample_ship)
+    tank = TankRepository(db_session).create(
+        Tank(ship_id=ship.id, name="T", capacity_m3=5000.0, kg_m=4.0, longitudinal_pos=0.2)
+    )
+    res = ConditionService(db_session).compute(ship, LoadingCondition(name="C"), {tank.id: 3000.0})
+    assert res.strength_curves is not None
+    assert res.strength_curves.buoyancy_t.sum() == pytest.approx(res.displacement_t)
@@ -0,0 +1,150 @@
+"""Tests for tank sounding tables and geometric free surface."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+
+from senashipping_app.models import LoadingCondition, Tank, TankSoundingTable
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.repositories.tank_sounding_repository import TankSoundingRepository
+from senashipping_app.services import stl_mesh_service
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.incremental_state import IncrementalConditionState
+from senashipping_app.services.ship_model import ShipModel
+from senashipping_app.services.stability_service import compute_model_batch
+from senashipping_app.services.tank_sounding_generator import (
+    generate_sounding_tables,
+    sounding_table_from_mesh,
+)
+from senashipping_app.services.validation import compute_free_surface_correction_array
+
+# 10 m long, 8 m wide, 5 m deep box tank; bottom at z = 1, centred at x = 60, y = 3
+TANK_L, TANK_B, TANK_D = 10.0, 8.0, 5.0
+
+
+def _box_tank():
+    mesh = trimesh.creation.box(extents=[TANK_L, TANK_B, TANK_D])
+    mesh.apply_translation([60.0, 3.0, 1.0 + TANK_D / 2])
+    return mesh
+
+
+def _box_table() -> TankSoundingTable:
+    return sounding_table_from_mesh(_box_tank(), n_levels=11)
+
+
+def test_box_tank_table_matches_closed_form():
+    table = _box_table()
+    assert np.allclose(table.level_m, np.linspace(0.0, TANK_D, 11))
+    assert np.allclose(table.volume_m3, TANK_L * TANK_B * table.level_m)
+    assert np.allclose(table.vcg_m[1:], 1.0 + table.level_m[1:] / 2.0)
+    assert np.allclose(table.lcg_m, 60.0) and np.allclose(table.tcg_m, 3.0)
+    assert np.allclose(table.fs_inertia_m4, TANK_L * TANK_B ** 3 / 12.0)
+    state = table.at_volume(TANK_L * TANK_B * 1.25)
+    assert state.level_m == pytest.approx(1.25)
+    assert state.ullage_m == pytest.approx(TANK_D - 1.25)
+    assert state.vcg_m == pytest.approx(1.625)
+
+
+def test_table_rejects_non_increasing_volume():
+    with pytest.raises(ValueError, match="volume"):
+        TankSoundingTable([0.0, 1.0, 2.0], [0.0, 5.0, 5.0], [0.0] * 3, [0.0] * 3, [0.0] * 3, [0.0] * 3)
+
+
+def test_sounding_tables_are_cached_by_stl_contents(tmp_path, monkeypatch):
+    stl = tmp_path / "tanks.stl"
+    _box_tank().export(stl)
+    cache = tmp_path / "cache"
+    first = generate_sounding_tables(stl, n_levels=11, cache_dir=cache)
+    assert len(first) == 1 and list(cache.glob("*.soundings.npz"))
+
+    def _no_load(path):
+        raise AssertionError("mesh should not be reloaded")
+
+    monkeypatch.setattr(stl_mesh_service, "load_stl", _no_load)
+    again = generate_sounding_tables(stl, n_levels=11, cache_dir=cache)
+    assert np.array_equal(again[0][1].volume_m3, first[0][1].volume_m3)
+
+
+def test_each_level_count_keeps_its_own_cache_file(tmp_path, monkeypatch):
+    stl = tmp_path / "tanks.stl"
+    _box_tank().export(stl)
+    cache = tmp_path / "cache"
+    for n_levels in (11, 21):
+        generate_sounding_tables(stl, n_levels=n_levels, cache_dir=cache)
+    assert len(list(cache.glob("*.soundings.npz"))) == 2
+
+    def _no_load(path):
+        raise AssertionError("mesh should not be reloaded")
+
+    monkeypatch.setattr(stl_mesh_service, "load_stl", _no_load)
+    for n_levels in (11, 21, 11):
+        table = generate_sounding_tables(stl, n_levels=n_levels, cache_dir=cache)[0][1]
+        assert len(table.level_m) == n_levels
+
+
+def _model_with_table(sample_ship) -> ShipModel:
+    tanks = [
+        Tank(id=1, name="Box", capacity_m3=TANK_L * TANK_B * TANK_D, kg_m=3.5,
+             longitudinal_pos=0.4, tcg_m=3.0),
+        Tank(id=2, name="Plain", capacity_m3=500.0, kg_m=2.0, longitudinal_pos=0.7),
+    ]
+    return ShipModel.compile(sample_ship, tanks, soundings={1: _box_table()})
+
+
+def test_batch_uses_contents_centroid_and_inertia(sample_ship):
+    model = _model_with_table(sample_ship)
+    volumes = np.array([[80.0, 0.0], [320.0, 250.0]])
+    batch = compute_model_batch(model, volumes)
+    # Only the box tank loaded: KG is the contents VCG at 1 m sounding
+    assert batch.kg_m[0] == pytest.approx(1.5)
+    assert batch.lcg_m[0] == pytest.approx(60.0)
+    fsc = compute_free_surface_correction_array(model, volumes, batch.displacement_t, 1.0)
+    geometric = TANK_L * TANK_B ** 3 / 12.0 / batch.displacement_t
+    approx = 250.0 * 0.5 * 0.5 / batch.displacement_t[1]
+    assert fsc[0] == pytest.approx(geometric[0])
+    assert fsc[1] == pytest.approx(geometric[1] + approx)
+    # Full and empty tanks carry no free surface
+    full = compute_free_surface_correction_array(model, np.array([400.0, 0.0]), 400.0, 1.0)
+    assert float(full) == 0.0
+
+
+def test_incremental_state_follows_sounding_tables(sample_ship):
+    model = _model_with_table(sample_ship)
+    state = IncrementalConditionState(model, {1: 50.0, 2: 100.0})
+    for vol in (120.0, 310.0, 400.0, 75.0):
+        state.set_tank_volume(1, vol)
+    state.set_tank_volume(2, 260.0)
+    ref = compute_model_batch(model, model.volumes_vector(state.tank_volume_map())[None, :])
+    res = state.results()
+    assert res.kg_m == pytest.approx(float(ref.kg_m[0]))
+    assert res.trim_m == pytest.approx(float(ref.trim_m[0]))
+    fsc = compute_free_surface_correction_array(model, state.tank_volumes, res.displacement_t, 1.0)
+    assert res.free_surface_correction_m == pytest.approx(float(fsc))
+
+
+def test_import_stores_tables_and_service_uses_them(db_session, sample_ship, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "senashipping_app.services.tank_sounding_generator.default_cache_dir", lambda: tmp_path / "cache"
+    )
+    stl = tmp_path / "tank.stl"
+    _box_tank().export(stl)
+    ship = ShipRepository(db_session).create(sample_ship)
+    sounding_repo = TankSoundingRepository(db_session)
+    created = stl_mesh_service.create_tanks_from_stl(
+        stl, ship.id, "A", TankRepository(db_session), sounding_repo=sounding_repo
+    )
+    tank = created[0]
+    stored = sounding_repo.get_for_ship(ship.id)
+    assert set(stored) == {tank.id}
+    assert stored[tank.id].capacity_m3 == pytest.approx(TANK_L * TANK_B * TANK_D)
+
+    service = ConditionService(db_session)
+    res = service.compute(ship, LoadingCondition(name="C"), {tank.id: 80.0})
+    assert res.kg_m == pytest.approx(1.5, abs=0.01)
+
+    TankRepository(db_session).delete(tank.id)
+    assert sounding_repo.get_for_ship(ship.id) == {}
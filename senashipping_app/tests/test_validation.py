@@ -57,6 +57,28 @@ class TestValidation:
         v = validate_condition(ship, res, tanks, {})
         assert any(i.code == "ZERO_WEIGHT" for i in v.issues)
 
+    def test_issues_come_from_validation_rules(self):
+        from senashipping_app.config.limits import MIN_GM_M
+        from senashipping_app.services.longitudinal_strength import StrengthResult
+
+        ship = Ship(length_overall_m=150.0, breadth_m=25.0, design_draft_m=10.0)
+        tanks = [Tank(id=1, ship_id=1, capacity_m3=100.0, longitudinal_pos=0.5, kg_m=2.0)]
+        res = compute_condition(ship, tanks, LoadingCondition(tank_volumes_m3={1: 100.0}))
+        res.gm_m = 1.2 * MIN_GM_M
+        res.strength = StrengthResult(
+            hogging_bm_tm=0.0, shear_force_max_t=0.0,
+            still_water_bm_approx_tm=res.displacement_t * 150.0,
+        )
+        v = validate_condition(ship, res, tanks, {1: 100.0})
+        issues = {i.code: i for i in v.issues}
+        assert "GM_LOW" not in issues
+        assert issues["GM_MARGINAL"].severity == ValidationSeverity.WARNING
+        assert issues["GM_MARGINAL"].limit == pytest.approx(1.5 * MIN_GM_M)
+        # SWBM of displacement x L against a design estimate of displacement x L x 0.1
+        assert issues["BM_OVER"].severity == ValidationSeverity.WARNING
+        assert issues["BM_OVER"].value == pytest.approx(1000.0)
+        assert not v.has_errors
+
 
 class TestFreeSurface:
     def test_slack_tank_reduces_gm(self):
@@ -0,0 +1,138 @@
+"""Tests for the voyage timeline simulation."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+
+from senashipping_app.models import LivestockPen, LoadingCondition, Tank, TankType, Voyage
+from senashipping_app.models.cargo_type import CargoType
+from senashipping_app.repositories.hydrostatic_repository import HydrostaticRepository
+from senashipping_app.repositories.ship_repository import ShipRepository
+from senashipping_app.repositories.tank_repository import TankRepository
+from senashipping_app.services.condition_service import ConditionService
+from senashipping_app.services.hydrostatics import box_hydrostatic_table
+from senashipping_app.services.rule_engine import DEFAULT_RULES, fields_from_results
+from senashipping_app.services.stability_service import compute_condition_for_model
+from senashipping_app.services.validation import compute_free_surface_correction
+from senashipping_app.services.voyage_timeline import (
+    ConsumptionRates,
+    simulate_voyage,
+    tank_group_columns,
+)
+
+RATES = ConsumptionRates(fuel_t_per_day=30.0, fresh_water_t_per_day=5.0,
+                         water_kg_per_head_day=40.0, fodder_kg_per_head_day=10.0)
+
+
+def _tanks(ship_id=1, with_ids=True):
+    specs = [
+        dict(name="DB", capacity_m3=8000.0, longitudinal_pos=0.5, kg_m=1.0),
+        dict(name="HFO P", capacity_m3=600.0, longitudinal_pos=0.2, kg_m=2.0, tcg_m=-6.0,
+             tank_type=TankType.FUEL),
+        dict(name="HFO S", capacity_m3=400.0, longitudinal_pos=0.2, kg_m=2.0, tcg_m=6.0,
+             category="Heavy Fuel Oil"),
+        dict(name="FW", capacity_m3=2000.0, longitudinal_pos=0.1, kg_m=3.0, category="Fresh Water"),
+        dict(name="Fodder", capacity_m3=1500.0, longitudinal_pos=0.8, kg_m=9.0, category="Fodder Hold"),
+        dict(name="Dung", capacity_m3=300.0, longitudinal_pos=0.6, kg_m=1.0, category="Dung"),
+    ]
+    return [Tank(id=i + 1 if with_ids else None, ship_id=ship_id, **spec) for i, spec in enumerate(specs)]
+
+
+def _pens():
+    return [
+        LivestockPen(id=i + 1, ship_id=1, name=f"PEN {i + 1}", deck="DK1", vcg_m=12.0,
+                     lcg_m=40.0 + 10.0 * i, tcg_m=0.0, area_m2=100.0)
+        for i in range(6)
+    ]
+
+
+VOLUMES = {1: 8000.0, 2: 500.0, 3: 400.0, 4: 1800.0, 5: 1200.0, 6: 0.0}
+HEADS = {p: 50 for p in range(1, 7)}
+
+
+def test_tank_groups_by_type_or_category(box_model):
+    assert tank_group_columns(box_model(_tanks(), _pens())) == {"fuel": [1, 2], "fresh_water": [3], "fodder": [4], "dung": [5]}
+
+
+def test_consumption_and_dung_build_up(box_model):
+    model = box_model(_tanks(), _pens())
+    steps = list(simulate_voyage(model, VOLUMES, HEADS, days=2.0, rates=RATES,
+                                 dung_weight_pct_per_day=1.5))
+    assert len(steps) == 49 and steps[-1].hours == 48.0
+    first, last = steps[0], steps[-1]
+    assert first.group_volumes_m3["fuel"] - last.group_volumes_m3["fuel"] == pytest.approx(60.0)
+    assert first.group_volumes_m3["fresh_water"] - last.group_volumes_m3["fresh_water"] == pytest.approx(
+        2 * (5.0 + 300 * 0.04)
+    )
+    assert first.group_volumes_m3["fodder"] - last.group_volumes_m3["fodder"] == pytest.approx(2 * 3.0)
+    assert last.group_volumes_m3["dung"] == pytest.approx(2 * 300 * 0.5 * 0.015)
+    # Net loss is consumption less the dung retained
+    assert first.results.displacement_t - last.results.displacement_t == pytest.approx(60.0 + 34.0 + 6.0 - 4.5)
+
+
+def test_steps_match_full_compute(box_model):
+    model = box_model(_tanks(), _pens())
+    steps = simulate_voyage(model, VOLUMES, HEADS, days=1.0, step_hours=5.0, rates=RATES,
+                            dung_weight_pct_per_day=1.5)
+    *_, last = steps
+    assert last.hours == 24.0 and last.step == 5
+    volumes = dict(VOLUMES)
+    volumes[2] = 500.0 - 30.0 * 500.0 / 900.0
+    volumes[3] = 400.0 - 30.0 * 400.0 / 900.0
+    volumes[4] = 1800.0 - 17.0
+    volumes[5] = 1200.0 - 3.0
+    volumes[6] = 2.25
+    ref = compute_condition_for_model(model, volumes, HEADS)
+    assert last.results.displacement_t == pytest.approx(ref.displacement_t)
+    assert last.results.trim_m == pytest.approx(ref.trim_m)
+    assert last.results.heel_deg == pytest.approx(ref.heel_deg)
+
+
+def test_shortage_and_failed_criteria_are_flagged(box_model):
+    model = box_model(_tanks(), _pens())
+    rates = ConsumptionRates(fuel_t_per_day=600.0)
+    steps = list(simulate_voyage(model, {**VOLUMES, 1: 4000.0}, HEADS, days=2.0, rates=rates))
+    short = [s.step for s in steps if "fuel" in s.shortages]
+    assert short[0] == 37  # 900 m³ of bunkers at 25 m³/h
+    assert steps[-1].group_volumes_m3["fuel"] == 0.0
+    # Burning bunkers lifts the stern until the propeller is no longer immersed enough
+    assert steps[0].ok
+    flagged = [s.step for s in steps if "PROP_IMM" in s.failed]
+    assert flagged and flagged == list(range(flagged[0], len(steps)))
+    at = steps[flagged[0]]
+    volumes = {**VOLUMES, 1: 4000.0}
+    burned = 25.0 * at.hours
+    volumes[2] = 500.0 * (1.0 - burned / 900.0)
+    volumes[3] = 400.0 * (1.0 - burned / 900.0)
+    ref = compute_condition_for_model(model, volumes, HEADS)
+    fsc = compute_free_surface_correction(model.tanks, volumes, ref.displacement_t, 1.0)
+    reference = DEFAULT_RULES.evaluate(model.ship, fields_from_results(ref, fsc))
+    failed = reference.applicable[:, 0] & ~reference.ok[:, 0]
+    assert at.failed == tuple(c for c, f in zip(reference.codes, failed) if f)
+
+
+def test_thirty_days_hourly_streams_quickly(box_model):
+    model = box_model(_tanks(), _pens())
+    start = time.perf_counter()
+    steps = simulate_voyage(model, VOLUMES, HEADS, days=30.0, rates=RATES, dung_weight_pct_per_day=1.5)
+    n = sum(1 for _ in steps)
+    assert n == 721
+    assert time.perf_counter() - start < 1.0
+
+
+def test_service_voyage_timeline(db_session, sample_ship):
+    ship = ShipRepository(db_session).create(sample_ship)
+    tanks = [TankRepository(db_session).create(t) for t in _tanks(ship.id, with_ids=False)]
+    table = box_hydrostatic_table(ship.length_overall_m, ship.breadth_m, np.linspace(0.0, 14.0, 141))
+    HydrostaticRepository(db_session).replace_for_ship(ship.id, table)
+    departure = LoadingCondition(name="Departure", tank_volumes_m3={tanks[1].id: 500.0, tanks[5].id: 0.0})
+    voyage = Voyage(ship_id=ship.id, name="V1", conditions=[departure])
+    cattle = CargoType(name="Cattle", avg_weight_per_head_kg=500.0, dung_weight_pct_per_day=1.5)
+    steps = list(ConditionService(db_session).voyage_timeline(
+        ship, voyage, days=1.0, rates=ConsumptionRates(fuel_t_per_day=24.0), cargo_type=cattle
+    ))
+    assert len(steps) == 25
+    assert steps[-1].group_volumes_m3["fuel"] == pytest.approx(476.0)
@@ -0,0 +1,78 @@
+"""
+Startup-time profiler for the desktop app.
+
+Enabled with `python -m senashipping_app.main --profile-startup` or the
+SENASHIPPING_PROFILE_STARTUP=1 environment variable. Startup code wraps
+its stages (imports, init_database, each page of MainWindow) in
+`startup_profiler.stage(name)`; when profiling is off that is a no-op.
+The report lists each stage, the time to the window being shown, and
+which of the heavy optional libraries were already imported by then.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+ENV_VAR = "SENASHIPPING_PROFILE_STARTUP"
+CLI_FLAG = "--profile-startup"
+
+# Libraries that should only load when their feature is first used
+HEAVY_MODULES = ("pandas", "reportlab", "trimesh", "pyvista", "pyvistaqt", "vtk", "matplotlib")
+
+
+@dataclass(slots=True)
+class StartupProfiler:
+    """Wall-clock time per named startup stage (nested stages are indented)."""
+    enabled: bool = False
+    started: float = field(default_factory=time.perf_counter)
+    stages: List[Tuple[int, str, float]] = field(default_factory=list)  # (depth, name, seconds)
+    window_shown_s: Optional[float] = None
+    _depth: int = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        index = len(self.stages)
+        self.stages.append((self._depth, name, 0.0))
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.stages[index] = (self._depth, name, time.perf_counter() - start)
+
+    def mark_window_shown(self) -> None:
+        if self.enabled:
+            self.window_shown_s = time.perf_counter() - self.started
+
+    def report(self) -> List[str]:
+        """Report lines: stages in start order, time to window, heavy modules loaded."""
+        lines = [f"{'stage':<48}{'ms':>10}"]
+        for depth, name, seconds in self.stages:
+            lines.append(f"{'  ' * depth + name:<48}{1000.0 * seconds:>10.1f}")
+        if self.window_shown_s is not None:
+            lines.append(f"{'time to window':<48}{1000.0 * self.window_shown_s:>10.1f}")
+        loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+        lines.append("heavy modules loaded at startup: " + (", ".join(loaded) or "none"))
+        return lines
+
+    def write(self, path: Path) -> None:
+        path.write_text("\n".join(self.report()) + "\n", encoding="utf-8")
+
+
+def profiling_requested(argv: List[str]) -> bool:
+    """True if the command line or environment asks for a startup profile."""
+    return CLI_FLAG in argv or os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+# Process-wide profiler; main() enables it before anything heavy is imported
+startup_profiler = StartupProfiler()
@@ -0,0 +1,160 @@
+"""
+Background worker for condition computes.
+
+ComputeWorker is a QThread that runs ConditionService.compute with its
+own database session, so the editor stays responsive on large ships. It
+holds at most one pending request: submitting a new one replaces a
+pending request that has not started and cancels the one running (its
+result would be stale anyway). cancel() stops both. Results, errors and
+cancellations come back through signals, which Qt delivers on the GUI
+thread. Free-trim requests are warm-started from the worker's last
+equilibrium for the same ship, which only the worker thread touches.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from ..models import CargoType, LoadingCondition, Ship, Tank
+from ..repositories import database
+from ..services.condition_batch import CancelCallback
+from ..services.equilibrium import EquilibriumResult
+from ..services.condition_service import (
+    ComputeCancelled,
+    ConditionResults,
+    ConditionService,
+    ConditionValidationError,
+)
+
+
+@dataclass(slots=True)
+class ComputeRequest:
+    """Inputs of one compute; request_id is assigned by ComputeWorker.submit."""
+    ship: Ship
+    condition: LoadingCondition
+    tank_volumes: Dict[int, float]
+    cargo_type: Optional[CargoType] = None
+    cargo_density_t_per_m3: float = 1.0
+    free_trim: bool = False
+    request_id: int = 0
+
+
+@dataclass(slots=True)
+class ComputeOutcome:
+    """Results of a request plus the pens/tanks read for the condition table."""
+    request: ComputeRequest
+    results: ConditionResults
+    pens: list = field(default_factory=list)
+    tanks: List[Tank] = field(default_factory=list)
+
+
+class ComputeWorker(QThread):
+    # args: ComputeOutcome
+    computed = pyqtSignal(object)
+    # args: request_id, message
+    failed = pyqtSignal(int, str)
+    # args: request_id
+    cancelled = pyqtSignal(int)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._lock = threading.Condition()
+        self._pending: Optional[ComputeRequest] = None
+        self._running_id = 0
+        self._cancel_id = 0  # requests with id <= this are cancelled
+        self._last_id = 0
+        self._stopping = False
+        # Last free-trim equilibrium per ship id (worker thread only)
+        self._warm_starts: Dict[int, EquilibriumResult] = {}
+
+    def submit(self, request: ComputeRequest) -> int:
+        """Queue request in place of any pending one; returns its id."""
+        with self._lock:
+            self._last_id += 1
+            request.request_id = self._last_id
+            dropped, self._pending = self._pending, request
+            # Anything older than this request is stale
+            self._cancel_id = self._last_id - 1
+            self._lock.notify()
+        if dropped is not None:
+            self.cancelled.emit(dropped.request_id)
+        if not self.isRunning():
+            self.start()
+        return request.request_id
+
+    def cancel(self) -> None:
+        """Cancel the running request and drop the pending one."""
+        with self._lock:
+            dropped, self._pending = self._pending, None
+            self._cancel_id = self._last_id
+        if dropped is not None:
+            self.cancelled.emit(dropped.request_id)
+
+    def is_busy(self) -> bool:
+        with self._lock:
+            return self._pending is not None or self._running_id != 0
+
+    def stop(self, timeout_ms: int = 5000) -> None:
+        """Cancel everything and end the thread (call before the app exits)."""
+        with self._lock:
+            self._stopping = True
+            self._pending = None
+            self._cancel_id = self._last_id
+            self._lock.notify()
+        self.wait(timeout_ms)
+
+    def _is_cancelled(self, request_id: int) -> bool:
+        with self._lock:
+            return self._stopping or request_id <= self._cancel_id
+
+    def run(self) -> None:
+        while True:
+            with self._lock:
+                while self._pending is None and not self._stopping:
+                    self._lock.wait()
+                if self._stopping:
+                    return
+                request, self._pending = self._pending, None
+                self._running_id = request.request_id
+            try:
+                outcome = self.execute(request, lambda: self._is_cancelled(request.request_id))
+            except ComputeCancelled:
+                self.cancelled.emit(request.request_id)
+            except ConditionValidationError as exc:
+                self.failed.emit(request.request_id, str(exc))
+            except Exception as exc:  # keep the thread alive for the next request
+                self.failed.emit(request.request_id, f"Computation failed: {exc}")
+            else:
+                if self._is_cancelled(request.request_id):
+                    self.cancelled.emit(request.request_id)
+                else:
+                    self.computed.emit(outcome)
+            finally:
+                with self._lock:
+                    self._running_id = 0
+
+    def execute(self, request: ComputeRequest, cancelled: CancelCallback) -> ComputeOutcome:
+        """Compute request in a session of this thread; cancelled() is polled between stages."""
+        if database.SessionLocal is None:
+            raise ConditionValidationError("Database not initialized.")
+        with database.SessionLocal() as db:
+            service = ConditionService(db)
+            results = service.compute(
+                request.ship, request.condition, request.tank_volumes,
+                cargo_density_t_per_m3=request.cargo_density_t_per_m3,
+                cargo_type=request.cargo_type,
+                free_trim=request.free_trim,
+                cancelled=cancelled,
+                warm_start=self._warm_starts.get(request.ship.id) if request.free_trim else None,
+            )
+            if results.equilibrium is not None:
+                self._warm_starts[request.ship.id] = results.equilibrium
+            if cancelled():
+                raise ComputeCancelled()
+            pens = service.get_pens_for_ship(request.ship.id)
+            tanks = service.get_tanks_for_ship(request.ship.id)
+        return ComputeOutcome(request, results, pens, tanks)
@@ -23,9 +23,10 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QMessageBox,
     QSplitter,
+    QCheckBox,
 )
 
-from ..models import Ship, Voyage, LoadingCondition, Tank, CargoType
+from ..models import Ship, Voyage, LoadingCondition, CargoType, LivestockPen, Tank
 from ..repositories import database
 from ..repositories.ship_repository import ShipRepository
 from ..repositories.cargo_type_repository import CargoTypeRepository
@@ -34,9 +35,12 @@ from ..services.condition_service import (
     ConditionValidationError,
     ConditionResults,
 )
+from ..services.live_condition import LiveUpdate
 from ..services.voyage_service import VoyageService, VoyageValidationError
-from ..utils.sorting import get_pen_sort_key, get_tank_sort_key
+from .compute_worker import ComputeOutcome, ComputeRequest, ComputeWorker
+from .live_recompute import LiveRecompute
 from .deck_profile_widget import DeckProfileWidget
+from .item_registry import ItemRegistry
 from .results_panel import ResultsPanel
 from .condition_table_widget import ConditionTableWidget
 from .cargo_library_dialog import CargoLibraryDialog
@@ -46,6 +50,10 @@ class ConditionEditorView(QWidget):
     # Signal emitted when a condition has been computed:
     # args: results, ship, condition, voyage (or None for ad-hoc)
     condition_computed = pyqtSignal(object, object, object, object)
+    # Emitted when a requested compute fails or is cancelled: args: message
+    compute_failed = pyqtSignal(str)
+    # Emitted for each live (incremental) update while editing: args: results
+    live_results_updated = pyqtSignal(object)
 
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -60,6 +68,8 @@ class ConditionEditorView(QWidget):
         self._current_ship: Optional[Ship] = None
         self._current_voyage: Optional[Voyage] = None
         self._current_condition: Optional[LoadingCondition] = None
+        # Pens/tanks of the current ship, shared with the deck profile and condition tables
+        self._registry = ItemRegistry(self)
 
         self._ship_combo = QComboBox(self)
         self._voyage_combo = QComboBox(self)
@@ -92,6 +102,12 @@ class ConditionEditorView(QWidget):
         self._pen_table.setEditTriggers(QTableWidget.EditTrigger.DoubleClicked | QTableWidget.EditTrigger.SelectedClicked)
 
         self._compute_btn = QPushButton("Compute Results", self)
+        self._cancel_compute_btn = QPushButton("Cancel", self)
+        self._cancel_compute_btn.setEnabled(False)
+        self._live_check = QCheckBox("Live results", self)
+        self._live_check.setToolTip("Update results and alarms while editing the tables")
+        self._free_trim_check = QCheckBox("Free trim", self)
+        self._free_trim_check.setToolTip("Solve draft, trim and heel for equilibrium instead of the linear estimate")
         self._save_condition_btn = QPushButton("Save Condition", self)
 
         # Graphical deck/profile view (left side)
@@ -106,6 +122,12 @@ class ConditionEditorView(QWidget):
         # Store last computed results
         self._last_results: Optional[ConditionResults] = None
 
+        # Computes run on a worker thread; only the latest request is shown
+        self._compute_worker = ComputeWorker(self)
+        self._active_request_id = 0
+        # Live mode: table edits are debounced into incremental updates
+        self._live = LiveRecompute(self)
+
         self._build_layout()
         self._connect_signals()
         # Single-ship: save to voyage disabled; user saves via File ΓåÆ Save
@@ -113,6 +135,11 @@ class ConditionEditorView(QWidget):
         self._save_condition_btn.setToolTip("Save to file via File ΓåÆ Save")
         # Connect deck profile widget to condition table for bidirectional synchronization
         self._condition_table.set_deck_profile_widget(self._deck_profile_widget)
+        self._condition_table.set_registry(self._registry)
+        self._deck_profile_widget.set_registry(self._registry)
+        # After the condition table's own handlers, so live restarts see its updated data
+        self._registry.pens_changed.connect(self._on_registry_pens_changed)
+        self._registry.tanks_changed.connect(self._on_registry_tanks_changed)
         # Initialize cargo types first to ensure "-- Blank --" is available
         self._refresh_cargo_types()
         self._load_ships()
@@ -215,6 +242,9 @@ class ConditionEditorView(QWidget):
         btn_row = QHBoxLayout()
         btn_row.setSpacing(4)
         btn_row.addWidget(self._compute_btn)
+        btn_row.addWidget(self._cancel_compute_btn)
+        btn_row.addWidget(self._live_check)
+        btn_row.addWidget(self._free_trim_check)
         btn_row.addWidget(self._save_condition_btn)
         btn_row.addStretch()
         root.addLayout(btn_row)
@@ -229,6 +259,15 @@ class ConditionEditorView(QWidget):
         self._condition_combo.currentIndexChanged.connect(self._on_condition_changed)
         self._cargo_type_combo.currentTextChanged.connect(self._on_cargo_type_changed)
         self._compute_btn.clicked.connect(self._on_compute)
+        self._cancel_compute_btn.clicked.connect(self.cancel_compute)
+        self._compute_worker.computed.connect(self._on_compute_finished)
+        self._compute_worker.failed.connect(self._on_compute_error)
+        self._compute_worker.cancelled.connect(self._on_compute_cancelled)
+        self._live_check.toggled.connect(self._on_live_toggled)
+        self._free_trim_check.toggled.connect(self._on_free_trim_toggled)
+        self._live.updated.connect(self._on_live_update)
+        self._condition_table.pen_heads_changed.connect(self._live.pen_heads_edited)
+        self._condition_table.tank_volume_changed.connect(self._live.tank_volume_edited)
         self._save_condition_btn.clicked.connect(self._on_save_condition)
         self._cargo_library_btn.clicked.connect(self._on_edit_cargo_library)
         self._deck_profile_widget.tank_selected.connect(self._on_tank_selected_from_view)
@@ -240,13 +279,9 @@ class ConditionEditorView(QWidget):
     def _on_cargo_type_changed(self, cargo_text: str) -> None:
         """Handle cargo type combo change - update condition table."""
         if self._current_ship:
-            with database.SessionLocal() as db:
-                cond_svc = ConditionService(db)
-                tanks = cond_svc.get_tanks_for_ship(self._current_ship.id)
-                pens = cond_svc.get_pens_for_ship(self._current_ship.id)
             volumes = self._current_condition.tank_volumes_m3 if self._current_condition else {}
             pen_loads = getattr(self._current_condition, "pen_loadings", {}) or {} if self._current_condition else {}
-            self._update_condition_table(pens, tanks, pen_loads, volumes)
+            self._update_condition_table(self._registry.pens, self._registry.tanks, pen_loads, volumes)
 
     def _load_ships(self) -> None:
         self._ship_combo.clear()
@@ -369,80 +404,120 @@ class ConditionEditorView(QWidget):
             tanks = cond_service.get_tanks_for_ship(ship.id)
             pens = cond_service.get_pens_for_ship(ship.id)
 
-        self._current_pens = pens
-        self._current_tanks = tanks
+        # Deck tabs follow the registry's reset signal
+        self._registry.load(ship.id, pens, tanks)
 
         volumes: Dict[int, float] = {}
         pen_loadings: Dict[int, int] = {}
         if self._current_condition:
             volumes = self._current_condition.tank_volumes_m3
             pen_loadings = getattr(self._current_condition, "pen_loadings", {}) or {}
-        self._populate_tanks_table(tanks, volumes)
-        self._populate_pens_table(pens, pen_loadings)
-        
-        # Update deck tabs with pens/tanks data
-        self._deck_profile_widget.update_tables(pens, tanks)
+        self._populate_tanks_table(volumes)
+        self._populate_pens_table(pen_loadings)
         
         # Update condition table widget
         # If no condition is selected, use empty pen_loadings and volumes to show blank values
         volumes = self._current_condition.tank_volumes_m3 if self._current_condition else {}
         pen_loads = getattr(self._current_condition, "pen_loadings", {}) or {} if self._current_condition else {}
-        self._update_condition_table(pens, tanks, pen_loads, volumes)
+        self._update_condition_table(self._registry.pens, self._registry.tanks, pen_loads, volumes)
 
-    def _populate_tanks_table(
-        self, tanks: List[Tank], volumes: Dict[int, float] | None = None
-    ) -> None:
+    def _populate_tanks_table(self, volumes: Dict[int, float] | None = None) -> None:
         volumes = volumes or {}
         self._tank_table.setRowCount(0)
-        # Sort tanks by the 3-level key: number -> letter pattern (A,B,D,C) -> deck
-        sorted_tanks = sorted(tanks, key=get_tank_sort_key)
-        for tank in sorted_tanks:
-            row = self._tank_table.rowCount()
-            self._tank_table.insertRow(row)
-
-            name_item = QTableWidgetItem(tank.name)
-            name_item.setData(Qt.ItemDataRole.UserRole, tank.id)
-            name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Read-only
-
-            cap_item = QTableWidgetItem(f"{tank.capacity_m3:.2f}")
-            cap_item.setFlags(cap_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Read-only
-            
+        # Registry order: number -> letter pattern (A,B,D,C) -> deck
+        for tank in self._registry.sorted_tanks():
             vol = volumes.get(tank.id or -1, 0.0)
             fill_pct = (vol / tank.capacity_m3 * 100.0) if tank.capacity_m3 > 0 else 0.0
-            fill_item = QTableWidgetItem(f"{fill_pct:.1f}")
-            # Fill % is editable (user can change loading)
+            self._insert_tank_row(self._tank_table.rowCount(), tank, f"{fill_pct:.1f}")
 
-            self._tank_table.setItem(row, 0, name_item)
-            self._tank_table.setItem(row, 1, cap_item)
-            self._tank_table.setItem(row, 2, fill_item)
+    def _insert_tank_row(self, row: int, tank: Tank, fill_text: str) -> None:
+        self._tank_table.insertRow(row)
 
-    def _populate_pens_table(
-        self, pens: list, pen_loadings: Dict[int, int] | None = None
-    ) -> None:
+        name_item = QTableWidgetItem(tank.name)
+        name_item.setData(Qt.ItemDataRole.UserRole, tank.id)
+        name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Read-only
+
+        cap_item = QTableWidgetItem(f"{tank.capacity_m3:.2f}")
+        cap_item.setFlags(cap_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Read-only
+
+        # Fill % is editable (user can change loading)
+        fill_item = QTableWidgetItem(fill_text)
+
+        self._tank_table.setItem(row, 0, name_item)
+        self._tank_table.setItem(row, 1, cap_item)
+        self._tank_table.setItem(row, 2, fill_item)
+
+    def _populate_pens_table(self, pen_loadings: Dict[int, int] | None = None) -> None:
         loadings = pen_loadings or {}
         self._pen_table.setRowCount(0)
-        # Sort pens by the 3-level key: number -> letter pattern (A,B,D,C) -> deck
-        sorted_pens = sorted(pens, key=get_pen_sort_key)
-        for pen in sorted_pens:
-            row = self._pen_table.rowCount()
-            self._pen_table.insertRow(row)
-            name_item = QTableWidgetItem(pen.name)
-            name_item.setData(Qt.ItemDataRole.UserRole, pen.id)
-            name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Read-only
-            self._pen_table.setItem(row, 0, name_item)
-            
-            deck_item = QTableWidgetItem(pen.deck)
-            deck_item.setFlags(deck_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Read-only
-            self._pen_table.setItem(row, 1, deck_item)
-            
-            area_item = QTableWidgetItem(f"{pen.area_m2:.2f}")
-            area_item.setFlags(area_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Read-only
-            self._pen_table.setItem(row, 2, area_item)
-            
+        # Registry order: number -> letter pattern (A,B,D,C) -> deck
+        for pen in self._registry.sorted_pens():
             heads = loadings.get(pen.id or -1, 0)
-            head_item = QTableWidgetItem(str(heads))
-            # Head Count is editable (user can change loading)
-            self._pen_table.setItem(row, 3, head_item)
+            self._insert_pen_row(self._pen_table.rowCount(), pen, str(heads))
+
+    def _insert_pen_row(self, row: int, pen: LivestockPen, heads_text: str) -> None:
+        self._pen_table.insertRow(row)
+        name_item = QTableWidgetItem(pen.name)
+        name_item.setData(Qt.ItemDataRole.UserRole, pen.id)
+        name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Read-only
+        self._pen_table.setItem(row, 0, name_item)
+
+        deck_item = QTableWidgetItem(pen.deck)
+        deck_item.setFlags(deck_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Read-only
+        self._pen_table.setItem(row, 1, deck_item)
+
+        area_item = QTableWidgetItem(f"{pen.area_m2:.2f}")
+        area_item.setFlags(area_item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Read-only
+        self._pen_table.setItem(row, 2, area_item)
+
+        # Head Count is editable (user can change loading)
+        self._pen_table.setItem(row, 3, QTableWidgetItem(heads_text))
+
+    @staticmethod
+    def _take_rows(table: QTableWidget, ids: set, value_col: int) -> Dict[int, str]:
+        """Remove the rows of these item ids; returns id -> text of their editable column."""
+        kept: Dict[int, str] = {}
+        for row in reversed(range(table.rowCount())):
+            item = table.item(row, 0)
+            item_id = item.data(Qt.ItemDataRole.UserRole) if item else None
+            if item_id in ids:
+                value = table.item(row, value_col)
+                kept[item_id] = value.text() if value else ""
+                table.removeRow(row)
+        return kept
+
+    def _on_registry_pens_changed(self, pen_ids: tuple) -> None:
+        """Add or replace the changed pens' rows, in registry order; entered head counts stay."""
+        registry = self._registry
+        ids = set(pen_ids)
+        self._pen_table.blockSignals(True)
+        try:
+            kept = self._take_rows(self._pen_table, ids, 3)
+            # Unchanged rows are still in order, so inserting by final position works
+            for row, i in enumerate(registry.pen_rows()):
+                pen = registry.pens[i]
+                if pen.id in ids:
+                    self._insert_pen_row(row, pen, kept.get(pen.id, "0"))
+        finally:
+            self._pen_table.blockSignals(False)
+        if self._live.active:
+            self._start_live()  # the compiled model must know the new pens
+
+    def _on_registry_tanks_changed(self, tank_ids: tuple) -> None:
+        """Add or replace the changed tanks' rows, in registry order; entered fills stay."""
+        registry = self._registry
+        ids = set(tank_ids)
+        self._tank_table.blockSignals(True)
+        try:
+            kept = self._take_rows(self._tank_table, ids, 2)
+            for row, i in enumerate(registry.tank_rows()):
+                tank = registry.tanks[i]
+                if tank.id in ids:
+                    self._insert_tank_row(row, tank, kept.get(tank.id, "0.0"))
+        finally:
+            self._tank_table.blockSignals(False)
+        if self._live.active:
+            self._start_live()
 
     def load_condition(self, voyage_id: int, condition_id: int) -> None:
         """Load a stored condition for editing. Called when user clicks Edit in Voyage Planner."""
@@ -498,13 +573,15 @@ class ConditionEditorView(QWidget):
                 cond_svc = ConditionService(db)
                 tanks = cond_svc.get_tanks_for_ship(ship.id)
                 pens = cond_svc.get_pens_for_ship(ship.id)
-            self._populate_tanks_table(tanks, condition.tank_volumes_m3)
+            # Deck tabs follow the registry's reset signal
+            self._registry.load(ship.id, pens, tanks)
+            self._populate_tanks_table(condition.tank_volumes_m3)
             pen_loads = getattr(condition, "pen_loadings", {}) or {}
-            self._populate_pens_table(pens, pen_loads)
-            # Update deck tabs
-            self._deck_profile_widget.update_tables(pens, tanks)
+            self._populate_pens_table(pen_loads)
             # Update condition table
-            self._update_condition_table(pens, tanks, pen_loads, condition.tank_volumes_m3)
+            self._update_condition_table(
+                self._registry.pens, self._registry.tanks, pen_loads, condition.tank_volumes_m3
+            )
 
     def _on_ship_changed(self, index: int) -> None:
         if index < 0 or index >= len(self._ships):
@@ -572,11 +649,7 @@ class ConditionEditorView(QWidget):
             QMessageBox.critical(self, "Error", "Database not initialized.")
             return
 
-        with database.SessionLocal() as db:
-            cond_service = ConditionService(db)
-            tanks = cond_service.get_tanks_for_ship(self._current_ship.id)
-            tank_by_id = {t.id: t for t in tanks}
-
+        # Tanks come from the registry (no database read on the GUI thread)
         for row in range(self._tank_table.rowCount()):
             name_item = self._tank_table.item(row, 0)
             fill_item = self._tank_table.item(row, 2)
@@ -593,7 +666,7 @@ class ConditionEditorView(QWidget):
                 fill_pct = 0.0
 
             fill_pct = max(0.0, min(100.0, fill_pct))
-            tank = tank_by_id.get(int(tank_id))
+            tank = self._registry.tank(int(tank_id))
             if not tank:
                 continue
 
@@ -623,14 +696,90 @@ class ConditionEditorView(QWidget):
             (c for c in self._cargo_types if c.name == self._cargo_type_combo.currentText().strip()),
             None,
         )
-        try:
-            results: ConditionResults = cond_service.compute(
-                self._current_ship, condition, tank_volumes,
-                cargo_type=selected_cargo,
+        self._active_request_id = self._compute_worker.submit(ComputeRequest(
+            self._current_ship, condition, tank_volumes, cargo_type=selected_cargo,
+            free_trim=self._free_trim_check.isChecked(),
+        ))
+        self._cancel_compute_btn.setEnabled(True)
+        self._show_status("Computing...", 0)
+
+    def cancel_compute(self) -> None:
+        """Cancel the running compute (if any)."""
+        self._compute_worker.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the compute worker thread (called when the main window closes)."""
+        self._compute_worker.stop()
+
+    def _show_status(self, text: str, timeout_ms: int) -> bool:
+        """Show text in the MainWindow status bar; False if there is none."""
+        parent = self.parent()
+        while parent and not hasattr(parent, '_status_bar'):
+            parent = parent.parent()
+        if parent and hasattr(parent, '_status_bar'):
+            parent._status_bar.showMessage(text, timeout_ms)
+            return True
+        return False
+
+    def _on_live_toggled(self, checked: bool) -> None:
+        if checked:
+            self._start_live()
+        else:
+            self._live.stop()
+
+    def _on_free_trim_toggled(self, _checked: bool) -> None:
+        if self._live.active:
+            self._start_live()
+
+    def _start_live(self) -> None:
+        """(Re)start live results from the loadings shown in the condition table."""
+        if not self._current_ship or self._current_ship.id is None or database.SessionLocal is None:
+            self._live.stop()
+            return
+        pen_heads, tank_volumes = self._condition_table.current_loadings()
+        selected_cargo = next(
+            (c for c in self._cargo_types if c.name == self._cargo_type_combo.currentText().strip()),
+            None,
+        )
+        with database.SessionLocal() as db:
+            live = ConditionService(db).live_condition(
+                self._current_ship, tank_volumes, pen_heads, cargo_type=selected_cargo,
+                free_trim=self._free_trim_check.isChecked(),
             )
-        except ConditionValidationError as exc:
-            QMessageBox.warning(self, "Validation", str(exc))
+        self._live.start(live)
+
+    def _on_live_update(self, update: LiveUpdate) -> None:
+        """Show a live update in the results panel and the alarms at once."""
+        ship_dwt = getattr(self._current_ship, "deadweight_t", 0.0) if self._current_ship else 0.0
+        self._results_panel.update_results(update.results, ship_dwt)
+        self.live_results_updated.emit(update.results)
+        self._show_status(f"Live results updated in {1000.0 * update.latency_s:.1f} ms", 2000)
+
+    def _on_compute_error(self, request_id: int, message: str) -> None:
+        if request_id != self._active_request_id:
+            return
+        self._cancel_compute_btn.setEnabled(False)
+        self._show_status("", 0)
+        QMessageBox.warning(self, "Validation", message)
+        self.compute_failed.emit(message)
+
+    def _on_compute_cancelled(self, request_id: int) -> None:
+        # Requests replaced by a newer one are cancelled silently
+        if request_id != self._active_request_id:
             return
+        self._cancel_compute_btn.setEnabled(False)
+        self._show_status("Computation cancelled", 3000)
+        self.compute_failed.emit("Computation cancelled")
+
+    def _on_compute_finished(self, outcome: ComputeOutcome) -> None:
+        """Show results of the latest compute request (stale ones are ignored)."""
+        if outcome.request.request_id != self._active_request_id:
+            return
+        self._cancel_compute_btn.setEnabled(False)
+        results = outcome.results
+        condition = outcome.request.condition
+        pen_loadings = condition.pen_loadings
+        tank_volumes = outcome.request.tank_volumes
 
         self._current_condition = condition
         self._last_results = results
@@ -642,24 +791,17 @@ class ConditionEditorView(QWidget):
         
         # Waterline visualization removed - no update needed
         
-        # Update condition table with current data
-        with database.SessionLocal() as db:
-            cond_service = ConditionService(db)
-            pens = cond_service.get_pens_for_ship(self._current_ship.id)
-            tanks = cond_service.get_tanks_for_ship(self._current_ship.id)
+        # Update condition table; the registry's items stand unless the worker computed another ship
+        pens, tanks = outcome.pens, outcome.tanks
+        if self._registry.ship_id == outcome.request.ship.id:
+            pens, tanks = self._registry.pens, self._registry.tanks
         self._update_condition_table(pens, tanks, pen_loadings, tank_volumes)
         
-        self.condition_computed.emit(results, self._current_ship, condition, voyage)
+        self.condition_computed.emit(results, outcome.request.ship, condition, voyage)
         validation = getattr(results, "validation", None)
         if validation and getattr(validation, "has_errors", False):
             # Use non-blocking status message instead of blocking dialog
-            # Try to find parent MainWindow to show status message
-            parent = self.parent()
-            while parent and not hasattr(parent, '_status_bar'):
-                parent = parent.parent()
-            if parent and hasattr(parent, '_status_bar'):
-                parent._status_bar.showMessage("Computation completed - FAILED: Check Results tab for details", 5000)
-            else:
+            if not self._show_status("Computation completed - FAILED: Check Results tab for details", 5000):
                 # Fallback to non-modal message box if no status bar found
                 msg = QMessageBox(self)
                 msg.setIcon(QMessageBox.Icon.Warning)
@@ -670,12 +812,7 @@ class ConditionEditorView(QWidget):
                 msg.show()
         else:
             # Use non-blocking status message instead of blocking dialog
-            parent = self.parent()
-            while parent and not hasattr(parent, '_status_bar'):
-                parent = parent.parent()
-            if parent and hasattr(parent, '_status_bar'):
-                parent._status_bar.showMessage("Computation completed successfully", 3000)
-            else:
+            if not self._show_status("Computation completed successfully", 3000):
                 # Fallback to non-modal message box if no status bar found
                 msg = QMessageBox(self)
                 msg.setIcon(QMessageBox.Icon.Information)
@@ -701,11 +838,6 @@ class ConditionEditorView(QWidget):
         tank_volumes: Dict[int, float] = {}
         pen_loadings: Dict[int, int] = {}
 
-        with database.SessionLocal() as db:
-            cond_service = ConditionService(db)
-            tanks = cond_service.get_tanks_for_ship(self._current_ship.id)
-            tank_by_id = {t.id: t for t in tanks}
-
         for row in range(self._tank_table.rowCount()):
             name_item = self._tank_table.item(row, 0)
             fill_item = self._tank_table.item(row, 2)
@@ -719,7 +851,7 @@ class ConditionEditorView(QWidget):
             except (TypeError, ValueError):
                 fill_pct = 0.0
             fill_pct = max(0.0, min(100.0, fill_pct))
-            tank = tank_by_id.get(int(tank_id))
+            tank = self._registry.tank(int(tank_id))
             if not tank:
                 continue
             tank_volumes[int(tank_id)] = tank.capacity_m3 * (fill_pct / 100.0)
@@ -755,9 +887,12 @@ class ConditionEditorView(QWidget):
                 None,
             )
             try:
+                # Warm-started from the editor's own last results, not the worker's solver
                 results = cond_svc.compute(
                     self._current_ship, condition, tank_volumes,
                     cargo_type=selected_cargo,
+                    free_trim=self._free_trim_check.isChecked(),
+                    warm_start=self._last_results.equilibrium if self._last_results is not None else None,
                 )
                 condition.displacement_t = results.displacement_t
                 condition.draft_m = results.draft_m
@@ -773,11 +908,7 @@ class ConditionEditorView(QWidget):
         
         # Update tables after save
         if self._current_ship:
-            with database.SessionLocal() as db:
-                cond_service = ConditionService(db)
-                pens = cond_service.get_pens_for_ship(self._current_ship.id)
-                tanks = cond_service.get_tanks_for_ship(self._current_ship.id)
-            self._update_condition_table(pens, tanks, pen_loadings, tank_volumes)
+            self._update_condition_table(self._registry.pens, self._registry.tanks, pen_loadings, tank_volumes)
         
         QMessageBox.information(self, "Saved", "Condition saved.")
         
@@ -814,17 +945,21 @@ class ConditionEditorView(QWidget):
             ship_id=self._current_ship.id if self._current_ship else None,
             default_cargo_name=default_cargo_name,
         )
+        if self._live_check.isChecked():
+            self._start_live()
         
     # Public methods for toolbar access
     def compute_condition(self) -> bool:
         """
-        Compute the current condition. Called from toolbar.
+        Compute the current condition in the background. Called from toolbar.
+        Results arrive through condition_computed (or compute_failed).
         
         Returns:
-            True if computation succeeded, False otherwise
+            True if a compute request was queued, False otherwise
         """
+        request_id = self._active_request_id
         self._on_compute()
-        return self._last_results is not None
+        return self._active_request_id != request_id
         
     def save_current_condition(self) -> bool:
         """
@@ -0,0 +1,1055 @@
+"""
+Array-backed models for the loading condition tables.
+
+ConditionTableData holds the pens and tanks of the ship being edited as
+numpy columns (heads, cargo, weights, moments, volumes, ...) and
+recalculates rows in bulk. The livestock, tank and All tabs share it
+through ConditionTableModel: each tab is a list of row indices into the
+same data, so an edit in one tab shows in the others, and a change to
+many rows is announced as one dataChanged range per model instead of one
+signal per cell. Totals rows render from RunningTotals: per-tab and
+per-deck sums of weight, moments and areas that edits move by the
+changed rows' deltas, so an edit costs the same however long the table
+is. CargoDelegate edits the Cargo column with a combo box while a cell
+is being edited, instead of a combo widget on every row.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt, pyqtSignal
+from PyQt6.QtWidgets import QComboBox, QStyledItemDelegate, QWidget
+
+from ..config.limits import MASS_PER_HEAD_T
+from ..models import LivestockPen, Tank
+
+BLANK_CARGO = "-- Blank --"
+
+# Decks with a Livestock-DK tab driven by this data (deck H is the free-entry DK8 table)
+LIVESTOCK_DECKS = "ABCDEFG"
+
+# Tank table column indices (reference: green indicator, Name, Ull/Snd, UTrim, Capacity, %Full, Volume, Dens, Weight, VCG, LCG, TCG, FSopt, FSt)
+TANK_COL_NAME = 1
+TANK_COL_ULL_SND = 2
+TANK_COL_UTRIM = 3
+TANK_COL_CAPACITY = 4
+TANK_COL_PCT_FULL = 5
+TANK_COL_VOLUME = 6
+TANK_COL_DENS = 7
+TANK_COL_WEIGHT = 8
+TANK_COL_VCG = 9
+TANK_COL_LCG = 10
+TANK_COL_TCG = 11
+TANK_COL_FSOPT = 12
+TANK_COL_FST = 13
+
+# Columns of RunningTotals.pens / .tanks; weight and moments line up so pens and tanks add
+SUM_WEIGHT = 0
+SUM_VCG_MOMENT = 1
+SUM_LCG_MOMENT = 2
+SUM_TCG_MOMENT = 3
+SUM_PEN_AREA_USED = 4
+SUM_PEN_AREA = 5
+SUM_TANK_CAPACITY = 4
+SUM_TANK_VOLUME = 5
+N_SUMS = 6
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+# Per-pen array attributes of ConditionTableData (grown together when pens are added)
+_PEN_COLUMNS = (
+    "pen_ids", "pen_on_deck_tab", "pen_area", "pen_capacity_head", "pen_vcg", "pen_lcg", "pen_tcg",
+    "pen_heads", "pen_cargo", "pen_head_capacity", "pen_area_used", "pen_area_per_head",
+    "pen_mass_per_head", "pen_head_pct", "pen_weight", "pen_vcg_display", "pen_moment",
+)
+_TANK_COLUMNS = (
+    "tank_ids", "tank_capacity", "tank_density", "tank_vcg", "tank_lcg", "tank_tcg",
+    "tank_volume", "tank_weight", "tank_fill_pct",
+)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """num / den where den > 0, else 0."""
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den > 0)
+
+
+def _whole(area: np.ndarray, per_head: np.ndarray) -> np.ndarray:
+    """int(area / per_head) where per_head > 0, else 0 (heads that fit the area)."""
+    return _ratio(area, per_head).astype(np.int64)
+
+
+def _max_heads(by_area: np.ndarray, by_capacity: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+    """The smaller of the area and capacity limits that are set; fallback where neither is."""
+    return np.where(
+        (by_area > 0) & (by_capacity > 0), np.minimum(by_area, by_capacity),
+        np.where(by_area > 0, by_area, np.where(by_capacity > 0, by_capacity, fallback)),
+    )
+
+
+@dataclass(slots=True, eq=False)
+class RunningTotals:
+    """Sums over one group of pens and tanks (a tab or a deck), kept current from row deltas."""
+    pen_mask: np.ndarray
+    tank_mask: np.ndarray
+    pens: np.ndarray = field(default_factory=lambda: np.zeros(N_SUMS))
+    tanks: np.ndarray = field(default_factory=lambda: np.zeros(N_SUMS))
+
+    @property
+    def weight(self) -> float:
+        return float(self.pens[SUM_WEIGHT] + self.tanks[SUM_WEIGHT])
+
+    def centre(self, moment: int) -> Optional[float]:
+        """Centre of gravity for moment (SUM_VCG/LCG/TCG_MOMENT); None when nothing is loaded."""
+        weight = self.weight
+        if abs(weight) < 1e-9:
+            return None
+        return float(self.pens[moment] + self.tanks[moment]) / weight
+
+
+class ConditionTableData(QObject):
+    """
+    Pen and tank values shown in the condition tables, one array entry per item.
+
+    Pens on decks A-G carry the livestock columns (cargo, heads, capacity,
+    areas, weight, VCG, moment); other pens keep blank values. Edits go
+    through set_pen_heads, set_pen_cargo and set_tank_weight, which
+    recalculate the affected rows, move the tracked RunningTotals by the
+    rows' deltas and emit the changed indices. upsert_pens and upsert_tanks
+    add or replace items at the positions ItemRegistry gave them, without
+    a reload.
+    """
+
+    # args: numpy array of pen indices whose values changed
+    pens_changed = pyqtSignal(object)
+    # args: numpy array of tank indices whose values changed
+    tanks_changed = pyqtSignal(object)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.pens: List[LivestockPen] = []
+        self.tanks: List[Tank] = []
+        self.pen_decks: List[str] = []
+        self.cargo_names: List[str] = [BLANK_CARGO]
+        self.cargo_choice = False  # Cargo column offers the cargo library
+        self.recalculate = False  # edits recalculate rows (needs a cargo library)
+        self.version = 0  # bumped by load(); views rebuild row selections when it moves
+        self._default_cargo = BLANK_CARGO  # cargo of pens added after load()
+        self._mass_per_head_t = MASS_PER_HEAD_T
+        self._pen_pos: Dict[int, int] = {}
+        self._tank_pos: Dict[int, int] = {}
+        self._running: List[RunningTotals] = []
+        self.deck_totals: Dict[str, RunningTotals] = {}  # deck letter -> totals of its pens
+        self._set_cargo_params([])
+        self._load_pen_arrays([], [])
+        self._load_tank_arrays([])
+
+    # --- loading -----------------------------------------------------------
+
+    def load(
+        self,
+        pens: Sequence[LivestockPen],
+        tanks: Sequence[Tank],
+        pen_decks: Sequence[str],
+        pen_loadings: Mapping[int, int],
+        tank_volumes: Mapping[int, float],
+        cargo_types: Optional[Sequence[Any]] = None,
+        cargo_choice: bool = False,
+        default_cargo: str = BLANK_CARGO,
+        mass_per_head_t: float = MASS_PER_HEAD_T,
+        area_per_head: Optional[float] = None,
+        preserved_cargo: Optional[Mapping[int, str]] = None,
+        preserved_heads: Optional[Mapping[int, int]] = None,
+        preserved_tank_weights: Optional[Mapping[int, float]] = None,
+    ) -> None:
+        """
+        Replace all pens and tanks. pen_decks holds each pen's deck letter.
+        Preserved values (by id) are what the user had entered before the
+        reload and win over the condition's loadings, as in the tables.
+        """
+        self.version += 1
+        self.cargo_choice = cargo_choice
+        self.recalculate = bool(cargo_types)
+        self._set_cargo_params(cargo_types or [])
+        self._cargo_index(default_cargo)
+        self._default_cargo = default_cargo
+        self._mass_per_head_t = mass_per_head_t
+        self._load_pen_arrays(pens, pen_decks)
+        self._load_tank_arrays(tanks)
+        self._init_pens(
+            pen_loadings, cargo_types or [], default_cargo, mass_per_head_t, area_per_head,
+            preserved_cargo or {}, preserved_heads or {},
+        )
+        self._init_tanks(tank_volumes, preserved_tank_weights or {})
+        # Totals tracked for the previous items are void; models track again in set_rows
+        self._running = []
+        decks = np.array(self.pen_decks, dtype=object)
+        self.deck_totals = {
+            letter: self.track(np.flatnonzero(self.pen_on_deck_tab & (decks == letter)))
+            for letter in LIVESTOCK_DECKS
+        }
+
+    def _set_cargo_params(self, cargo_types: Sequence[Any]) -> None:
+        self.cargo_names = [BLANK_CARGO] + [c.name for c in cargo_types]
+        # Index 0 is the blank cargo; unknown names added later use the defaults
+        self._cargo_mass = [0.0]
+        self._cargo_area = [0.0]
+        self._cargo_vcg = [0.0]
+        self._cargo_known = [False]
+        for c in cargo_types:
+            self._cargo_mass.append((getattr(c, "avg_weight_per_head_kg", 520.0) or 520.0) / 1000.0)
+            self._cargo_area.append(getattr(c, "deck_area_per_head_m2", 1.85) or 1.85)
+            self._cargo_vcg.append(getattr(c, "vcg_from_deck_m", 0) or 0.0)
+            self._cargo_known.append(True)
+        self._cargo_arrays()
+
+    def _cargo_arrays(self) -> None:
+        self._cargo_mass_a = np.array(self._cargo_mass, dtype=float)
+        self._cargo_area_a = np.array(self._cargo_area, dtype=float)
+        self._cargo_vcg_a = np.array(self._cargo_vcg, dtype=float)
+        self._cargo_known_a = np.array(self._cargo_known, dtype=bool)
+
+    def _cargo_index(self, name: str, add: bool = True) -> int:
+        """Index of cargo name (matched stripped); unknown names are added when add is set."""
+        name = (name or "").strip()
+        for k, existing in enumerate(self.cargo_names):
+            if (existing or "").strip() == name:
+                return k
+        if not add or not name:
+            return -1
+        self.cargo_names.append(name)
+        self._cargo_mass.append(MASS_PER_HEAD_T)
+        self._cargo_area.append(0.0)
+        self._cargo_vcg.append(0.0)
+        self._cargo_known.append(False)
+        self._cargo_arrays()
+        return len(self.cargo_names) - 1
+
+    def _load_pen_arrays(self, pens: Sequence[LivestockPen], pen_decks: Sequence[str]) -> None:
+        self.pens = list(pens)
+        self.pen_decks = [d or "" for d in pen_decks]
+        self._pen_pos = {p.id: i for i, p in enumerate(self.pens) if p.id is not None}
+        n = len(self.pens)
+        self.pen_ids = np.array([p.id if p.id is not None else -1 for p in self.pens], dtype=np.int64)
+        self.pen_on_deck_tab = np.array([d in LIVESTOCK_DECKS and d != "" for d in self.pen_decks], dtype=bool)
+        self.pen_area = np.array([p.area_m2 for p in self.pens], dtype=float)
+        self.pen_capacity_head = np.array([int(p.capacity_head or 0) for p in self.pens], dtype=np.int64)
+        self.pen_vcg = np.array([p.vcg_m for p in self.pens], dtype=float)
+        self.pen_lcg = np.array([p.lcg_m for p in self.pens], dtype=float)
+        self.pen_tcg = np.array([p.tcg_m for p in self.pens], dtype=float)
+        self.pen_heads = np.zeros(n, dtype=np.int64)
+        self.pen_cargo = np.zeros(n, dtype=np.int64)
+        self.pen_head_capacity = np.zeros(n, dtype=np.int64)
+        self.pen_area_used = np.zeros(n)
+        self.pen_area_per_head = np.zeros(n)
+        self.pen_mass_per_head = np.zeros(n)
+        self.pen_head_pct = np.zeros(n)
+        self.pen_weight = np.zeros(n)
+        self.pen_vcg_display = self.pen_vcg.copy()
+        self.pen_moment = np.zeros(n)
+
+    def _load_tank_arrays(self, tanks: Sequence[Tank]) -> None:
+        self.tanks = list(tanks)
+        self._tank_pos = {t.id: i for i, t in enumerate(self.tanks) if t.id is not None}
+        n = len(self.tanks)
+        self.tank_ids = np.array([t.id if t.id is not None else -1 for t in self.tanks], dtype=np.int64)
+        self.tank_capacity = np.array([t.capacity_m3 for t in self.tanks], dtype=float)
+        self.tank_density = np.array(
+            [getattr(t, "density_t_per_m3", 1.025) or 1.025 for t in self.tanks], dtype=float
+        )
+        self.tank_vcg = np.array([getattr(t, "kg_m", 0.0) or 0.0 for t in self.tanks], dtype=float)
+        self.tank_lcg = np.array([t.lcg_m for t in self.tanks], dtype=float)
+        self.tank_tcg = np.array([t.tcg_m for t in self.tanks], dtype=float)
+        self.tank_volume = np.zeros(n)
+        self.tank_weight = np.zeros(n)
+        self.tank_fill_pct = np.zeros(n)
+
+    def _init_pens(
+        self,
+        pen_loadings: Mapping[int, int],
+        cargo_types: Sequence[Any],
+        default_cargo: str,
+        mass_per_head_t: float,
+        area_per_head: Optional[float],
+        preserved_cargo: Mapping[int, str],
+        preserved_heads: Mapping[int, int],
+    ) -> None:
+        idx = np.flatnonzero(self.pen_on_deck_tab)
+        if idx.size == 0:
+            return
+        pens = [self.pens[i] for i in idx]
+        preserved = np.array([p.id in preserved_heads for p in pens], dtype=bool)
+        initial = np.array(
+            [preserved_heads[p.id] if p.id in preserved_heads else pen_loadings.get(p.id or -1, 0) for p in pens],
+            dtype=np.int64,
+        )
+        area = self.pen_area[idx]
+        default_ct = next(
+            (c for c in cargo_types if (getattr(c, "name", "") or "").strip() == default_cargo), None
+        )
+        if area_per_head is not None:
+            per_head = np.full(idx.size, float(area_per_head))
+        elif default_ct is not None:
+            per_head = np.full(idx.size, float(getattr(default_ct, "deck_area_per_head_m2", 1.85) or 1.85))
+        else:
+            per_head = np.where(initial > 0, _ratio(area, initial), 1.85)
+        by_area = _whole(area, per_head)
+        capacity = self.pen_capacity_head[idx]
+        by_capacity = np.where(capacity > 0, capacity, by_area)
+        if default_cargo == BLANK_CARGO:
+            # Blank cargo: no heads unless the user had entered some
+            heads = np.where(preserved, initial, 0)
+            head_capacity = np.where(preserved, by_area, 0)
+        else:
+            # Default to the most heads the area and capacity allow (the column stays editable)
+            heads = np.where(preserved, initial, _max_heads(by_area, by_capacity, initial))
+            head_capacity = by_area
+        heads = np.maximum(heads, 0)
+        weight = heads * mass_per_head_t
+        vcg_from_deck = (getattr(default_ct, "vcg_from_deck_m", 0) or 0) if default_ct else 0.0
+
+        self.pen_heads[idx] = heads
+        self.pen_head_capacity[idx] = head_capacity
+        self.pen_area_per_head[idx] = per_head
+        self.pen_area_used[idx] = np.where(per_head > 0, np.minimum(heads * per_head, area), 0.0)
+        self.pen_mass_per_head[idx] = mass_per_head_t
+        self.pen_head_pct[idx] = _ratio(heads, head_capacity) * 100.0
+        self.pen_weight[idx] = weight
+        self.pen_vcg_display[idx] = self.pen_vcg[idx] + vcg_from_deck
+        self.pen_moment[idx] = weight * self.pen_lcg[idx]
+
+        # Row cargo: the user's previous choice, else the default cargo
+        default_k = self._cargo_index(default_cargo, add=False)
+        cargo = np.full(idx.size, max(default_k, 0), dtype=np.int64)
+        if self.cargo_choice:
+            for j, p in enumerate(pens):
+                k = self._cargo_index(preserved_cargo.get(p.id, ""), add=False)
+                if k >= 0:
+                    cargo[j] = k
+        self.pen_cargo[idx] = cargo
+
+    def _init_tanks(self, tank_volumes: Mapping[int, float], preserved_weights: Mapping[int, float]) -> None:
+        if not self.tanks:
+            return
+        dens = self.tank_density
+        cap = self.tank_capacity
+        kept = np.array([preserved_weights.get(t.id or -1, 0.0) for t in self.tanks], dtype=float)
+        preserved = kept > 0
+        vol = np.where(
+            preserved, _ratio(kept, dens),
+            np.array([tank_volumes.get(t.id or -1, 0.0) for t in self.tanks], dtype=float),
+        )
+        capped = (cap > 0) & (vol > cap)
+        vol = np.where(capped, cap, vol)
+        self.tank_volume[:] = vol
+        self.tank_weight[:] = np.where(preserved & ~capped, kept, np.where(vol > 0, vol * dens, 0.0))
+        self.tank_fill_pct[:] = _ratio(vol, cap) * 100.0
+
+    # --- item changes ------------------------------------------------------
+
+    def upsert_pens(self, indices: Sequence[int], pens: Sequence[LivestockPen], pen_decks: Sequence[str]) -> np.ndarray:
+        """
+        Add pens (indices past the end) or replace the pens at indices, as
+        ItemRegistry.upsert_pens placed them. Replaced pens keep their cargo
+        and # head; added pens get the loaded default cargo. Deck totals
+        follow pens that move deck. Emits and returns the indices.
+        """
+        idx = np.asarray(indices, dtype=np.int64)
+        if idx.size == 0:
+            return idx
+        added = idx >= len(self.pens)
+        if added.any():
+            self._grow_pens(int(idx.max()) + 1 - len(self.pens))
+        before = self._pen_sums(idx)
+        was_member = [totals.pen_mask[idx].copy() for totals in self._running]
+        cargo_offset = self.pen_vcg_display[idx] - self.pen_vcg[idx]
+        for i, pen, deck in zip(idx.tolist(), pens, pen_decks):
+            old = self.pens[i]
+            if old is not None and self._pen_pos.get(old.id) == i:
+                del self._pen_pos[old.id]
+            self.pens[i] = pen
+            self.pen_decks[i] = deck or ""
+            if pen.id is not None:
+                self._pen_pos[pen.id] = i
+        self.pen_ids[idx] = [p.id if p.id is not None else -1 for p in pens]
+        self.pen_on_deck_tab[idx] = [d in LIVESTOCK_DECKS and d != "" for d in (self.pen_decks[i] for i in idx)]
+        self.pen_area[idx] = [p.area_m2 for p in pens]
+        self.pen_capacity_head[idx] = [int(p.capacity_head or 0) for p in pens]
+        self.pen_vcg[idx] = [p.vcg_m for p in pens]
+        self.pen_lcg[idx] = [p.lcg_m for p in pens]
+        self.pen_tcg[idx] = [p.tcg_m for p in pens]
+        self.pen_vcg_display[idx] = self.pen_vcg[idx] + np.where(added, 0.0, cargo_offset)
+
+        on_tab = self.pen_on_deck_tab[idx]
+        new = idx[added & on_tab]
+        self.pen_cargo[new] = max(self._cargo_index(self._default_cargo, add=False), 0)
+        self.pen_mass_per_head[new] = self._mass_per_head_t
+        if self.recalculate:
+            # New pens fill up as at load (unless the cargo is blank); replaced pens keep their # head
+            self._recalculate_pens(new, auto_max_heads=self._default_cargo != BLANK_CARGO)
+            self._recalculate_pens(idx[~added & on_tab], auto_max_heads=False)
+        else:
+            self.pen_weight[idx] = self.pen_heads[idx] * self.pen_mass_per_head[idx]
+            self.pen_moment[idx] = self.pen_weight[idx] * self.pen_lcg[idx]
+        off = idx[~on_tab]
+        for name in ("pen_heads", "pen_cargo", "pen_head_capacity", "pen_area_used", "pen_area_per_head",
+                     "pen_mass_per_head", "pen_head_pct", "pen_weight", "pen_moment"):
+            getattr(self, name)[off] = 0
+        self.pen_vcg_display[off] = self.pen_vcg[off]
+
+        decks = np.array([self.pen_decks[i] for i in idx], dtype=object)
+        for letter, totals in self.deck_totals.items():
+            totals.pen_mask[idx] = on_tab & (decks == letter)
+        after = self._pen_sums(idx)
+        for totals, member in zip(self._running, was_member):
+            now = totals.pen_mask[idx]
+            totals.pens += after[now].sum(axis=0) - before[member].sum(axis=0)
+        self.pens_changed.emit(idx)
+        return idx
+
+    def _grow_pens(self, n: int) -> None:
+        """Append n blank pen entries (arrays and tracked masks)."""
+        self.pens.extend([None] * n)
+        self.pen_decks.extend([""] * n)
+        for name in _PEN_COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate((column, np.zeros(n, dtype=column.dtype))))
+        self.pen_ids[-n:] = -1
+        for totals in self._running:
+            totals.pen_mask = np.concatenate((totals.pen_mask, np.zeros(n, dtype=bool)))
+
+    def upsert_tanks(self, indices: Sequence[int], tanks: Sequence[Tank]) -> np.ndarray:
+        """
+        Add tanks (indices past the end, empty) or replace the tanks at
+        indices, keeping their volume up to the new capacity. Emits and
+        returns the indices.
+        """
+        idx = np.asarray(indices, dtype=np.int64)
+        if idx.size == 0:
+            return idx
+        if int(idx.max()) >= len(self.tanks):
+            self._grow_tanks(int(idx.max()) + 1 - len(self.tanks))
+        before = self._tank_sums(idx)
+        for i, tank in zip(idx.tolist(), tanks):
+            old = self.tanks[i]
+            if old is not None and self._tank_pos.get(old.id) == i:
+                del self._tank_pos[old.id]
+            self.tanks[i] = tank
+            if tank.id is not None:
+                self._tank_pos[tank.id] = i
+        self.tank_ids[idx] = [t.id if t.id is not None else -1 for t in tanks]
+        self.tank_capacity[idx] = [t.capacity_m3 for t in tanks]
+        self.tank_density[idx] = [getattr(t, "density_t_per_m3", 1.025) or 1.025 for t in tanks]
+        self.tank_vcg[idx] = [getattr(t, "kg_m", 0.0) or 0.0 for t in tanks]
+        self.tank_lcg[idx] = [t.lcg_m for t in tanks]
+        self.tank_tcg[idx] = [t.tcg_m for t in tanks]
+        cap = self.tank_capacity[idx]
+        vol = self.tank_volume[idx]
+        vol = np.where((cap > 0) & (vol > cap), cap, vol)
+        self.tank_volume[idx] = vol
+        self.tank_weight[idx] = np.where(vol > 0, vol * self.tank_density[idx], 0.0)
+        self.tank_fill_pct[idx] = _ratio(vol, cap) * 100.0
+        self._move_tank_totals(idx, before)
+        self.tanks_changed.emit(idx)
+        return idx
+
+    def _grow_tanks(self, n: int) -> None:
+        """Append n blank tank entries (arrays and tracked masks)."""
+        self.tanks.extend([None] * n)
+        for name in _TANK_COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate((column, np.zeros(n, dtype=column.dtype))))
+        self.tank_ids[-n:] = -1
+        for totals in self._running:
+            totals.tank_mask = np.concatenate((totals.tank_mask, np.zeros(n, dtype=bool)))
+
+    # --- lookups -----------------------------------------------------------
+
+    def pen_index(self, pen_id: int) -> Optional[int]:
+        return self._pen_pos.get(pen_id)
+
+    def tank_index(self, tank_id: int) -> Optional[int]:
+        return self._tank_pos.get(tank_id)
+
+    def cargo_name(self, i: int) -> str:
+        return self.cargo_names[int(self.pen_cargo[i])]
+
+    def pen_heads_map(self) -> Dict[int, int]:
+        """pen_id -> # head for the pens on the Livestock-DK1..7 tabs."""
+        idx = np.flatnonzero(self.pen_on_deck_tab & (self.pen_ids >= 0))
+        return dict(zip(self.pen_ids[idx].tolist(), self.pen_heads[idx].tolist()))
+
+    def tank_volume_map(self, indices: Iterable[int] | None = None) -> Dict[int, float]:
+        """tank_id -> volume m³ for the given tank indices (all tanks by default)."""
+        idx = np.arange(len(self.tanks)) if indices is None else np.asarray(list(indices), dtype=np.int64)
+        idx = idx[self.tank_ids[idx] >= 0]
+        return dict(zip(self.tank_ids[idx].tolist(), self.tank_volume[idx].tolist()))
+
+    # --- running totals ----------------------------------------------------
+
+    def track(self, pen_rows: Sequence[int] = (), tank_rows: Sequence[int] = ()) -> RunningTotals:
+        """Start keeping totals over these pen and tank indices (summed once here, then by deltas)."""
+        pen_rows = np.asarray(pen_rows, dtype=np.int64)
+        tank_rows = np.asarray(tank_rows, dtype=np.int64)
+        totals = RunningTotals(np.zeros(len(self.pens), dtype=bool), np.zeros(len(self.tanks), dtype=bool))
+        totals.pen_mask[pen_rows] = True
+        totals.tank_mask[tank_rows] = True
+        totals.pens += self._pen_sums(pen_rows).sum(axis=0)
+        totals.tanks += self._tank_sums(tank_rows).sum(axis=0)
+        self._running.append(totals)
+        return totals
+
+    def untrack(self, totals: RunningTotals) -> None:
+        if totals in self._running:
+            self._running.remove(totals)
+
+    def _pen_sums(self, idx: np.ndarray) -> np.ndarray:
+        """Per-row contributions of pens idx, one column per SUM_* (LCG moment is the LS Moment column)."""
+        w = self.pen_weight[idx]
+        return np.column_stack((
+            w, w * self.pen_vcg_display[idx], self.pen_moment[idx], w * self.pen_tcg[idx],
+            self.pen_area_used[idx], self.pen_area[idx],
+        )) if idx.size else np.zeros((0, N_SUMS))
+
+    def _tank_sums(self, idx: np.ndarray) -> np.ndarray:
+        w = self.tank_weight[idx]
+        return np.column_stack((
+            w, w * self.tank_vcg[idx], w * self.tank_lcg[idx], w * self.tank_tcg[idx],
+            self.tank_capacity[idx], self.tank_volume[idx],
+        )) if idx.size else np.zeros((0, N_SUMS))
+
+    def _move_pen_totals(self, idx: np.ndarray, before: np.ndarray) -> None:
+        """Add the change of pens idx since before (their _pen_sums) to every group holding them."""
+        delta = self._pen_sums(idx) - before
+        for totals in self._running:
+            member = totals.pen_mask[idx]
+            if member.any():
+                totals.pens += delta[member].sum(axis=0)
+
+    def _move_tank_totals(self, idx: np.ndarray, before: np.ndarray) -> None:
+        delta = self._tank_sums(idx) - before
+        for totals in self._running:
+            member = totals.tank_mask[idx]
+            if member.any():
+                totals.tanks += delta[member].sum(axis=0)
+
+    # --- edits -------------------------------------------------------------
+
+    def set_pen_heads(self, i: int, heads: int) -> None:
+        """Set a pen's # head; with a cargo library the row is capped and recalculated."""
+        if not self.pen_on_deck_tab[i]:
+            return
+        idx = np.array([i], dtype=np.int64)
+        before = self._pen_sums(idx)
+        self.pen_heads[i] = max(0, int(heads))
+        if self.recalculate:
+            self._recalculate_pens(idx, auto_max_heads=False)
+        self._move_pen_totals(idx, before)
+        self.pens_changed.emit(idx)
+
+    def set_pen_cargo(self, indices: Iterable[int], cargo_name: str) -> int:
+        """Give pens cargo_name and fill them to the most heads it allows; returns the rows changed."""
+        k = self._cargo_index(cargo_name, add=False)
+        if k < 0:
+            return 0
+        idx = np.asarray(list(indices) if not isinstance(indices, np.ndarray) else indices, dtype=np.int64)
+        idx = idx[self.pen_on_deck_tab[idx]] if idx.size else idx
+        if idx.size == 0:
+            return 0
+        before = self._pen_sums(idx)
+        self.pen_cargo[idx] = k
+        if self.recalculate:
+            self._recalculate_pens(idx, auto_max_heads=True)
+        self._move_pen_totals(idx, before)
+        self.pens_changed.emit(idx)
+        return int(idx.size)
+
+    def set_cargo_types(self, cargo_types: Sequence[Any]) -> None:
+        """Swap in an updated cargo library; pens whose cargo is gone become blank."""
+        old_names = self.cargo_names
+        self._set_cargo_params(cargo_types)
+        remap = np.array([max(self._cargo_index(name, add=False), 0) for name in old_names], dtype=np.int64)
+        old = self.pen_cargo
+        self.pen_cargo = remap[old] if old.size else old
+        dropped = np.flatnonzero((self.pen_cargo == 0) & (old != 0))
+        self.recalculate = self.recalculate or bool(cargo_types)
+        if dropped.size:
+            if self.recalculate:
+                before = self._pen_sums(dropped)
+                self._recalculate_pens(dropped, auto_max_heads=True)
+                self._move_pen_totals(dropped, before)
+            self.pens_changed.emit(dropped)
+
+    def set_tank_weight(self, i: int, weight_mt: float) -> None:
+        """Set a tank's weight; volume follows from density and is capped at capacity."""
+        dens = float(self.tank_density[i])
+        cap = float(self.tank_capacity[i])
+        vol = weight_mt / dens if dens > 0 else 0.0
+        if cap > 0 and vol > cap:
+            # Volume cannot exceed capacity: cap it and adjust the weight to match
+            vol = cap
+            weight_mt = vol * dens
+        idx = np.array([i], dtype=np.int64)
+        before = self._tank_sums(idx)
+        self.tank_weight[i] = weight_mt
+        self.tank_volume[i] = vol
+        self.tank_fill_pct[i] = (vol / cap) * 100.0 if cap > 0 else 0.0
+        self._move_tank_totals(idx, before)
+        self.tanks_changed.emit(idx)
+
+    def _recalculate_pens(self, idx: np.ndarray, auto_max_heads: bool) -> None:
+        """Recalculate pen rows from their cargo and # head (auto_max_heads: fill to the limit)."""
+        c = self.pen_cargo[idx]
+        known = self._cargo_known_a[c]
+        area = self.pen_area[idx]
+        heads = np.maximum(self.pen_heads[idx], 0)
+        mass = np.where(known, self._cargo_mass_a[c], MASS_PER_HEAD_T)
+        per_head = np.where(known, self._cargo_area_a[c], _ratio(area, heads))
+        by_area = _whole(area, per_head)
+        capacity = self.pen_capacity_head[idx]
+        by_capacity = np.where(capacity > 0, capacity, by_area)
+        if auto_max_heads:
+            heads = _max_heads(by_area, by_capacity, heads)
+        else:
+            # Keep the entered value but cap it to what the area and capacity allow
+            heads = np.where((per_head > 0) & (by_area > 0), np.minimum(heads, by_area), heads)
+            heads = np.where(by_capacity > 0, np.minimum(heads, by_capacity), heads)
+        weight = heads * mass
+
+        blank = c == 0
+        self.pen_heads[idx] = np.where(blank, 0, heads)
+        self.pen_head_capacity[idx] = np.where(blank, 0, by_area)
+        self.pen_area_per_head[idx] = np.where(blank, 0.0, per_head)
+        self.pen_mass_per_head[idx] = np.where(blank, 0.0, mass)
+        self.pen_area_used[idx] = np.where(blank, 0.0, np.minimum(np.where(heads > 0, heads * per_head, 0.0), area))
+        self.pen_head_pct[idx] = np.where(blank, 0.0, _ratio(heads, by_area) * 100.0)
+        self.pen_weight[idx] = np.where(blank, 0.0, weight)
+        self.pen_vcg_display[idx] = self.pen_vcg[idx] + np.where(known & ~blank, self._cargo_vcg_a[c], 0.0)
+        self.pen_moment[idx] = np.where(blank, 0.0, weight * self.pen_lcg[idx])
+
+
+class ConditionTableModel(QAbstractTableModel):
+    """
+    Table model over a row selection of ConditionTableData: pen rows, then
+    tank rows, then an optional totals row. Subclasses define the columns.
+    """
+
+    HEADERS: Tuple[str, ...] = ()
+    NAME_COLUMN = 0
+
+    def __init__(self, table_data: ConditionTableData, totals_label: str = "", parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._table_data = table_data
+        self._totals_label = totals_label
+        self._pen_rows = _EMPTY
+        self._tank_rows = _EMPTY
+        self._pen_pos = _EMPTY  # pen index -> model row (-1 if not shown)
+        self._tank_pos = _EMPTY
+        self._running: Optional[RunningTotals] = None
+        self._owns_running = False
+        self._totals: Optional[Dict[int, str]] = None
+        table_data.pens_changed.connect(self._on_pens_changed)
+        table_data.tanks_changed.connect(self._on_tanks_changed)
+
+    def set_rows(
+        self,
+        pen_rows: Sequence[int] = (),
+        tank_rows: Sequence[int] = (),
+        totals: Optional[RunningTotals] = None,
+    ) -> None:
+        """
+        Show these pen and tank indices (in order); call after every ConditionTableData.load.
+        totals may be shared running totals over exactly these rows (e.g. a deck's);
+        otherwise the model has the data track its rows.
+        """
+        data = self._table_data
+        self.beginResetModel()
+        self._pen_rows = np.asarray(pen_rows, dtype=np.int64)
+        self._tank_rows = np.asarray(tank_rows, dtype=np.int64)
+        self._pen_pos = self._positions(self._pen_rows, len(data.pens))
+        self._tank_pos = self._positions(self._tank_rows, len(data.tanks))
+        if self._owns_running and self._running is not None:
+            data.untrack(self._running)
+        self._owns_running = totals is None and bool(self._totals_label)
+        self._running = data.track(self._pen_rows, self._tank_rows) if self._owns_running else totals
+        self._totals = None
+        self.endResetModel()
+
+    @staticmethod
+    def _positions(rows: np.ndarray, n: int) -> np.ndarray:
+        pos = np.full(n, -1, dtype=np.int64)
+        pos[rows] = np.arange(rows.size)
+        return pos
+
+    def pen_indices(self) -> np.ndarray:
+        return self._pen_rows
+
+    def tank_indices(self) -> np.ndarray:
+        return self._tank_rows
+
+    def rows_for_pens(self, pen_ids: Iterable[int]) -> List[int]:
+        """Model rows showing the given pen ids."""
+        rows = []
+        for pen_id in pen_ids:
+            i = self._table_data.pen_index(pen_id)
+            if i is not None and i < self._pen_pos.size and self._pen_pos[i] >= 0:
+                rows.append(int(self._pen_pos[i]))
+        return sorted(rows)
+
+    def _item_count(self) -> int:
+        return int(self._pen_rows.size + self._tank_rows.size)
+
+    def _has_totals(self) -> bool:
+        return bool(self._totals_label) and self._item_count() > 0
+
+    # --- QAbstractTableModel --------------------------------------------
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._item_count() + (1 if self._has_totals() else 0)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            if 0 <= section < len(self.HEADERS):
+                return self.HEADERS[section]
+            return None
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        n_pens = self._pen_rows.size
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if row < n_pens:
+                return self._pen_text(int(self._pen_rows[row]), col)
+            if row < self._item_count():
+                return self._tank_text(int(self._tank_rows[row - n_pens]), col)
+            return self._totals_text(col)
+        if role == Qt.ItemDataRole.UserRole and col == self.NAME_COLUMN:
+            return self._row_id(row)
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.row() < self._item_count() and self._is_editable(index.row(), index.column()):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        row = index.row()
+        if row >= self._item_count() or not self._is_editable(row, index.column()):
+            return False
+        try:
+            return self._set_value(row, index.column(), value)
+        except (TypeError, ValueError):
+            return False
+
+    # --- change notifications -------------------------------------------
+
+    def _on_pens_changed(self, indices: np.ndarray) -> None:
+        if self._pen_pos.size:
+            self._rows_changed(self._pen_pos[indices[indices < self._pen_pos.size]])
+
+    def _on_tanks_changed(self, indices: np.ndarray) -> None:
+        if self._tank_pos.size:
+            rows = self._tank_pos[indices[indices < self._tank_pos.size]]
+            self._rows_changed(np.where(rows >= 0, rows + self._pen_rows.size, -1))
+
+    def _rows_changed(self, rows: np.ndarray) -> None:
+        rows = rows[rows >= 0]
+        if rows.size == 0:
+            return
+        last_col = len(self.HEADERS) - 1
+        # One range for the edited rows, plus the totals row
+        self.dataChanged.emit(self.index(int(rows.min()), 0), self.index(int(rows.max()), last_col))
+        if self._has_totals():
+            self._totals = None
+            tot = self._item_count()
+            self.dataChanged.emit(self.index(tot, 0), self.index(tot, last_col))
+
+    # --- per-layout hooks -----------------------------------------------
+
+    def _row_id(self, row: int) -> Optional[int]:
+        if row < self._pen_rows.size:
+            pen_id = int(self._table_data.pen_ids[self._pen_rows[row]])
+            return pen_id if pen_id >= 0 else None
+        return None
+
+    def _pen_text(self, i: int, col: int) -> str:
+        return ""
+
+    def _tank_text(self, i: int, col: int) -> str:
+        return ""
+
+    def _totals_text(self, col: int) -> str:
+        if self._totals is None:
+            self._totals = self._compute_totals()
+        return self._totals.get(col, "")
+
+    def _compute_totals(self) -> Dict[int, str]:
+        return {self.NAME_COLUMN: self._totals_label}
+
+    def _centre_totals(self, vcg_col: int, lcg_col: int, tcg_col: int) -> Dict[int, str]:
+        """Combined VCG/LCG/TCG of the rows (blank while nothing is loaded)."""
+        cells = {}
+        for col, moment in ((vcg_col, SUM_VCG_MOMENT), (lcg_col, SUM_LCG_MOMENT), (tcg_col, SUM_TCG_MOMENT)):
+            centre = self._running.centre(moment)
+            if centre is not None:
+                cells[col] = _total_text(centre, 3)
+        return cells
+
+    def _is_editable(self, row: int, col: int) -> bool:
+        return False
+
+    def _set_value(self, row: int, col: int, value: Any) -> bool:
+        return False
+
+
+def _total_text(value: float, decimals: int = 2) -> str:
+    # Deltas can leave a sum a hair below zero; never show "-0.00"
+    return f"{round(float(value), decimals) + 0.0:.{decimals}f}"
+
+
+def _pen_cells(d: ConditionTableData, i: int, col: int) -> str:
+    """Livestock columns 1-13 (Cargo .. LS Moment) for pen i."""
+    if col == 1:
+        return d.cargo_name(i)
+    if col == 2:
+        return str(int(d.pen_heads[i]))
+    if col == 3:
+        return f"{d.pen_head_pct[i]:.2f}"
+    if col == 4:
+        return str(int(d.pen_head_capacity[i]))
+    if col == 5:
+        return f"{d.pen_area_used[i]:.2f}"
+    if col == 6:
+        return f"{d.pen_area[i]:.2f}"
+    if col == 7:
+        return f"{d.pen_area_per_head[i]:.2f}"
+    if col == 8:
+        return f"{d.pen_mass_per_head[i]:.2f}"
+    if col == 9:
+        return f"{d.pen_weight[i]:.2f}"
+    if col == 10:
+        return f"{d.pen_vcg_display[i]:.3f}"
+    if col == 11:
+        return f"{d.pen_lcg[i]:.3f}"
+    if col == 12:
+        return f"{d.pen_tcg[i]:.3f}"
+    if col == 13:
+        return f"{d.pen_moment[i]:.2f}"
+    return ""
+
+
+class LivestockTableModel(ConditionTableModel):
+    """Livestock-DK1..7 tab: pens of one deck, Cargo and # Head editable."""
+
+    HEADERS = (
+        "Name",
+        "Cargo",
+        "# Head",
+        "Head %Full",
+        "Head Capacity",
+        "Used Area m2",
+        "Total Area m2",
+        "Area/Head",
+        "AvW/Head MT",
+        "Weight MT",
+        "VCG m-BL",
+        "LCG m-[FR]",
+        "TCG m-CL",
+        "LS Moment m-MT",
+    )
+    CARGO_COLUMN = 1
+    HEAD_COLUMN = 2
+
+    def _pen_text(self, i: int, col: int) -> str:
+        if col == 0:
+            return self._table_data.pens[i].name
+        return _pen_cells(self._table_data, i, col)
+
+    def _compute_totals(self) -> Dict[int, str]:
+        sums = self._running.pens
+        return {
+            0: self._totals_label,
+            5: _total_text(sums[SUM_PEN_AREA_USED]),
+            6: _total_text(sums[SUM_PEN_AREA]),
+            9: _total_text(sums[SUM_WEIGHT]),
+            **self._centre_totals(10, 11, 12),
+            13: _total_text(sums[SUM_LCG_MOMENT]),
+        }
+
+    def _is_editable(self, row: int, col: int) -> bool:
+        if col == self.CARGO_COLUMN:
+            return self._table_data.cargo_choice
+        return col == self.HEAD_COLUMN
+
+    def _set_value(self, row: int, col: int, value: Any) -> bool:
+        i = int(self._pen_rows[row])
+        if col == self.CARGO_COLUMN:
+            return self._table_data.set_pen_cargo([i], str(value)) > 0
+        self._table_data.set_pen_heads(i, int(float(str(value).strip() or "0")))
+        return True
+
+
+class AllTableModel(ConditionTableModel):
+    """'All' tab: every pen (with its deck), then the tanks holding liquid."""
+
+    HEADERS = (
+        "Name",
+        "Deck",
+        "Cargo",
+        "# Head",
+        "Head %Full",
+        "Head Capacity",
+        "Used Area m2",
+        "Total Area m2",
+        "Area/Head",
+        "AvW/Head MT",
+        "Weight MT",
+        "VCG m-BL",
+        "LCG m-[FR]",
+        "TCG m-CL",
+        "LS Moment m-MT",
+    )
+    HEAD_COLUMN = 3
+
+    def _pen_text(self, i: int, col: int) -> str:
+        if col == 0:
+            return self._table_data.pens[i].name
+        if col == 1:
+            return self._table_data.pen_decks[i] or (self._table_data.pens[i].deck or "")
+        return _pen_cells(self._table_data, i, col - 1)
+
+    def _tank_text(self, i: int, col: int) -> str:
+        d = self._table_data
+        if col == 0:
+            return d.tanks[i].name
+        if col == 2:
+            return "Tank"
+        if col == 4:
+            return f"{d.tank_fill_pct[i]:.1f}"
+        if col == 5:
+            return f"{d.tank_capacity[i]:.2f}"
+        if col == 10:
+            return f"{d.tank_weight[i]:.2f}"
+        return ""
+
+    def _is_editable(self, row: int, col: int) -> bool:
+        return (
+            col == self.HEAD_COLUMN
+            and row < self._pen_rows.size
+            and bool(self._table_data.pen_on_deck_tab[self._pen_rows[row]])
+        )
+
+    def _set_value(self, row: int, col: int, value: Any) -> bool:
+        self._table_data.set_pen_heads(int(self._pen_rows[row]), int(float(str(value).strip() or "0")))
+        return True
+
+
+class TankTableModel(ConditionTableModel):
+    """Tank category tab: Weight is editable; Volume and %Full follow from it."""
+
+    HEADERS = (
+        "",           # Green indicator column
+        "Name",
+        "Ull/Snd\n(m)",
+        "UTrim\n(m)",
+        "Capacity\n(m3)",
+        "%Full\n(%)",
+        "Volume\n(m3)",
+        "Dens\n(MT/m3)",
+        "Weight\n(MT)",
+        "VCG\n(m-BL)",
+        "LCG\n(m-[FR])",
+        "TCG\n(m-CL)",
+        "FSopt",
+        "FSt\n(m-MT)",
+    )
+    NAME_COLUMN = TANK_COL_NAME
+
+    def _row_id(self, row: int) -> Optional[int]:
+        if row < self._tank_rows.size:
+            tank_id = int(self._table_data.tank_ids[self._tank_rows[row]])
+            return tank_id if tank_id >= 0 else None
+        return None
+
+    def _tank_text(self, i: int, col: int) -> str:
+        d = self._table_data
+        if col == TANK_COL_NAME:
+            return d.tanks[i].name
+        if col == TANK_COL_CAPACITY:
+            return f"{d.tank_capacity[i]:.2f}"
+        if col == TANK_COL_PCT_FULL:
+            return f"{d.tank_fill_pct[i]:.1f}"
+        if col == TANK_COL_VOLUME:
+            return f"{d.tank_volume[i]:.2f}"
+        if col == TANK_COL_DENS:
+            return f"{d.tank_density[i]:.3f}"
+        if col == TANK_COL_WEIGHT:
+            return f"{d.tank_weight[i]:.2f}"
+        if col == TANK_COL_VCG:
+            return f"{d.tank_vcg[i]:.3f}"
+        if col == TANK_COL_LCG:
+            return f"{d.tank_lcg[i]:.3f}"
+        if col == TANK_COL_TCG:
+            return f"{d.tank_tcg[i]:.3f}"
+        return ""
+
+    def _compute_totals(self) -> Dict[int, str]:
+        sums = self._running.tanks
+        return {
+            TANK_COL_NAME: self._totals_label,
+            TANK_COL_CAPACITY: _total_text(sums[SUM_TANK_CAPACITY]),
+            TANK_COL_VOLUME: _total_text(sums[SUM_TANK_VOLUME]),
+            TANK_COL_WEIGHT: _total_text(sums[SUM_WEIGHT]),
+            **self._centre_totals(TANK_COL_VCG, TANK_COL_LCG, TANK_COL_TCG),
+        }
+
+    def _is_editable(self, row: int, col: int) -> bool:
+        return col == TANK_COL_WEIGHT
+
+    def _set_value(self, row: int, col: int, value: Any) -> bool:
+        text = str(value).strip()
+        self._table_data.set_tank_weight(int(self._tank_rows[row - self._pen_rows.size]), float(text) if text else 0.0)
+        return True
+
+
+class CargoDelegate(QStyledItemDelegate):
+    """Combo box editor for the Cargo column, listing the cargo library."""
+
+    def __init__(self, table_data: ConditionTableData, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._table_data = table_data
+
+    def createEditor(self, parent: QWidget, option, index: QModelIndex) -> QWidget:
+        combo = QComboBox(parent)
+        combo.addItems(self._table_data.cargo_names)
+        # Commit as soon as a cargo is picked, like the old per-row combos
+        combo.activated.connect(lambda _i, c=combo: self._commit(c))
+        return combo
+
+    def setEditorData(self, editor: QWidget, index: QModelIndex) -> None:
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(str(index.data(Qt.ItemDataRole.EditRole) or ""))
+
+    def setModelData(self, editor: QWidget, model, index: QModelIndex) -> None:
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+    def _commit(self, combo: QComboBox) -> None:
+        self.commitData.emit(combo)
+        self.closeEditor.emit(combo)
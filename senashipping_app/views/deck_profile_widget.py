@@ -13,8 +13,8 @@ from PyQt6.QtWidgets import (
     QTableWidgetItem,
 )
 
+from .item_registry import ItemRegistry
 from .stl_view_widget import StlViewWidget
-from ..utils.sorting import get_pen_sort_key
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent  # -> senashipping_app
@@ -77,14 +77,8 @@ class DeckTabWidget(QWidget):
         # right.addWidget(self._table, 1)
         # layout.addLayout(right, 1)
 
-    def update_table(self, pens: list, tanks: list) -> None:
-        """Update deck tab data (no 2D view to update)."""
-        deck_pens = [
-            p for p in pens
-            if (getattr(p, "deck", None) or "").strip().upper() == self._deck_name.upper()
-        ]
-        # Sort pens by the 3-level key: number -> letter pattern (A,B,D,C) -> deck
-        deck_pens = sorted(deck_pens, key=get_pen_sort_key)
+    def update_table(self, deck_pens: list) -> None:
+        """Update deck tab data from this deck's pens, already in pen sort order (no 2D view to update)."""
 
         # Net area: sum of area_a+area_b+area_c+area_d when set, else area_m2
         net_area = 0.0
@@ -202,6 +196,7 @@ class DeckProfileWidget(QWidget):
             self._deck_tabs.addTab(tab_widget, f"Deck {deck_letter}")
 
         self._syncing_selection = False
+        self._registry: ItemRegistry | None = None
 
         main_layout.addWidget(self._deck_tabs, 20)
 
@@ -221,10 +216,37 @@ class DeckProfileWidget(QWidget):
                     self._deck_stl_view.clear()
                 self.deck_changed.emit(deck_name)
 
-    def update_tables(self, pens: list, tanks: list) -> None:
+    def set_registry(self, registry: ItemRegistry) -> None:
+        """Follow the condition editor's pen/tank registry: deck tabs refresh on its change signals."""
+        if self._registry is not None:
+            self._registry.reset.disconnect(self._on_registry_reset)
+            self._registry.pens_changed.disconnect(self._on_registry_pens_changed)
+        self._registry = registry
+        registry.reset.connect(self._on_registry_reset)
+        registry.pens_changed.connect(self._on_registry_pens_changed)
+        self._on_registry_reset()
+
+    def _on_registry_reset(self) -> None:
+        self._update_decks(self._deck_tab_widgets)
+
+    def _on_registry_pens_changed(self, pen_ids: tuple) -> None:
+        """Refresh only the decks holding the changed pens."""
+        registry = self._registry
+        decks = set()
+        for pen_id in pen_ids:
+            i = registry.pen_position(pen_id)
+            if i is not None and registry.pen_decks[i]:
+                decks.add(registry.pen_decks[i])
+        self._update_decks(decks)
+
+    def _update_decks(self, decks) -> None:
         """Update deck tab data (selection is from table only now; no 2D drawings)."""
-        for tab_widget in self._deck_tab_widgets.values():
-            tab_widget.update_table(pens, tanks)
+        if self._registry is None:
+            return
+        for deck in decks:
+            tab_widget = self._deck_tab_widgets.get(deck)
+            if tab_widget is not None:
+                tab_widget.update_table(self._registry.pens_on_deck(deck))
 
     def set_selected(self, pen_ids: set[int], tank_ids: set[int]) -> None:
         """No-op: selection is from condition table only (no 2D profile/deck view)."""
@@ -0,0 +1,266 @@
+"""
+Indexed in-memory registry of the current ship's pens and tanks.
+
+One ItemRegistry is owned by the condition editor and shared with the
+condition tables and the deck profile. It keeps the pens and tanks as
+loaded (their positions are the row indices the table models use) and
+indexes them by id, normalized deck letter, tank category and sort key,
+so views look items up instead of scanning lists. Views subscribe to
+`reset` (a new set of items) and `pens_changed` / `tanks_changed` (ids
+added or replaced) rather than being handed lists to re-read.
+"""
+
+from __future__ import annotations
+
+from bisect import insort
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from ..models import LivestockPen, Tank
+from ..models.tank import TankType
+from ..utils.sorting import get_pen_sort_key, get_tank_sort_key
+
+DECK_LETTERS = "ABCDEFGH"
+
+# Map tank category tab name -> TankType(s) for filtering. Same list used in Ship Manager "Storing" dropdown.
+TANK_CATEGORY_TYPES: Dict[str, List[TankType]] = {
+    "Water Ballast": [TankType.BALLAST],
+    "Fresh Water": [TankType.FRESH_WATER],
+    "Heavy Fuel Oil": [TankType.FUEL],
+    "Diesel Oil": [TankType.FUEL],
+    "Lube Oil": [TankType.OTHER],
+    "Misc. Tanks": [TankType.CARGO],
+    "Dung": [],       # Pens for dung (optional; define in Ship & data setup)
+    "Fodder Hold": [TankType.CARGO],
+    "Spaces": [TankType.CARGO],  # Spaces category for tanks
+}
+TANK_CATEGORY_NAMES: List[str] = list(TANK_CATEGORY_TYPES.keys())
+
+
+def deck_letter(deck: str) -> Optional[str]:
+    """Normalize Ship Manager deck value to A–H so it matches loading condition tabs (Livestock-DK1..DK8)."""
+    s = (deck or "").strip().upper()
+    if not s:
+        return None
+    # A–H already
+    if s in DECK_LETTERS:
+        return s
+    # 1–8 or DK1–DK8
+    if s.isdigit() and 1 <= int(s) <= 8:
+        return chr(ord("A") + int(s) - 1)
+    if s.startswith("DK") and s[2:].strip().isdigit():
+        n = int(s[2:].strip())
+        if 1 <= n <= 8:
+            return chr(ord("A") + n - 1)
+    return None
+
+
+def tank_in_category(tank: Tank, cat: str) -> bool:
+    """Match by tank.category (Ship Manager "Storing"); fall back to tank_type for old data."""
+    tcat = (getattr(tank, "category", None) or "").strip()
+    if tcat:
+        # Case-insensitive comparison to handle any casing differences
+        return tcat.lower() == cat.lower()
+    return tank.tank_type in TANK_CATEGORY_TYPES.get(cat, [])
+
+
+def _all_pens_key(letter: str, pen_key: tuple) -> tuple:
+    """Deck first (A, B, C, ...; unknown decks last), then the standard pen sort key."""
+    return (ord(letter) if letter else 999, *pen_key)
+
+
+class ItemRegistry(QObject):
+    """Pens and tanks of the current ship, indexed by id, deck, category and sort key."""
+
+    # Emitted after load(): every index was rebuilt
+    reset = pyqtSignal()
+    # args: tuple of pen ids added or replaced
+    pens_changed = pyqtSignal(object)
+    # args: tuple of tank ids added or replaced
+    tanks_changed = pyqtSignal(object)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.ship_id: Optional[int] = None
+        self.version = 0  # bumped on every change
+        self._pens: List[LivestockPen] = []
+        self._tanks: List[Tank] = []
+        self._pen_pos: Dict[int, int] = {}
+        self._tank_pos: Dict[int, int] = {}
+        self._pen_decks: List[str] = []
+        self._pen_keys: List[tuple] = []
+        self._tank_keys: List[tuple] = []
+        self._deck_rows: Dict[str, List[int]] = {}
+        self._category_rows: Dict[str, List[int]] = {}
+        self._pen_order: List[int] = []
+        self._all_pen_order: List[int] = []
+        self._tank_order: List[int] = []
+
+    # --- Loading -----------------------------------------------------------
+
+    def load(self, ship_id: Optional[int], pens: Sequence[LivestockPen], tanks: Sequence[Tank]) -> None:
+        """Replace the items (e.g. after switching ship or loading a condition) and rebuild the indexes."""
+        self.ship_id = ship_id
+        self._pens = list(pens)
+        self._tanks = list(tanks)
+        self._pen_pos = {p.id: i for i, p in enumerate(self._pens) if p.id is not None}
+        self._tank_pos = {t.id: i for i, t in enumerate(self._tanks) if t.id is not None}
+        self._pen_decks = [deck_letter(p.deck or "") or "" for p in self._pens]
+        self._pen_keys = [get_pen_sort_key(p) for p in self._pens]
+        self._tank_keys = [get_tank_sort_key(t) for t in self._tanks]
+
+        self._pen_order = sorted(range(len(self._pens)), key=self._pen_keys.__getitem__)
+        self._all_pen_order = sorted(range(len(self._pens)), key=self._all_key)
+        self._deck_rows = {letter: [] for letter in DECK_LETTERS}
+        for i in self._pen_order:
+            if self._pen_decks[i]:
+                self._deck_rows[self._pen_decks[i]].append(i)
+
+        self._tank_order = sorted(range(len(self._tanks)), key=self._tank_keys.__getitem__)
+        self._category_rows = {
+            cat: [i for i in self._tank_order if tank_in_category(self._tanks[i], cat)]
+            for cat in TANK_CATEGORY_NAMES
+        }
+        self.version += 1
+        self.reset.emit()
+
+    def holds(self, pens: Sequence[LivestockPen], tanks: Sequence[Tank]) -> bool:
+        """True if pens and tanks are this registry's own lists (no reload needed)."""
+        return pens is self._pens and tanks is self._tanks
+
+    # --- Lookups -----------------------------------------------------------
+
+    @property
+    def pens(self) -> List[LivestockPen]:
+        """Pens in load order; a position in this list is the pen's row index. Do not modify."""
+        return self._pens
+
+    @property
+    def tanks(self) -> List[Tank]:
+        """Tanks in load order; a position in this list is the tank's row index. Do not modify."""
+        return self._tanks
+
+    @property
+    def pen_decks(self) -> List[str]:
+        """Normalized deck letter per pen position ("" if the deck is not A–H)."""
+        return self._pen_decks
+
+    def pen(self, pen_id: int) -> Optional[LivestockPen]:
+        i = self._pen_pos.get(pen_id)
+        return None if i is None else self._pens[i]
+
+    def tank(self, tank_id: int) -> Optional[Tank]:
+        i = self._tank_pos.get(tank_id)
+        return None if i is None else self._tanks[i]
+
+    def pen_position(self, pen_id: int) -> Optional[int]:
+        return self._pen_pos.get(pen_id)
+
+    def tank_position(self, tank_id: int) -> Optional[int]:
+        return self._tank_pos.get(tank_id)
+
+    def deck_rows(self, letter: str) -> List[int]:
+        """Positions of the pens on deck letter, in pen sort order."""
+        return self._deck_rows.get(letter, [])
+
+    def category_rows(self, cat: str) -> List[int]:
+        """Positions of the tanks in category cat, in tank sort order."""
+        return self._category_rows.get(cat, [])
+
+    def pen_rows(self) -> List[int]:
+        """Positions of all pens in pen sort order."""
+        return self._pen_order
+
+    def all_pen_rows(self) -> List[int]:
+        """Positions of all pens by deck, then pen sort order (the All tab)."""
+        return self._all_pen_order
+
+    def tank_rows(self) -> List[int]:
+        """Positions of all tanks in tank sort order."""
+        return self._tank_order
+
+    def pens_on_deck(self, letter: str) -> List[LivestockPen]:
+        return [self._pens[i] for i in self.deck_rows(letter)]
+
+    def tanks_in_category(self, cat: str) -> List[Tank]:
+        return [self._tanks[i] for i in self.category_rows(cat)]
+
+    def sorted_pens(self) -> List[LivestockPen]:
+        return [self._pens[i] for i in self._pen_order]
+
+    def sorted_tanks(self) -> List[Tank]:
+        return [self._tanks[i] for i in self._tank_order]
+
+    # --- Changes -----------------------------------------------------------
+
+    def upsert_pens(self, pens: Iterable[LivestockPen]) -> None:
+        """Add pens (new ids are appended) or replace those already held, keeping every index sorted."""
+        ids: List[int] = []
+        for pen in pens:
+            i = self._pen_pos.get(pen.id) if pen.id is not None else None
+            if i is None:
+                i = len(self._pens)
+                self._pens.append(pen)
+                self._pen_decks.append("")
+                self._pen_keys.append(())
+                if pen.id is not None:
+                    self._pen_pos[pen.id] = i
+            else:
+                self._unindex_pen(i)
+                self._pens[i] = pen
+            self._pen_decks[i] = deck_letter(pen.deck or "") or ""
+            self._pen_keys[i] = get_pen_sort_key(pen)
+            self._index_pen(i)
+            if pen.id is not None:
+                ids.append(pen.id)
+        self.version += 1
+        self.pens_changed.emit(tuple(ids))
+
+    def upsert_tanks(self, tanks: Iterable[Tank]) -> None:
+        """Add tanks (new ids are appended) or replace those already held, keeping every index sorted."""
+        ids: List[int] = []
+        for tank in tanks:
+            i = self._tank_pos.get(tank.id) if tank.id is not None else None
+            if i is None:
+                i = len(self._tanks)
+                self._tanks.append(tank)
+                self._tank_keys.append(())
+                if tank.id is not None:
+                    self._tank_pos[tank.id] = i
+            else:
+                self._unindex_tank(i)
+                self._tanks[i] = tank
+            self._tank_keys[i] = get_tank_sort_key(tank)
+            self._index_tank(i)
+            if tank.id is not None:
+                ids.append(tank.id)
+        self.version += 1
+        self.tanks_changed.emit(tuple(ids))
+
+    def _all_key(self, i: int) -> tuple:
+        return _all_pens_key(self._pen_decks[i], self._pen_keys[i])
+
+    def _index_pen(self, i: int) -> None:
+        insort(self._pen_order, i, key=self._pen_keys.__getitem__)
+        insort(self._all_pen_order, i, key=self._all_key)
+        if self._pen_decks[i]:
+            insort(self._deck_rows.setdefault(self._pen_decks[i], []), i, key=self._pen_keys.__getitem__)
+
+    def _unindex_pen(self, i: int) -> None:
+        self._pen_order.remove(i)
+        self._all_pen_order.remove(i)
+        if self._pen_decks[i]:
+            self._deck_rows[self._pen_decks[i]].remove(i)
+
+    def _index_tank(self, i: int) -> None:
+        insort(self._tank_order, i, key=self._tank_keys.__getitem__)
+        for cat in TANK_CATEGORY_NAMES:
+            if tank_in_category(self._tanks[i], cat):
+                insort(self._category_rows.setdefault(cat, []), i, key=self._tank_keys.__getitem__)
+
+    def _unindex_tank(self, i: int) -> None:
+        self._tank_order.remove(i)
+        for rows in self._category_rows.values():
+            if i in rows:
+                rows.remove(i)
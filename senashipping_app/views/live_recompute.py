@@ -0,0 +1,85 @@
+"""
+Debounced live recompute for the loading condition tables.
+
+LiveRecompute collects tank volume and pen head edits as they are made
+(the latest value per id wins) and, once no edit has arrived for
+debounce_ms, hands them to a LiveCondition in one apply(). Each update is
+published through `updated` together with its latency; `latency_measured`
+carries the latency alone for status displays and logging.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from ..services.live_condition import FRAME_BUDGET_S, LiveCondition
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE_MS = 150
+
+
+class LiveRecompute(QObject):
+    # args: LiveUpdate
+    updated = pyqtSignal(object)
+    # args: seconds taken by the update
+    latency_measured = pyqtSignal(float)
+
+    def __init__(self, parent: QObject | None = None, debounce_ms: int = DEFAULT_DEBOUNCE_MS) -> None:
+        super().__init__(parent)
+        self._live: Optional[LiveCondition] = None
+        self._tank_volumes: Dict[int, float] = {}
+        self._pen_heads: Dict[int, int] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def active(self) -> bool:
+        return self._live is not None
+
+    def start(self, live: LiveCondition) -> None:
+        """Track live (replacing any previous condition) and publish its results."""
+        self._live = live
+        self._tank_volumes.clear()
+        self._pen_heads.clear()
+        self.flush(force=True)
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._live = None
+        self._tank_volumes.clear()
+        self._pen_heads.clear()
+
+    def tank_volume_edited(self, tank_id: int, volume_m3: float) -> None:
+        if self._live is None:
+            return
+        self._tank_volumes[tank_id] = volume_m3
+        self._timer.start()
+
+    def pen_heads_edited(self, pen_id: int, heads: int) -> None:
+        if self._live is None:
+            return
+        self._pen_heads[pen_id] = heads
+        self._timer.start()
+
+    def flush(self, force: bool = False) -> None:
+        """Apply the pending edits now (also what the debounce timer calls)."""
+        self._timer.stop()
+        if self._live is None or not (force or self._tank_volumes or self._pen_heads):
+            return
+        tank_volumes, self._tank_volumes = self._tank_volumes, {}
+        pen_heads, self._pen_heads = self._pen_heads, {}
+        update = self._live.apply(tank_volumes, pen_heads)
+        if not update.within_budget:
+            logger.debug(
+                "Live update took %.1f ms (budget %.1f ms) for %d tank and %d pen edits",
+                1000.0 * update.latency_s, 1000.0 * FRAME_BUDGET_S,
+                update.tanks_changed, update.pens_changed,
+            )
+        self.latency_measured.emit(update.latency_s)
+        self.updated.emit(update)
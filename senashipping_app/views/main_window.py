@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import Dict
 
 from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QAction, QIcon, QActionGroup
+from PyQt6.QtGui import QAction, QIcon, QActionGroup, QCloseEvent
 from PyQt6.QtWidgets import (
     QMainWindow,
     QStackedWidget,
@@ -33,6 +33,7 @@ from ..config.settings import Settings
 from ..services.file_service import save_condition_to_file, load_condition_from_file
 from ..reports import export_condition_to_excel, export_condition_to_pdf
 from ..repositories import database
+from ..utils.startup_profiler import startup_profiler
 from .ship_manager_view import ShipManagerView
 from .voyage_planner_view import VoyagePlannerView
 from .condition_editor_view import ConditionEditorView
@@ -71,7 +72,11 @@ class MainWindow(QMainWindow):
         # Track current file path for save
         self._current_file_path: Path | None = None
 
-        self._page_indexes = self._create_pages()
+        # Set while a toolbar compute runs: show Results when it finishes
+        self._results_after_compute = False
+
+        with startup_profiler.stage("MainWindow._create_pages"):
+            self._page_indexes = self._create_pages()
         self._create_menu()
         self._create_toolbar()
         self._create_status_panel()
@@ -83,10 +88,14 @@ class MainWindow(QMainWindow):
     def _create_pages(self) -> _PageIndexes:
         """Create core application pages and add them to the stacked widget."""
         # Keep references to views to allow signal wiring between them
-        self._ship_manager = ShipManagerView(self)
-        self._voyage_planner = VoyagePlannerView(self)
-        self._condition_editor = ConditionEditorView(self)
-        self._results_view = ResultsView(self)
+        with startup_profiler.stage("page ShipManagerView"):
+            self._ship_manager = ShipManagerView(self)
+        with startup_profiler.stage("page VoyagePlannerView"):
+            self._voyage_planner = VoyagePlannerView(self)
+        with startup_profiler.stage("page ConditionEditorView"):
+            self._condition_editor = ConditionEditorView(self)
+        with startup_profiler.stage("page ResultsView"):
+            self._results_view = ResultsView(self)
 
         ship_idx = self._stack.addWidget(self._ship_manager)
         voy_idx = self._stack.addWidget(self._voyage_planner)
@@ -107,6 +116,11 @@ class MainWindow(QMainWindow):
         self._condition_editor.condition_computed.connect(
             self._results_view.update_results
         )
+        self._condition_editor.condition_computed.connect(self._on_condition_computed)
+        self._condition_editor.live_results_updated.connect(
+            self._results_view.show_live_results
+        )
+        self._condition_editor.compute_failed.connect(self._on_compute_failed)
 
         # Wire voyage planner: when user clicks Edit Condition, switch to editor and load it
         self._voyage_planner.condition_selected.connect(
@@ -692,6 +706,7 @@ class MainWindow(QMainWindow):
                 return
             from ..repositories import database
             from ..repositories.tank_repository import TankRepository
+            from ..repositories.tank_sounding_repository import TankSoundingRepository
             with database.SessionLocal() as db:
                 tank_repo = TankRepository(db)
                 created = create_tanks_from_stl(
@@ -699,6 +714,7 @@ class MainWindow(QMainWindow):
                     ship.id,
                     deck_name,
                     tank_repo,
+                    sounding_repo=TankSoundingRepository(db),
                 )
             cond_editor._set_current_ship(ship)
             QMessageBox.information(
@@ -1077,14 +1093,30 @@ class MainWindow(QMainWindow):
         current_widget = self._stack.currentWidget()
         if isinstance(current_widget, ConditionEditorView):
             if current_widget.compute_condition():
-                self._status_bar.showMessage("Computation completed", 3000)
-                # Auto-switch to results view
-                self._switch_page(self._page_indexes.results, "Results")
+                # Results view is shown when the background compute finishes
+                self._results_after_compute = True
             else:
                 self._status_bar.showMessage("Computation failed - check inputs", 3000)
         else:
             self._status_bar.showMessage("Switch to Loading Condition view first")
 
+    def _on_condition_computed(self, *_args) -> None:
+        if self._results_after_compute:
+            self._results_after_compute = False
+            self._status_bar.showMessage("Computation completed", 3000)
+            # Auto-switch to results view
+            self._switch_page(self._page_indexes.results, "Results")
+
+    def _on_compute_failed(self, message: str) -> None:
+        if self._results_after_compute:
+            self._results_after_compute = False
+            self._status_bar.showMessage(message or "Computation failed - check inputs", 3000)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        # Let a running compute finish or cancel before its thread is destroyed
+        self._condition_editor.shutdown()
+        super().closeEvent(event)
+
     # def _on_zoom_in(self) -> None:
     #     """Handle zoom in action from toolbar."""
     #     current_widget = self._stack.currentWidget()
@@ -348,6 +348,14 @@ class ResultsView(QWidget):
         )
         self._report_view.setPlainText(text)
 
+    def show_live_results(self, results: ConditionResults) -> None:
+        """
+        Slot for live (incremental) results while the condition is edited:
+        refreshes alarms and criteria only; exports keep the last full compute.
+        """
+        self._populate_alarms_table(results, getattr(results, "validation", None), getattr(results, "criteria", None))
+        self._populate_criteria_table(getattr(results, "criteria", None))
+
     def _on_export_pdf(self) -> None:
         if not all([self._last_results, self._last_ship, self._last_condition, self._last_voyage]):
             QMessageBox.information(
@@ -33,7 +33,7 @@ from ..repositories.tank_repository import TankRepository
 from ..repositories.livestock_pen_repository import LivestockPenRepository
 from ..services.ship_service import ShipService, ShipValidationError
 from ..utils.sorting import get_pen_sort_key, get_tank_sort_key
-from .condition_table_widget import TANK_CATEGORY_NAMES, TANK_CATEGORY_TYPES
+from .item_registry import TANK_CATEGORY_NAMES, TANK_CATEGORY_TYPES
 
 
 class ShipManagerView(QWidget):
@@ -7,6 +7,7 @@ Used instead of 2D DXF for profile and deck drawings.
 
 from __future__ import annotations
 
+import importlib.util
 import os
 from pathlib import Path
 from typing import List, Optional
@@ -14,22 +15,33 @@ from typing import List, Optional
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame
 
-# Prefer PyQt6 for PyVistaQt; set before first pyvistaqt import if needed
-try:
-    import os
-    if "QT_API" not in os.environ:
-        os.environ["QT_API"] = "pyqt6"
-except Exception:
-    pass
-
-PYVISTA_AVAILABLE = False
+# pyvista/pyvistaqt (and VTK) are slow to import, so they are only loaded
+# when a 3D view is first shown. Availability is checked without importing.
+PYVISTA_AVAILABLE = (
+    importlib.util.find_spec("pyvista") is not None
+    and importlib.util.find_spec("pyvistaqt") is not None
+)
 QtInteractor = None
 pv = None
 
-try:
-    import pyvista as pv
-    from pyvistaqt import QtInteractor
-    PYVISTA_AVAILABLE = True
+_MISSING_TEXT = "3D view requires pyvista and pyvistaqt.\nInstall: pip install pyvista pyvistaqt"
+
+
+def _load_pyvista() -> bool:
+    """Import pyvista/pyvistaqt on first use; returns False if they cannot be loaded."""
+    global PYVISTA_AVAILABLE, QtInteractor, pv
+    if pv is not None or not PYVISTA_AVAILABLE:
+        return PYVISTA_AVAILABLE
+    # Prefer PyQt6 for PyVistaQt; set before first pyvistaqt import if needed
+    if "QT_API" not in os.environ:
+        os.environ["QT_API"] = "pyqt6"
+    try:
+        import pyvista
+        from pyvistaqt import QtInteractor as interactor
+    except ImportError:
+        PYVISTA_AVAILABLE = False
+        return False
+    pv, QtInteractor = pyvista, interactor
     # Reduce VTK/WGL log spam on Windows (e.g. wglMakeCurrent code 2004)
     try:
         import vtk
@@ -40,13 +52,12 @@ try:
         vtk.vtkOutputWindow.SetInstance(_vtk_silent)
     except Exception:
         pass
-except ImportError:
-    pass
+    return True
 
 
 def _load_stl_mesh(path: Path):
     """Load STL into PyVista mesh. Returns None if failed or pyvista unavailable."""
-    if not PYVISTA_AVAILABLE or not pv or not path.exists():
+    if not _load_pyvista() or not path.exists():
         return None
     try:
         mesh = pv.read(str(path))
@@ -66,19 +77,28 @@ class StlViewWidget(QWidget):
         self._paths: List[Path] = []
         self._plotter = None
         self._placeholder_label: Optional[QLabel] = None
+        self._plotter_tried = False
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
 
         if not PYVISTA_AVAILABLE:
-            self._placeholder_label = QLabel(
-                "3D view requires pyvista and pyvistaqt.\n"
-                "Install: pip install pyvista pyvistaqt"
-            )
-            self._placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self._placeholder_label.setStyleSheet("color: gray; padding: 20px;")
-            layout.addWidget(self._placeholder_label)
-            return
-
+            self._show_placeholder(_MISSING_TEXT)
+            self._plotter_tried = True
+
+    def _show_placeholder(self, text: str) -> None:
+        self._placeholder_label = QLabel(text)
+        self._placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._placeholder_label.setStyleSheet("color: gray; padding: 20px;")
+        self.layout().addWidget(self._placeholder_label)
+
+    def _ensure_plotter(self) -> bool:
+        """Create the 3D plotter (importing pyvista) the first time it is needed."""
+        if self._plotter is not None or self._plotter_tried:
+            return self._plotter is not None
+        self._plotter_tried = True
+        if not _load_pyvista():
+            self._show_placeholder(_MISSING_TEXT)
+            return False
         self._frame = QFrame(self)
         self._frame.setFrameStyle(QFrame.Shape.StyledPanel)
         frame_layout = QVBoxLayout(self._frame)
@@ -88,10 +108,16 @@ class StlViewWidget(QWidget):
             frame_layout.addWidget(self._plotter.interactor)
             self._plotter.set_background("white")
         except Exception:
+            self._plotter = None
             self._placeholder_label = QLabel("Could not create 3D view.")
-            layout.addWidget(self._placeholder_label)
-            return
-        layout.addWidget(self._frame)
+            self.layout().addWidget(self._placeholder_label)
+            return False
+        self.layout().addWidget(self._frame)
+        return True
+
+    def showEvent(self, event) -> None:  # noqa: N802 - Qt override
+        self._ensure_plotter()
+        super().showEvent(event)
 
     def load_stl(self, path: "Path | str | None") -> bool:
         """
@@ -99,7 +125,7 @@ class StlViewWidget(QWidget):
         If path is None or missing, clear the view.
         Returns True if something was drawn.
         """
-        if not PYVISTA_AVAILABLE or self._plotter is None:
+        if not self._ensure_plotter():
             return False
         self._plotter.clear()
         self._paths = []
@@ -118,7 +144,7 @@ class StlViewWidget(QWidget):
 
     def load_stl_paths(self, paths: "List[Path] | List[str]") -> bool:
         """Load and display multiple STL files. Returns True if at least one was drawn."""
-        if not PYVISTA_AVAILABLE or self._plotter is None:
+        if not self._ensure_plotter():
             return False
         self._plotter.clear()
         self._paths = []